@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Cross-region price anomaly report for Azure services.
+
+Scans every Consumption price of the given services (live from the Retail
+Prices API, or from saved snapshots) and flags regions whose price is far
+from the SKU's median across regions, plus unusual Spot discounts.
+
+Examples:
+    # Live scan, Markdown report to stdout, keep a snapshot for next time
+    python scripts/price_anomaly_report.py --service "Virtual Machines" --save-snapshot vm-prices.json
+
+    # Re-analyse a snapshot with a stricter threshold and write JSON
+    python scripts/price_anomaly_report.py --snapshot vm-prices.json --ratio 1.5 --format json -o report.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+from azure_pricing_mcp.client import AzurePricingClient
+from azure_pricing_mcp.config import (
+    ANOMALY_MAX_PAGES,
+    ANOMALY_MIN_REGIONS,
+    ANOMALY_OUTLIER_RATIO,
+    ANOMALY_SPOT_DEVIATION,
+)
+from azure_pricing_mcp.formatters import format_price_anomaly_report
+from azure_pricing_mcp.services import PricingService, RetirementService
+from azure_pricing_mcp.services.anomaly import find_price_anomalies
+
+
+def load_snapshot(path: Path) -> list[dict[str, Any]]:
+    """Load pricing items from a snapshot (a list of items or an API-shaped {"Items": [...]})."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, dict):
+        data = data.get("Items") or data.get("items") or []
+    return list(data)
+
+
+async def fetch_items(services: list[str], currency: str, max_pages: int) -> tuple[list[dict[str, Any]], list[str]]:
+    """Fetch every Consumption price of the services across all regions.
+
+    Returns the items and the services whose scan stopped at ``max_pages``.
+    """
+    async with AzurePricingClient() as client:
+        pricing = PricingService(client, RetirementService(client))
+        results = await asyncio.gather(
+            *(pricing.fetch_service_prices(s, currency_code=currency, max_pages=max_pages) for s in services)
+        )
+    items = [item for service_items, _ in results for item in service_items]
+    return items, [service for service, (_, truncated) in zip(services, results, strict=True) if truncated]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--service", action="append", default=[], help="Service name to scan (repeatable)")
+    parser.add_argument("--snapshot", action="append", default=[], type=Path, help="Snapshot JSON file (repeatable)")
+    parser.add_argument("--save-snapshot", type=Path, help="Write fetched items to this file")
+    parser.add_argument("--region", action="append", default=[], help="Only consider these regions (repeatable)")
+    parser.add_argument("--currency", default="USD", help="Currency code (default: USD)")
+    parser.add_argument("--ratio", type=float, default=ANOMALY_OUTLIER_RATIO, help="Outlier price ratio to median")
+    parser.add_argument(
+        "--spot-deviation", type=float, default=ANOMALY_SPOT_DEVIATION, help="Spot discount deviation (points)"
+    )
+    parser.add_argument("--min-regions", type=int, default=ANOMALY_MIN_REGIONS, help="Minimum regions per SKU")
+    parser.add_argument("--max-pages", type=int, default=ANOMALY_MAX_PAGES, help="Pages per service for live scans")
+    parser.add_argument("--top", type=int, default=100, help="Maximum outliers and Spot anomalies reported")
+    parser.add_argument("--format", choices=["markdown", "json"], default="markdown", help="Report format")
+    parser.add_argument("-o", "--output", type=Path, help="Write the report to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if not args.service and not args.snapshot:
+        print("❌ Specify at least one --service or --snapshot", file=sys.stderr)
+        return 2
+
+    truncated: list[str] = []
+    if args.snapshot:
+        items = [item for path in args.snapshot for item in load_snapshot(path)]
+    else:
+        items, truncated = asyncio.run(fetch_items(args.service, args.currency, args.max_pages))
+    print(f"Loaded {len(items):,} pricing items", file=sys.stderr)
+    if truncated:
+        print(f"⚠️ Stopped at --max-pages {args.max_pages} for: {', '.join(truncated)}", file=sys.stderr)
+
+    if args.save_snapshot:
+        args.save_snapshot.write_text(json.dumps({"Items": items}), encoding="utf-8")
+        print(f"Snapshot written to {args.save_snapshot}", file=sys.stderr)
+
+    result = find_price_anomalies(
+        items,
+        service_names=args.service or None,
+        regions=args.region or None,
+        currency_code=args.currency,
+        outlier_ratio=args.ratio,
+        spot_deviation=args.spot_deviation,
+        min_regions=args.min_regions,
+        top_n=args.top,
+        truncated_services=truncated,
+    )
+    if "error" in result:
+        print(f"❌ {result['error']}", file=sys.stderr)
+        return 1
+
+    report = json.dumps(result, indent=2) if args.format == "json" else format_price_anomaly_report(result)
+    if args.output:
+        args.output.write_text(report, encoding="utf-8")
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
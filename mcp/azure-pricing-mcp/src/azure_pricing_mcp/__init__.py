@@ -3,7 +3,12 @@
 A Model Context Protocol server for querying Azure retail pricing information.
 """
 
-from .server import AzurePricingServer, create_server, main, run
+from typing import TYPE_CHECKING
+
+from .lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .server import AzurePricingServer, create_server, main, run
 
 __version__ = "4.0.0"
 __all__ = [
@@ -12,3 +17,7 @@ __all__ = [
     "create_server",
     "AzurePricingServer",
 ]
+
+# The server (and the MCP SDK behind it) loads on first use, so importing a
+# submodule such as ``azure_pricing_mcp.config`` stays cheap
+__getattr__, __dir__ = lazy_exports(__name__, dict.fromkeys(__all__, ".server"))
@@ -0,0 +1,107 @@
+"""Batch tool-call execution for Azure Pricing MCP Server.
+
+The ``batch`` meta-tool takes a list of ``{"tool": ..., "arguments": {...}}``
+entries and runs them concurrently through the regular tool dispatch (so
+each call still goes through the tool result cache). A limiter shared by
+all batches bounds how many calls run at once; results come back in input
+order, and a failing entry is reported without affecting the others.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from mcp.types import TextContent
+
+from .cancellation import gather_cancelling
+from .config import BATCH_MAX_CALLS
+from .progress import ProgressReporter
+from .tool_cache import is_error_response
+
+logger = logging.getLogger(__name__)
+
+BATCH_TOOL_NAME = "batch"
+
+ToolCaller = Callable[[str, dict[str, Any]], Awaitable[Any]]
+
+
+def _content_text(content: Any) -> str:
+    """Join the text parts of a tool response."""
+    if isinstance(content, list):
+        return "\n".join(part.text for part in content if isinstance(part, TextContent))
+    return str(content)
+
+
+async def run_batch(
+    calls: list[Any] | None,
+    call_tool: ToolCaller,
+    limiter: asyncio.Semaphore,
+    max_calls: int = BATCH_MAX_CALLS,
+    progress: ProgressReporter | None = None,
+) -> dict[str, Any]:
+    """Run tool *calls* concurrently and return their results in order.
+
+    *calls* comes straight from the tool arguments (it may be missing or
+    hold malformed entries) and is validated here. Each result has
+    ``index``, ``tool``, ``ok``, ``elapsed_ms`` and either ``text`` (the tool
+    response) or ``error``. ``progress`` is advanced with each result as it
+    finishes.
+    """
+    if not isinstance(calls, list) or not calls:
+        return {"error": "calls must be a non-empty list of {tool, arguments} entries"}
+    if len(calls) > max_calls:
+        return {"error": f"Batch has {len(calls)} calls, exceeding the limit of {max_calls}"}
+
+    async def _run_one(index: int, entry: Any) -> dict[str, Any]:
+        tool = entry.get("tool") if isinstance(entry, dict) else None
+        result: dict[str, Any] = {"index": index, "tool": tool, "ok": False, "elapsed_ms": 0.0}
+        if not tool or not isinstance(tool, str):
+            result["error"] = "Missing tool name"
+            return result
+        if tool == BATCH_TOOL_NAME:
+            result["error"] = "Batches cannot be nested"
+            return result
+        arguments = entry.get("arguments") or {}
+        if not isinstance(arguments, dict):
+            result["error"] = "arguments must be an object"
+            return result
+
+        async with limiter:
+            started = time.perf_counter()
+            try:
+                # Handlers resolve arguments in place; keep the caller's entry intact
+                content = await call_tool(tool, dict(arguments))
+            except Exception as exc:
+                logger.warning(f"Batch call {index} ({tool}) failed: {exc}")
+                result["error"] = str(exc) or type(exc).__name__
+            else:
+                text = _content_text(content)
+                if is_error_response(content):
+                    result["error"] = text.strip()
+                else:
+                    result["ok"] = True
+                    result["text"] = text
+            result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    async def _run_and_report(index: int, entry: Any) -> dict[str, Any]:
+        result = await _run_one(index, entry)
+        if progress is not None:
+            status = "finished" if result["ok"] else "failed"
+            await progress.advance(f"Call {index + 1} ({result['tool']}) {status}", {"call": result})
+        return result
+
+    if progress is not None:
+        progress.add_total(len(calls))
+    started = time.perf_counter()
+    results = await gather_cancelling(*(_run_and_report(i, entry) for i, entry in enumerate(calls)))
+    succeeded = sum(1 for r in results if r["ok"])
+    return {
+        "calls": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "results": list(results),
+    }
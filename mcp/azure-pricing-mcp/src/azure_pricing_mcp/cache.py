@@ -0,0 +1,442 @@
+"""Shared cache backends for Azure Pricing MCP Server.
+
+Each server process keeps small in-process caches (pricing query results,
+VM retirement data, Spot eviction rates). With several workers those caches
+are cold per process and every worker repeats the same outbound queries.
+A ``CacheBackend`` is a second level shared by all workers:
+
+- ``memory``: per-process dict (the default for a single process)
+- ``sqlite``: a WAL-mode SQLite file, shared by workers on one host
+- ``redis``: any Redis-compatible server (``redis.asyncio`` client), shared across nodes
+
+Values must be JSON-serializable. ``get_or_fetch`` also shares refresh work:
+the first worker to miss a key takes a short lease and fetches, others wait
+for its result instead of issuing the same query. Only the worker holding a
+lease releases it, and waiters stop waiting as soon as it is released.
+
+Expired entries are swept from the memory and SQLite backends at most every
+``PURGE_INTERVAL_SECONDS`` on writes; the memory backend also drops its
+oldest writes beyond ``AZURE_PRICING_CACHE_MAX_ENTRIES``.
+
+Select the backend with ``AZURE_PRICING_CACHE_BACKEND`` and ``AZURE_PRICING_CACHE_URL``.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from .config import (
+    CACHE_BACKEND,
+    CACHE_LEASE_SECONDS,
+    CACHE_MAX_ENTRIES,
+    CACHE_URL,
+    DEFAULT_SQLITE_CACHE_PATH,
+)
+from .metrics import CACHE_REQUESTS
+from .tracing import set_attribute, span
+
+logger = logging.getLogger(__name__)
+
+CACHE_TOOL_NAME = "server_cache"
+LEASE_PREFIX = "lease:"
+LEASE_POLL_INTERVAL = 0.05
+PURGE_INTERVAL_SECONDS = 60.0
+
+
+def approx_size(value: Any) -> int:
+    """Approximate memory held by *value* in bytes (containers, dataclasses and objects are followed)."""
+    seen: set[int] = set()
+    stack = [value]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, list | tuple | set | frozenset):
+            stack.extend(item)
+        elif hasattr(item, "__dict__") and not isinstance(item, type):
+            stack.append(vars(item))
+    return total
+
+
+def matching_keys(keys: Iterable[str], prefix: str | None = None, key: str | None = None) -> list[str]:
+    """Keys equal to *key* or starting with *prefix*; every key when neither is given."""
+    if key is not None:
+        return [k for k in keys if k == key]
+    return [k for k in keys if k.startswith(prefix or "")]
+
+
+class CacheBackend:
+    """Interface of a shared key/value cache with per-entry TTL (seconds)."""
+
+    name = "base"
+
+    async def get(self, key: str) -> Any | None:
+        """Value stored under *key*, or None when missing or expired."""
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store *value* under *key* for *ttl* seconds."""
+        raise NotImplementedError
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Store *value* only if *key* is not already present; True when stored."""
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        """Remove *key* if present."""
+        raise NotImplementedError
+
+    async def release(self, key: str, token: str) -> None:
+        """Remove *key* only while it still holds *token*, i.e. a lease this worker took with ``add``.
+
+        The default compares and deletes in two steps; backends override it when
+        they can do both at once.
+        """
+        if await self.get(key) == token:
+            await self.delete(key)
+
+    async def purge_expired(self) -> int:
+        """Drop expired entries (lookups already ignore them); returns how many were dropped."""
+        return 0
+
+    async def clear(self, prefix: str = "") -> int:
+        """Remove every entry of this cache (or those whose key starts with *prefix*); returns the count."""
+        raise NotImplementedError
+
+    async def stats(self, oldest: int = 5) -> dict[str, Any]:
+        """Live entry count, stored bytes and the *oldest* entries closest to expiry (when the backend knows)."""
+        return {"backend": self.name, "entries": None, "bytes": None, "oldest": []}
+
+    async def close(self) -> None:
+        """Release connections held by the backend."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process cache; values are kept as-is (no serialization)."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES) -> None:
+        self._entries: dict[str, tuple[Any, float]] = {}
+        self._max_entries = max_entries
+        self._next_purge = time.monotonic() + PURGE_INTERVAL_SECONDS
+
+    def _store(self, key: str, value: Any, ttl: float) -> None:
+        now = time.monotonic()
+        # Re-insert so dict order is write order
+        self._entries.pop(key, None)
+        self._entries[key] = (value, now + ttl)
+        if now >= self._next_purge:
+            self._purge(now)
+        while len(self._entries) > self._max_entries > 0:
+            del self._entries[next(iter(self._entries))]
+
+    def _purge(self, now: float) -> int:
+        expired = [key for key, (_, expires) in self._entries.items() if expires <= now]
+        for key in expired:
+            del self._entries[key]
+        self._next_purge = now + PURGE_INTERVAL_SECONDS
+        return len(expired)
+
+    def _live(self, key: str) -> tuple[Any, float] | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._live(key)
+        return entry[0] if entry is not None else None
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._store(key, value, ttl)
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        if self._live(key) is not None:
+            return False
+        self._store(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def release(self, key: str, token: str) -> None:
+        entry = self._live(key)
+        if entry is not None and entry[0] == token:
+            del self._entries[key]
+
+    async def purge_expired(self) -> int:
+        return self._purge(time.monotonic())
+
+    async def clear(self, prefix: str = "") -> int:
+        keys = [key for key in self._entries if key.startswith(prefix)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    async def stats(self, oldest: int = 5) -> dict[str, Any]:
+        now = time.monotonic()
+        live = sorted((expires, key) for key, (_, expires) in self._entries.items() if expires > now)
+        return {
+            "backend": self.name,
+            "entries": len(live),
+            "bytes": approx_size([self._entries[key][0] for _, key in live]),
+            "oldest": [{"key": key, "expires_in_seconds": round(expires - now, 1)} for expires, key in live[:oldest]],
+        }
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache in a SQLite file (WAL mode) that every process on the host can open.
+
+    Queries run in a worker thread so lock waits never block the event loop.
+    Expiry uses wall-clock time because it is compared across processes.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = DEFAULT_SQLITE_CACHE_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._next_purge = time.monotonic() + PURGE_INTERVAL_SECONDS
+        with self._lock:
+            self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database (again after ``close``); caller holds the lock."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _execute(self, sql: str, params: tuple[Any, ...] = ()) -> tuple[Any, int]:
+        with self._lock:
+            cursor = self._connect().execute(sql, params)
+            return cursor.fetchone(), cursor.rowcount
+
+    async def _run(self, sql: str, params: tuple[Any, ...] = ()) -> tuple[Any, int]:
+        """Run one statement in a thread; returns (first row, affected row count)."""
+        return await asyncio.to_thread(self._execute, sql, params)
+
+    def _fetchall(self, sql: str, params: tuple[Any, ...] = ()) -> list[Any]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    async def get(self, key: str) -> Any | None:
+        row, _ = await self._run("SELECT value FROM cache WHERE key = ? AND expires > ?", (key, time.time()))
+        return json.loads(row[0]) if row else None
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self._run(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, json.dumps(value), time.time() + ttl),
+        )
+        if time.monotonic() >= self._next_purge:
+            await self.purge_expired()
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        now = time.time()
+        # Take over expired entries, keep live ones
+        _, changed = await self._run(
+            "INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires WHERE expires <= ?",
+            (key, json.dumps(value), now + ttl, now),
+        )
+        return changed == 1
+
+    async def delete(self, key: str) -> None:
+        await self._run("DELETE FROM cache WHERE key = ?", (key,))
+
+    async def release(self, key: str, token: str) -> None:
+        await self._run("DELETE FROM cache WHERE key = ? AND value = ?", (key, json.dumps(token)))
+
+    async def clear(self, prefix: str = "") -> int:
+        # substr rather than LIKE: LIKE is case-insensitive and treats % and _ as wildcards
+        _, removed = await self._run("DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+        return removed
+
+    async def stats(self, oldest: int = 5) -> dict[str, Any]:
+        now = time.time()
+        (entries, size), _ = await self._run(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache WHERE expires > ?", (now,)
+        )
+        rows = await asyncio.to_thread(
+            self._fetchall, "SELECT key, expires FROM cache WHERE expires > ? ORDER BY expires LIMIT ?", (now, oldest)
+        )
+        return {
+            "backend": self.name,
+            "entries": entries,
+            "bytes": size,
+            "oldest": [{"key": key, "expires_in_seconds": round(expires - now, 1)} for key, expires in rows],
+        }
+
+    async def purge_expired(self) -> int:
+        self._next_purge = time.monotonic() + PURGE_INTERVAL_SECONDS
+        _, removed = await self._run("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+        return removed
+
+    async def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache on a Redis-compatible server through a ``redis.asyncio``-style client.
+
+    Only ``get``, ``set`` (with ``px``/``nx``), ``delete``, ``scan_iter`` and
+    ``aclose`` are used, so any client exposing those works. Leases are released
+    with the base compare-then-delete; entries expire server-side, so there is
+    nothing to purge.
+    """
+
+    name = "redis"
+
+    def __init__(self, client: Any, prefix: str = "azure-pricing:") -> None:
+        self._client = client
+        self._prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "azure-pricing:") -> "RedisCacheBackend":
+        """Connect to *url* (requires the optional ``redis`` package)."""
+        import redis.asyncio as redis_asyncio
+
+        return cls(redis_asyncio.from_url(url), prefix)
+
+    async def get(self, key: str) -> Any | None:
+        raw = await self._client.get(self._prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self._client.set(self._prefix + key, json.dumps(value), px=max(int(ttl * 1000), 1))
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        return bool(await self._client.set(self._prefix + key, json.dumps(value), px=max(int(ttl * 1000), 1), nx=True))
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self._prefix + key)
+
+    async def _keys(self, prefix: str = "") -> list[Any]:
+        pattern = re.sub(r"([*?\[\]\\])", r"\\\1", self._prefix + prefix) + "*"
+        return [key async for key in self._client.scan_iter(match=pattern)]
+
+    async def clear(self, prefix: str = "") -> int:
+        keys = await self._keys(prefix)
+        if keys:
+            await self._client.delete(*keys)
+        return len(keys)
+
+    async def stats(self, oldest: int = 5) -> dict[str, Any]:
+        # Sizes and TTLs would cost a round trip per key; only keys are counted
+        return {"backend": self.name, "entries": len(await self._keys()), "bytes": None, "oldest": []}
+
+    async def close(self) -> None:
+        close = getattr(self._client, "aclose", None) or getattr(self._client, "close", None)
+        if close is not None:
+            await close()
+
+
+def create_cache_backend(backend: str = CACHE_BACKEND, url: str = CACHE_URL) -> CacheBackend:
+    """Create the configured backend, falling back to ``memory`` when it cannot be opened."""
+    backend = backend.lower()
+    path = url or DEFAULT_SQLITE_CACHE_PATH
+    try:
+        if backend == "sqlite":
+            return SQLiteCacheBackend(path)
+        if backend == "redis":
+            return RedisCacheBackend.from_url(url or "redis://localhost:6379/0")
+    except ImportError:
+        logger.warning("Redis cache backend requires the 'redis' package; using the in-process cache")
+        return MemoryCacheBackend()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not open SQLite cache at {path}: {e}; using the in-process cache")
+        return MemoryCacheBackend()
+    if backend != "memory":
+        logger.warning(f"Unknown cache backend '{backend}'; using the in-process cache")
+    return MemoryCacheBackend()
+
+
+async def get_or_fetch(
+    cache: CacheBackend,
+    key: str,
+    ttl: float,
+    fetch: Callable[[], Awaitable[Any]],
+    lease_seconds: float = CACHE_LEASE_SECONDS,
+) -> Any:
+    """Return the cached value of *key* or fetch and store it, fetching once across workers.
+
+    A worker that misses takes a lease on the key before fetching. Workers that
+    find the lease taken poll for the result until the lease is released or
+    expires, then fetch themselves. Cache errors never fail the call; the value
+    is fetched directly.
+    """
+    with span("shared_cache", backend=cache.name):
+        return await _get_or_fetch(cache, key, ttl, fetch, lease_seconds)
+
+
+async def _get_or_fetch(
+    cache: CacheBackend, key: str, ttl: float, fetch: Callable[[], Awaitable[Any]], lease_seconds: float
+) -> Any:
+    label = f"shared_{cache.name}"
+    try:
+        cached = await cache.get(key)
+        CACHE_REQUESTS.inc(label, "miss" if cached is None else "hit")
+        set_attribute("cache_hit", cached is not None)
+        if cached is not None:
+            return cached
+        lease_key = LEASE_PREFIX + key
+        token: str | None = uuid.uuid4().hex
+        if not await cache.add(lease_key, token, lease_seconds):
+            token = None
+            set_attribute("lease_wait", True)
+            deadline = time.monotonic() + lease_seconds
+            while time.monotonic() < deadline:
+                await asyncio.sleep(LEASE_POLL_INTERVAL)
+                cached = await cache.get(key)
+                if cached is not None:
+                    set_attribute("cache_hit", True)
+                    return cached
+                # Released without a value: the holder failed or got an error response
+                if await cache.get(lease_key) is None:
+                    break
+    except Exception as e:
+        logger.warning(f"Shared cache lookup for {key} failed: {e}")
+        CACHE_REQUESTS.inc(label, "error")
+        return await fetch()
+
+    try:
+        value = await fetch()
+        # Error responses are returned but not shared
+        if value is not None and not (isinstance(value, dict) and "error" in value):
+            try:
+                await cache.set(key, value, ttl)
+            except Exception as e:
+                logger.warning(f"Could not store {key} in the shared cache: {e}")
+        return value
+    finally:
+        if token is not None:
+            try:
+                await cache.release(lease_key, token)
+            except Exception as e:
+                logger.warning(f"Could not release cache lease for {key}: {e}")
@@ -0,0 +1,46 @@
+"""Cooperative cancellation helpers for Azure Pricing MCP Server.
+
+The MCP SDK cancels a tool call's handler task when the client sends
+``notifications/cancelled`` or the transport (stdio, SSE) goes away. The
+cancellation only reaches the HTTP requests behind a fan-out if every
+sub-task is cancelled with it: ``asyncio.gather`` leaves the remaining
+awaitables running when one of them fails, and with
+``return_exceptions=True`` hands back a cancelled sub-task's
+``CancelledError`` as a result. ``gather_cancelling`` closes both gaps so
+an abandoned call stops issuing requests and releases its connections.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+async def gather_cancelling(*aws: Awaitable[Any], return_exceptions: bool = False) -> list[Any]:
+    """Like ``asyncio.gather``, but never leaves sub-tasks running behind it.
+
+    - When the caller is cancelled, every sub-task is cancelled and awaited
+      (so ``async with session.get(...)`` blocks release their connections)
+      before ``CancelledError`` propagates.
+    - When a sub-task raises (and ``return_exceptions`` is False), the
+      remaining sub-tasks are cancelled and awaited before the error
+      propagates.
+    - When a sub-task is cancelled on its own, the whole gather is treated
+      as cancelled, even with ``return_exceptions=True``.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        results = await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        if pending:
+            logger.debug(f"Cancelling {len(pending)} outstanding sub-task(s)")
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+    for result in results:
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+    return results
@@ -4,7 +4,9 @@ import asyncio
 import logging
 import random
 import ssl
+import time
 from typing import Any
+from urllib.parse import urlsplit
 
 import aiohttp
 
@@ -14,15 +16,25 @@ from .config import (
     HTTP_POOL_PER_HOST,
     HTTP_POOL_SIZE,
     HTTP_REQUEST_TIMEOUT,
+    MAX_PAGES_PER_QUERY,
     MAX_RESULTS_PER_REQUEST,
     MAX_RETRIES,
+    PREWARM_CONNECTIONS,
     RATE_LIMIT_RETRY_BASE_WAIT,
     SSL_VERIFY,
 )
+from .metrics import UPSTREAM_DURATION, UPSTREAM_REQUESTS, UPSTREAM_RETRIES
+from .tracing import span
 
 logger = logging.getLogger(__name__)
 
 
+def _content_length(response: Any) -> int | None:
+    """Body size from the Content-Length header (None when the body was chunked)."""
+    length = getattr(response, "content_length", None)
+    return length if isinstance(length, int) else None
+
+
 class AzurePricingClient:
     """HTTP client for Azure Pricing API with retry logic."""
 
@@ -76,56 +88,100 @@ class AzurePricingClient:
             raise RuntimeError("HTTP session not initialized. Use 'async with' context manager.")
 
         request_url = url or self._base_url
+        host = urlsplit(request_url).hostname or "unknown"
         last_exception = None
 
-        for attempt in range(max_retries + 1):
-            try:
-                async with self.session.get(
-                    request_url, params=params, timeout=aiohttp.ClientTimeout(total=HTTP_REQUEST_TIMEOUT)
-                ) as response:
-                    if response.status == 429:  # Too Many Requests
-                        if attempt < max_retries:
-                            retry_after = response.headers.get("Retry-After")
-                            if retry_after:
-                                wait_time = float(retry_after)
+        with span("http.request", host=host, method="GET") as request_span:
+            for attempt in range(max_retries + 1):
+                started = time.perf_counter()
+                status = "error"
+                if request_span is not None:
+                    request_span.set("attempts", attempt + 1)
+                try:
+                    async with self.session.get(
+                        request_url, params=params, timeout=aiohttp.ClientTimeout(total=HTTP_REQUEST_TIMEOUT)
+                    ) as response:
+                        status = str(response.status)
+                        if request_span is not None:
+                            request_span.set("status", status)
+                        if response.status == 429:  # Too Many Requests
+                            if attempt < max_retries:
+                                UPSTREAM_RETRIES.inc(host, "429")
+                                retry_after = response.headers.get("Retry-After")
+                                if retry_after:
+                                    wait_time = float(retry_after)
+                                else:
+                                    wait_time = RATE_LIMIT_RETRY_BASE_WAIT * (2 ** attempt) + random.uniform(0, 1)
+                                logger.warning(
+                                    f"Rate limited (429). Retrying in {wait_time:.1f}s "
+                                    f"(attempt {attempt + 1}/{max_retries + 1})"
+                                )
+                                await asyncio.sleep(wait_time)
+                                continue
                             else:
-                                wait_time = RATE_LIMIT_RETRY_BASE_WAIT * (2 ** attempt) + random.uniform(0, 1)
-                            logger.warning(
-                                f"Rate limited (429). Retrying in {wait_time:.1f}s "
-                                f"(attempt {attempt + 1}/{max_retries + 1})"
-                            )
-                            await asyncio.sleep(wait_time)
-                            continue
-                        else:
-                            response.raise_for_status()
-
-                    response.raise_for_status()
-                    json_data: dict[str, Any] = await response.json()
-                    return json_data
-
-            except aiohttp.ClientResponseError as e:
-                if e.status == 429 and attempt < max_retries:
-                    wait_time = RATE_LIMIT_RETRY_BASE_WAIT * (2 ** attempt) + random.uniform(0, 1)
-                    logger.warning(
-                        f"Rate limited (429). Retrying in {wait_time:.1f}s "
-                        f"(attempt {attempt + 1}/{max_retries + 1})"
-                    )
-                    await asyncio.sleep(wait_time)
-                    last_exception = e
-                    continue
-                else:
+                                response.raise_for_status()
+
+                        response.raise_for_status()
+                        json_data: dict[str, Any] = await response.json()
+                        if request_span is not None:
+                            request_span.set("bytes", _content_length(response))
+                        return json_data
+
+                except aiohttp.ClientResponseError as e:
+                    if e.status == 429 and attempt < max_retries:
+                        UPSTREAM_RETRIES.inc(host, "429")
+                        wait_time = RATE_LIMIT_RETRY_BASE_WAIT * (2 ** attempt) + random.uniform(0, 1)
+                        logger.warning(
+                            f"Rate limited (429). Retrying in {wait_time:.1f}s "
+                            f"(attempt {attempt + 1}/{max_retries + 1})"
+                        )
+                        await asyncio.sleep(wait_time)
+                        last_exception = e
+                        continue
+                    else:
+                        logger.error(f"HTTP request failed: {e}")
+                        raise
+                except aiohttp.ClientError as e:
                     logger.error(f"HTTP request failed: {e}")
                     raise
-            except aiohttp.ClientError as e:
-                logger.error(f"HTTP request failed: {e}")
-                raise
-            except Exception as e:
-                logger.error(f"Unexpected error during request: {e}")
-                raise
+                except Exception as e:
+                    logger.error(f"Unexpected error during request: {e}")
+                    raise
+                finally:
+                    UPSTREAM_REQUESTS.inc(host, status)
+                    UPSTREAM_DURATION.observe(host, value=time.perf_counter() - started)
+
+            if last_exception:
+                raise last_exception
+            raise RuntimeError("Request failed without exception")
+
+    async def prewarm(self, connections: int = PREWARM_CONNECTIONS) -> int:
+        """Open pooled connections to the pricing API ahead of the first tool call.
 
-        if last_exception:
-            raise last_exception
-        raise RuntimeError("Request failed without exception")
+        Issues ``connections`` concurrent one-item queries (capped at the
+        per-host pool size) so DNS, TCP and TLS setup is done and the
+        keep-alive connections stay in the pool. Failures are logged, not raised.
+
+        Returns:
+            Number of warm-up queries that succeeded
+        """
+        count = min(connections, HTTP_POOL_PER_HOST)
+        if count <= 0 or not self.session:
+            return 0
+        params = {
+            "api-version": self._api_version,
+            "$filter": "serviceName eq 'Virtual Machines'",
+            "$top": "1",
+        }
+        results = await asyncio.gather(
+            *(self.make_request(params=params, max_retries=0) for _ in range(count)), return_exceptions=True
+        )
+        warmed = sum(1 for result in results if not isinstance(result, BaseException))
+        if warmed < count:
+            logger.warning(f"Pre-warmed {warmed}/{count} pricing API connections")
+        else:
+            logger.info(f"Pre-warmed {warmed} pricing API connections")
+        return warmed
 
     async def fetch_prices(
         self,
@@ -156,6 +212,41 @@ class AzurePricingClient:
 
         return await self.make_request(params=params)
 
+    async def fetch_all_prices(
+        self,
+        filter_conditions: list[str] | None = None,
+        currency_code: str = "USD",
+        limit: int | None = None,
+        max_pages: int = MAX_PAGES_PER_QUERY,
+    ) -> dict[str, Any]:
+        """Fetch prices following NextPageLink until exhausted or a limit is hit.
+
+        Args:
+            filter_conditions: List of OData filter conditions
+            currency_code: Currency code for prices
+            limit: Maximum number of items to collect (None for all pages)
+            max_pages: Maximum number of pages to request
+
+        Returns:
+            API response shape with the combined Items; NextPageLink is set
+            only if more results remain beyond the collected pages.
+        """
+        data = await self.fetch_prices(filter_conditions=filter_conditions, currency_code=currency_code, limit=limit)
+        items: list[dict[str, Any]] = list(data.get("Items", []))
+        next_link = data.get("NextPageLink")
+        pages = 1
+
+        while next_link and pages < max_pages and (limit is None or len(items) < limit):
+            page = await self.make_request(url=next_link)
+            items.extend(page.get("Items", []))
+            next_link = page.get("NextPageLink")
+            pages += 1
+
+        if limit is not None and len(items) > limit:
+            items = items[:limit]
+
+        return {"Items": items, "Count": len(items), "NextPageLink": next_link, "Pages": pages}
+
     async def fetch_text(self, url: str, timeout: float = 10.0) -> str:
         """Fetch text content from a URL.
 
@@ -169,11 +260,24 @@ class AzurePricingClient:
         if not self.session:
             raise RuntimeError("HTTP session not initialized. Use 'async with' context manager.")
 
-        try:
-            async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
-                if response.status == 200:
-                    return await response.text()
+        host = urlsplit(url).hostname or "unknown"
+        started = time.perf_counter()
+        status = "error"
+        with span("http.request", host=host, method="GET", attempts=1) as request_span:
+            try:
+                async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    status = str(response.status)
+                    if response.status == 200:
+                        text = await response.text()
+                        if request_span is not None:
+                            request_span.set("bytes", len(text.encode()))
+                        return text
+                    return ""
+            except Exception as e:
+                logger.warning(f"Failed to fetch {url}: {e}")
                 return ""
-        except Exception as e:
-            logger.warning(f"Failed to fetch {url}: {e}")
-            return ""
+            finally:
+                UPSTREAM_REQUESTS.inc(host, status)
+                UPSTREAM_DURATION.observe(host, value=time.perf_counter() - started)
+                if request_span is not None:
+                    request_span.set("status", status)
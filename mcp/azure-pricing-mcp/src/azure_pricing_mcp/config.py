@@ -1,6 +1,7 @@
 """Configuration constants for Azure Pricing MCP Server."""
 
 import os
+import tempfile
 from datetime import timedelta
 
 # Azure Retail Prices API configuration
@@ -18,6 +19,115 @@ HTTP_REQUEST_TIMEOUT = float(os.environ.get("AZURE_PRICING_HTTP_TIMEOUT", "30.0"
 HTTP_POOL_SIZE = int(os.environ.get("AZURE_PRICING_HTTP_POOL_SIZE", "10"))
 HTTP_POOL_PER_HOST = int(os.environ.get("AZURE_PRICING_HTTP_POOL_PER_HOST", "5"))
 REQUEST_DEDUP_TTL = float(os.environ.get("AZURE_PRICING_DEDUP_TTL", "30.0"))
+# Connection pre-warming at startup, in the background (readiness does not wait for it): pooled connections
+# opened to the pricing API with a cheap query, plus a retirement data prefetch (AZURE_PRICING_PREWARM=false disables)
+PREWARM_ENABLED = os.environ.get("AZURE_PRICING_PREWARM", "true").lower() != "false"
+PREWARM_CONNECTIONS = int(os.environ.get("AZURE_PRICING_PREWARM_CONNECTIONS", "2"))
+# Streamable HTTP transport: stateless mode (any worker serves any request), JSON instead of SSE
+# responses, and uvicorn worker processes. Workers read these too, so they share the parent's settings.
+HTTP_STATELESS = os.environ.get("AZURE_PRICING_HTTP_STATELESS", "true").lower() != "false"
+HTTP_JSON_RESPONSE = os.environ.get("AZURE_PRICING_HTTP_JSON_RESPONSE", "false").lower() == "true"
+HTTP_WORKERS = int(os.environ.get("AZURE_PRICING_HTTP_WORKERS", "1"))
+# Shared cache backend (see cache.py): memory (per process), sqlite (workers on one host) or redis
+# (across nodes). CACHE_URL is the SQLite file path or Redis URL. A worker that misses a key holds a
+# lease for CACHE_LEASE_SECONDS while fetching; other workers wait for its result meanwhile.
+# The memory backend keeps at most CACHE_MAX_ENTRIES entries (0 = unbounded).
+CACHE_BACKEND = os.environ.get("AZURE_PRICING_CACHE_BACKEND", "memory")
+CACHE_URL = os.environ.get("AZURE_PRICING_CACHE_URL", "")
+CACHE_LEASE_SECONDS = float(os.environ.get("AZURE_PRICING_CACHE_LEASE", "10"))
+CACHE_MAX_ENTRIES = int(os.environ.get("AZURE_PRICING_CACHE_MAX_ENTRIES", "10000"))
+DEFAULT_SQLITE_CACHE_PATH = os.path.join(tempfile.gettempdir(), "azure-pricing-mcp-cache.sqlite3")
+# Tool-level result cache: seconds a formatted tool response is reused for identical arguments (0 disables)
+TOOL_CACHE_TTL = float(os.environ.get("AZURE_PRICING_TOOL_CACHE_TTL", "300"))
+TOOL_CACHE_MAX_ENTRIES = int(os.environ.get("AZURE_PRICING_TOOL_CACHE_MAX_ENTRIES", "1000"))
+# Predictive warm-up (see warmup.py): tool calls are logged as normalized query keys with counts (no caller
+# details) in a file private to the user (under XDG_CACHE_HOME or ~/.cache); at startup and every
+# WARMUP_INTERVAL seconds the WARMUP_TOP_K most frequent queries are re-run into the tool result cache.
+# AZURE_PRICING_WARMUP=false disables it.
+WARMUP_ENABLED = os.environ.get("AZURE_PRICING_WARMUP", "true").lower() != "false"
+WARMUP_LOG_PATH = os.environ.get(
+    "AZURE_PRICING_WARMUP_LOG",
+    os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+        "azure-pricing-mcp",
+        "queries.json",
+    ),
+)
+WARMUP_TOP_K = int(os.environ.get("AZURE_PRICING_WARMUP_TOP_K", "20"))
+WARMUP_INTERVAL = float(os.environ.get("AZURE_PRICING_WARMUP_INTERVAL", "240"))
+WARMUP_MAX_QUERIES = int(os.environ.get("AZURE_PRICING_WARMUP_MAX_QUERIES", "500"))
+# Tracing (see tracing.py): spans of each tool call (dispatch queueing, handler, service lookups, HTTP
+# attempts) appended as JSON lines to TRACE_FILE (empty disables). Only calls slower than TRACE_SLOW_MS are kept.
+TRACE_FILE = os.environ.get("AZURE_PRICING_TRACE_FILE", "")
+TRACE_SLOW_MS = float(os.environ.get("AZURE_PRICING_TRACE_SLOW_MS", "0"))
+TRACE_MAX_SPANS = int(os.environ.get("AZURE_PRICING_TRACE_MAX_SPANS", "2000"))
+# On-demand profiling (see profiling.py): a PROFILE_SAMPLE_RATE fraction of tool calls (or, with PROFILE_TOOL,
+# calls of that tool only) run under cProfile; profiles are saved to PROFILE_DIR, keeping the newest PROFILE_MAX_FILES.
+# Both can also be changed at runtime with the server_profiling admin tool.
+PROFILE_SAMPLE_RATE = float(os.environ.get("AZURE_PRICING_PROFILE_SAMPLE_RATE", "0"))
+PROFILE_TOOL = os.environ.get("AZURE_PRICING_PROFILE_TOOL", "")
+PROFILE_DIR = os.environ.get(
+    "AZURE_PRICING_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "azure-pricing-mcp-profiles")
+)
+PROFILE_MAX_FILES = int(os.environ.get("AZURE_PRICING_PROFILE_MAX_FILES", "50"))
+# Admin tools that change server state: "full" (inspect and change), "read" (inspect only) or "off" (not offered).
+# ADMIN_TOOLS applies to all of them; the per-tool settings override it for server_cache (flush and prewarm)
+# and server_profiling (changing the profiled tool or sample rate).
+ADMIN_TOOLS = os.environ.get("AZURE_PRICING_ADMIN_TOOLS", "read").lower()
+CACHE_ADMIN = os.environ.get("AZURE_PRICING_CACHE_ADMIN", ADMIN_TOOLS).lower()
+PROFILING_ADMIN = os.environ.get("AZURE_PRICING_PROFILING_ADMIN", ADMIN_TOOLS).lower()
+# Queries accepted by one server_cache prewarm request
+CACHE_PREWARM_MAX_QUERIES = int(os.environ.get("AZURE_PRICING_CACHE_PREWARM_MAX_QUERIES", "50"))
+# Graceful shutdown: new tool calls are refused with a retryable error while in-flight calls get up to
+# SHUTDOWN_DRAIN_SECONDS to finish; calls still running then are cancelled before the HTTP session closes
+SHUTDOWN_DRAIN_SECONDS = float(os.environ.get("AZURE_PRICING_SHUTDOWN_DRAIN_SECONDS", "25"))
+# Batch meta-tool: calls run at once across all batches, and calls allowed per batch
+BATCH_CONCURRENCY = int(os.environ.get("AZURE_PRICING_BATCH_CONCURRENCY", "8"))
+BATCH_MAX_CALLS = int(os.environ.get("AZURE_PRICING_BATCH_MAX_CALLS", "50"))
+# Dispatcher admission control per priority class (see dispatch.py): concurrent calls per tool,
+# calls allowed to wait for a slot before new ones are rejected, and deadline in seconds (0 disables)
+DISPATCH_INTERACTIVE_CONCURRENCY = int(os.environ.get("AZURE_PRICING_DISPATCH_INTERACTIVE_CONCURRENCY", "32"))
+DISPATCH_INTERACTIVE_QUEUE = int(os.environ.get("AZURE_PRICING_DISPATCH_INTERACTIVE_QUEUE", "64"))
+DISPATCH_INTERACTIVE_TIMEOUT = float(os.environ.get("AZURE_PRICING_DISPATCH_INTERACTIVE_TIMEOUT", "60"))
+DISPATCH_STANDARD_CONCURRENCY = int(os.environ.get("AZURE_PRICING_DISPATCH_STANDARD_CONCURRENCY", "8"))
+DISPATCH_STANDARD_QUEUE = int(os.environ.get("AZURE_PRICING_DISPATCH_STANDARD_QUEUE", "16"))
+DISPATCH_STANDARD_TIMEOUT = float(os.environ.get("AZURE_PRICING_DISPATCH_STANDARD_TIMEOUT", "120"))
+DISPATCH_HEAVY_CONCURRENCY = int(os.environ.get("AZURE_PRICING_DISPATCH_HEAVY_CONCURRENCY", "2"))
+DISPATCH_HEAVY_QUEUE = int(os.environ.get("AZURE_PRICING_DISPATCH_HEAVY_QUEUE", "4"))
+DISPATCH_HEAVY_TIMEOUT = float(os.environ.get("AZURE_PRICING_DISPATCH_HEAVY_TIMEOUT", "300"))
+# Heavy tools combined (bulk estimates, matrices, orphaned scans), so they cannot take every HTTP connection
+DISPATCH_HEAVY_TOTAL_CONCURRENCY = int(os.environ.get("AZURE_PRICING_DISPATCH_HEAVY_TOTAL", "3"))
+# Maximum pages followed via NextPageLink for paginated queries (1000 items per page)
+MAX_PAGES_PER_QUERY = int(os.environ.get("AZURE_PRICING_MAX_PAGES", "10"))
+# Maximum number of grid points returned by a cost-estimate sweep
+SWEEP_MAX_GRID_POINTS = int(os.environ.get("AZURE_PRICING_SWEEP_MAX_POINTS", "5000"))
+# Number of SKUs combined into one OData query when building cost matrices
+COST_MATRIX_SKUS_PER_QUERY = int(os.environ.get("AZURE_PRICING_MATRIX_SKUS_PER_QUERY", "5"))
+
+# VM price-performance configuration
+# Optional JSON file with VM specs (rows or `az vm list-skus` output) overriding the embedded table
+VM_SPECS_PATH = os.environ.get("AZURE_PRICING_VM_SPECS_PATH", "")
+# Seconds a region's joined VM price/spec table is reused
+VM_PRICE_TABLE_TTL = float(os.environ.get("AZURE_PRICING_VM_TABLE_TTL", "3600"))
+# Pages fetched when building a region's VM price table (1000 items per page)
+VM_PRICE_TABLE_MAX_PAGES = int(os.environ.get("AZURE_PRICING_VM_TABLE_MAX_PAGES", "50"))
+
+# Cross-region price anomaly detection
+# A region is an outlier when its price is this many times the SKU median (or below median / ratio)
+ANOMALY_OUTLIER_RATIO = float(os.environ.get("AZURE_PRICING_ANOMALY_RATIO", "1.3"))
+# Spot discounts this many percentage points away from the SKU's median spot discount are flagged
+ANOMALY_SPOT_DEVIATION = float(os.environ.get("AZURE_PRICING_ANOMALY_SPOT_DEVIATION", "20.0"))
+# SKUs priced in fewer regions than this are not analysed
+ANOMALY_MIN_REGIONS = int(os.environ.get("AZURE_PRICING_ANOMALY_MIN_REGIONS", "3"))
+# Pages fetched per service for live scans (1000 items per page)
+ANOMALY_MAX_PAGES = int(os.environ.get("AZURE_PRICING_ANOMALY_MAX_PAGES", "200"))
+
+# Customer price sheet configuration
+# Path to a CSV or JSON file with per-meter / per-SKU / per-service negotiated rates.
+# When unset, the static DEFAULT_CUSTOMER_DISCOUNT is used.
+PRICE_SHEET_PATH = os.environ.get("AZURE_PRICING_PRICE_SHEET", "")
+# Minimum seconds between file modification checks (hot reload)
+PRICE_SHEET_RELOAD_INTERVAL = float(os.environ.get("AZURE_PRICING_PRICE_SHEET_RELOAD_INTERVAL", "5.0"))
 
 # SSL verification configuration
 # Set to False if behind a corporate proxy with self-signed certificates
@@ -1,17 +1,29 @@
-"""Databricks DBU pricing package for Azure Pricing MCP Server."""
+"""Databricks DBU pricing package for Azure Pricing MCP Server.
 
-from .formatters import (
-    format_databricks_compare_workloads_response,
-    format_databricks_cost_estimate_response,
-    format_databricks_dbu_pricing_response,
-)
-from .handlers import DatabricksHandlers
-from .tools import get_databricks_tool_definitions
+Submodules are imported on first access (see ``azure_pricing_mcp.lazy``).
+"""
 
-__all__ = [
-    "DatabricksHandlers",
-    "format_databricks_compare_workloads_response",
-    "format_databricks_cost_estimate_response",
-    "format_databricks_dbu_pricing_response",
-    "get_databricks_tool_definitions",
-]
+from typing import TYPE_CHECKING
+
+from ..lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .formatters import (
+        format_databricks_compare_workloads_response,
+        format_databricks_cost_estimate_response,
+        format_databricks_dbu_pricing_response,
+    )
+    from .handlers import DatabricksHandlers
+    from .tools import get_databricks_tool_definitions
+
+_EXPORTS: dict[str, str] = {
+    "DatabricksHandlers": ".handlers",
+    "format_databricks_compare_workloads_response": ".formatters",
+    "format_databricks_cost_estimate_response": ".formatters",
+    "format_databricks_dbu_pricing_response": ".formatters",
+    "get_databricks_tool_definitions": ".tools",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
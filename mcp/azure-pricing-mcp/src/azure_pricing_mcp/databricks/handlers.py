@@ -5,6 +5,7 @@ from typing import Any
 from mcp.types import TextContent
 
 from ..services.databricks import DatabricksService
+from ..tool_cache import text_response
 from .formatters import (
     format_databricks_compare_workloads_response,
     format_databricks_cost_estimate_response,
@@ -41,7 +42,7 @@ class DatabricksHandlers:
             currency_code=arguments.get("currency_code", "USD"),
         )
         text = format_databricks_dbu_pricing_response(result)
-        return [TextContent(type="text", text=text)]
+        return text_response(text, result)
 
     async def handle_databricks_cost_estimate(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle databricks_cost_estimate tool calls."""
@@ -58,7 +59,7 @@ class DatabricksHandlers:
             discount_percentage=arguments.get("discount_percentage", 0.0),
         )
         text = format_databricks_cost_estimate_response(result)
-        return [TextContent(type="text", text=text)]
+        return text_response(text, result)
 
     async def handle_databricks_compare_workloads(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle databricks_compare_workloads tool calls."""
@@ -72,4 +73,4 @@ class DatabricksHandlers:
             hours_per_month=arguments.get("hours_per_month"),
         )
         text = format_databricks_compare_workloads_response(result)
-        return [TextContent(type="text", text=text)]
+        return text_response(text, result)
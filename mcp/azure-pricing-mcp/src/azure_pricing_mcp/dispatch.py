@@ -0,0 +1,215 @@
+"""Tool dispatch with per-tool admission control for Azure Pricing MCP Server.
+
+Tool calls are routed through a dispatch table (tool name -> ``ToolHandlers``
+method and priority class). Each tool gets a ``ToolPolicy``:
+
+- Concurrency cap: calls of that tool running at once
+- Queue limit: calls allowed to wait for a slot; beyond it new calls are
+  rejected immediately with an error instead of piling up
+- Deadline: a call (including its time in the queue) is cancelled and
+  answered with an error once it runs longer than this
+- Priority class: ``interactive`` (single price lookups), ``standard`` or
+  ``heavy`` (fan-outs over many queries). Heavy tools also share one
+  class-wide cap, so a burst of bulk estimates or orphaned-resource scans
+  cannot use up the HTTP connections that cheap lookups need
+
+Class defaults come from the ``AZURE_PRICING_DISPATCH_*`` settings.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from .config import (
+    DISPATCH_HEAVY_CONCURRENCY,
+    DISPATCH_HEAVY_QUEUE,
+    DISPATCH_HEAVY_TIMEOUT,
+    DISPATCH_HEAVY_TOTAL_CONCURRENCY,
+    DISPATCH_INTERACTIVE_CONCURRENCY,
+    DISPATCH_INTERACTIVE_QUEUE,
+    DISPATCH_INTERACTIVE_TIMEOUT,
+    DISPATCH_STANDARD_CONCURRENCY,
+    DISPATCH_STANDARD_QUEUE,
+    DISPATCH_STANDARD_TIMEOUT,
+)
+from .tool_cache import error_response
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_STANDARD = "standard"
+PRIORITY_HEAVY = "heavy"
+
+
+@dataclass(frozen=True)
+class ToolPolicy:
+    """Admission-control settings for one tool (``timeout`` of None or 0 means no deadline)."""
+
+    priority: str = PRIORITY_INTERACTIVE
+    max_concurrency: int = DISPATCH_INTERACTIVE_CONCURRENCY
+    max_queue: int = DISPATCH_INTERACTIVE_QUEUE
+    timeout: float | None = DISPATCH_INTERACTIVE_TIMEOUT
+
+
+PRIORITY_POLICIES: dict[str, ToolPolicy] = {
+    PRIORITY_INTERACTIVE: ToolPolicy(
+        PRIORITY_INTERACTIVE, DISPATCH_INTERACTIVE_CONCURRENCY, DISPATCH_INTERACTIVE_QUEUE, DISPATCH_INTERACTIVE_TIMEOUT
+    ),
+    PRIORITY_STANDARD: ToolPolicy(
+        PRIORITY_STANDARD, DISPATCH_STANDARD_CONCURRENCY, DISPATCH_STANDARD_QUEUE, DISPATCH_STANDARD_TIMEOUT
+    ),
+    PRIORITY_HEAVY: ToolPolicy(
+        PRIORITY_HEAVY, DISPATCH_HEAVY_CONCURRENCY, DISPATCH_HEAVY_QUEUE, DISPATCH_HEAVY_TIMEOUT
+    ),
+}
+
+# Calls of all tools in a class running at once (classes not listed are only capped per tool)
+PRIORITY_CLASS_LIMITS: dict[str, int] = {PRIORITY_HEAVY: DISPATCH_HEAVY_TOTAL_CONCURRENCY}
+
+# Tool name -> (ToolHandlers method, priority class)
+TOOL_ROUTES: dict[str, tuple[str, str]] = {
+    "azure_price_search": ("handle_price_search", PRIORITY_INTERACTIVE),
+    "azure_price_compare": ("handle_price_compare", PRIORITY_INTERACTIVE),
+    "azure_cost_estimate": ("handle_cost_estimate", PRIORITY_INTERACTIVE),
+    "azure_discover_skus": ("handle_discover_skus", PRIORITY_INTERACTIVE),
+    "azure_sku_discovery": ("handle_sku_discovery", PRIORITY_INTERACTIVE),
+    "azure_region_recommend": ("handle_region_recommend", PRIORITY_STANDARD),
+    "azure_ri_pricing": ("handle_ri_pricing", PRIORITY_INTERACTIVE),
+    "get_customer_discount": ("handle_customer_discount", PRIORITY_INTERACTIVE),
+    "spot_eviction_rates": ("handle_spot_eviction_rates", PRIORITY_STANDARD),
+    "spot_price_history": ("handle_spot_price_history", PRIORITY_STANDARD),
+    "simulate_eviction": ("handle_simulate_eviction", PRIORITY_STANDARD),
+    "find_orphaned_resources": ("handle_find_orphaned_resources", PRIORITY_HEAVY),
+    "databricks_dbu_pricing": ("handle_databricks_dbu_pricing", PRIORITY_INTERACTIVE),
+    "databricks_cost_estimate": ("handle_databricks_cost_estimate", PRIORITY_INTERACTIVE),
+    "databricks_compare_workloads": ("handle_databricks_compare_workloads", PRIORITY_STANDARD),
+    "azure_ptu_sizing": ("handle_ptu_sizing", PRIORITY_INTERACTIVE),
+    "azure_bulk_estimate": ("handle_bulk_estimate", PRIORITY_HEAVY),
+    "azure_cost_matrix": ("handle_cost_matrix", PRIORITY_HEAVY),
+    "azure_bom_region_optimizer": ("handle_bom_region", PRIORITY_HEAVY),
+    "azure_vm_price_performance": ("handle_vm_price_performance", PRIORITY_STANDARD),
+    "azure_coverage_optimizer": ("handle_coverage_optimizer", PRIORITY_STANDARD),
+    "azure_tco_projection": ("handle_tco_projection", PRIORITY_STANDARD),
+    "github_pricing": ("handle_github_pricing", PRIORITY_INTERACTIVE),
+    "github_cost_estimate": ("handle_github_cost_estimate", PRIORITY_INTERACTIVE),
+}
+
+
+class _ToolGate:
+    """Concurrency slots and counters for one tool."""
+
+    def __init__(self, policy: ToolPolicy) -> None:
+        self.policy = policy
+        self.slots = asyncio.Semaphore(max(policy.max_concurrency, 1))
+        self.running = 0
+        self.queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+
+class ToolDispatcher:
+    """Route tool calls to ``ToolHandlers`` methods under per-tool admission control."""
+
+    def __init__(
+        self,
+        policies: dict[str, ToolPolicy] | None = None,
+        class_limits: dict[str, int] | None = None,
+    ) -> None:
+        """
+        Args:
+            policies: Per-tool policy overrides; other tools use their priority class defaults.
+            class_limits: Concurrent calls per priority class (default ``PRIORITY_CLASS_LIMITS``).
+        """
+        self._policies = dict(policies or {})
+        limits = PRIORITY_CLASS_LIMITS if class_limits is None else class_limits
+        self._class_slots = {priority: asyncio.Semaphore(limit) for priority, limit in limits.items() if limit > 0}
+        self._gates: dict[str, _ToolGate] = {}
+
+    def policy(self, name: str) -> ToolPolicy:
+        """Effective policy of a tool."""
+        if name in self._policies:
+            return self._policies[name]
+        priority = TOOL_ROUTES[name][1] if name in TOOL_ROUTES else PRIORITY_STANDARD
+        return PRIORITY_POLICIES[priority]
+
+    def _gate(self, name: str) -> _ToolGate:
+        gate = self._gates.get(name)
+        if gate is None:
+            gate = self._gates[name] = _ToolGate(self.policy(name))
+        return gate
+
+    async def dispatch(self, handlers: Any, name: str, arguments: dict[str, Any]) -> Any:
+        """Run a tool call on *handlers*, or reject it when the tool's queue is full."""
+        route = TOOL_ROUTES.get(name)
+        if route is None:
+            return error_response(f"Unknown tool: {name}")
+
+        gate = self._gate(name)
+        policy = gate.policy
+        class_slots = self._class_slots.get(policy.priority)
+        must_wait = gate.slots.locked() or (class_slots is not None and class_slots.locked())
+        if must_wait and gate.queued >= policy.max_queue:
+            gate.rejected += 1
+            logger.warning(f"Rejected {name}: {gate.running} running, {gate.queued} queued")
+            return error_response(
+                f"Error: {name} is at capacity ({gate.running} running, {gate.queued} queued). Retry shortly."
+            )
+
+        call = self._run(gate, class_slots, getattr(handlers, route[0]), arguments)
+        if not policy.timeout:
+            return await call
+        try:
+            return await asyncio.wait_for(call, policy.timeout)
+        except asyncio.TimeoutError:
+            gate.timed_out += 1
+            logger.warning(f"{name} exceeded its {policy.timeout:g}s deadline")
+            return error_response(f"Error: {name} did not finish within {policy.timeout:g}s and was cancelled.")
+
+    async def _run(
+        self, gate: _ToolGate, class_slots: asyncio.Semaphore | None, handler: Any, arguments: dict[str, Any]
+    ) -> Any:
+        """Wait for a tool slot (then a class slot) and run the handler."""
+        held: list[asyncio.Semaphore] = []
+        gate.queued += 1
+        try:
+            with span("dispatch.queue", priority=gate.policy.priority, queued_ahead=gate.queued - 1):
+                for slots in (gate.slots, class_slots):
+                    if slots is not None:
+                        await slots.acquire()
+                        held.append(slots)
+        except BaseException:
+            for slots in held:
+                slots.release()
+            raise
+        finally:
+            gate.queued -= 1
+
+        gate.running += 1
+        try:
+            with span("handler", handler=getattr(handler, "__name__", "handler")):
+                return await handler(arguments)
+        finally:
+            gate.running -= 1
+            gate.completed += 1
+            for slots in reversed(held):
+                slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        """Policy, load and rejection counters per tool that has been called."""
+        return {
+            name: {
+                "priority": gate.policy.priority,
+                "max_concurrency": gate.policy.max_concurrency,
+                "max_queue": gate.policy.max_queue,
+                "timeout_seconds": gate.policy.timeout or None,
+                "running": gate.running,
+                "queued": gate.queued,
+                "completed": gate.completed,
+                "rejected": gate.rejected,
+                "timed_out": gate.timed_out,
+            }
+            for name, gate in sorted(self._gates.items())
+        }
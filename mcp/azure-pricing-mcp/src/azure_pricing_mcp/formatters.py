@@ -1,6 +1,7 @@
 """Response formatters for Azure Pricing MCP Server."""
 
 import json
+import os
 from typing import Any
 
 from azure_pricing_mcp.config import DEFAULT_CUSTOMER_DISCOUNT
@@ -23,6 +24,11 @@ DISCOUNT_TIP_NO_DISCOUNT = (
     "💡 Want to see potential savings? Use the 'discount_percentage' parameter "
     "to apply your organization's negotiated discount rate."
 )
+# Price grids that stopped at the page limit (AZURE_PRICING_MAX_PAGES)
+_TRUNCATED_PRICES_NOTE = (
+    "⚠️ Price data was truncated at the page limit: some regions may be shown as unavailable or ranked on "
+    "incomplete prices. Narrow the regions or raise AZURE_PRICING_MAX_PAGES."
+)
 
 
 def _get_discount_tip(result: dict[str, Any]) -> str:
@@ -338,6 +344,171 @@ Original Pricing (before discount):
     return estimate_text
 
 
+def format_cost_sweep_response(result: dict[str, Any], max_rows: int = 200) -> str:
+    """Format a what-if cost sweep grid for display."""
+    if "error" in result:
+        return f"Error: {result['error']}"
+
+    dims = result["dimensions"]
+    response_text = f"""
+Cost Sweep for {result["service_name"]} - {result["sku_name"]}
+Region: {result["region"]}
+Product: {result["product_name"]}
+Unit: {result["unit_of_measure"]}
+Currency: {result["currency"]}
+Base Hourly Rate: ${result["base_hourly_rate"]}
+
+Swept Dimensions:
+- Pricing: {", ".join(dims["pricing"])}
+- Discounts (%): {", ".join(f"{d:g}" for d in dims["discount_percentages"])}
+- Hours per month: {", ".join(f"{h:g}" for h in dims["hours_per_month"])}
+- Quantities: {", ".join(f"{q:g}" for q in dims["quantities"])}
+"""
+
+    if "discount_applied" in result:
+        response_text += f"\n💰 {result['discount_applied']['percentage']}% discount applied - {result['discount_applied']['note']}\n"
+
+    if "unavailable_savings_plan_terms" in result:
+        response_text += (
+            f"\n⚠️ Savings plan terms not offered for this SKU: {', '.join(result['unavailable_savings_plan_terms'])}\n"
+        )
+
+    if "cheapest" in result:
+        cheapest = result["cheapest"]
+        response_text += (
+            f"\n🥇 Cheapest: {cheapest['pricing']}, {cheapest['discount_percentage']:g}% discount, "
+            f"{cheapest['hours_per_month']:g} h/month × {cheapest['quantity']:g} = ${cheapest['monthly_cost']:,.2f}/month\n"
+        )
+
+    response_text += f"\n📋 Cost Grid ({result['grid_points']} points):\n\n"
+    response_text += "| Pricing | Discount | Hours/Month | Quantity | Hourly Rate | Monthly Cost | Yearly Cost |\n"
+    response_text += "|---------|----------|-------------|----------|-------------|--------------|-------------|\n"
+    for point in result["grid"][:max_rows]:
+        response_text += (
+            f"| {point['pricing']} | {point['discount_percentage']:g}% | {point['hours_per_month']:g} | "
+            f"{point['quantity']:g} | ${point['hourly_rate']:.6f} | ${point['monthly_cost']:,.2f} | "
+            f"${point['yearly_cost']:,.2f} |\n"
+        )
+    if result["grid_points"] > max_rows:
+        response_text += f"\n... {result['grid_points'] - max_rows} more grid points not shown\n"
+
+    return response_text
+
+
+def format_multi_currency_search_response(result: dict[str, Any], max_rows: int = 100) -> str:
+    """Format a price search fanned out over several currencies as aligned columns."""
+    if "error" in result:
+        return f"Error: {result['error']}"
+
+    currencies = result["currencies"]
+    rows = result["rows"]
+    if not rows:
+        return "No pricing results found for the specified criteria."
+
+    response_text = f"Found {result['count']} Azure pricing results in {', '.join(currencies)}:\n\n"
+    if result.get("retirement_warnings"):
+        response_text += _format_retirement_warnings(result["retirement_warnings"])
+    if "discount_applied" in result:
+        response_text += f"💰 **Customer Discount Applied: {result['discount_applied']['percentage']}%**\n"
+        response_text += f"   {result['discount_applied']['note']}\n\n"
+    if "clarification" in result:
+        response_text += _format_clarification(result["clarification"])
+
+    response_text += "| SKU | Product | Region | Type | Unit | " + " | ".join(currencies) + " |\n"
+    response_text += "|-----|---------|--------|------|------|" + "|".join("---:" for _ in currencies) + "|\n"
+    for row in rows[:max_rows]:
+        cells = " | ".join(f"{v:,.6f}" if v is not None else "N/A" for v in row["prices"].values())
+        price_type = row["type"] if not row.get("reservation_term") else f"{row['type']} {row['reservation_term']}"
+        response_text += (
+            f"| {row['sku_name']} | {row['product_name']} | {row['region']} | {price_type} "
+            f"| {row['unit_of_measure']} | {cells} |\n"
+        )
+    if len(rows) > max_rows:
+        response_text += f"\n... {len(rows) - max_rows} more rows not shown\n"
+
+    for code, error in result.get("errors", {}).items():
+        response_text += f"\n⚠️ {code}: {error}\n"
+    return response_text
+
+
+def format_multi_currency_estimate_response(result: dict[str, Any]) -> str:
+    """Format a cost estimate in several currencies as aligned columns."""
+    if "error" in result:
+        return f"Error: {result['error']}"
+
+    currencies = result["currencies"]
+    assumptions = result.get("usage_assumptions") or {}
+    response_text = f"""
+Cost Estimate for {result["service_name"]} - {result["sku_name"]}
+Region: {result["region"]}
+Product: {result["product_name"]}
+Unit: {result["unit_of_measure"]}
+Currencies: {", ".join(currencies)}
+Hours per month: {assumptions.get("hours_per_month")}
+"""
+    if "discount_applied" in result:
+        response_text += f"\n💰 {result['discount_applied']['percentage']}% discount applied - {result['discount_applied']['note']}\n"
+
+    response_text += "\n| Cost | " + " | ".join(currencies) + " |\n"
+    response_text += "|------|" + "|".join("---:" for _ in currencies) + "|\n"
+    for row in result["rows"]:
+        decimals = 6 if row["label"].endswith("hourly") else 2
+        cells = " | ".join(f"{v:,.{decimals}f}" if v is not None else "N/A" for v in row["values"].values())
+        response_text += f"| {row['label']} | {cells} |\n"
+
+    for code, error in result.get("errors", {}).items():
+        response_text += f"\n⚠️ {code}: {error}\n"
+    return response_text
+
+
+def format_cost_matrix_response(result: dict[str, Any]) -> str:
+    """Format the SKU × region cost matrix for display."""
+    if "error" in result:
+        return f"Error: {result['error']}"
+
+    skus = result["skus"]
+    regions = result["regions"]
+    monthly = result["ranked_by"] == "monthly_cost"
+    values = result["monthly_costs"] if monthly else result["unit_prices"]
+
+    response_text = f"""
+Cost Matrix for {result["service_name"]}
+Currency: {result["currency"]}
+Price Type: {result["price_type"]}
+"""
+    if monthly:
+        response_text += f"Values: monthly cost at {result['hours_per_month']:g} hours/month\n"
+    else:
+        response_text += "Values: unit price (meters are not all time-based)\n"
+
+    if "discount_applied" in result:
+        response_text += f"\n💰 {result['discount_applied']['percentage']}% discount applied - {result['discount_applied']['note']}\n"
+
+    response_text += "\n| SKU | " + " | ".join(regions) + " | Cheapest Region |\n"
+    response_text += "|-----|" + "|".join("---" for _ in regions) + "|-----------------|\n"
+    for sku, row, row_min in zip(skus, values, result["row_minimums"], strict=True):
+        cells = " | ".join(f"${v:,.{2 if monthly else 6}f}" if v is not None else "N/A" for v in row)
+        cheapest = row_min["region"] if row_min else "N/A"
+        response_text += f"| {sku} | {cells} | {cheapest} |\n"
+
+    col_mins = [c["sku"] if c else "N/A" for c in result["column_minimums"]]
+    response_text += "| **Cheapest SKU** | " + " | ".join(col_mins) + " | |\n"
+
+    if "cheapest" in result:
+        cheapest = result["cheapest"]
+        value = cheapest["monthly_cost"] if monthly else cheapest["unit_price"]
+        suffix = "/month" if monthly else ""
+        response_text += f"\n🥇 Cheapest overall: {cheapest['sku']} in {cheapest['region']} - ${value:,.6g}{suffix}\n"
+
+    if result["missing_cells"]:
+        response_text += f"\n⚠️ {len(result['missing_cells'])} SKU/region combinations have no pricing\n"
+    if result.get("truncated"):
+        response_text += f"\n{_TRUNCATED_PRICES_NOTE}\n"
+
+    response_text += f"\n📡 Fetched with {result['queries']} batched queries\n"
+    return response_text
+
+
 def format_discover_skus_response(result: dict[str, Any]) -> str:
     """Format the discover SKUs response for display."""
     skus = result.get("skus", [])
@@ -425,16 +596,31 @@ def format_sku_discovery_response(result: dict[str, Any]) -> str:
 
 def format_customer_discount_response(result: dict[str, Any]) -> str:
     """Format the customer discount response for display."""
-    return f"""Customer Discount Information
+    response_text = f"""Customer Discount Information
 
 Customer ID: {result["customer_id"]}
 Discount Type: {result["discount_type"]}
 Discount Percentage: {result["discount_percentage"]}%
 Description: {result["description"]}
 Applicable Services: {result["applicable_services"]}
+"""
+
+    sheet = result.get("price_sheet")
+    if sheet:
+        response_text += f"""
+Price Sheet: {sheet["path"]}
+Currency: {sheet["currency"] or "any"}
+Meter Rates: {sheet["meter_rates"]}
+Service + SKU Rates: {sheet["service_sku_rates"]}
+SKU Rates: {sheet["sku_rates"]}
+Service Rates: {sheet["service_rates"]}
+Loaded At: {sheet["loaded_at"]}
+"""
 
+    response_text += f"""
 {result["note"]}
 """
+    return response_text
 
 
 def format_ri_pricing_response(result: dict[str, Any]) -> str:
@@ -826,12 +1012,29 @@ def format_bulk_estimate_response(result: dict[str, Any]) -> str:
         f"{result.get('unique_specs', 0)} unique, "
         f"{result.get('successful', 0)} estimated, "
         f"{result.get('failed', 0)} failed",
-        f"**Currency**: {result.get('currency', 'USD')}",
+        f"**Currency**: {', '.join(result.get('currencies') or [result.get('currency', 'USD')])}",
         "",
     ]
 
     line_items = result.get("line_items", [])
-    if line_items:
+    currencies = result.get("currencies")
+    if line_items and currencies:
+        lines.append("## Line Items (monthly)")
+        lines.append("")
+        lines.append("| Service | SKU | Region | Qty | " + " | ".join(currencies) + " |")
+        lines.append("|---------|-----|--------|----:|" + "|".join("---:" for _ in currencies) + "|")
+        for item in line_items:
+            costs = item.get("costs_by_currency", {})
+            cells = " | ".join(f"{costs[code]['monthly_cost']:,.2f}" if code in costs else "N/A" for code in currencies)
+            lines.append(
+                f"| {item.get('service_name', 'N/A')} "
+                f"| {item.get('sku_name', 'N/A')} "
+                f"| {item.get('region', 'N/A')} "
+                f"| {item.get('quantity', 1)} "
+                f"| {cells} |"
+            )
+        lines.append("")
+    elif line_items:
         lines.append("## Line Items")
         lines.append("")
         lines.append("| Service | SKU | Region | Qty | Monthly | Yearly |")
@@ -850,8 +1053,14 @@ def format_bulk_estimate_response(result: dict[str, Any]) -> str:
     totals = result.get("totals", {})
     lines.append("## Totals")
     lines.append("")
-    lines.append(f"- **Monthly**: ${totals.get('monthly', 0):,.2f}")
-    lines.append(f"- **Yearly**: ${totals.get('yearly', 0):,.2f}")
+    if currencies:
+        lines.append("| Currency | Monthly | Yearly |")
+        lines.append("|----------|--------:|-------:|")
+        for code, code_totals in result.get("totals_by_currency", {}).items():
+            lines.append(f"| {code} | {code_totals['monthly']:,.2f} | {code_totals['yearly']:,.2f} |")
+    else:
+        lines.append(f"- **Monthly**: ${totals.get('monthly', 0):,.2f}")
+        lines.append(f"- **Yearly**: ${totals.get('yearly', 0):,.2f}")
 
     errors = result.get("errors", [])
     if errors:
@@ -865,3 +1074,566 @@ def format_bulk_estimate_response(result: dict[str, Any]) -> str:
             )
 
     return "\n".join(lines)
+
+
+def format_bom_region_response(result: dict[str, Any]) -> str:
+    """Format bill-of-materials region ranking as Markdown."""
+    if "error" in result and not result.get("rankings"):
+        return f"❌ **Error**: {result['error']}"
+
+    currency = result.get("currency", "USD")
+    lines = [
+        "# 🌍 Bill of Materials — Cheapest Region",
+        "",
+        f"**Resources**: {result.get('resource_count', 0)} submitted, {result.get('priced_resources', 0)} priced",
+        f"**Regions**: {result.get('regions_evaluated', 0)} evaluated, "
+        f"{result.get('regions_available', 0)} offer every resource",
+        f"**Currency**: {currency}",
+        f"**Queries**: {result.get('queries', 0)}",
+        "",
+    ]
+
+    if "discount_applied" in result:
+        discount = result["discount_applied"]
+        lines.append(f"💰 {discount['percentage']}% discount applied - {discount['note']}")
+        lines.append("")
+
+    rankings = result.get("rankings", [])
+    if rankings:
+        lines.append("## Region Ranking")
+        lines.append("")
+        lines.append("| Rank | Region | Monthly | Yearly | Savings vs Most Expensive |")
+        lines.append("|-----:|--------|--------:|-------:|--------------------------:|")
+        for i, rank in enumerate(rankings, 1):
+            lines.append(
+                f"| {i} | {rank['region']} "
+                f"| ${rank['monthly_cost']:,.2f} "
+                f"| ${rank['yearly_cost']:,.2f} "
+                f"| ${rank.get('savings_vs_most_expensive', 0):,.2f} ({rank.get('savings_percentage', 0):.1f}%) |"
+            )
+        lines.append("")
+    else:
+        lines.append("⚠️ No region offers every resource in the bill of materials.")
+        lines.append("")
+
+    breakdown = result.get("breakdown", [])
+    if breakdown:
+        lines.append(f"## Breakdown in {result['cheapest_region']}")
+        lines.append("")
+        lines.append("| Service | SKU | Region | Qty | Unit Price | Monthly |")
+        lines.append("|---------|-----|--------|----:|-----------:|--------:|")
+        for item in breakdown:
+            lines.append(
+                f"| {item['service_name']} | {item['sku_name']} | {item['region']} | {item['quantity']} "
+                f"| ${item['unit_price']:.6f}/{item.get('unit_of_measure') or 'unit'} "
+                f"| ${item['monthly_cost']:,.2f} |"
+            )
+        lines.append("")
+
+    if result.get("pinned_resources"):
+        lines.append(
+            f"📌 {len(result['pinned_resources'])} pinned resource(s) add "
+            f"${result.get('pinned_monthly_cost', 0):,.2f}/month to every region"
+        )
+        lines.append("")
+
+    if result.get("truncated"):
+        lines.append(_TRUNCATED_PRICES_NOTE)
+        lines.append("")
+
+    unavailable = result.get("unavailable_regions", [])
+    if unavailable:
+        lines.append(f"## 🚫 Unavailable Regions ({len(unavailable)})")
+        for region in unavailable[:20]:
+            lines.append(f"- {region['region']}: missing {', '.join(region['missing_resources'])}")
+        if len(unavailable) > 20:
+            lines.append(f"- ... and {len(unavailable) - 20} more")
+        lines.append("")
+
+    errors = result.get("errors", [])
+    if errors:
+        lines.append("## ⚠️ Unpriced Items")
+        for err in errors:
+            lines.append(f"- Resource #{err.get('index', '?')}: {err.get('error', 'Unknown error')}")
+
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def format_vm_price_performance_response(result: dict[str, Any]) -> str:
+    """Format VM price-performance rankings as Markdown."""
+    if "error" in result:
+        return f"❌ **Error**: {result['error']}"
+
+    currency = result.get("currency", "USD")
+    lines = [
+        "# ⚡ VM Price-Performance Ranking",
+        "",
+        f"**Region**: {result['region']} | **OS**: {result['os_type'].title()} | **Currency**: {currency}",
+        f"**Sorted by**: {result['sort_by']}",
+        f"**Matching sizes**: {result['matching']} of {result['table_size']} priced sizes",
+        "",
+    ]
+
+    if "discount_applied" in result:
+        discount = result["discount_applied"]
+        lines.append(f"💰 {discount['percentage']}% discount applied - {discount['note']}")
+        lines.append("")
+
+    if result.get("truncated"):
+        lines.append(
+            "⚠️ The region's VM price scan stopped at the page limit, so some sizes may be missing from this "
+            "ranking. Raise AZURE_PRICING_VM_TABLE_MAX_PAGES to scan every page."
+        )
+        lines.append("")
+
+    rankings = result.get("rankings", [])
+    if not rankings:
+        lines.append("No VM sizes match the given constraints.")
+    else:
+        lines.append("| Rank | SKU | vCPU | Memory (GB) | GPUs | $/hour | $/vCPU-hour | $/GB-hour | $/month |")
+        lines.append("|-----:|-----|-----:|------------:|-----:|-------:|------------:|----------:|--------:|")
+        for i, row in enumerate(rankings, 1):
+            gpus = f"{row['gpus']:g} {row['gpu_model']}" if row["gpus"] else "-"
+            lines.append(
+                f"| {i} | {row['sku']} | {row['vcpus']} | {row['memory_gb']:g} | {gpus} "
+                f"| ${row['hourly_price']:.4f} | ${row['price_per_vcpu_hour']:.5f} "
+                f"| ${row['price_per_gb_hour']:.5f} | ${row['monthly_price']:,.2f} |"
+            )
+        lines.append("")
+
+    if "best_per_vcpu" in result:
+        best_cpu = result["best_per_vcpu"]
+        best_gb = result["best_per_gb"]
+        lines.append(f"🥇 Best $/vCPU-hour: {best_cpu['sku']} (${best_cpu['price_per_vcpu_hour']:.5f})")
+        lines.append(f"🥇 Best $/GB-hour: {best_gb['sku']} (${best_gb['price_per_gb_hour']:.5f})")
+        lines.append("")
+
+    cache_note = "cached table" if result.get("from_cache") else "fresh prices"
+    lines.append(f"_Specs: data version {result['spec_data_version']} ({result['spec_source']}); {cache_note}_")
+
+    return "\n".join(lines)
+
+
+def format_coverage_optimizer_response(result: dict[str, Any]) -> str:
+    """Format reservation / savings plan coverage optimization as Markdown."""
+    if "error" in result:
+        text = f"❌ **Error**: {result['error']}"
+        for err in result.get("errors", []):
+            text += f"\n- Fleet entry #{err.get('index', '?')}: {err.get('error', 'Unknown error')}"
+        return text
+
+    currency = result.get("currency", "USD")
+    optimal = result["optimal"]
+    lines = [
+        "# 📐 Reservation & Savings Plan Coverage",
+        "",
+        f"**Fleet**: {result['priced_skus']} of {result['fleet_size']} SKUs priced | "
+        f"**Profile**: {result['profile_hours']:,} hours | **Currency**: {currency}",
+        f"**All on-demand**: ${result['annual_on_demand_cost']:,.2f}/year",
+        "",
+    ]
+
+    if "discount_applied" in result:
+        discount = result["discount_applied"]
+        lines.append(f"💰 {discount['percentage']}% discount applied - {discount['note']}")
+        lines.append("")
+
+    lines.append(f"## 🏆 Optimal: {optimal['strategy']}")
+    lines.append("")
+    lines.append(
+        f"- Annual cost: ${optimal['annual_cost']:,.2f} "
+        f"(saves ${optimal['annual_savings']:,.2f}, {optimal['savings_percentage']:.1f}%)"
+    )
+    if optimal["reserved_instances"]:
+        lines.append(
+            f"- Reservations ({optimal['reservation_term']}): {optimal['reserved_instances']} instances, "
+            f"{optimal['reservation_coverage']:.1f}% of usage hours covered"
+        )
+    if optimal["savings_plan_term"]:
+        lines.append(
+            f"- Savings plan ({optimal['savings_plan_term']}): ${optimal['savings_plan_commitment_hourly']:,.4f}/hour "
+            f"commitment, {optimal['savings_plan_utilization']:.1f}% utilized"
+        )
+    lines.append("")
+
+    lines.append("## Strategies")
+    lines.append("")
+    lines.append("| Strategy | Reserved | SP $/hour | Annual Cost | Savings |")
+    lines.append("|----------|---------:|----------:|------------:|--------:|")
+    for strategy in result["strategies"]:
+        lines.append(
+            f"| {strategy['strategy']} | {strategy['reserved_instances']} "
+            f"| ${strategy['savings_plan_commitment_hourly']:,.4f} "
+            f"| ${strategy['annual_cost']:,.2f} | {strategy['savings_percentage']:.1f}% |"
+        )
+    lines.append("")
+
+    lines.append("## Per-SKU Reservations (optimal strategy)")
+    lines.append("")
+    lines.append("| SKU | Region | Avg | Peak | On-Demand $/hour | Reserved |")
+    lines.append("|-----|--------|----:|-----:|-----------------:|---------:|")
+    for sku in result["per_sku"]:
+        lines.append(
+            f"| {sku['sku_name']} | {sku['region']} | {sku['average_instances']:g} | {sku['peak_instances']:g} "
+            f"| ${sku['on_demand_hourly']:.4f} | {sku['reserved_instances']} |"
+        )
+
+    errors = result.get("errors", [])
+    if errors:
+        lines.append("")
+        lines.append("## ⚠️ Skipped Fleet Entries")
+        for err in errors:
+            lines.append(f"- Fleet entry #{err.get('index', '?')}: {err.get('error', 'Unknown error')}")
+
+    return "\n".join(lines)
+
+
+def format_tco_projection_response(result: dict[str, Any]) -> str:
+    """Format a multi-year TCO projection as Markdown."""
+    if "error" in result:
+        text = f"❌ **Error**: {result['error']}"
+        for err in result.get("errors", []):
+            text += f"\n- Resource #{err.get('index', '?')}: {err.get('error', 'Unknown error')}"
+        return text
+
+    currency = result.get("currency", "USD")
+    lines = [
+        f"# 📈 {result['years']}-Year TCO Projection",
+        "",
+        f"**Pricing**: {result['pricing']} ({result['payment']} payment) | "
+        f"**Growth**: {result['growth_rate_percent']:g}%/year | **Currency**: {currency}",
+        f"**Total**: ${result['total_cost']:,.2f} (avg ${result['average_monthly_cost']:,.2f}/month)",
+    ]
+    if result.get("discount_schedule"):
+        lines.append(f"**Discount schedule**: {', '.join(f'{d:g}%' for d in result['discount_schedule'])} by year")
+    if "npv" in result:
+        lines.append(f"**NPV** at {result['cost_of_capital_percent']:g}% cost of capital: ${result['npv']:,.2f}")
+    lines.append("")
+
+    if "discount_applied" in result:
+        discount = result["discount_applied"]
+        lines.append(f"💰 {discount['percentage']}% discount applied - {discount['note']}")
+        lines.append("")
+
+    lines.append("## By Year")
+    lines.append("")
+    lines.append("| Year | Cost | Cumulative |")
+    lines.append("|-----:|-----:|-----------:|")
+    for year in result["yearly"]:
+        lines.append(f"| {year['year']} | ${year['cost']:,.2f} | ${year['cumulative']:,.2f} |")
+    lines.append("")
+
+    lines.append("## By Resource")
+    lines.append("")
+    lines.append("| # | Service | SKU | Region | Pricing | First Month | Last Month | Total |")
+    lines.append("|--:|---------|-----|--------|---------|------------:|-----------:|------:|")
+    for res in result["resources"]:
+        lines.append(
+            f"| {res['index']} | {res['service_name']} | {res['sku_name']} | {res['region']} | {res['pricing']} "
+            f"| ${res['first_month_cost']:,.2f} | ${res['last_month_cost']:,.2f} | ${res['total_cost']:,.2f} |"
+        )
+    lines.append("")
+
+    lines.append("## Pricing Options")
+    lines.append("")
+    lines.append("| Pricing | Total | Savings vs On-Demand |")
+    lines.append("|---------|------:|---------------------:|")
+    for option in result["comparison"]:
+        lines.append(
+            f"| {option['pricing']} | ${option['total_cost']:,.2f} "
+            f"| ${option['savings_vs_on_demand']:,.2f} ({option['savings_percentage']:.1f}%) |"
+        )
+    lines.append("")
+
+    sensitivity = result.get("sensitivity")
+    if sensitivity:
+        discounts = sensitivity["discount_percentages"]
+        lines.append("## Sensitivity (total cost)")
+        lines.append("")
+        header = [f"{d:g}% discount" for d in discounts] if discounts else ["Total"]
+        lines.append("| Growth | " + " | ".join(header) + " |")
+        lines.append("|-------:|" + "|".join("---:" for _ in header) + "|")
+        for growth, row in zip(sensitivity["growth_rates"], sensitivity["total_cost"], strict=True):
+            lines.append(f"| {growth:g}% | " + " | ".join(f"${value:,.2f}" for value in row) + " |")
+        lines.append("")
+
+    for note in result.get("warnings", []):
+        lines.append(f"⚠️ Resource #{note['index']}: {note['warning']}")
+    for err in result.get("errors", []):
+        lines.append(f"⚠️ Resource #{err.get('index', '?')}: {err.get('error', 'Unknown error')}")
+
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def format_price_anomaly_report(result: dict[str, Any], max_rows: int = 25) -> str:
+    """Format a cross-region price anomaly scan as a Markdown report."""
+    if "error" in result:
+        return f"❌ **Error**: {result['error']}"
+
+    thresholds = result["thresholds"]
+    lines = [
+        "# 🔎 Cross-Region Price Anomaly Report",
+        "",
+        f"**Generated**: {result['generated_at']} | **Currency**: {result['currency']}",
+        f"**Services**: {', '.join(result['services']) or '-'}",
+        f"**Scanned**: {result['items_scanned']:,} prices, {result['skus_analyzed']:,} SKUs analysed "
+        f"({result['skus_skipped']:,} priced in fewer than {thresholds['min_regions']} regions)",
+        f"**Thresholds**: {thresholds['outlier_ratio']:g}× median price, "
+        f"{thresholds['spot_deviation']:g} pts from median Spot discount",
+        "",
+    ]
+    if result.get("truncated_services"):
+        lines.append(
+            f"⚠️ **Incomplete scan**: {', '.join(result['truncated_services'])} stopped at the page limit, so only "
+            "part of their prices was analysed and the region summary may be biased. Raise --max-pages "
+            "(AZURE_PRICING_ANOMALY_MAX_PAGES) or narrow the scan."
+        )
+        lines.append("")
+
+    outliers = result.get("outliers", [])
+    lines.append(f"## Regional Price Outliers ({result['outlier_count']})")
+    lines.append("")
+    if outliers:
+        lines.append("| Service | SKU | Product | Region | Price | Median | Ratio |")
+        lines.append("|---------|-----|---------|--------|------:|-------:|------:|")
+        for o in outliers[:max_rows]:
+            marker = "🔺" if o["direction"] == "expensive" else "🔻"
+            lines.append(
+                f"| {o['service_name']} | {o['sku_name']} | {o['product_name']} | {o['region']} "
+                f"| ${o['retail_price']:.6f} | ${o['median_price']:.6f} | {marker} {o['ratio']:.2f}× |"
+            )
+        if result["outlier_count"] > max_rows:
+            lines.append(f"\n_... and {result['outlier_count'] - max_rows} more_")
+    else:
+        lines.append("No regional price outliers found.")
+    lines.append("")
+
+    spot = result.get("spot_anomalies", [])
+    lines.append(f"## Spot Discount Anomalies ({result['spot_anomaly_count']})")
+    lines.append("")
+    if spot:
+        lines.append("| Service | SKU | Region | Spot | On-Demand | Discount | Median Discount | Reason |")
+        lines.append("|---------|-----|--------|-----:|----------:|---------:|----------------:|--------|")
+        for a in spot[:max_rows]:
+            median = a["median_spot_discount_percentage"]
+            median_text = f"{median:.1f}%" if median is not None else "-"
+            lines.append(
+                f"| {a['service_name']} | {a['sku_name']} | {a['region']} | ${a['spot_price']:.6f} "
+                f"| ${a['on_demand_price']:.6f} | {a['spot_discount_percentage']:.1f}% | {median_text} "
+                f"| {a['reason'].replace('_', ' ')} |"
+            )
+        if result["spot_anomaly_count"] > max_rows:
+            lines.append(f"\n_... and {result['spot_anomaly_count'] - max_rows} more_")
+    else:
+        lines.append("No Spot discount anomalies found.")
+    lines.append("")
+
+    summary = result.get("region_summary", [])
+    if summary:
+        lines.append("## Region Price Index (median price vs SKU median)")
+        lines.append("")
+        lines.append("| Region | SKUs | Median Ratio | Expensive Outliers | Cheap Outliers |")
+        lines.append("|--------|-----:|-------------:|-------------------:|---------------:|")
+        for r in summary:
+            lines.append(
+                f"| {r['region']} | {r['skus_priced']} | {r['median_ratio']:.3f} "
+                f"| {r['expensive_outliers']} | {r['cheap_outliers']} |"
+            )
+
+    return "\n".join(lines).rstrip() + "\n"
+
+
+def format_batch_response(result: dict[str, Any]) -> str:
+    """Format batch meta-tool results in call order."""
+    if "error" in result:
+        return f"❌ **Error**: {result['error']}"
+
+    lines = [
+        "# ⚡ Batch Results",
+        "",
+        f"**Calls**: {result['calls']} ({result['succeeded']} succeeded, {result['failed']} failed) "
+        f"in {result['elapsed_ms']:,.0f} ms",
+    ]
+    for entry in result["results"]:
+        status = "✅" if entry["ok"] else "❌"
+        lines.append("")
+        lines.append(f"## {entry['index'] + 1}. {entry['tool'] or 'unknown'} {status} ({entry['elapsed_ms']:,.1f} ms)")
+        lines.append("")
+        lines.append(entry["text"].strip() if entry["ok"] else f"**Error**: {entry['error']}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _format_ms(value: float | None) -> str:
+    if value is None:
+        return "-"
+    return "> 60,000" if value == float("inf") else f"{value:,.1f}"
+
+
+def format_metrics_response(metrics: dict[str, Any]) -> str:
+    """Format the server_metrics admin tool summary."""
+    lines = ["# 📈 Server Metrics", ""]
+
+    lines.append("## Tools")
+    lines.append("")
+    if metrics["tools"]:
+        lines.append("| Tool | Calls | Cached | Errors | Mean ms | p95 ms | Running | Queued | Rejected |")
+        lines.append("|------|------:|-------:|-------:|--------:|-------:|--------:|-------:|---------:|")
+        for name, entry in sorted(metrics["tools"].items()):
+            outcomes = entry["outcomes"]
+            errors = sum(outcomes.get(key, 0) for key in ("error", "exception"))
+            load = metrics["dispatcher"].get(name, {})
+            lines.append(
+                f"| {name} | {entry['calls']} | {outcomes.get('cached', 0)} | {errors} "
+                f"| {_format_ms(entry.get('mean_ms'))} | {_format_ms(entry.get('p95_ms'))} "
+                f"| {load.get('running', 0)} | {load.get('queued', 0)} | {load.get('rejected', 0)} |"
+            )
+    else:
+        lines.append("No tool calls yet.")
+
+    lines.append("")
+    lines.append("## Upstream APIs")
+    lines.append("")
+    if metrics["upstream"]:
+        lines.append("| Host | Requests | 429s | Retries | Mean ms | p95 ms |")
+        lines.append("|------|---------:|-----:|--------:|--------:|-------:|")
+        for host, entry in sorted(metrics["upstream"].items()):
+            lines.append(
+                f"| {host} | {entry['requests']} | {entry['rate_limited']} | {entry['retries']} "
+                f"| {_format_ms(entry.get('mean_ms'))} | {_format_ms(entry.get('p95_ms'))} |"
+            )
+    else:
+        lines.append("No upstream requests yet.")
+
+    lines.append("")
+    lines.append("## Caches")
+    lines.append("")
+    lines.append("| Cache | Hits | Misses | Hit rate |")
+    lines.append("|-------|-----:|-------:|---------:|")
+    for name, entry in sorted(metrics["caches"].items()):
+        lines.append(f"| {name} | {entry['hit']} | {entry['miss']} | {entry['hit_rate']:.1%} |")
+    tool_cache = metrics["tool_cache"]
+    warmup = metrics["warmup"]
+    lines.append("")
+    lines.append(f"**Tool cache entries**: {tool_cache['entries']} / {tool_cache['max_entries']}")
+    lines.append(
+        f"**Warm-up**: {warmup['prefetched']} prefetched, {warmup['warm_hits']} hits on prefetched entries "
+        f"({warmup['warm_hit_rate']:.1%} of logged calls)"
+    )
+
+    return "\n".join(lines) + "\n"
+
+
+def format_profiling_response(stats: dict[str, Any], top: str | None = None) -> str:
+    """Format the server_profiling admin tool response."""
+    lines = ["# 🔬 Tool Profiling", ""]
+
+    if not stats["enabled"]:
+        selection = "Off"
+    elif stats["tool"]:
+        rate = stats["sample_rate"] or 1.0
+        selection = f"{rate:.0%} of `{stats['tool']}` calls"
+    else:
+        selection = f"{stats['sample_rate']:.0%} of all tool calls"
+    lines.append(f"**Profiling**: {selection}")
+    lines.append(f"**Directory**: `{stats['directory']}` (newest {stats['max_files']} profiles kept)")
+    lines.append(f"**Profiled calls**: {stats['profiled']}")
+    if stats["skipped_busy"]:
+        lines.append(f"**Skipped** (another call was being profiled): {stats['skipped_busy']}")
+
+    lines.append("")
+    lines.append("## Saved Profiles")
+    lines.append("")
+    if stats["profiles"]:
+        for path in stats["profiles"][:10]:
+            lines.append(f"- `{os.path.basename(path)}`")
+        if len(stats["profiles"]) > 10:
+            lines.append(f"- ... and {len(stats['profiles']) - 10} more")
+    else:
+        lines.append("No profiles saved yet.")
+
+    if top:
+        lines.append("")
+        lines.append(f"## Hot Spots: `{os.path.basename(stats['profiles'][0])}`")
+        lines.append("")
+        lines.append("```")
+        lines.append(top.strip("\n"))
+        lines.append("```")
+
+    lines.append("")
+    lines.append("💡 Open a profile with `python -m pstats <file>` or snakeviz.")
+    return "\n".join(lines) + "\n"
+
+
+def _format_bytes(value: int | None) -> str:
+    if value is None:
+        return "-"
+    if value < 1024:
+        return f"{value:,} B"
+    size = value / 1024
+    unit = "KiB"
+    for larger in ("MiB", "GiB"):
+        if size < 1024:
+            break
+        size /= 1024
+        unit = larger
+    return f"{size:,.1f} {unit}"
+
+
+def format_cache_admin_response(caches: dict[str, dict[str, Any]], result: dict[str, Any]) -> str:
+    """Format the server_cache admin tool response."""
+    lines = ["# 🗄️ Server Caches", ""]
+
+    if result.get("removed") is not None:
+        removed = result["removed"]
+        detail = ", ".join(f"{name}: {count}" for name, count in removed.items())
+        lines.append(f"🧹 **Flushed** {sum(removed.values())} entries ({detail})")
+        lines.append("")
+    if result.get("warmed") is not None:
+        warmed = result["warmed"]
+        if "hot_queries" in warmed:
+            lines.append(
+                f"🔥 **Prewarmed** connections and retirement data, and {warmed['hot_queries']} frequent queries"
+            )
+        else:
+            lines.append(
+                f"🔥 **Prewarmed** {warmed['warmed']} queries ({warmed['failed']} failed, "
+                f"{warmed['uncacheable']} not cacheable)"
+            )
+        lines.append("")
+
+    lines.append("| Cache | Entries | Memory | Hits | Misses | Hit rate | Oldest |")
+    lines.append("|-------|--------:|-------:|-----:|-------:|---------:|-------:|")
+    for name, stats in caches.items():
+        label = f"{name} ({stats['backend']})" if "backend" in stats else name
+        entries = "-" if stats.get("entries") is None else f"{stats['entries']:,}"
+        hit_rate = "-" if stats.get("hit_rate") is None else f"{stats['hit_rate']:.1%}"
+        oldest = stats.get("oldest") or []
+        age = oldest[0].get("age_seconds") if oldest else None
+        lines.append(
+            f"| {label} | {entries} | {_format_bytes(stats.get('bytes'))} | {stats.get('hits', 0)} "
+            f"| {stats.get('misses', 0)} | {hit_rate} | {'-' if age is None else f'{age:,.0f}s'} |"
+        )
+        if stats.get("error"):
+            lines.append(f"| ⚠️ {name} unavailable: {stats['error']} | | | | | | |")
+
+    for name, stats in caches.items():
+        if not stats.get("oldest"):
+            continue
+        lines.append("")
+        lines.append(f"### Oldest {name} entries")
+        lines.append("")
+        for entry in stats["oldest"]:
+            key = entry["key"] if len(entry["key"]) <= 100 else entry["key"][:97] + "..."
+            if entry.get("age_seconds") is not None:
+                when = f"{entry['age_seconds']:,.0f}s old"
+            else:
+                when = f"expires in {entry['expires_in_seconds']:,.0f}s"
+            lines.append(f"- `{key}` ({when})")
+
+    lines.append("")
+    lines.append(
+        '💡 Flush with `action: "flush"` and a `cache`, `prefix` or `key`; '
+        'prewarm with `action: "prewarm"` and `queries`.'
+    )
+    return "\n".join(lines) + "\n"
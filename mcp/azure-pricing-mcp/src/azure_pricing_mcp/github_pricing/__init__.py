@@ -1,15 +1,27 @@
-"""GitHub Pricing package for Azure Pricing MCP Server."""
-
-from .formatters import (
-    format_github_cost_estimate_response,
-    format_github_pricing_response,
-)
-from .handlers import GitHubPricingHandlers
-from .tools import get_github_pricing_tool_definitions
-
-__all__ = [
-    "GitHubPricingHandlers",
-    "format_github_cost_estimate_response",
-    "format_github_pricing_response",
-    "get_github_pricing_tool_definitions",
-]
+"""GitHub Pricing package for Azure Pricing MCP Server.
+
+Submodules are imported on first access (see ``azure_pricing_mcp.lazy``).
+"""
+
+from typing import TYPE_CHECKING
+
+from ..lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .formatters import (
+        format_github_cost_estimate_response,
+        format_github_pricing_response,
+    )
+    from .handlers import GitHubPricingHandlers
+    from .tools import get_github_pricing_tool_definitions
+
+_EXPORTS: dict[str, str] = {
+    "GitHubPricingHandlers": ".handlers",
+    "format_github_cost_estimate_response": ".formatters",
+    "format_github_pricing_response": ".formatters",
+    "get_github_pricing_tool_definitions": ".tools",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
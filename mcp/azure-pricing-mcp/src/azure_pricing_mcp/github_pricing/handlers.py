@@ -7,6 +7,7 @@ from typing import Any
 from mcp.types import TextContent
 
 from ..services.github_pricing import GitHubPricingService
+from ..tool_cache import text_response
 from .formatters import (
     format_github_cost_estimate_response,
     format_github_pricing_response,
@@ -37,7 +38,7 @@ class GitHubPricingHandlers:
             copilot_plan=arguments.get("copilot_plan"),
         )
         text = format_github_pricing_response(result)
-        return [TextContent(type="text", text=text)]
+        return text_response(text, result)
 
     async def handle_github_cost_estimate(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle ``github_cost_estimate`` tool calls."""
@@ -55,4 +56,4 @@ class GitHubPricingHandlers:
             ghas_committers=arguments.get("ghas_committers", 0),
         )
         text = format_github_cost_estimate_response(result)
-        return [TextContent(type="text", text=text)]
+        return text_response(text, result)
@@ -1,18 +1,28 @@
 """Tool handlers for Azure Pricing MCP Server."""
 
+import asyncio
 import logging
 from typing import Any
 
 from mcp.types import TextContent
 
-from .config import DEFAULT_CUSTOMER_DISCOUNT
+from .batch import BATCH_TOOL_NAME, run_batch
+from .cache import CacheBackend
+from .config import BATCH_CONCURRENCY, DEFAULT_CUSTOMER_DISCOUNT
 from .databricks.handlers import DatabricksHandlers
 from .formatters import (
     _get_discount_tip,
+    format_batch_response,
+    format_bom_region_response,
     format_bulk_estimate_response,
     format_cost_estimate_response,
+    format_cost_matrix_response,
+    format_cost_sweep_response,
+    format_coverage_optimizer_response,
     format_customer_discount_response,
     format_discover_skus_response,
+    format_multi_currency_estimate_response,
+    format_multi_currency_search_response,
     format_orphaned_resources_response,
     format_price_compare_response,
     format_price_search_response,
@@ -23,10 +33,26 @@ from .formatters import (
     format_sku_discovery_response,
     format_spot_eviction_rates_response,
     format_spot_price_history_response,
+    format_tco_projection_response,
+    format_vm_price_performance_response,
 )
 from .github_pricing.handlers import GitHubPricingHandlers
-from .services import BulkEstimateService, DatabricksService, PricingService, PTUService, SKUService, SpotService
+from .progress import ProgressReporter, current_progress, progress_scope
+from .services import (
+    BillOfMaterialsService,
+    BulkEstimateService,
+    CoverageOptimizerService,
+    DatabricksService,
+    PricePerformanceService,
+    PricingService,
+    PTUService,
+    SKUService,
+    SpotService,
+    TCOService,
+)
 from .services.orphaned import OrphanedResourcesService
+from .tool_cache import error_response, text_response
+from .tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +60,14 @@ logger = logging.getLogger(__name__)
 class ToolHandlers(DatabricksHandlers, GitHubPricingHandlers):
     """Handlers for MCP tool calls."""
 
+    # azure_cost_estimate arguments that switch it into what-if sweep mode
+    _SWEEP_ARGUMENTS = (
+        "sweep_hours_per_month",
+        "sweep_quantities",
+        "sweep_discount_percentages",
+        "sweep_savings_plan_terms",
+    )
+
     def __init__(
         self,
         pricing_service: PricingService,
@@ -42,6 +76,7 @@ class ToolHandlers(DatabricksHandlers, GitHubPricingHandlers):
         orphaned_service: OrphanedResourcesService | None = None,
         databricks_service: DatabricksService | None = None,
         bulk_service: BulkEstimateService | None = None,
+        shared_cache: CacheBackend | None = None,
     ) -> None:
         self._pricing_service = pricing_service
         self._sku_service = sku_service
@@ -49,7 +84,12 @@ class ToolHandlers(DatabricksHandlers, GitHubPricingHandlers):
         self._orphaned_service = orphaned_service
         self._databricks_service = databricks_service
         self._bulk_service = bulk_service
+        self._shared_cache = shared_cache
         self._ptu_service: PTUService | None = None
+        self._bom_service: BillOfMaterialsService | None = None
+        self._price_performance_service: PricePerformanceService | None = None
+        self._coverage_service: CoverageOptimizerService | None = None
+        self._tco_service: TCOService | None = None
         self._github_pricing_service = None
 
     def _resolve_discount(self, arguments: dict[str, Any]) -> tuple[float, bool, bool]:
@@ -76,8 +116,10 @@ class ToolHandlers(DatabricksHandlers, GitHubPricingHandlers):
 
         # No explicit discount_percentage provided
         if show_with_discount:
-            # User wants default discount applied
+            # User wants default discount applied; negotiated price-sheet rates
+            # take precedence per item when a sheet is configured
             arguments["discount_percentage"] = DEFAULT_CUSTOMER_DISCOUNT
+            arguments["use_price_sheet"] = True
             return (DEFAULT_CUSTOMER_DISCOUNT, False, True)
         else:
             # No discount requested - use 0%
@@ -109,6 +151,12 @@ class ToolHandlers(DatabricksHandlers, GitHubPricingHandlers):
         """Handle azure_price_search tool calls."""
         discount_pct, discount_specified, used_default = self._resolve_discount(arguments)
 
+        currency_codes = arguments.pop("currency_codes", None)
+        if currency_codes:
+            result = await self._pricing_service.search_prices_multi_currency(currency_codes, **arguments)
+            self._attach_discount_metadata(result, discount_pct, discount_specified, used_default)
+            return text_response(format_multi_currency_search_response(result), result)
+
         result = await self._pricing_service.search_prices(**arguments)
         self._attach_discount_metadata(result, discount_pct, discount_specified, used_default)
 
@@ -119,7 +167,7 @@ class ToolHandlers(DatabricksHandlers, GitHubPricingHandlers):
         if discount_tip:
             response_text += f"\n\n{discount_tip}"
 
-        return [TextContent(type="text", text=response_text)]
+        return text_response(response_text, result)
 
     async def handle_price_compare(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle azure_price_compare tool calls."""
@@ -129,7 +177,7 @@ class ToolHandlers(DatabricksHandlers, GitHubPricingHandlers):
         self._attach_discount_metadata(result, discount_pct, discount_specified, used_default)
 
         response_text = format_price_compare_response(result)
-        return [TextContent(type="text", text=response_text)]
+        return text_response(response_text, result)
 
     async def handle_region_recommend(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle azure_region_recommend tool calls."""
@@ -139,54 +187,142 @@ class ToolHandlers(DatabricksHandlers, GitHubPricingHandlers):
         self._attach_discount_metadata(result, discount_pct, discount_specified, used_default)
 
         response_text = format_region_recommend_response(result)
-        return [TextContent(type="text", text=response_text)]
+        return text_response(response_text, result)
 
     async def handle_cost_estimate(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle azure_cost_estimate tool calls."""
         discount_pct, discount_specified, used_default = self._resolve_discount(arguments)
 
+        currency_codes = arguments.pop("currency_codes", None)
+        sweep_args = {key: arguments.pop(key) for key in self._SWEEP_ARGUMENTS if key in arguments}
+        if sweep_args and currency_codes:
+            return error_response("Error: currency_codes cannot be combined with sweep_* parameters")
+        if currency_codes:
+            result = await self._pricing_service.estimate_costs_multi_currency(currency_codes, **arguments)
+            self._attach_discount_metadata(result, discount_pct, discount_specified, used_default)
+            return text_response(format_multi_currency_estimate_response(result), result)
+        if sweep_args:
+            # Scalar hours_per_month is one more sweep value when no vector is given
+            hours = arguments.pop("hours_per_month", None)
+            sweep_args.setdefault("sweep_hours_per_month", [hours] if hours is not None else None)
+            result = await self._pricing_service.estimate_cost_sweep(
+                hours_per_month=sweep_args.get("sweep_hours_per_month"),
+                quantities=sweep_args.get("sweep_quantities"),
+                discount_percentages=sweep_args.get("sweep_discount_percentages"),
+                savings_plan_terms=sweep_args.get("sweep_savings_plan_terms"),
+                **arguments,
+            )
+            self._attach_discount_metadata(result, discount_pct, discount_specified, used_default)
+            return text_response(format_cost_sweep_response(result), result)
+
         result = await self._pricing_service.estimate_costs(**arguments)
         self._attach_discount_metadata(result, discount_pct, discount_specified, used_default)
 
         response_text = format_cost_estimate_response(result)
-        return [TextContent(type="text", text=response_text)]
+        return text_response(response_text, result)
+
+    async def handle_cost_matrix(self, arguments: dict[str, Any]) -> list[TextContent]:
+        """Handle azure_cost_matrix tool calls."""
+        discount_pct, discount_specified, used_default = self._resolve_discount(arguments)
+
+        result = await self._pricing_service.cost_matrix(**arguments, progress=current_progress())
+        self._attach_discount_metadata(result, discount_pct, discount_specified, used_default)
+
+        with span("format"):
+            response_text = format_cost_matrix_response(result)
+        return text_response(response_text, result)
 
     async def handle_bulk_estimate(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle azure_bulk_estimate tool calls."""
         if self._bulk_service is None:
             self._bulk_service = BulkEstimateService(self._pricing_service)
-        result = await self._bulk_service.bulk_estimate(**arguments)
-        response_text = format_bulk_estimate_response(result)
-        return [TextContent(type="text", text=response_text)]
+        if arguments.pop("show_with_discount", False):
+            arguments.setdefault("discount_percentage", DEFAULT_CUSTOMER_DISCOUNT)
+            arguments["use_price_sheet"] = True
+        result = await self._bulk_service.bulk_estimate(**arguments, progress=current_progress())
+        with span("format"):
+            response_text = format_bulk_estimate_response(result)
+        return text_response(response_text, result)
+
+    async def handle_bom_region(self, arguments: dict[str, Any]) -> list[TextContent]:
+        """Handle azure_bom_region_optimizer tool calls."""
+        if self._bom_service is None:
+            self._bom_service = BillOfMaterialsService(self._pricing_service)
+        if arguments.pop("show_with_discount", False):
+            arguments.setdefault("discount_percentage", DEFAULT_CUSTOMER_DISCOUNT)
+            arguments["use_price_sheet"] = True
+        result = await self._bom_service.cheapest_region(**arguments, progress=current_progress())
+        with span("format"):
+            response_text = format_bom_region_response(result)
+        return text_response(response_text, result)
+
+    async def handle_vm_price_performance(self, arguments: dict[str, Any]) -> list[TextContent]:
+        """Handle azure_vm_price_performance tool calls."""
+        if self._price_performance_service is None:
+            self._price_performance_service = PricePerformanceService(self._pricing_service)
+        discount_pct, discount_specified, used_default = self._resolve_discount(arguments)
+
+        result = await self._price_performance_service.rank(**arguments)
+        self._attach_discount_metadata(result, discount_pct, discount_specified, used_default)
+
+        response_text = format_vm_price_performance_response(result)
+        return text_response(response_text, result)
+
+    async def handle_coverage_optimizer(self, arguments: dict[str, Any]) -> list[TextContent]:
+        """Handle azure_coverage_optimizer tool calls."""
+        if self._coverage_service is None:
+            self._coverage_service = CoverageOptimizerService(self._pricing_service)
+        if arguments.pop("show_with_discount", False):
+            arguments.setdefault("discount_percentage", DEFAULT_CUSTOMER_DISCOUNT)
+            arguments["use_price_sheet"] = True
+        result = await self._coverage_service.optimize(**arguments)
+        response_text = format_coverage_optimizer_response(result)
+        return text_response(response_text, result)
+
+    async def handle_tco_projection(self, arguments: dict[str, Any]) -> list[TextContent]:
+        """Handle azure_tco_projection tool calls."""
+        if self._tco_service is None:
+            self._tco_service = TCOService(self._pricing_service)
+        if arguments.pop("show_with_discount", False):
+            arguments.setdefault("discount_percentage", DEFAULT_CUSTOMER_DISCOUNT)
+            arguments["use_price_sheet"] = True
+        result = await self._tco_service.project(**arguments)
+        response_text = format_tco_projection_response(result)
+        return text_response(response_text, result)
 
     async def handle_discover_skus(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle azure_discover_skus tool calls."""
         result = await self._sku_service.discover_skus(**arguments)
         response_text = format_discover_skus_response(result)
-        return [TextContent(type="text", text=response_text)]
+        return text_response(response_text, result)
 
     async def handle_sku_discovery(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle azure_sku_discovery tool calls."""
         result = await self._sku_service.discover_service_skus(**arguments)
         response_text = format_sku_discovery_response(result)
-        return [TextContent(type="text", text=response_text)]
+        return text_response(response_text, result)
 
     async def handle_customer_discount(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle get_customer_discount tool calls."""
         result = await self._pricing_service.get_customer_discount(**arguments)
         response_text = format_customer_discount_response(result)
-        return [TextContent(type="text", text=response_text)]
+        return text_response(response_text, result)
 
     async def handle_ri_pricing(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle azure_ri_pricing tool calls."""
         result = await self._pricing_service.get_ri_pricing(**arguments)
         response_text = format_ri_pricing_response(result)
-        return [TextContent(type="text", text=response_text)]
+        return text_response(response_text, result)
+
+    @property
+    def loaded_spot_service(self) -> SpotService | None:
+        """The Spot service once a Spot tool has been called (None before)."""
+        return self._spot_service
 
     def _get_spot_service(self) -> SpotService:
         """Get or create the SpotService (lazy initialization)."""
         if self._spot_service is None:
-            self._spot_service = SpotService()
+            self._spot_service = SpotService(shared_cache=self._shared_cache)
         return self._spot_service
 
     def _get_orphaned_service(self) -> OrphanedResourcesService:
@@ -211,7 +347,7 @@ class ToolHandlers(DatabricksHandlers, GitHubPricingHandlers):
             locations=arguments["locations"],
         )
         response_text = format_spot_eviction_rates_response(result)
-        return [TextContent(type="text", text=response_text)]
+        return text_response(response_text, result)
 
     async def handle_spot_price_history(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle spot_price_history tool calls."""
@@ -222,7 +358,7 @@ class ToolHandlers(DatabricksHandlers, GitHubPricingHandlers):
             os_type=arguments.get("os_type", "linux"),
         )
         response_text = format_spot_price_history_response(result)
-        return [TextContent(type="text", text=response_text)]
+        return text_response(response_text, result)
 
     async def handle_simulate_eviction(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle simulate_eviction tool calls."""
@@ -231,7 +367,7 @@ class ToolHandlers(DatabricksHandlers, GitHubPricingHandlers):
             vm_resource_id=arguments["vm_resource_id"],
         )
         response_text = format_simulate_eviction_response(result)
-        return [TextContent(type="text", text=response_text)]
+        return text_response(response_text, result)
 
     async def handle_find_orphaned_resources(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle find_orphaned_resources tool calls."""
@@ -239,9 +375,11 @@ class ToolHandlers(DatabricksHandlers, GitHubPricingHandlers):
         result = await orphaned_service.find_orphaned_resources(
             days=arguments.get("days", 60),
             all_subscriptions=arguments.get("all_subscriptions", True),
+            progress=current_progress(),
         )
-        response_text = format_orphaned_resources_response(result)
-        return [TextContent(type="text", text=response_text)]
+        with span("format"):
+            response_text = format_orphaned_resources_response(result)
+        return text_response(response_text, result)
 
     async def handle_ptu_sizing(self, arguments: dict[str, Any]) -> list[TextContent]:
         """Handle azure_ptu_sizing tool calls."""
@@ -258,7 +396,7 @@ class ToolHandlers(DatabricksHandlers, GitHubPricingHandlers):
             currency_code=arguments.get("currency_code", "USD"),
         )
         response_text = format_ptu_sizing_response(result)
-        return [TextContent(type="text", text=response_text)]
+        return text_response(response_text, result)
 
 
 def register_tool_handlers(server: Any, tool_handlers: ToolHandlers) -> None:
@@ -269,9 +407,10 @@ def register_tool_handlers(server: Any, tool_handlers: ToolHandlers) -> None:
         tool_handlers: The ToolHandlers instance
     """
 
-    @server.call_tool()
-    async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
-        """Handle tool calls."""
+    batch_limiter = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def dispatch(name: str, arguments: dict[str, Any]) -> list[TextContent]:
+        """Route a tool call to its handler."""
         try:
             if name == "azure_price_search":
                 return await tool_handlers.handle_price_search(arguments)
@@ -294,6 +433,21 @@ def register_tool_handlers(server: Any, tool_handlers: ToolHandlers) -> None:
             elif name == "azure_ri_pricing":
                 return await tool_handlers.handle_ri_pricing(arguments)
 
+            elif name == "azure_cost_matrix":
+                return await tool_handlers.handle_cost_matrix(arguments)
+
+            elif name == "azure_bom_region_optimizer":
+                return await tool_handlers.handle_bom_region(arguments)
+
+            elif name == "azure_vm_price_performance":
+                return await tool_handlers.handle_vm_price_performance(arguments)
+
+            elif name == "azure_coverage_optimizer":
+                return await tool_handlers.handle_coverage_optimizer(arguments)
+
+            elif name == "azure_tco_projection":
+                return await tool_handlers.handle_tco_projection(arguments)
+
             elif name == "get_customer_discount":
                 return await tool_handlers.handle_customer_discount(arguments)
 
@@ -332,9 +486,26 @@ def register_tool_handlers(server: Any, tool_handlers: ToolHandlers) -> None:
             elif name == "github_cost_estimate":
                 return await tool_handlers.handle_github_cost_estimate(arguments)
 
+            # Batch meta-tool: each call goes back through this dispatcher, without its own progress
+            elif name == BATCH_TOOL_NAME:
+                progress = ProgressReporter.from_request_context(server)
+                result = await run_batch(arguments.get("calls"), dispatch, batch_limiter, progress=progress)
+                return [TextContent(type="text", text=format_batch_response(result))]
+
             else:
-                return [TextContent(type="text", text=f"Unknown tool: {name}")]
+                return error_response(f"Unknown tool: {name}")
 
         except Exception as e:
             logger.error(f"Error handling tool call {name}: {e}")
-            return [TextContent(type="text", text=f"Error: {str(e)}")]
+            return error_response(f"Error: {str(e)}")
+
+    @server.call_tool()
+    async def handle_call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
+        """Handle tool calls."""
+        progress = None if name == BATCH_TOOL_NAME else ProgressReporter.from_request_context(server)
+        try:
+            with progress_scope(progress):
+                return await dispatch(name, arguments)
+        except asyncio.CancelledError:
+            logger.info(f"Tool call {name} cancelled")
+            raise
@@ -0,0 +1,33 @@
+"""Lazy package exports for Azure Pricing MCP Server.
+
+Packages list their public names and the submodule defining each; the
+submodule is imported on first attribute access (PEP 562), so importing the
+server does not load every service, formatter and handler up front.
+"""
+
+import importlib
+from collections.abc import Callable
+from typing import Any
+
+
+def lazy_exports(package: str, exports: dict[str, str]) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Build module-level ``__getattr__`` and ``__dir__`` for *package*.
+
+    Args:
+        package: The package's ``__name__``.
+        exports: Exported name -> relative submodule (e.g. ``{"PricingService": ".pricing"}``).
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,261 @@
+"""Metrics for Azure Pricing MCP Server.
+
+Counters and latency histograms for tool calls, upstream HTTP requests and
+caches, kept in process and rendered in the Prometheus text exposition
+format (no client library needed):
+
+- ``azure_pricing_tool_calls_total{tool,outcome}`` and ``azure_pricing_tool_duration_seconds{tool}``
+- ``azure_pricing_upstream_requests_total{host,status}``, ``azure_pricing_upstream_duration_seconds{host}``
+  and ``azure_pricing_upstream_retries_total{host,reason}``
+- ``azure_pricing_cache_requests_total{cache,result}``
+
+State held elsewhere (dispatcher load, cache sizes, warm-up counters) is
+read when metrics are rendered. Exposed on ``/metrics`` by the HTTP
+transports and through the ``server_metrics`` tool. With several workers
+each process reports its own metrics.
+"""
+
+import math
+from typing import Any
+
+METRICS_TOOL_NAME = "server_metrics"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans a cached lookup (~1 ms) to a long paginated scan
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = tuple[str, ...]
+# (name, type, help, label names, samples) of a family rendered from live state
+MetricFamily = tuple[str, str, str, tuple[str, ...], list[tuple[Labels, float]]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: Labels, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def items(self) -> list[tuple[Labels, float]]:
+        return sorted(self._values.items())
+
+    def render(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self.items()
+        ]
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count], sum
+        self._counts: dict[Labels, list[int]] = {}
+        self._sums: dict[Labels, float] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        counts = self._counts.setdefault(labels, [0] * (len(self.buckets) + 1))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        self._sums[labels] = self._sums.get(labels, 0.0) + value
+
+    def count(self, *labels: str) -> int:
+        return sum(self._counts.get(labels, ()))
+
+    def total(self, *labels: str) -> float:
+        return self._sums.get(labels, 0.0)
+
+    def quantile(self, q: float, *labels: str) -> float | None:
+        """Upper bound of the bucket holding the *q* quantile (None without observations)."""
+        counts = self._counts.get(labels)
+        if not counts:
+            return None
+        target = q * sum(counts)
+        running = 0
+        for bound, bucket in zip((*self.buckets, math.inf), counts, strict=True):
+            running += bucket
+            if running >= target and bucket:
+                return bound
+        return math.inf
+
+    def label_sets(self) -> list[Labels]:
+        return sorted(self._counts)
+
+    def render(self) -> list[str]:
+        lines = []
+        for labels in self.label_sets():
+            running = 0
+            for bound, bucket in zip((*self.buckets, math.inf), self._counts[labels], strict=True):
+                running += bucket
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {running}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(self._sums[labels])}")
+            lines.append(f"{self.name}_count{label_text} {running}")
+        return lines
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._sums.clear()
+
+
+class MetricsRegistry:
+    """Named metrics of one process."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        metric = self._metrics.setdefault(name, Counter(name, documentation, labelnames))
+        assert isinstance(metric, Counter)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = self._metrics.setdefault(name, Histogram(name, documentation, labelnames, buckets))
+        assert isinstance(metric, Histogram)
+        return metric
+
+    def render(self, state: list[MetricFamily] | None = None) -> str:
+        """Prometheus text exposition of all metrics.
+
+        Args:
+            state: Extra families read from live objects at render time, e.g. dispatcher load.
+        """
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        for name, kind, documentation, labelnames, samples in state or []:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(
+                f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}" for labels, value in samples
+            )
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Zero every metric (tests, or after an admin flush)."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+METRICS = MetricsRegistry()
+
+TOOL_CALLS = METRICS.counter(
+    "azure_pricing_tool_calls_total",
+    "Tool calls by outcome (ok, cached, error, cancelled, exception, refused)",
+    ("tool", "outcome"),
+)
+TOOL_DURATION = METRICS.histogram("azure_pricing_tool_duration_seconds", "Tool call latency", ("tool",))
+UPSTREAM_REQUESTS = METRICS.counter(
+    "azure_pricing_upstream_requests_total", "Upstream HTTP requests by status code (or 'error')", ("host", "status")
+)
+UPSTREAM_DURATION = METRICS.histogram(
+    "azure_pricing_upstream_duration_seconds", "Upstream HTTP request latency per attempt", ("host",)
+)
+UPSTREAM_RETRIES = METRICS.counter(
+    "azure_pricing_upstream_retries_total", "Upstream requests retried, by reason", ("host", "reason")
+)
+CACHE_REQUESTS = METRICS.counter(
+    "azure_pricing_cache_requests_total", "Cache lookups by result (hit, miss, error)", ("cache", "result")
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup."""
+    CACHE_REQUESTS.inc(cache, "hit" if hit else "miss")
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else (round(seconds * 1000, 1) if math.isfinite(seconds) else math.inf)
+
+
+def snapshot() -> dict[str, Any]:
+    """Summary of the counters for the ``server_metrics`` tool: per tool, upstream host and cache."""
+    tools: dict[str, dict[str, Any]] = {}
+    for (tool, outcome), value in TOOL_CALLS.items():
+        tools.setdefault(tool, {"calls": 0, "outcomes": {}})
+        tools[tool]["calls"] += int(value)
+        tools[tool]["outcomes"][outcome] = int(value)
+    for (tool,) in TOOL_DURATION.label_sets():
+        entry = tools.setdefault(tool, {"calls": 0, "outcomes": {}})
+        count = TOOL_DURATION.count(tool)
+        entry["mean_ms"] = _ms(TOOL_DURATION.total(tool) / count)
+        entry["p95_ms"] = _ms(TOOL_DURATION.quantile(0.95, tool))
+
+    hosts: dict[str, dict[str, Any]] = {}
+    for (host, status), value in UPSTREAM_REQUESTS.items():
+        entry = hosts.setdefault(host, {"requests": 0, "statuses": {}, "retries": 0})
+        entry["requests"] += int(value)
+        entry["statuses"][status] = int(value)
+    for (host, _reason), value in UPSTREAM_RETRIES.items():
+        hosts.setdefault(host, {"requests": 0, "statuses": {}, "retries": 0})["retries"] += int(value)
+    for (host,) in UPSTREAM_DURATION.label_sets():
+        entry = hosts.setdefault(host, {"requests": 0, "statuses": {}, "retries": 0})
+        entry["mean_ms"] = _ms(UPSTREAM_DURATION.total(host) / UPSTREAM_DURATION.count(host))
+        entry["p95_ms"] = _ms(UPSTREAM_DURATION.quantile(0.95, host))
+    for entry in hosts.values():
+        entry["rate_limited"] = entry["statuses"].get("429", 0)
+
+    caches: dict[str, dict[str, Any]] = {}
+    for (cache, result), value in CACHE_REQUESTS.items():
+        caches.setdefault(cache, {"hit": 0, "miss": 0, "error": 0})[result] = int(value)
+    for entry in caches.values():
+        lookups = entry["hit"] + entry["miss"]
+        entry["hit_rate"] = round(entry["hit"] / lookups, 4) if lookups else 0.0
+
+    return {"tools": tools, "upstream": hosts, "caches": caches}
@@ -0,0 +1,187 @@
+"""On-demand tool call profiling for Azure Pricing MCP Server.
+
+Runs a sampled fraction of tool calls, or the calls of one named tool, under
+``cProfile`` so CPU hot spots (response formatting, retirement markdown
+parsing, bulk estimate aggregation, price item discounting) can be found in
+production without an instrumented build:
+
+- ``AZURE_PRICING_PROFILE_SAMPLE_RATE`` and ``AZURE_PRICING_PROFILE_TOOL`` set
+  the selection at startup; the ``server_profiling`` admin tool changes it at
+  runtime
+- Each profile is saved as ``<tool>-<arguments hash>-<timestamp>.prof`` in
+  ``AZURE_PRICING_PROFILE_DIR`` (load it with ``pstats`` or snakeviz); only the
+  newest ``AZURE_PRICING_PROFILE_MAX_FILES`` files are kept
+
+The profiler sees everything the event loop runs while the call is in
+flight, including other concurrent calls, so one call is profiled at a time
+and a quiet period gives the cleanest profile. Cache hits are not profiled.
+"""
+
+import cProfile
+import hashlib
+import io
+import json
+import logging
+import os
+import random
+import re
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from typing import Any, TypeVar
+
+from .config import PROFILE_DIR, PROFILE_MAX_FILES, PROFILE_SAMPLE_RATE, PROFILE_TOOL
+
+logger = logging.getLogger(__name__)
+
+PROFILING_TOOL_NAME = "server_profiling"
+
+T = TypeVar("T")
+
+# Tool names used in profile file names; anything else (path separators, dots) is not saved
+_FILE_NAME_PART = re.compile(r"[\w-]+")
+
+
+def arguments_hash(arguments: dict[str, Any] | None) -> str:
+    """Short stable hash of a call's arguments, used in profile file names."""
+    encoded = json.dumps(arguments or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:12]
+
+
+class ToolProfiler:
+    """Profile selected tool calls with cProfile and save the results."""
+
+    def __init__(
+        self,
+        sample_rate: float = PROFILE_SAMPLE_RATE,
+        tool: str | None = PROFILE_TOOL or None,
+        directory: str = PROFILE_DIR,
+        max_files: int = PROFILE_MAX_FILES,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        """
+        Args:
+            sample_rate: Fraction of selected calls profiled (0 disables unless *tool* is set).
+            tool: Profile only this tool's calls; every call when *sample_rate* is 0.
+            directory: Where profile files are written.
+            max_files: Newest profile files kept in *directory*.
+            rng: Random source for sampling (tests).
+        """
+        self.sample_rate = 0.0
+        self.tool: str | None = None
+        self.configure(sample_rate, tool)
+        self.directory = directory
+        self._max_files = max_files
+        self._rng = rng
+        self._active = False
+        self._profiled = 0
+        self._skipped_busy = 0
+        self._last_profile: str | None = None
+
+    def configure(self, sample_rate: float | None = None, tool: str | None = None) -> None:
+        """Change the selection; *tool* ``""`` profiles all tools again, None leaves it unchanged."""
+        if sample_rate is not None:
+            self.sample_rate = min(max(float(sample_rate), 0.0), 1.0)
+        if tool is not None:
+            self.tool = tool or None
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 or self.tool is not None
+
+    def should_profile(self, name: str) -> bool:
+        """Whether this call of *name* is selected for profiling."""
+        if not self.enabled or (self.tool is not None and name != self.tool):
+            return False
+        rate = self.sample_rate if self.sample_rate > 0 else 1.0
+        return rate >= 1.0 or self._rng() < rate
+
+    async def run(self, name: str, arguments: dict[str, Any] | None, call: Callable[[], Awaitable[T]]) -> T:
+        """Await *call*, under the profiler when the call is selected."""
+        if not self.should_profile(name):
+            return await call()
+        if self._active:
+            # cProfile covers the whole thread; overlapping profiles would mix calls
+            self._skipped_busy += 1
+            return await call()
+
+        # Hash before handlers modify the arguments in place
+        digest = arguments_hash(arguments)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Another profiler (e.g. a debugger or coverage) holds the hook
+            logger.warning(f"Cannot profile {name}: {e}")
+            return await call()
+        self._active = True
+        started = time.perf_counter()
+        try:
+            return await call()
+        finally:
+            profile.disable()
+            self._active = False
+            self._save(profile, name, digest, time.perf_counter() - started)
+
+    def _save(self, profile: cProfile.Profile, name: str, digest: str, elapsed: float) -> None:
+        if not _FILE_NAME_PART.fullmatch(name):
+            logger.warning(f"Not saving profile of {name!r}: not a valid tool name")
+            return
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        path = os.path.join(self.directory, f"{name}-{digest}-{stamp}.prof")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(path)
+        except OSError as e:
+            logger.warning(f"Could not save profile {path}: {e}")
+            return
+        self._profiled += 1
+        self._last_profile = path
+        logger.info(f"Profiled {name} ({elapsed * 1000:.0f} ms) to {path}")
+        self._prune()
+
+    def _prune(self) -> None:
+        for path in self.profiles()[self._max_files :]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.debug(f"Could not remove old profile {path}: {e}")
+
+    def profiles(self) -> list[str]:
+        """Saved profile files, newest first."""
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith(".prof")]
+        except OSError:
+            return []
+        # Newest by mtime; the timestamped name breaks ties within one clock tick
+        dated = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                dated.append((os.path.getmtime(path), name, path))
+            except OSError:
+                continue  # removed by another worker meanwhile
+        return [path for _, _, path in sorted(dated, reverse=True)]
+
+    @staticmethod
+    def top_functions(path: str, limit: int = 15) -> str:
+        """The *limit* functions with the most cumulative time in a saved profile, as pstats text."""
+        import pstats
+
+        out = io.StringIO()
+        pstats.Stats(path, stream=out).strip_dirs().sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def stats(self) -> dict[str, Any]:
+        """Selection, counters and the saved profiles."""
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "tool": self.tool,
+            "directory": self.directory,
+            "max_files": self._max_files,
+            "profiled": self._profiled,
+            "skipped_busy": self._skipped_busy,
+            "last_profile": self._last_profile,
+            "profiles": self.profiles(),
+        }
@@ -0,0 +1,101 @@
+"""MCP progress notifications for long-running tools.
+
+Tools that work through many sub-tasks (resources in a bulk estimate,
+Resource Graph queries and cost lookups for orphaned resources, batched
+price queries for region sweeps) report each finished sub-task through a
+``ProgressReporter``:
+
+- a ``notifications/progress`` message with completed / total counts, sent
+  when the client supplied a progress token with the request
+- a ``notifications/message`` log entry carrying the partial result chunk,
+  so clients can act on early results and keep them if the call times out
+
+The reporter for the current tool call is published in a context variable by
+the server; handlers pass it explicitly to the services. Notification
+failures are logged and never fail the tool call.
+"""
+
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PARTIAL_RESULT_LOGGER = "azure_pricing_mcp.progress"
+
+_current_progress: ContextVar["ProgressReporter | None"] = ContextVar("azure_pricing_progress", default=None)
+
+
+class ProgressReporter:
+    """Send progress and partial results for one tool call."""
+
+    def __init__(
+        self,
+        session: Any = None,
+        progress_token: str | int | None = None,
+        request_id: str | int | None = None,
+    ) -> None:
+        self._session = session
+        self._progress_token = progress_token
+        self._request_id = request_id
+        self.total: float | None = None
+        self.completed = 0
+
+    @classmethod
+    def from_request_context(cls, server: Any) -> "ProgressReporter":
+        """Reporter for the request being handled by *server* (inactive outside a request)."""
+        try:
+            ctx = server.request_context
+        except LookupError:
+            return cls()
+        token = ctx.meta.progressToken if ctx.meta is not None else None
+        return cls(ctx.session, token, ctx.request_id)
+
+    @property
+    def active(self) -> bool:
+        """Whether the client asked for progress (sent a progress token)."""
+        return self._session is not None and self._progress_token is not None
+
+    def add_total(self, count: int) -> None:
+        """Announce *count* more sub-tasks."""
+        self.total = (self.total or 0) + count
+
+    async def advance(self, message: str | None = None, partial: dict[str, Any] | None = None, count: int = 1) -> None:
+        """Mark *count* sub-tasks finished, optionally with their partial result."""
+        self.completed += count
+        if not self.active:
+            return
+        try:
+            await self._session.send_progress_notification(
+                self._progress_token,
+                self.completed,
+                total=self.total,
+                message=message,
+                related_request_id=self._request_id,
+            )
+            if partial is not None:
+                await self._session.send_log_message(
+                    level="info",
+                    data={"type": "partial_result", "progress": self.completed, "total": self.total, **partial},
+                    logger=PARTIAL_RESULT_LOGGER,
+                    related_request_id=self._request_id,
+                )
+        except Exception as exc:
+            logger.debug(f"Failed to send progress notification: {exc}")
+
+
+def current_progress() -> ProgressReporter | None:
+    """Progress reporter of the tool call being handled, if any."""
+    return _current_progress.get()
+
+
+@contextmanager
+def progress_scope(reporter: ProgressReporter | None) -> Iterator[None]:
+    """Publish *reporter* as the current tool call's reporter."""
+    token = _current_progress.set(reporter)
+    try:
+        yield
+    finally:
+        _current_progress.reset(token)
@@ -10,22 +10,58 @@ Version 3.0.0 Breaking Changes:
 """
 
 import asyncio
+import contextlib
 import logging
-from typing import Any, Literal, overload
+import os
+import signal
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from typing import TYPE_CHECKING, Any, Literal, overload
 
 from mcp.server import NotificationOptions, Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
+from .batch import BATCH_TOOL_NAME, run_batch
+from .cache import CACHE_TOOL_NAME, CacheBackend, create_cache_backend
 from .client import AzurePricingClient
-from .handlers import ToolHandlers
-from .services import DatabricksService, PricingService, RetirementService, SKUService
+from .config import (
+    BATCH_CONCURRENCY,
+    CACHE_ADMIN,
+    CACHE_PREWARM_MAX_QUERIES,
+    HTTP_JSON_RESPONSE,
+    HTTP_STATELESS,
+    HTTP_WORKERS,
+    PREWARM_CONNECTIONS,
+    PREWARM_ENABLED,
+    PROFILING_ADMIN,
+    SHUTDOWN_DRAIN_SECONDS,
+    WARMUP_ENABLED,
+)
+from .dispatch import TOOL_ROUTES, ToolDispatcher
+from .metrics import METRICS, METRICS_TOOL_NAME, PROMETHEUS_CONTENT_TYPE, TOOL_CALLS, TOOL_DURATION, snapshot
+from .profiling import PROFILING_TOOL_NAME, ToolProfiler
+from .progress import ProgressReporter, progress_scope
+from .services import DatabricksService, PriceSheet, PricingService, RetirementService, SKUService
+from .tool_cache import ToolResultCache, is_error_response
 from .tools import get_tool_definitions
+from .tracing import start_trace
+from .warmup import CacheWarmer
+
+if TYPE_CHECKING:
+    from .handlers import ToolHandlers
+    from .services import SpotService
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Caches the server_cache tool reports and flushes
+CACHE_NAMES = ("tool", "prices", "retirement", "spot", "shared")
+
+SHUTTING_DOWN_ERROR = "Error: Server is shutting down. Retry shortly."
+
 
 class AzurePricingServer:
     """Azure Pricing MCP Server - coordinates all services.
@@ -38,14 +74,33 @@ class AzurePricingServer:
             result = await pricing_server.tool_handlers.handle_price_search(...)
     """
 
-    def __init__(self) -> None:
+    def __init__(self, shared_cache: CacheBackend | None = None) -> None:
         self._client = AzurePricingClient()
-        self._retirement_service = RetirementService(self._client)
-        self._pricing_service = PricingService(self._client, self._retirement_service)
+        # Second-level cache shared with other worker processes (AZURE_PRICING_CACHE_BACKEND)
+        self._shared_cache = shared_cache or create_cache_backend()
+        self._retirement_service = RetirementService(self._client, self._shared_cache)
+        self._pricing_service = PricingService(
+            self._client, self._retirement_service, PriceSheet.from_config(), self._shared_cache
+        )
         self._sku_service = SKUService(self._pricing_service)
         # Lazy-initialized services (created on first use)
         self._databricks_service: DatabricksService | None = None
         self._tool_handlers: ToolHandlers | None = None
+        price_sheet = self._pricing_service.price_sheet
+        self._tool_cache = ToolResultCache(price_sheet_version=price_sheet.version if price_sheet else None)
+        # Shared by all batch tool calls
+        self._batch_limiter = asyncio.Semaphore(BATCH_CONCURRENCY)
+        self._dispatcher = ToolDispatcher()
+        self._cache_warmer = CacheWarmer(
+            self._tool_cache,
+            lambda name, arguments: self._dispatcher.dispatch(self.tool_handlers, name, arguments),
+            self._batch_limiter,
+        )
+        self._profiler = ToolProfiler()
+        self._prewarm_task: asyncio.Task[None] | None = None
+        # Tasks of tool calls in flight, drained (then cancelled) on shutdown
+        self._in_flight: set[asyncio.Task[Any]] = set()
+        self._draining = False
         self._session_active = False
 
     @property
@@ -56,35 +111,129 @@ class AzurePricingServer:
 
     async def __aenter__(self) -> "AzurePricingServer":
         """Async context manager entry - initializes the HTTP session."""
-        if not self._session_active:
-            await self._client.__aenter__()
-            self._session_active = True
+        await self.initialize()
         return self
 
     async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
-        """Async context manager exit - closes the HTTP session."""
+        """Async context manager exit - drains tool calls, then closes the HTTP session and shared cache."""
+        await self.drain()
         if self._session_active:
             await self._client.__aexit__(exc_type, exc_val, exc_tb)
             self._session_active = False
+        await self._shared_cache.close()
 
-    async def initialize(self) -> None:
+    async def initialize(self, prewarm: bool = False) -> None:
         """Initialize the server's HTTP session.
 
         Call this method to start the session without using context manager.
         Remember to call shutdown() when done.
+
+        Args:
+            prewarm: Also start pre-warming in the background (see ``start_prewarm``).
         """
         if not self._session_active:
             await self._client.__aenter__()
             self._session_active = True
+            self._draining = False
+            try:
+                # Rows left by earlier runs are otherwise only swept on later writes
+                await self._shared_cache.purge_expired()
+            except Exception as e:
+                logger.warning(f"Could not purge expired shared cache entries: {e}")
+        if prewarm:
+            self.start_prewarm()
+
+    def start_prewarm(self) -> "asyncio.Task[None] | None":
+        """Start pre-warming in the background; returns immediately.
+
+        Opens pooled connections to the pricing API and prefetches VM
+        retirement data (which also connects to GitHub), so the first tool
+        call does not pay for DNS, TCP and TLS setup. Does nothing when the
+        session is not active or pre-warming already started.
+        """
+        if not self._session_active:
+            return None
+        if self._prewarm_task is None:
+            self._prewarm_task = asyncio.create_task(self.prewarm())
+        return self._prewarm_task
+
+    async def prewarm(self) -> None:
+        """Open pooled connections and load retirement data (errors are logged, never raised)."""
+        connections, retirement = await asyncio.gather(
+            self._client.prewarm(PREWARM_CONNECTIONS),
+            self._retirement_service.get_retirement_data(),
+            return_exceptions=True,
+        )
+        if isinstance(connections, BaseException):
+            logger.warning(f"Connection pre-warming failed: {connections}")
+        if isinstance(retirement, BaseException):
+            logger.warning(f"Retirement data prefetch failed: {retirement}")
+        else:
+            logger.info(f"Prefetched retirement data for {len(retirement)} VM series")
+
+    def start_warmup(self) -> "asyncio.Task[None] | None":
+        """Start re-running the most frequent logged queries into the tool result cache (see warmup.py)."""
+        if not self._session_active:
+            return None
+        return self._cache_warmer.start()
+
+    async def _stop_prewarm(self) -> None:
+        """Cancel pre-warming that is still running before the session closes."""
+        task, self._prewarm_task = self._prewarm_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    @contextlib.contextmanager
+    def track_call(self) -> Iterator[None]:
+        """Count the current task as an in-flight tool call until the block exits (see ``drain``)."""
+        task = asyncio.current_task()
+        if task is None:
+            yield
+            return
+        self._in_flight.add(task)
+        try:
+            yield
+        finally:
+            self._in_flight.discard(task)
+
+    async def drain(self, timeout: float = SHUTDOWN_DRAIN_SECONDS) -> int:
+        """Stop admitting tool calls and let the ones in flight finish.
+
+        New calls are refused with a retryable error from here on. Pre-warming
+        and the warm-up loop are cancelled (the query log is saved), then calls
+        in flight get *timeout* seconds; any still running are cancelled.
+        Safe to call more than once. Returns the number of calls cancelled.
+        """
+        self._draining = True
+        await self._stop_prewarm()
+        await self._cache_warmer.stop()
+
+        current = asyncio.current_task()
+        pending = {task for task in self._in_flight if task is not current and not task.done()}
+        if not pending:
+            return 0
+        logger.info(f"Draining {len(pending)} in-flight tool calls (up to {timeout:g}s)")
+        _, pending = await asyncio.wait(pending, timeout=max(timeout, 0))
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning(f"Cancelled {len(pending)} tool calls still running after {timeout:g}s")
+        return len(pending)
 
     async def shutdown(self) -> None:
         """Shutdown the server's HTTP session.
 
         Call this method to close the session when not using context manager.
+        In-flight tool calls are drained first (see ``drain``).
         """
+        await self.drain()
         if self._session_active:
             await self._client.__aexit__(None, None, None)
             self._session_active = False
+        await self._shared_cache.close()
 
     @property
     def is_active(self) -> bool:
@@ -92,13 +241,182 @@ class AzurePricingServer:
         return self._session_active
 
     @property
-    def tool_handlers(self) -> ToolHandlers:
+    def is_draining(self) -> bool:
+        """Whether shutdown has started and new tool calls are refused."""
+        return self._draining
+
+    @property
+    def tool_cache(self) -> ToolResultCache:
+        """Cache of formatted tool responses, keyed on tool name and normalized arguments."""
+        return self._tool_cache
+
+    @property
+    def shared_cache(self) -> CacheBackend:
+        """Cache of pricing, retirement and Spot results shared with other workers."""
+        return self._shared_cache
+
+    @property
+    def cache_warmer(self) -> CacheWarmer:
+        """Query log and predictive warm-up of the tool result cache."""
+        return self._cache_warmer
+
+    @property
+    def profiler(self) -> ToolProfiler:
+        """Sampled cProfile profiling of tool calls (``server_profiling`` tool)."""
+        return self._profiler
+
+    def _loaded_spot_service(self) -> "SpotService | None":
+        return self._tool_handlers.loaded_spot_service if self._tool_handlers is not None else None
+
+    async def cache_stats(self, oldest: int = 5) -> dict[str, dict[str, Any]]:
+        """Entries, approximate memory, hit rate and oldest entries of each cache (``server_cache`` tool)."""
+        spot = self._loaded_spot_service()
+        caches: dict[str, dict[str, Any]] = {
+            "tool": self._tool_cache.inspect(oldest),
+            "prices": self._pricing_service.cache_stats(oldest),
+            "retirement": self._retirement_service.cache_stats(oldest),
+            "spot": spot.cache_stats(oldest) if spot is not None else {"entries": 0, "bytes": 0, "oldest": []},
+        }
+        try:
+            caches["shared"] = await self._shared_cache.stats(oldest)
+        except Exception as e:
+            logger.warning(f"Could not read shared cache stats: {e}")
+            caches["shared"] = {"backend": self._shared_cache.name, "error": str(e), "oldest": []}
+
+        # Labels the lookups of each cache are counted under (see metrics.py)
+        labels = {"prices": "request_dedup", "shared": f"shared_{self._shared_cache.name}"}
+        lookups = snapshot()["caches"]
+        for name, stats in caches.items():
+            counts = lookups.get(labels.get(name, name))
+            stats["hits"] = counts["hit"] if counts else 0
+            stats["misses"] = counts["miss"] if counts else 0
+            stats["hit_rate"] = counts["hit_rate"] if counts else None
+        return caches
+
+    async def flush_caches(
+        self, cache: str = "all", prefix: str | None = None, key: str | None = None
+    ) -> dict[str, int]:
+        """Drop entries from one cache or all of them: every entry, one *key* or keys starting with *prefix*.
+
+        For the tool result cache, *prefix* matches tool names. Returns the number removed per cache.
+        """
+        removed: dict[str, int] = {}
+        for name in CACHE_NAMES if cache == "all" else (cache,):
+            if name == "tool":
+                removed[name] = self._tool_cache.clear(prefix=prefix, key=key)
+            elif name == "prices":
+                removed[name] = self._pricing_service.clear_cache(prefix, key)
+            elif name == "retirement":
+                removed[name] = self._retirement_service.clear_cache(prefix, key)
+            elif name == "spot":
+                spot = self._loaded_spot_service()
+                removed[name] = spot.clear_cache(prefix, key) if spot is not None else 0
+            elif name == "shared":
+                removed[name] = await self._flush_shared(prefix, key)
+        logger.info(f"Flushed caches (prefix={prefix!r}, key={key!r}): {removed}")
+        return removed
+
+    async def _flush_shared(self, prefix: str | None, key: str | None) -> int:
+        try:
+            if key is None:
+                return await self._shared_cache.clear(prefix or "")
+            found = await self._shared_cache.get(key) is not None
+            await self._shared_cache.delete(key)
+            return int(found)
+        except Exception as e:
+            logger.warning(f"Could not flush the shared cache: {e}")
+            return 0
+
+    def metrics(self) -> dict[str, Any]:
+        """Metrics summary with dispatcher, tool cache and warm-up state (``server_metrics`` tool)."""
+        return {
+            **snapshot(),
+            "dispatcher": self._dispatcher.stats(),
+            "tool_cache": self._tool_cache.stats(),
+            "warmup": self._cache_warmer.stats(),
+        }
+
+    def metrics_text(self) -> str:
+        """All metrics in the Prometheus text format (``/metrics``), including current dispatcher load."""
+        dispatch = self._dispatcher.stats()
+        cache = self._tool_cache.stats()
+        warmup = self._cache_warmer.stats()
+        return METRICS.render(
+            [
+                (
+                    "azure_pricing_dispatch_running",
+                    "gauge",
+                    "Tool calls running",
+                    ("tool",),
+                    [((tool,), stats["running"]) for tool, stats in dispatch.items()],
+                ),
+                (
+                    "azure_pricing_dispatch_queued",
+                    "gauge",
+                    "Tool calls waiting for a slot",
+                    ("tool",),
+                    [((tool,), stats["queued"]) for tool, stats in dispatch.items()],
+                ),
+                (
+                    "azure_pricing_dispatch_rejected_total",
+                    "counter",
+                    "Tool calls rejected because the queue was full",
+                    ("tool",),
+                    [((tool,), stats["rejected"]) for tool, stats in dispatch.items()],
+                ),
+                (
+                    "azure_pricing_dispatch_timed_out_total",
+                    "counter",
+                    "Tool calls cancelled at their deadline",
+                    ("tool",),
+                    [((tool,), stats["timed_out"]) for tool, stats in dispatch.items()],
+                ),
+                (
+                    "azure_pricing_tool_cache_entries",
+                    "gauge",
+                    "Tool result cache entries",
+                    (),
+                    [((), cache["entries"])],
+                ),
+                (
+                    "azure_pricing_warmup_prefetched_total",
+                    "counter",
+                    "Queries prefetched by the cache warm-up",
+                    (),
+                    [((), warmup["prefetched"])],
+                ),
+                (
+                    "azure_pricing_warmup_hits_total",
+                    "counter",
+                    "Tool calls answered from prefetched entries",
+                    (),
+                    [((), warmup["warm_hits"])],
+                ),
+            ]
+        )
+
+    @property
+    def batch_limiter(self) -> asyncio.Semaphore:
+        """Limiter bounding how many batched tool calls run at once."""
+        return self._batch_limiter
+
+    @property
+    def dispatcher(self) -> ToolDispatcher:
+        """Dispatch table with per-tool concurrency caps, queue limits and deadlines."""
+        return self._dispatcher
+
+    @property
+    def tool_handlers(self) -> "ToolHandlers":
         """Get the tool handlers instance (lazy-initialized)."""
         if self._tool_handlers is None:
+            # Handlers pull in every formatter and service; load them on first tool call
+            from .handlers import ToolHandlers
+
             self._tool_handlers = ToolHandlers(
                 self._pricing_service,
                 self._sku_service,
                 databricks_service=self.databricks_service,
+                shared_cache=self._shared_cache,
             )
         return self._tool_handlers
 
@@ -112,52 +430,183 @@ def _register_tool_handlers(server: Server, pricing_server: AzurePricingServer)
 
     @server.call_tool()
     async def handle_call_tool(name: str, arguments: dict[str, Any]) -> Any:
-        """Handle tool calls - session must already be initialized."""
+        """Handle tool calls - session must already be initialized.
+
+        A client cancellation (or disconnect) cancels this task; the
+        CancelledError propagates into the handler and its sub-tasks. Once
+        shutdown starts, new calls are refused and this task is drained.
+        """
+        if pricing_server.is_draining:
+            # Retried on another instance; calls already running are drained
+            TOOL_CALLS.inc(name if name in TOOL_ROUTES else "unknown", "refused")
+            return [TextContent(type="text", text=SHUTTING_DOWN_ERROR)]
+        progress = ProgressReporter.from_request_context(server)
+        try:
+            with pricing_server.track_call():
+                if name == BATCH_TOOL_NAME and pricing_server.is_active:
+                    # Progress is reported per batched call, not from inside each call
+                    with start_trace("tool_call", tool=name):
+                        result = await run_batch(
+                            arguments.get("calls"),
+                            lambda tool, tool_arguments: _call_tool(pricing_server, tool, tool_arguments),
+                            pricing_server.batch_limiter,
+                            progress=progress,
+                        )
+                    from .formatters import format_batch_response
+
+                    return [TextContent(type="text", text=format_batch_response(result))]
+                if name == METRICS_TOOL_NAME:
+                    return _metrics_tool(pricing_server, arguments)
+                if name == PROFILING_TOOL_NAME:
+                    return _profiling_tool(pricing_server, arguments)
+                if name == CACHE_TOOL_NAME:
+                    return await _cache_tool(pricing_server, arguments)
+                with progress_scope(progress):
+                    return await _call_tool(pricing_server, name, arguments)
+        except asyncio.CancelledError:
+            logger.info(f"Tool call {name} cancelled")
+            raise
+
+
+async def _call_tool(pricing_server: AzurePricingServer, name: str, arguments: dict[str, Any]) -> Any:
+    """Run one tool call through the result cache, then the dispatcher's admission control."""
+    if not pricing_server.is_active:
+        return [TextContent(type="text", text="Error: Server session not initialized")]
+
+    # Unknown names share one label so clients cannot grow the metric set
+    label = name if name in TOOL_ROUTES else "unknown"
+    started = time.perf_counter()
+    outcome = "exception"
+    with start_trace("tool_call", tool=label) as trace:
+        try:
+            # Key on the arguments before handlers pop/resolve them in place
+            cache = pricing_server.tool_cache
+            cache_key = cache.key(name, arguments)
+            cached = cache.get(name, cache_key)
+            pricing_server.cache_warmer.record(name, cache_key, arguments, hit=cached is not None)
+            if cached is not None:
+                outcome = "cached"
+                return cached
+
+            def dispatch() -> Awaitable[Any]:
+                return pricing_server.dispatcher.dispatch(pricing_server.tool_handlers, name, arguments)
+
+            # Unknown names are rejected by the dispatcher and never profiled
+            if label in TOOL_ROUTES:
+                result = await pricing_server.profiler.run(name, arguments, dispatch)
+            else:
+                result = await dispatch()
+            if isinstance(result, list):
+                outcome = "error" if is_error_response(result) else "ok"
+                cache.put(name, cache_key, result)
+            else:
+                outcome = "ok"
+            return result
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            TOOL_CALLS.inc(label, outcome)
+            TOOL_DURATION.observe(label, value=time.perf_counter() - started)
+            if trace is not None:
+                trace.set("cache_hit", outcome == "cached")
+                trace.set("outcome", outcome)
+
+
+def _metrics_tool(pricing_server: AzurePricingServer, arguments: dict[str, Any] | None) -> list[TextContent]:
+    """Answer the ``server_metrics`` admin tool."""
+    if (arguments or {}).get("format") == "prometheus":
+        return [TextContent(type="text", text=pricing_server.metrics_text())]
+    from .formatters import format_metrics_response
+
+    return [TextContent(type="text", text=format_metrics_response(pricing_server.metrics()))]
+
+
+def _profiling_tool(pricing_server: AzurePricingServer, arguments: dict[str, Any] | None) -> list[TextContent]:
+    """Answer the ``server_profiling`` admin tool: change the selection, then report it."""
+    arguments = arguments or {}
+    if PROFILING_ADMIN == "off":
+        return [
+            TextContent(type="text", text="Error: server_profiling is disabled (AZURE_PRICING_PROFILING_ADMIN=off)")
+        ]
+    if ("tool" in arguments or "sample_rate" in arguments) and PROFILING_ADMIN != "full":
+        return [
+            TextContent(
+                type="text",
+                text=f"Error: changing profiling is disabled (AZURE_PRICING_PROFILING_ADMIN={PROFILING_ADMIN})",
+            )
+        ]
+    tool = arguments.get("tool")
+    if tool and tool not in TOOL_ROUTES:
+        return [TextContent(type="text", text=f"Error: Unknown tool: {tool}")]
+    sample_rate = arguments.get("sample_rate")
+    if sample_rate is not None and not (isinstance(sample_rate, int | float) and 0 <= sample_rate <= 1):
+        return [TextContent(type="text", text="Error: sample_rate must be a number between 0 and 1")]
+    profiler = pricing_server.profiler
+    profiler.configure(sample_rate=sample_rate, tool=tool)
+
+    stats = profiler.stats()
+    top_limit = arguments.get("top", 15)
+    top = None
+    if top_limit and stats["profiles"]:
+        try:
+            top = profiler.top_functions(stats["profiles"][0], int(top_limit))
+        except (OSError, EOFError, ValueError, TypeError) as e:
+            logger.warning(f"Could not read profile {stats['profiles'][0]}: {e}")
+    from .formatters import format_profiling_response
+
+    return [TextContent(type="text", text=format_profiling_response(stats, top))]
+
+
+async def _cache_tool(pricing_server: AzurePricingServer, arguments: dict[str, Any] | None) -> list[TextContent]:
+    """Answer the ``server_cache`` admin tool: report caches, flush entries or prewarm queries."""
+    arguments = arguments or {}
+    action = arguments.get("action", "stats")
+    if CACHE_ADMIN == "off":
+        return [TextContent(type="text", text="Error: server_cache is disabled (AZURE_PRICING_CACHE_ADMIN=off)")]
+    if action not in ("stats", "flush", "prewarm"):
+        return [TextContent(type="text", text=f"Error: Unknown action '{action}' (use stats, flush or prewarm)")]
+    if action != "stats" and CACHE_ADMIN != "full":
+        return [TextContent(type="text", text=f"Error: {action} is disabled (AZURE_PRICING_CACHE_ADMIN={CACHE_ADMIN})")]
+
+    result: dict[str, Any] = {"action": action}
+    if action == "flush":
+        cache = arguments.get("cache", "all")
+        if cache != "all" and cache not in CACHE_NAMES:
+            names = ", ".join(["all", *CACHE_NAMES])
+            return [TextContent(type="text", text=f"Error: Unknown cache '{cache}' (use {names})")]
+        result["removed"] = await pricing_server.flush_caches(cache, arguments.get("prefix"), arguments.get("key"))
+    elif action == "prewarm":
         if not pricing_server.is_active:
             return [TextContent(type="text", text="Error: Server session not initialized")]
-
-        handlers = pricing_server.tool_handlers
-
-        if name == "azure_price_search":
-            return await handlers.handle_price_search(arguments)
-        elif name == "azure_price_compare":
-            return await handlers.handle_price_compare(arguments)
-        elif name == "azure_cost_estimate":
-            return await handlers.handle_cost_estimate(arguments)
-        elif name == "azure_discover_skus":
-            return await handlers.handle_discover_skus(arguments)
-        elif name == "azure_sku_discovery":
-            return await handlers.handle_sku_discovery(arguments)
-        elif name == "azure_region_recommend":
-            return await handlers.handle_region_recommend(arguments)
-        elif name == "azure_ri_pricing":
-            return await handlers.handle_ri_pricing(arguments)
-        elif name == "get_customer_discount":
-            return await handlers.handle_customer_discount(arguments)
-        elif name == "spot_eviction_rates":
-            return await handlers.handle_spot_eviction_rates(arguments)
-        elif name == "spot_price_history":
-            return await handlers.handle_spot_price_history(arguments)
-        elif name == "simulate_eviction":
-            return await handlers.handle_simulate_eviction(arguments)
-        elif name == "find_orphaned_resources":
-            return await handlers.handle_find_orphaned_resources(arguments)
-        elif name == "databricks_dbu_pricing":
-            return await handlers.handle_databricks_dbu_pricing(arguments)
-        elif name == "databricks_cost_estimate":
-            return await handlers.handle_databricks_cost_estimate(arguments)
-        elif name == "databricks_compare_workloads":
-            return await handlers.handle_databricks_compare_workloads(arguments)
-        elif name == "azure_ptu_sizing":
-            return await handlers.handle_ptu_sizing(arguments)
-        elif name == "azure_bulk_estimate":
-            return await handlers.handle_bulk_estimate(arguments)
-        elif name == "github_pricing":
-            return await handlers.handle_github_pricing(arguments)
-        elif name == "github_cost_estimate":
-            return await handlers.handle_github_cost_estimate(arguments)
+        queries = arguments.get("queries") or []
+        if not isinstance(queries, list) or not all(
+            isinstance(q, dict) and isinstance(q.get("arguments") or {}, dict) for q in queries
+        ):
+            return [TextContent(type="text", text="Error: queries must be a list of {tool, arguments} objects")]
+        if len(queries) > CACHE_PREWARM_MAX_QUERIES:
+            return [
+                TextContent(
+                    type="text",
+                    text=f"Error: {len(queries)} queries exceed the prewarm limit of {CACHE_PREWARM_MAX_QUERIES}",
+                )
+            ]
+        unknown = sorted({q.get("tool") for q in queries if q.get("tool") not in TOOL_ROUTES}, key=str)
+        if unknown:
+            return [TextContent(type="text", text=f"Error: Unknown tool(s): {', '.join(map(str, unknown))}")]
+        if queries:
+            result["warmed"] = await pricing_server.cache_warmer.warm(
+                [(q["tool"], dict(q.get("arguments") or {})) for q in queries]
+            )
         else:
-            return [TextContent(type="text", text=f"Unknown tool: {name}")]
+            # Connections and retirement data, then the most frequent logged queries
+            await pricing_server.prewarm()
+            result["warmed"] = {"hot_queries": await pricing_server.cache_warmer.warm_once()}
+
+    caches = await pricing_server.cache_stats(int(arguments.get("oldest", 5)))
+    from .formatters import format_cache_admin_response
+
+    return [TextContent(type="text", text=format_cache_admin_response(caches, result))]
 
 
 @overload
@@ -194,7 +643,13 @@ def create_server(return_pricing_server: bool = True) -> Server | tuple[Server,
     @server.list_tools()
     async def handle_list_tools() -> list[Tool]:
         """List available tools."""
-        return get_tool_definitions()
+        tools = get_tool_definitions()
+        hidden = {
+            name
+            for name, mode in ((CACHE_TOOL_NAME, CACHE_ADMIN), (PROFILING_TOOL_NAME, PROFILING_ADMIN))
+            if mode == "off"
+        }
+        return [tool for tool in tools if tool.name not in hidden]
 
     _register_tool_handlers(server, pricing_server)
 
@@ -203,23 +658,161 @@ def create_server(return_pricing_server: bool = True) -> Server | tuple[Server,
     return server
 
 
-async def main() -> None:
-    """Main entry point for the server.
+def create_streamable_http_app(stateless: bool | None = None, json_response: bool | None = None) -> Any:
+    """Create the Starlette app for the streamable HTTP transport.
 
-    This function manages the complete server lifecycle including:
-    - Parsing command-line arguments
-    - Initializing the pricing server session (kept alive for all tool calls)
-    - Running the appropriate transport (stdio or HTTP)
-    - Properly shutting down resources on exit
+    Each app owns its own MCP server and pricing session, so uvicorn can call
+    this as an app factory in every worker process. The MCP endpoint is
+    ``/mcp`` and ``/health`` answers load balancer probes (503 while
+    draining on shutdown, so new traffic goes to other instances).
+
+    Args:
+        stateless: Give every request a fresh transport with no session state,
+                  so any worker (or node) can serve any request.
+                  Defaults to AZURE_PRICING_HTTP_STATELESS.
+        json_response: Answer with JSON bodies instead of SSE streams.
+                      Defaults to AZURE_PRICING_HTTP_JSON_RESPONSE.
     """
+    from collections.abc import AsyncIterator
+
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    from starlette.applications import Starlette
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    server, pricing_server = create_server()
+    session_manager = StreamableHTTPSessionManager(
+        app=server,
+        stateless=HTTP_STATELESS if stateless is None else stateless,
+        json_response=HTTP_JSON_RESPONSE if json_response is None else json_response,
+    )
+
+    async def handle_health(request: Request) -> JSONResponse:
+        if pricing_server.is_draining:
+            return JSONResponse({"status": "draining", "stateless": session_manager.stateless}, status_code=503)
+        return JSONResponse(
+            {"status": "ok" if pricing_server.is_active else "starting", "stateless": session_manager.stateless}
+        )
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        async with pricing_server, session_manager.run():
+            if PREWARM_ENABLED:
+                pricing_server.start_prewarm()
+            if WARMUP_ENABLED:
+                pricing_server.start_warmup()
+            logger.info(f"Streamable HTTP worker {os.getpid()} ready (stateless={session_manager.stateless})")
+            restore_signals = _drain_on_shutdown_signal(pricing_server)
+            try:
+                yield
+            finally:
+                restore_signals()
+            # Before the session manager cancels the sessions still open
+            await pricing_server.drain()
+
+    app = Starlette(
+        routes=[
+            Route("/mcp", endpoint=_ASGIEndpoint(session_manager.handle_request)),
+            Route("/health", endpoint=handle_health),
+            Route("/metrics", endpoint=_metrics_endpoint(pricing_server)),
+        ],
+        lifespan=lifespan,
+    )
+    app.state.pricing_server = pricing_server
+    return app
+
+
+def _metrics_endpoint(pricing_server: AzurePricingServer) -> Any:
+    """Starlette endpoint serving ``pricing_server`` metrics in the Prometheus text format."""
+    from starlette.requests import Request
+    from starlette.responses import PlainTextResponse
+
+    async def handle_metrics(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(pricing_server.metrics_text(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    return handle_metrics
+
+
+def _drain_on_shutdown_signal(pricing_server: AzurePricingServer) -> Callable[[], None]:
+    """Start draining ``pricing_server`` as soon as the process gets SIGINT or SIGTERM.
+
+    uvicorn worker processes only reach the app's lifespan shutdown after
+    closing connections (up to the graceful timeout), so without this new
+    calls would still be admitted and ``/health`` would answer 200 meanwhile.
+    The handlers in place (uvicorn's) still run. Returns a function that
+    restores them; does nothing outside the main thread.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return lambda: None
+    loop = asyncio.get_running_loop()
+    drains: set[asyncio.Task[int]] = set()
+
+    def start_drain() -> None:
+        if not pricing_server.is_draining:
+            task = loop.create_task(pricing_server.drain())
+            drains.add(task)
+            task.add_done_callback(drains.discard)
+
+    def handle(sig: int, frame: Any) -> None:
+        loop.call_soon_threadsafe(start_drain)
+        handler = previous[sig]
+        if callable(handler):
+            handler(sig, frame)
+        elif handler == signal.SIG_DFL:
+            signal.signal(sig, handler)
+            signal.raise_signal(sig)
+
+    previous: dict[int, Any] = {sig: signal.signal(sig, handle) for sig in (signal.SIGINT, signal.SIGTERM)}
+
+    def restore() -> None:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+    return restore
+
+
+def _uvicorn_server(app: Any, pricing_server: AzurePricingServer, host: str, port: int) -> Any:
+    """uvicorn server that drains ``pricing_server`` on shutdown before closing connections.
+
+    uvicorn stops listening and then waits for open connections; draining
+    first keeps ``/health`` answering 503 and refuses new tool calls on
+    connections that are still open while in-flight calls finish.
+    """
+    import uvicorn
+
+    class _DrainingServer(uvicorn.Server):
+        async def shutdown(self, sockets: Any = None) -> None:
+            await pricing_server.drain()
+            await super().shutdown(sockets)
+
+    config = uvicorn.Config(
+        app, host=host, port=port, log_level="info", timeout_graceful_shutdown=int(SHUTDOWN_DRAIN_SECONDS)
+    )
+    return _DrainingServer(config)
+
+
+class _ASGIEndpoint:
+    """Serve a raw ASGI callable from an exact Starlette route (a Mount would redirect ``/mcp`` to ``/mcp/``)."""
+
+    def __init__(self, app: Any) -> None:
+        self._app = app
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        await self._app(scope, receive, send)
+
+
+def _parse_args(argv: list[str] | None = None) -> Any:
+    """Parse the server's command-line arguments (unknown arguments are ignored)."""
     import argparse
 
     parser = argparse.ArgumentParser(description="Azure Pricing MCP Server")
     parser.add_argument(
         "--transport",
-        choices=["stdio", "http"],
+        choices=["stdio", "http", "streamable-http"],
         default="stdio",
-        help="Transport type: stdio (for local MCP clients) or http (for remote access)",
+        help="Transport type: stdio (for local MCP clients), http (SSE, for remote access) "
+        "or streamable-http (stateless, scales across workers and nodes)",
     )
     parser.add_argument(
         "--host",
@@ -232,14 +825,88 @@ async def main() -> None:
         default=8080,
         help="Port for HTTP server (default: 8080)",
     )
+    parser.add_argument(
+        "--stateless",
+        action=argparse.BooleanOptionalAction,
+        default=HTTP_STATELESS,
+        help="streamable-http: keep no session state between requests (default: on)",
+    )
+    parser.add_argument(
+        "--json-response",
+        action=argparse.BooleanOptionalAction,
+        default=HTTP_JSON_RESPONSE,
+        help="streamable-http: answer with JSON instead of SSE streams (default: off)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=HTTP_WORKERS,
+        help="streamable-http: uvicorn worker processes (default: 1)",
+    )
+
+    args, _ = parser.parse_known_args(argv)
+    return args
+
 
-    args, _ = parser.parse_known_args()
+def _run_streamable_http_workers(args: Any) -> None:
+    """Serve the streamable HTTP transport from several uvicorn worker processes.
+
+    Workers build their own app through ``create_streamable_http_app`` and
+    read the transport settings from the environment, so the parent exports
+    the command-line choices before starting them. Unless a cache backend is
+    configured, workers share a SQLite cache so they do not each warm their own.
+    Each worker's app drains on the shutdown signal itself (see
+    ``_drain_on_shutdown_signal``), since uvicorn's own worker server is used.
+    """
+    import uvicorn
+
+    if not args.stateless:
+        logger.warning("Stateful sessions with several workers need a load balancer with session affinity")
+    os.environ["AZURE_PRICING_HTTP_STATELESS"] = str(args.stateless).lower()
+    os.environ["AZURE_PRICING_HTTP_JSON_RESPONSE"] = str(args.json_response).lower()
+    os.environ.setdefault("AZURE_PRICING_CACHE_BACKEND", "sqlite")
+    logger.info(f"Starting streamable HTTP MCP server on {args.host}:{args.port} with {args.workers} workers")
+    uvicorn.run(
+        "azure_pricing_mcp.server:create_streamable_http_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level="info",
+        timeout_graceful_shutdown=int(SHUTDOWN_DRAIN_SECONDS),
+    )
+
+
+async def main() -> None:
+    """Main entry point for the server.
+
+    This function manages the complete server lifecycle including:
+    - Parsing command-line arguments
+    - Initializing the pricing server session (kept alive for all tool calls)
+    - Running the appropriate transport (stdio, SSE or streamable HTTP)
+    - Properly shutting down resources on exit
+    """
+    args = _parse_args()
+
+    if args.transport == "streamable-http":
+        # The app manages its own pricing session; several workers need run() (no running event loop)
+        if args.workers > 1:
+            logger.warning("--workers is only honoured by the azure-pricing-mcp entry point; running one worker")
+        logger.info(f"Starting streamable HTTP MCP server on {args.host}:{args.port}/mcp")
+        http_app = create_streamable_http_app(stateless=args.stateless, json_response=args.json_response)
+        await _uvicorn_server(http_app, http_app.state.pricing_server, args.host, args.port).serve()
+        return
 
     server, pricing_server = create_server()
 
     # Initialize the pricing server session ONCE and keep it alive
     # This avoids creating a new HTTP session for every tool call
     async with pricing_server:
+        # Readiness does not wait for pre-warming
+        if PREWARM_ENABLED:
+            pricing_server.start_prewarm()
+        if WARMUP_ENABLED:
+            pricing_server.start_warmup()
         if args.transport == "http":
             # Use HTTP transport for remote access (Docker use case)
             from mcp.server.sse import SseServerTransport
@@ -263,14 +930,12 @@ async def main() -> None:
             app = Starlette(
                 routes=[
                     Route("/sse", endpoint=handle_sse),
+                    Route("/metrics", endpoint=_metrics_endpoint(pricing_server)),
                     Mount("/messages/", app=sse.handle_post_message),
                 ]
             )
 
-            import uvicorn
-
-            config = uvicorn.Config(app, host=args.host, port=args.port, log_level="info")
-            server_instance = uvicorn.Server(config)
+            server_instance = _uvicorn_server(app, pricing_server, args.host, args.port)
             await server_instance.serve()
         else:
             # Use stdio transport for local MCP clients (VS Code, Claude Desktop)
@@ -284,6 +949,10 @@ async def main() -> None:
 
 def run() -> None:
     """Synchronous entry point for the console script."""
+    args = _parse_args()
+    if args.transport == "streamable-http" and args.workers > 1:
+        _run_streamable_http_workers(args)
+        return
     asyncio.run(main())
 
 
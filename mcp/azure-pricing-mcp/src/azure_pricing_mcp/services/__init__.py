@@ -1,23 +1,49 @@
-"""Services package for Azure Pricing MCP Server."""
+"""Services package for Azure Pricing MCP Server.
 
-from .bulk import BulkEstimateService
-from .databricks import DatabricksService
-from .github_pricing import GitHubPricingService
-from .orphaned import OrphanedResourcesService
-from .pricing import PricingService
-from .ptu import PTUService
-from .retirement import RetirementService
-from .sku import SKUService
-from .spot import SpotService
+Services are imported on first access so that starting the server only loads
+the modules it needs up front (each stdio session is a fresh process).
+"""
 
-__all__ = [
-    "BulkEstimateService",
-    "DatabricksService",
-    "GitHubPricingService",
-    "OrphanedResourcesService",
-    "PricingService",
-    "PTUService",
-    "RetirementService",
-    "SKUService",
-    "SpotService",
-]
+from typing import TYPE_CHECKING
+
+from ..lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .anomaly import PriceAnomalyService
+    from .bom import BillOfMaterialsService
+    from .bulk import BulkEstimateService
+    from .coverage import CoverageOptimizerService
+    from .databricks import DatabricksService
+    from .github_pricing import GitHubPricingService
+    from .orphaned import OrphanedResourcesService
+    from .price_performance import PricePerformanceService
+    from .price_sheet import PriceSheet
+    from .pricing import PricingService
+    from .ptu import PTUService
+    from .retirement import RetirementService
+    from .sku import SKUService
+    from .spot import SpotService
+    from .tco import TCOService
+
+# Exported name -> submodule defining it
+_EXPORTS: dict[str, str] = {
+    "BillOfMaterialsService": ".bom",
+    "BulkEstimateService": ".bulk",
+    "CoverageOptimizerService": ".coverage",
+    "DatabricksService": ".databricks",
+    "GitHubPricingService": ".github_pricing",
+    "OrphanedResourcesService": ".orphaned",
+    "PriceAnomalyService": ".anomaly",
+    "PricePerformanceService": ".price_performance",
+    "PriceSheet": ".price_sheet",
+    "PricingService": ".pricing",
+    "PTUService": ".ptu",
+    "RetirementService": ".retirement",
+    "SKUService": ".sku",
+    "SpotService": ".spot",
+    "TCOService": ".tco",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,248 @@
+"""Cross-region price anomaly detection for Azure Pricing MCP Server.
+
+Scans every price of one or more services (live, or from a saved snapshot)
+and, per SKU, compares each region's price with the SKU's median across
+regions. Items are reduced to the same per-region entries used by region
+recommendations (see ``region_price_entry``), grouped by service, product,
+SKU and unit, and each group is reduced in one pass:
+
+- Outlier regions: price ≥ ratio × median (expensive) or ≤ median / ratio (cheap)
+- Spot anomalies: Spot not cheaper than on-demand, or a Spot discount far
+  from the SKU's median Spot discount (Low Priority meters are skipped)
+- Region summary: median price ratio per region across all SKUs, for
+  region-placement guidance
+
+Meant for periodic batch runs (see scripts/price_anomaly_report.py).
+"""
+
+import asyncio
+import logging
+import math
+import statistics
+from datetime import datetime, timezone
+from typing import Any
+
+from ..config import ANOMALY_MAX_PAGES, ANOMALY_MIN_REGIONS, ANOMALY_OUTLIER_RATIO, ANOMALY_SPOT_DEVIATION
+from .pricing import PricingService, region_price_entry
+
+logger = logging.getLogger(__name__)
+
+
+def _base_sku(sku_name: str) -> str:
+    """SKU name without the Spot / Low Priority suffix."""
+    for suffix in (" Spot", " Low Priority"):
+        if sku_name.endswith(suffix):
+            return sku_name[: -len(suffix)]
+    return sku_name
+
+
+def find_price_anomalies(
+    items: list[dict[str, Any]],
+    service_names: list[str] | None = None,
+    regions: list[str] | None = None,
+    currency_code: str = "USD",
+    outlier_ratio: float = ANOMALY_OUTLIER_RATIO,
+    spot_deviation: float = ANOMALY_SPOT_DEVIATION,
+    min_regions: int = ANOMALY_MIN_REGIONS,
+    top_n: int = 100,
+    truncated_services: list[str] | None = None,
+) -> dict[str, Any]:
+    """Find price outliers in already-fetched (or snapshot) pricing items.
+
+    Args:
+        items: Retail Prices API items, any mix of services and regions
+        service_names: Only analyse these services (default: all present)
+        regions: Only consider these regions (default: all present)
+        outlier_ratio: Price ratio to the SKU median that marks an outlier
+        spot_deviation: Percentage points from the median Spot discount
+            that mark an unusual Spot discount
+        min_regions: SKUs priced in fewer regions are skipped
+        top_n: Maximum outliers / Spot anomalies returned (largest first)
+        truncated_services: Services whose scan stopped at the page limit,
+            reported so partial results are not mistaken for a full scan
+    """
+    if outlier_ratio <= 1:
+        return {"error": "outlier_ratio must be greater than 1"}
+
+    service_filter = {s.lower() for s in service_names} if service_names else None
+    region_filter = {r.lower() for r in regions} if regions else None
+
+    # Group: (service, product, sku, unit) -> {"od": {region: entry}, "spot": {region: entry}}
+    groups: dict[tuple[str, str, str, str], dict[str, dict[str, dict[str, Any]]]] = {}
+    scanned = 0
+    for item in items:
+        if item.get("type", "Consumption") != "Consumption" or item.get("tierMinimumUnits", 0):
+            continue
+        if item.get("isPrimaryMeterRegion") is False:
+            continue
+        service = item.get("serviceName") or ""
+        if service_filter is not None and service.lower() not in service_filter:
+            continue
+        entry = region_price_entry(item)
+        if entry is None or (region_filter is not None and entry["region"].lower() not in region_filter):
+            continue
+        if entry["pricing_type"] == "Low Priority":
+            # Priced differently from Spot; mixing them would skew Spot discounts
+            continue
+        scanned += 1
+        key = (
+            service,
+            entry["product_name"] or "",
+            _base_sku(entry["sku_name"] or ""),
+            entry["unit_of_measure"] or "",
+        )
+        kind = "od" if entry["pricing_type"] == "On-Demand" else "spot"
+        bucket = groups.setdefault(key, {"od": {}, "spot": {}})[kind]
+        current = bucket.get(entry["region"])
+        if current is None or entry["retail_price"] < current["retail_price"]:
+            bucket[entry["region"]] = entry
+
+    outliers: list[dict[str, Any]] = []
+    spot_anomalies: list[dict[str, Any]] = []
+    region_ratios: dict[str, list[float]] = {}
+    region_flags: dict[str, dict[str, int]] = {}
+    analysed = 0
+    skipped = 0
+
+    for (service, product, sku, unit), bucket in groups.items():
+        od = bucket["od"]
+        if len(od) < min_regions:
+            skipped += 1
+            continue
+        analysed += 1
+
+        group_regions = list(od)
+        prices = [od[region]["retail_price"] for region in group_regions]
+        median = statistics.median(prices)
+        ratios = [price / median for price in prices]
+
+        for region, price, ratio in zip(group_regions, prices, ratios, strict=True):
+            region_ratios.setdefault(region, []).append(ratio)
+            flags = region_flags.setdefault(region, {"expensive": 0, "cheap": 0})
+            if ratio >= outlier_ratio:
+                direction = "expensive"
+            elif ratio <= 1 / outlier_ratio:
+                direction = "cheap"
+            else:
+                continue
+            flags[direction] += 1
+            outliers.append(
+                {
+                    "service_name": service,
+                    "product_name": product,
+                    "sku_name": sku,
+                    "unit_of_measure": unit,
+                    "region": region,
+                    "location": od[region]["location"],
+                    "retail_price": price,
+                    "median_price": round(median, 6),
+                    "ratio": round(ratio, 3),
+                    "direction": direction,
+                    "regions_compared": len(group_regions),
+                }
+            )
+
+        # Spot discount per region that has both prices
+        spot_regions = [region for region in group_regions if region in bucket["spot"]]
+        if not spot_regions:
+            continue
+        discounts = [
+            (1 - bucket["spot"][region]["retail_price"] / od[region]["retail_price"]) * 100 for region in spot_regions
+        ]
+        median_discount = statistics.median(discounts) if len(spot_regions) >= min_regions else None
+        for region, discount in zip(spot_regions, discounts, strict=True):
+            if discount <= 0:
+                reason = "spot_not_cheaper"
+            elif median_discount is not None and abs(discount - median_discount) >= spot_deviation:
+                reason = "unusually_high_discount" if discount > median_discount else "unusually_low_discount"
+            else:
+                continue
+            spot_anomalies.append(
+                {
+                    "service_name": service,
+                    "product_name": product,
+                    "sku_name": sku,
+                    "region": region,
+                    "spot_price": bucket["spot"][region]["retail_price"],
+                    "on_demand_price": od[region]["retail_price"],
+                    "spot_discount_percentage": round(discount, 2),
+                    "median_spot_discount_percentage": (
+                        round(median_discount, 2) if median_discount is not None else None
+                    ),
+                    "reason": reason,
+                }
+            )
+
+    outliers.sort(key=lambda o: abs(math.log(o["ratio"])), reverse=True)
+    spot_anomalies.sort(
+        key=lambda a: (
+            a["reason"] != "spot_not_cheaper",
+            -abs(a["spot_discount_percentage"] - (a["median_spot_discount_percentage"] or 0)),
+        )
+    )
+
+    region_summary: list[dict[str, Any]] = [
+        {
+            "region": region,
+            "skus_priced": len(ratios),
+            "median_ratio": round(statistics.median(ratios), 3),
+            "expensive_outliers": region_flags[region]["expensive"],
+            "cheap_outliers": region_flags[region]["cheap"],
+        }
+        for region, ratios in region_ratios.items()
+    ]
+    region_summary.sort(key=lambda r: (r["median_ratio"], -r["skus_priced"]))
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "services": sorted({key[0] for key in groups}),
+        "currency": currency_code,
+        "items_scanned": scanned,
+        "truncated_services": sorted(truncated_services or []),
+        "skus_analyzed": analysed,
+        "skus_skipped": skipped,
+        "thresholds": {
+            "outlier_ratio": outlier_ratio,
+            "spot_deviation": spot_deviation,
+            "min_regions": min_regions,
+        },
+        "outlier_count": len(outliers),
+        "outliers": outliers[:top_n],
+        "spot_anomaly_count": len(spot_anomalies),
+        "spot_anomalies": spot_anomalies[:top_n],
+        "region_summary": region_summary,
+    }
+
+
+class PriceAnomalyService:
+    """Detect regional price outliers and unusual Spot discounts."""
+
+    def __init__(self, pricing_service: PricingService) -> None:
+        self._pricing = pricing_service
+
+    async def scan(
+        self,
+        service_names: list[str],
+        regions: list[str] | None = None,
+        currency_code: str = "USD",
+        max_pages: int = ANOMALY_MAX_PAGES,
+        **analyze_kwargs: Any,
+    ) -> dict[str, Any]:
+        """Fetch every Consumption price of *service_names* and analyse them.
+
+        Services are fetched concurrently across all regions, up to
+        ``max_pages`` pages each; services that hit the limit are listed in
+        ``truncated_services``. Remaining keyword arguments go to
+        :func:`find_price_anomalies`.
+        """
+        results = await asyncio.gather(
+            *(
+                self._pricing.fetch_service_prices(service, currency_code=currency_code, max_pages=max_pages)
+                for service in service_names
+            )
+        )
+        items = [item for service_items, _ in results for item in service_items]
+        truncated = [service for service, (_, hit_limit) in zip(service_names, results, strict=True) if hit_limit]
+        return find_price_anomalies(
+            items, regions=regions, currency_code=currency_code, truncated_services=truncated, **analyze_kwargs
+        )
@@ -0,0 +1,223 @@
+"""Bill-of-materials region solver for Azure Pricing MCP Server.
+
+Finds the cheapest region for a whole set of resources rather than one SKU
+at a time. Prices for every resource are retrieved with batched queries
+(one per service and group of SKUs, via PricingService.fetch_price_grid),
+arranged into a resource × region cost matrix, and regions are ranked by
+total cost.
+
+Features:
+- Regions missing any required resource are masked out (reported separately)
+- Pinned resources (with an explicit ``region``) are costed in their own
+  region and added to every candidate's total
+- Candidate regions default to every region the API returns prices for
+- Results flag ``truncated`` when a query hit the page limit, since regions
+  may then be reported unavailable or ranked on incomplete prices
+"""
+
+import asyncio
+import logging
+from typing import Any
+
+from ..progress import ProgressReporter
+from .bulk import _resolve_service_alias
+from .pricing import PricingService, monthly_units
+
+logger = logging.getLogger(__name__)
+
+
+class BillOfMaterialsService:
+    """Rank regions by the total cost of a bill of materials."""
+
+    def __init__(self, pricing_service: PricingService) -> None:
+        self._pricing = pricing_service
+
+    async def cheapest_region(
+        self,
+        resources: list[dict[str, Any]],
+        regions: list[str] | None = None,
+        top_n: int = 10,
+        currency_code: str = "USD",
+        discount_percentage: float | None = None,
+        use_price_sheet: bool = False,
+        progress: ProgressReporter | None = None,
+    ) -> dict[str, Any]:
+        """Rank candidate regions by the total monthly cost of *resources*.
+
+        Each entry in *resources* must contain:
+            service_name, sku_name
+        Optional keys:
+            quantity (default 1; instance count for hourly/daily/monthly
+            meters, billing units such as GB otherwise), hours_per_month
+            (default 730), region (pins the resource to that region)
+        """
+        candidate_regions = [r.strip().lower() for r in regions or [] if r and r.strip()]
+
+        rows: list[dict[str, Any]] = []
+        errors: list[dict[str, Any]] = []
+        for idx, res in enumerate(resources):
+            if not res.get("service_name") or not res.get("sku_name"):
+                errors.append(
+                    {"index": idx, "error": "Missing required field(s): service_name, sku_name", "input": res}
+                )
+                continue
+            rows.append(
+                {
+                    "index": idx,
+                    "service_name": _resolve_service_alias(res["service_name"]),
+                    "sku_name": res["sku_name"].strip(),
+                    "quantity": res.get("quantity", 1),
+                    "hours_per_month": res.get("hours_per_month", 730),
+                    "pinned_region": (res.get("region") or "").strip().lower() or None,
+                }
+            )
+
+        if not rows:
+            return {"error": "No valid resources to price", "errors": errors, "rankings": []}
+
+        # Batched retrieval: one price grid per service, fetched concurrently
+        skus_by_service: dict[str, list[str]] = {}
+        for row in rows:
+            skus_by_service.setdefault(row["service_name"], []).append(row["sku_name"])
+
+        fetch_regions: list[str] | None = None
+        if candidate_regions:
+            pinned = [row["pinned_region"] for row in rows if row["pinned_region"]]
+            fetch_regions = list(dict.fromkeys([*candidate_regions, *pinned]))
+
+        services = list(skus_by_service)
+        grids = await asyncio.gather(
+            *(
+                self._pricing.fetch_price_grid(
+                    service,
+                    skus_by_service[service],
+                    fetch_regions,
+                    currency_code=currency_code,
+                    discount_percentage=discount_percentage,
+                    use_price_sheet=use_price_sheet,
+                    progress=progress,
+                )
+                for service in services
+            )
+        )
+
+        # Lookup (service, sku, region) -> pricing item
+        cell_lookup: dict[tuple[str, str, str], dict[str, Any]] = {}
+        all_regions: set[str] = set()
+        discount_applied = None
+        queries = 0
+        truncated = False
+        for service, grid in zip(services, grids, strict=True):
+            queries += grid["queries"]
+            truncated = truncated or grid["truncated"]
+            discount_applied = discount_applied or grid["discount_applied"]
+            all_regions.update(grid["regions"])
+            for sku, cell_row in zip(grid["skus"], grid["cells"], strict=True):
+                for region, cell in zip(grid["regions"], cell_row, strict=True):
+                    if cell is not None:
+                        cell_lookup[(service, sku, region)] = cell
+
+        region_list = candidate_regions or sorted(all_regions)
+
+        def _monthly_cost(row: dict[str, Any], item: dict[str, Any]) -> float:
+            units = monthly_units(item.get("unitOfMeasure"), row["hours_per_month"])
+            return float(item["retailPrice"] * (units if units is not None else 1) * row["quantity"])
+
+        # Pinned resources: fixed cost added to every region
+        pinned_rows = [row for row in rows if row["pinned_region"]]
+        floating_rows = [row for row in rows if not row["pinned_region"]]
+        pinned_total = 0.0
+        pinned_items: list[dict[str, Any]] = []
+        for row in pinned_rows:
+            item = cell_lookup.get((row["service_name"], row["sku_name"], row["pinned_region"]))
+            if item is None:
+                errors.append(
+                    {
+                        "index": row["index"],
+                        "error": f"No pricing for {row['sku_name']} in pinned region {row['pinned_region']}",
+                    }
+                )
+                continue
+            cost = _monthly_cost(row, item)
+            pinned_total += cost
+            pinned_items.append(self._line_item(row, item, row["pinned_region"], cost))
+
+        # Resource × region cost matrix for floating resources (None = unavailable)
+        matrix: list[list[float | None]] = []
+        for row in floating_rows:
+            key = (row["service_name"], row["sku_name"])
+            items = [cell_lookup.get((*key, region)) for region in region_list]
+            matrix.append([_monthly_cost(row, item) if item is not None else None for item in items])
+
+        # Resources priced nowhere cannot discriminate between regions; report and drop them
+        priced: list[tuple[dict[str, Any], list[float | None]]] = []
+        for row, costs in zip(floating_rows, matrix, strict=True):
+            if all(cost is None for cost in costs):
+                errors.append({"index": row["index"], "error": f"No pricing found for {row['sku_name']} in any region"})
+            else:
+                priced.append((row, costs))
+
+        # Column totals with availability mask
+        rankings: list[dict[str, Any]] = []
+        unavailable: list[dict[str, Any]] = []
+        for col, region in enumerate(region_list):
+            column = [costs[col] for _, costs in priced]
+            present = [cost for cost in column if cost is not None]
+            if len(present) < len(column):
+                missing = [row["sku_name"] for (row, _), cost in zip(priced, column, strict=True) if cost is None]
+                unavailable.append({"region": region, "missing_resources": missing})
+                continue
+            monthly = sum(present) + pinned_total
+            rankings.append(
+                {"region": region, "monthly_cost": round(monthly, 2), "yearly_cost": round(monthly * 12, 2)}
+            )
+
+        rankings.sort(key=lambda r: r["monthly_cost"])
+        if rankings:
+            most_expensive = rankings[-1]["monthly_cost"]
+            for rank in rankings:
+                savings = most_expensive - rank["monthly_cost"]
+                rank["savings_vs_most_expensive"] = round(savings, 2)
+                rank["savings_percentage"] = round(savings / most_expensive * 100, 2) if most_expensive else 0.0
+
+        result: dict[str, Any] = {
+            "currency": currency_code,
+            "resource_count": len(resources),
+            "priced_resources": len(priced) + len(pinned_items),
+            "pinned_resources": pinned_items,
+            "pinned_monthly_cost": round(pinned_total, 2),
+            "regions_evaluated": len(region_list),
+            "regions_available": len(rankings),
+            "rankings": rankings[:top_n],
+            "unavailable_regions": unavailable,
+            "errors": errors,
+            "queries": queries,
+            "truncated": truncated,
+        }
+
+        if rankings:
+            best_region = rankings[0]["region"]
+            result["cheapest_region"] = best_region
+            breakdown = []
+            for row, _ in priced:
+                item = cell_lookup[(row["service_name"], row["sku_name"], best_region)]
+                breakdown.append(self._line_item(row, item, best_region, _monthly_cost(row, item)))
+            result["breakdown"] = breakdown + pinned_items
+
+        if discount_applied is not None:
+            result["discount_applied"] = discount_applied
+
+        return result
+
+    @staticmethod
+    def _line_item(row: dict[str, Any], item: dict[str, Any], region: str, monthly_cost: float) -> dict[str, Any]:
+        return {
+            "index": row["index"],
+            "service_name": row["service_name"],
+            "sku_name": row["sku_name"],
+            "region": region,
+            "quantity": row["quantity"],
+            "unit_price": item["retailPrice"],
+            "unit_of_measure": item.get("unitOfMeasure"),
+            "monthly_cost": round(monthly_cost, 2),
+        }
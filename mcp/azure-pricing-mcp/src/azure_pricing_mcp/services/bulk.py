@@ -9,14 +9,22 @@ Features:
 - Request deduplication (identical service/sku/region -> sum quantities)
 - Concurrent dispatch with configurable semaphore
 - Per-item retry with exponential backoff
+- Multi-currency fan-out: each spec is priced in every requested currency concurrently
+- Progress notifications with each finished line item as a partial result
+- Cancelling the tool call cancels every outstanding estimate and its HTTP requests
+- A ``bulk.item`` trace span per line item, with its semaphore wait and attempt count
 """
 
 import asyncio
 import logging
+import time
 from typing import Any
 
+from ..cancellation import gather_cancelling
 from ..config import SERVICE_NAME_MAPPINGS
-from .pricing import PricingService
+from ..progress import ProgressReporter
+from ..tracing import set_attribute, span
+from .pricing import PricingService, unique_currencies
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +55,9 @@ class BulkEstimateService:
         resources: list[dict[str, Any]],
         currency_code: str = "USD",
         discount_percentage: float | None = None,
+        use_price_sheet: bool = False,
+        currency_codes: list[str] | None = None,
+        progress: ProgressReporter | None = None,
     ) -> dict[str, Any]:
         """Estimate costs for a list of resources.
 
@@ -54,7 +65,14 @@ class BulkEstimateService:
             service_name, sku_name, region
         Optional keys:
             quantity (default 1), hours_per_month (default 730)
+
+        With *currency_codes*, every resource is priced in each currency
+        (concurrently) and per-currency costs and totals are added; the first
+        currency fills the regular cost fields.
         """
+        currencies = unique_currencies(currency_codes, currency_code) if currency_codes else [currency_code]
+        multi_currency = len(currencies) > 1
+
         # Phase A: resolve service aliases
         for res in resources:
             if "service_name" in res and res["service_name"]:
@@ -102,31 +120,43 @@ class BulkEstimateService:
             hours_per_month = res.get("hours_per_month", 730)
             last_exc: Exception | None = None
 
+            queued_at = time.perf_counter()
             async with sem:
+                set_attribute("queue_ms", round((time.perf_counter() - queued_at) * 1000, 3))
                 for attempt in range(1, BULK_ITEM_MAX_RETRIES + 1):
+                    set_attribute("attempts", attempt)
                     try:
                         estimate_kwargs: dict[str, Any] = {
                             "service_name": service_name,
                             "sku_name": sku_name,
                             "hours_per_month": hours_per_month,
-                            "currency_code": currency_code,
                             "discount_percentage": discount_percentage,
                         }
+                        if use_price_sheet:
+                            estimate_kwargs["use_price_sheet"] = True
                         if region:
                             estimate_kwargs["region"] = region
-                        estimate = await self._pricing.estimate_costs(**estimate_kwargs)
+                        estimates = await gather_cancelling(
+                            *(
+                                self._pricing.estimate_costs(currency_code=code, **estimate_kwargs)
+                                for code in currencies
+                            )
+                        )
 
-                        if "error" in estimate:
-                            return None, {
-                                "indices": indices,
-                                "error": estimate.get("message", estimate.get("error", "Unknown error")),
-                                "input": res,
-                            }
+                        for code, estimate in zip(currencies, estimates, strict=True):
+                            if "error" in estimate:
+                                message = estimate.get("message", estimate.get("error", "Unknown error"))
+                                return None, {
+                                    "indices": indices,
+                                    "error": f"{message} ({code})" if multi_currency else message,
+                                    "input": res,
+                                }
 
+                        estimate = estimates[0]
                         monthly = estimate["on_demand_pricing"]["monthly_cost"] * quantity
                         yearly = estimate["on_demand_pricing"]["yearly_cost"] * quantity
 
-                        return {
+                        line_item: dict[str, Any] = {
                             "indices": indices,
                             "service_name": estimate.get("service_name"),
                             "sku_name": estimate.get("sku_name"),
@@ -137,7 +167,16 @@ class BulkEstimateService:
                             "quantity": quantity,
                             "monthly_cost": monthly,
                             "yearly_cost": yearly,
-                        }, None
+                        }
+                        if multi_currency:
+                            line_item["costs_by_currency"] = {
+                                code: {
+                                    "monthly_cost": e["on_demand_pricing"]["monthly_cost"] * quantity,
+                                    "yearly_cost": e["on_demand_pricing"]["yearly_cost"] * quantity,
+                                }
+                                for code, e in zip(currencies, estimates, strict=True)
+                            }
+                        return line_item, None
 
                     except Exception as exc:
                         last_exc = exc
@@ -159,17 +198,34 @@ class BulkEstimateService:
                     "input": res,
                 }
 
+        async def _estimate_and_report(
+            res: dict[str, Any],
+            indices: list[int],
+        ) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+            with span("bulk.item", sku=res.get("sku_name", ""), region=res.get("region", "")):
+                item, err = await _estimate_one(res, indices)
+            if progress is not None:
+                label = f"{res.get('sku_name', '')} in {res.get('region') or 'any region'}"
+                if item is not None:
+                    await progress.advance(f"Estimated {label}", {"line_item": item})
+                else:
+                    await progress.advance(f"Failed {label}", {"error": err})
+            return item, err
+
+        if progress is not None:
+            progress.add_total(len(deduped_list))
         tasks = [
-            _estimate_one(res, idxs)
+            _estimate_and_report(res, idxs)
             for res, idxs in zip(deduped_list, index_map, strict=True)
         ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await gather_cancelling(*tasks, return_exceptions=True)
 
         # Phase D: aggregate
         line_items: list[dict[str, Any]] = []
         errors: list[dict[str, Any]] = []
         total_monthly = 0.0
         total_yearly = 0.0
+        currency_totals = {code: {"monthly": 0.0, "yearly": 0.0} for code in currencies}
 
         for r in results:
             if isinstance(r, Exception):
@@ -181,10 +237,13 @@ class BulkEstimateService:
             elif item:
                 total_monthly += item["monthly_cost"]
                 total_yearly += item["yearly_cost"]
+                for code, costs in item.get("costs_by_currency", {}).items():
+                    currency_totals[code]["monthly"] += costs["monthly_cost"]
+                    currency_totals[code]["yearly"] += costs["yearly_cost"]
                 line_items.append(item)
 
-        return {
-            "currency": currency_code,
+        result: dict[str, Any] = {
+            "currency": currencies[0],
             "resource_count": len(resources),
             "unique_specs": len(deduped_list),
             "successful": len(line_items),
@@ -196,3 +255,10 @@ class BulkEstimateService:
                 "yearly": round(total_yearly, 2),
             },
         }
+        if multi_currency:
+            result["currencies"] = currencies
+            result["totals_by_currency"] = {
+                code: {"monthly": round(totals["monthly"], 2), "yearly": round(totals["yearly"], 2)}
+                for code, totals in currency_totals.items()
+            }
+        return result
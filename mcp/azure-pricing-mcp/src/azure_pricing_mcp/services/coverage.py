@@ -0,0 +1,390 @@
+"""Reservation and savings-plan coverage optimizer for Azure Pricing MCP Server.
+
+Takes an hourly usage profile per SKU (a full list of hourly instance counts,
+or a compact histogram of instance count → hours) and finds the cheapest mix
+of reservations and a savings-plan commitment for the whole fleet.
+
+For every combination of reservation term (none, 1 year, 3 years) and
+savings-plan term (none, 1 year, 3 years):
+
+1. Reservations are bought per SKU. The k-th reserved instance pays off when
+   the hours it would be used, priced at the rate it displaces, exceed its
+   fixed cost, so the optimal count is read directly from the sorted usage
+   profile. Combined with a savings plan, reserved hours displace
+   savings-plan spend, so the count is sized against the savings-plan rate.
+2. Usage left after reservations is priced at savings-plan rates and summed
+   across the fleet per hour. The commitment ($/hour) that minimises
+   ``commitment × hours + uncovered on-demand`` is found from the sorted
+   hourly totals in one pass.
+
+Rates come from PricingService.fetch_row_commitment_rates (one set of batched
+queries per service and region).
+
+Assumptions:
+- A savings-plan commitment covers each hour's eligible usage pro rata, so
+  the on-demand equivalent of the uncovered part is proportional to it.
+- Histogram profiles carry no hour ordering; they are laid out with peaks
+  aligned across SKUs, which is the least favourable case for a shared
+  savings plan.
+"""
+
+import bisect
+import itertools
+import logging
+import math
+import operator
+from typing import Any
+
+from .bulk import _resolve_service_alias
+from .pricing import RI_TERM_HOURS, SAVINGS_PLAN_TERMS, PricingService
+
+logger = logging.getLogger(__name__)
+
+HOURS_PER_YEAR = 8760
+# Longest usage profile accepted (one 3-year reservation term)
+MAX_PROFILE_HOURS = 3 * HOURS_PER_YEAR
+# Profiles with at most this many distinct usage values have hourly spend looked up rather than computed
+MAX_SPEND_TABLE_SIZE = 256
+
+
+def _usage_vector(entry: dict[str, Any]) -> tuple[list[float] | None, str | None]:
+    """Return the hourly usage vector of a fleet entry, or an error message."""
+    hourly = entry.get("hourly_usage")
+    histogram = entry.get("usage_histogram")
+    if hourly is not None and histogram is not None:
+        return None, "Specify either hourly_usage or usage_histogram, not both"
+    if hourly is not None:
+        try:
+            usage = list(map(float, hourly))
+        except (TypeError, ValueError):
+            return None, "hourly_usage must be a list of numbers"
+        if len(usage) > MAX_PROFILE_HOURS:
+            return None, f"hourly_usage covers more than {MAX_PROFILE_HOURS} hours"
+        if usage and min(usage) < 0:
+            usage = [max(value, 0.0) for value in usage]
+        return usage, None
+    if histogram is None:
+        return None, "Missing usage profile: provide hourly_usage or usage_histogram"
+
+    # {"instances": hours} mapping or [{"instances": n, "hours": h}, ...]
+    try:
+        if isinstance(histogram, dict):
+            buckets = [(float(instances), float(hours)) for instances, hours in histogram.items()]
+        else:
+            buckets = [(float(bucket["instances"]), float(bucket["hours"])) for bucket in histogram]
+    except (KeyError, TypeError, ValueError):
+        return None, "usage_histogram must map instance counts to hours"
+    if any(hours < 0 for _, hours in buckets):
+        return None, "usage_histogram hours must not be negative"
+    if sum(int(round(hours)) for _, hours in buckets) > MAX_PROFILE_HOURS:
+        return None, f"usage_histogram covers more than {MAX_PROFILE_HOURS} hours"
+
+    usage = []
+    for instances, hours in sorted(buckets, reverse=True):
+        usage.extend([max(instances, 0.0)] * int(round(hours)))
+    return usage, None
+
+
+class _SkuProfile:
+    """Sorted usage profile of one SKU with prefix sums for fast partial sums."""
+
+    def __init__(self, usage: list[float]) -> None:
+        self.usage = usage
+        self.sorted = sorted(usage)
+        self.prefix = list(itertools.accumulate(self.sorted, initial=0.0))
+        self.total = self.prefix[-1]
+        # Distinct usage values, found by bisecting the sorted profile; None when there are too many
+        self.distinct: list[float] | None = []
+        idx = 0
+        while idx < len(self.sorted):
+            if len(self.distinct) == MAX_SPEND_TABLE_SIZE:
+                self.distinct = None
+                break
+            self.distinct.append(self.sorted[idx])
+            idx = bisect.bisect_right(self.sorted, self.sorted[idx], idx)
+
+    def capped_sum(self, cap: float) -> float:
+        """Σ min(usage, cap) over the profile."""
+        idx = bisect.bisect_left(self.sorted, cap)
+        return self.prefix[idx] + cap * (len(self.sorted) - idx)
+
+    def optimal_reservations(self, alternative_rate: float, ri_rate: float, hours: int) -> int:
+        """Number of reserved instances that minimises cost against *alternative_rate* per instance hour."""
+        if ri_rate <= 0 or alternative_rate <= 0 or not self.sorted:
+            return 0
+        reserved = 0
+        covered = 0.0
+        while reserved < math.ceil(self.sorted[-1]):
+            next_covered = self.capped_sum(reserved + 1)
+            if (next_covered - covered) * alternative_rate < ri_rate * hours:
+                break
+            reserved += 1
+            covered = next_covered
+        return reserved
+
+
+def _optimal_commitment(eligible_sp: list[float], eligible_od: list[float], hours: int) -> float:
+    """Savings-plan commitment ($/hour) minimising commitment + uncovered on-demand cost.
+
+    Cost(c) = c·H + Σ_{s_t > c} o_t·(1 − c/s_t) is convex and piecewise linear;
+    its slope H − Σ_{s_t > c} o_t/s_t changes sign at the optimum.
+    """
+    ranked = sorted(((s, o / s) for s, o in zip(eligible_sp, eligible_od, strict=True) if s > 0), reverse=True)
+    cumulative = 0.0
+    for spend, ratio in ranked:
+        cumulative += ratio
+        if cumulative >= hours:
+            return spend
+    return 0.0
+
+
+def _fleet_spend(
+    profiles: list[_SkuProfile], counts: tuple[int, ...], sp_rates: list[float], od_rates: list[float], hours: int
+) -> tuple[list[float], list[float]]:
+    """Per-hour fleet spend Σ max(usage[i] − counts[i], 0) × rate[i] at savings-plan and on-demand rates.
+
+    Both rates are accumulated in one pass as the real and imaginary parts of
+    a complex sum. A SKU with few distinct usage values (whole instance
+    counts) has its hourly spend looked up from a table over those values
+    instead of computed per hour.
+    """
+    totals = [0j] * hours
+    for profile, count, sp_rate, od_rate in zip(profiles, counts, sp_rates, od_rates, strict=True):
+        if not (sp_rate or od_rate) or not profile.sorted or profile.sorted[-1] <= count:
+            continue
+        rate = complex(sp_rate, od_rate)
+        if profile.distinct is not None:
+            table = {value: (value - count) * rate if value > count else 0j for value in profile.distinct}
+            hourly = map(table.__getitem__, profile.usage)
+        else:
+            leftover = [value - count if value > count else 0.0 for value in profile.usage] if count else profile.usage
+            hourly = map(operator.mul, leftover, itertools.repeat(rate))
+        totals[:] = map(operator.add, totals, hourly)
+    return [total.real for total in totals], [total.imag for total in totals]
+
+
+class CoverageOptimizerService:
+    """Find the cheapest reservation and savings-plan coverage for a fleet."""
+
+    def __init__(self, pricing_service: PricingService) -> None:
+        self._pricing = pricing_service
+
+    async def optimize(
+        self,
+        fleet: list[dict[str, Any]],
+        region: str = "eastus",
+        currency_code: str = "USD",
+        discount_percentage: float | None = None,
+        use_price_sheet: bool = False,
+    ) -> dict[str, Any]:
+        """Find the cheapest coverage strategy for a fleet's hourly usage.
+
+        Each entry in *fleet* must contain ``sku_name`` and one usage profile:
+            hourly_usage: list of instance counts, one per hour
+            usage_histogram: {instance_count: hours} or [{"instances", "hours"}]
+        Optional keys: service_name (default "Virtual Machines"), region.
+
+        Returns:
+            Dict with the on-demand baseline, every evaluated strategy ranked
+            by annualised cost, and the optimal strategy with per-SKU
+            reservation counts and the savings-plan commitment.
+        """
+        rows: list[dict[str, Any]] = []
+        errors: list[dict[str, Any]] = []
+        for idx, entry in enumerate(fleet):
+            if not entry.get("sku_name"):
+                errors.append({"index": idx, "error": "Missing required field: sku_name"})
+                continue
+            usage, error = _usage_vector(entry)
+            if error is not None:
+                errors.append({"index": idx, "sku_name": entry["sku_name"], "error": error})
+                continue
+            rows.append(
+                {
+                    "index": idx,
+                    "sku_name": entry["sku_name"].strip(),
+                    "service_name": _resolve_service_alias(entry.get("service_name") or "Virtual Machines"),
+                    "region": (entry.get("region") or region).strip().lower(),
+                    "usage": usage,
+                }
+            )
+
+        if not rows:
+            return {"error": "No valid fleet entries to optimize", "errors": errors}
+
+        lengths = {len(row["usage"]) for row in rows}
+        if len(lengths) > 1:
+            return {"error": f"Usage profiles differ in length: {sorted(lengths)} hours", "errors": errors}
+        hours = lengths.pop()
+        if hours == 0:
+            return {"error": "Usage profiles are empty", "errors": errors}
+
+        row_rates, discount_applied = await self._pricing.fetch_row_commitment_rates(
+            rows, currency_code=currency_code, discount_percentage=discount_percentage, use_price_sheet=use_price_sheet
+        )
+
+        priced: list[dict[str, Any]] = []
+        for row, rates in zip(rows, row_rates, strict=True):
+            if rates is None:
+                errors.append(
+                    {"index": row["index"], "sku_name": row["sku_name"], "error": f"No pricing in {row['region']}"}
+                )
+                continue
+            row["rates"] = rates
+            row["profile"] = _SkuProfile(row["usage"])
+            priced.append(row)
+
+        if not priced:
+            return {"error": "No pricing found for any fleet entry", "errors": errors}
+
+        annualise = HOURS_PER_YEAR / hours
+        on_demand_cost = sum(row["profile"].total * row["rates"]["on_demand"] for row in priced)
+
+        profiles: list[_SkuProfile] = [row["profile"] for row in priced]
+        od_rates: list[float] = [row["rates"]["on_demand"] for row in priced]
+        sp_terms = [term for term in SAVINGS_PLAN_TERMS if any(term in row["rates"]["savings_plan"] for row in priced)]
+        # Per SP term: SP rates and on-demand rates of the eligible SKUs (0 where not eligible)
+        sp_rates = {term: [row["rates"]["savings_plan"].get(term, 0.0) for row in priced] for term in sp_terms}
+        eligible_od = {
+            term: [od if sp else 0.0 for od, sp in zip(od_rates, sp_rates[term], strict=True)] for term in sp_terms
+        }
+
+        # Candidate plans: (RI term, SP term, reserved instances per SKU)
+        no_reservations = (0,) * len(priced)
+        plans: list[tuple[str | None, str | None, tuple[int, ...]]] = [
+            (None, sp_term, no_reservations) for sp_term in (None, *sp_terms)
+        ]
+        ri_rates: dict[str, list[float]] = {}
+        for term in RI_TERM_HOURS:
+            ri_rates[term] = [row["rates"]["reservation"].get(term, 0.0) for row in priced]
+            # Next to a savings plan, reserved hours displace savings-plan spend rather than on-demand
+            for plan_term in (None, *sp_terms):
+                alternative = (
+                    od_rates
+                    if plan_term is None
+                    else [sp or od for od, sp in zip(od_rates, sp_rates[plan_term], strict=True)]
+                )
+                counts = tuple(
+                    profile.optimal_reservations(alt, ri, hours)
+                    for profile, alt, ri in zip(profiles, alternative, ri_rates[term], strict=True)
+                )
+                if any(counts):
+                    plans.append((term, plan_term, counts))
+
+        # Hourly SP and eligible on-demand spend of the leftover usage, one fleet pass per plan with a savings plan
+        spend: dict[tuple[tuple[int, ...], str], tuple[list[float], list[float]]] = {}
+        for _, plan_term, counts in plans:
+            if plan_term is not None and (counts, plan_term) not in spend:
+                spend[(counts, plan_term)] = _fleet_spend(
+                    profiles, counts, sp_rates[plan_term], eligible_od[plan_term], hours
+                )
+
+        strategies: list[dict[str, Any]] = []
+        for ri_term, sp_term, counts in plans:
+            ri_cost = (
+                sum(count * ri * hours for count, ri in zip(counts, ri_rates[ri_term], strict=True)) if ri_term else 0.0
+            )
+            # Usage left after reservations goes to the savings plan or on-demand
+            leftover_od_total = sum(
+                (profile.total - profile.capped_sum(count)) * od if count else profile.total * od
+                for profile, count, od in zip(profiles, counts, od_rates, strict=True)
+            )
+            commitment = 0.0
+            uncovered = leftover_od_total
+            covered_od = 0.0
+            utilization = None
+            if sp_term is not None:
+                sp_hourly, od_hourly = spend[(counts, sp_term)]
+                commitment = _optimal_commitment(sp_hourly, od_hourly, hours)
+                if commitment > 0:
+                    covered_od = sum(
+                        o if s <= commitment else o * commitment / s for s, o in zip(sp_hourly, od_hourly, strict=True)
+                    )
+                    used = sum(s if s <= commitment else commitment for s in sp_hourly)
+                    utilization = used / (commitment * hours) * 100
+                    uncovered = leftover_od_total - covered_od
+
+            labels = []
+            if ri_term:
+                labels.append(f"Reservations {ri_term}")
+            if commitment > 0:
+                labels.append(f"Savings Plan {sp_term}")
+            total = ri_cost + commitment * hours + uncovered
+            strategies.append(
+                {
+                    "strategy": " + ".join(labels) or "On-Demand",
+                    "reservation_term": ri_term,
+                    "savings_plan_term": sp_term if commitment > 0 else None,
+                    "reserved_instances": sum(counts),
+                    "savings_plan_commitment_hourly": round(commitment, 4),
+                    "savings_plan_utilization": round(utilization, 2) if utilization is not None else None,
+                    "reservation_cost": ri_cost,
+                    "commitment_cost": commitment * hours,
+                    "on_demand_cost": uncovered,
+                    "total_cost": total,
+                    "_counts": counts,
+                    "_covered_od": covered_od,
+                }
+            )
+
+        # Same strategy can appear twice when a plan buys nothing; keep the first
+        unique: dict[str, dict[str, Any]] = {}
+        for strategy in sorted(strategies, key=lambda s: s["total_cost"]):
+            unique.setdefault(strategy["strategy"], strategy)
+        ranked = list(unique.values())
+
+        total_usage_hours = sum(row["profile"].total for row in priced)
+
+        def _summary(strategy: dict[str, Any]) -> dict[str, Any]:
+            ri_usage = sum(
+                row["profile"].capped_sum(count) for row, count in zip(priced, strategy["_counts"], strict=True)
+            )
+            savings = on_demand_cost - strategy["total_cost"]
+            return {
+                "strategy": strategy["strategy"],
+                "reservation_term": strategy["reservation_term"],
+                "savings_plan_term": strategy["savings_plan_term"],
+                "reserved_instances": strategy["reserved_instances"],
+                "savings_plan_commitment_hourly": strategy["savings_plan_commitment_hourly"],
+                "savings_plan_utilization": strategy["savings_plan_utilization"],
+                "reservation_coverage": round(ri_usage / total_usage_hours * 100, 2) if total_usage_hours else 0.0,
+                "savings_plan_coverage": (
+                    round(strategy["_covered_od"] / on_demand_cost * 100, 2) if on_demand_cost else 0.0
+                ),
+                "annual_cost": round(strategy["total_cost"] * annualise, 2),
+                "annual_reservation_cost": round(strategy["reservation_cost"] * annualise, 2),
+                "annual_commitment_cost": round(strategy["commitment_cost"] * annualise, 2),
+                "annual_on_demand_cost": round(strategy["on_demand_cost"] * annualise, 2),
+                "annual_savings": round(savings * annualise, 2),
+                "savings_percentage": round(savings / on_demand_cost * 100, 2) if on_demand_cost else 0.0,
+            }
+
+        best = ranked[0]
+        result: dict[str, Any] = {
+            "currency": currency_code,
+            "profile_hours": hours,
+            "fleet_size": len(fleet),
+            "priced_skus": len(priced),
+            "annual_on_demand_cost": round(on_demand_cost * annualise, 2),
+            "strategies": [_summary(strategy) for strategy in ranked],
+            "optimal": _summary(best),
+            "per_sku": [
+                {
+                    "index": row["index"],
+                    "sku_name": row["sku_name"],
+                    "region": row["region"],
+                    "average_instances": round(row["profile"].total / hours, 3),
+                    "peak_instances": row["profile"].sorted[-1] if row["profile"].sorted else 0.0,
+                    "on_demand_hourly": row["rates"]["on_demand"],
+                    "reservation_hourly": {t: round(r, 6) for t, r in row["rates"]["reservation"].items()},
+                    "savings_plan_hourly": row["rates"]["savings_plan"],
+                    "reserved_instances": count,
+                }
+                for row, count in zip(priced, best["_counts"], strict=True)
+            ],
+            "errors": errors,
+        }
+        if discount_applied is not None:
+            result["discount_applied"] = discount_applied
+
+        return result
@@ -8,6 +8,7 @@ import logging
 from typing import Any
 
 from ..auth import AzureCredentialManager, get_credential_manager
+from ..progress import ProgressReporter
 from .orphaned_resources import OrphanedResourceScanner
 
 logger = logging.getLogger(__name__)
@@ -33,19 +34,22 @@ class OrphanedResourcesService:
         self,
         days: int = 60,
         all_subscriptions: bool = True,
+        progress: ProgressReporter | None = None,
     ) -> dict[str, Any]:
         """Find orphaned resources across Azure subscriptions.
 
         Args:
             days: Number of days to look back for cost data.
             all_subscriptions: If True, scan all accessible subscriptions.
+            progress: Optional reporter for per-query / per-resource progress.
 
         Returns:
             Dict with orphaned resources grouped by subscription, or error dict.
         """
         logger.info(f"Scanning for orphaned resources (lookback: {days} days, all subs: {all_subscriptions})")
 
-        result = await self._scanner.scan(days=days, all_subscriptions=all_subscriptions)
+        progress_kwargs = {"progress": progress} if progress is not None else {}
+        result = await self._scanner.scan(days=days, all_subscriptions=all_subscriptions, **progress_kwargs)
 
         if "error" not in result:
             logger.info(
@@ -10,7 +10,6 @@ All methods require Azure authentication. If not authenticated, they return
 a friendly error message with instructions for how to authenticate.
 """
 
-import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any
@@ -18,6 +17,8 @@ from typing import Any
 import aiohttp
 
 from ..auth import AzureCredentialManager, get_credential_manager
+from ..cancellation import gather_cancelling
+from ..progress import ProgressReporter
 
 logger = logging.getLogger(__name__)
 
@@ -391,6 +392,7 @@ class OrphanedResourceScanner:
         self,
         days: int = COST_LOOKBACK_DAYS,
         all_subscriptions: bool = True,
+        progress: ProgressReporter | None = None,
     ) -> dict[str, Any]:
         """Scan for orphaned resources and compute their costs.
 
@@ -398,6 +400,8 @@ class OrphanedResourceScanner:
             days: Number of days to look back for cost data.
             all_subscriptions: If True, scan all accessible subscriptions.
                              If False, scan only the first subscription.
+            progress: Advanced per Resource Graph query and per cost lookup,
+                      with the orphaned resources found as partial results.
 
         Returns:
             Dict containing orphaned resources grouped by subscription,
@@ -447,8 +451,19 @@ class OrphanedResourceScanner:
 
         # Run all Resource Graph queries concurrently
         query_items = list(queries.items())
-        results = await asyncio.gather(
-            *[self._execute_resource_graph_query(query, subscription_ids) for _, query in query_items],
+
+        async def _query(label: str, query: str) -> dict[str, Any]:
+            try:
+                result = await self._execute_resource_graph_query(query, subscription_ids)
+            finally:
+                if progress is not None:
+                    await progress.advance(f"Queried {label}")
+            return result
+
+        if progress is not None:
+            progress.add_total(len(query_items))
+        results = await gather_cancelling(
+            *[_query(label, query) for label, query in query_items],
             return_exceptions=True,
         )
 
@@ -466,6 +481,8 @@ class OrphanedResourceScanner:
                 all_orphaned.append(resource)
 
         # Look up costs for each orphaned resource
+        if progress is not None:
+            progress.add_total(len(all_orphaned))
         total_cost = 0.0
         for resource in all_orphaned:
             sub_id = resource.get("subscriptionId", "")
@@ -475,6 +492,19 @@ class OrphanedResourceScanner:
                 resource["estimated_cost_usd"] = cost
                 if cost is not None:
                     total_cost += cost
+            if progress is not None:
+                await progress.advance(
+                    f"Costed {resource.get('name', resource_id)}",
+                    {
+                        "resource": {
+                            "id": resource_id,
+                            "name": resource.get("name"),
+                            "orphan_type": resource.get("orphan_type"),
+                            "subscription_id": sub_id,
+                            "estimated_cost_usd": resource.get("estimated_cost_usd"),
+                        }
+                    },
+                )
 
         # Group results by subscription
         sub_name_map = {s["id"]: s["name"] for s in subscriptions}
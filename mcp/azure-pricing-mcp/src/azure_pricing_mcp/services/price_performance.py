@@ -0,0 +1,228 @@
+"""VM price-performance ranking for Azure Pricing MCP Server.
+
+Joins pay-as-you-go VM prices for a region with the VM capability table
+(vcpus, memory, GPUs, generation) and ranks sizes by $/vCPU-hour,
+$/GB-hour, $/GPU-hour or hourly price under constraint filters.
+
+The joined table is kept per (region, currency, OS) as parallel columns,
+so repeated questions ("cheapest VM with >= 8 vCPU and 32 GB") are answered
+from memory with a filter mask and a sort instead of new searches.
+"""
+
+import logging
+import time
+from typing import Any
+
+from ..config import VM_PRICE_TABLE_MAX_PAGES, VM_PRICE_TABLE_TTL
+from .pricing import PricingService
+from .vm_specs import DATA_SOURCE_URL, VMSpecTable
+
+logger = logging.getLogger(__name__)
+
+SORT_KEYS = ("price_per_vcpu_hour", "price_per_gb_hour", "price_per_gpu_hour", "hourly_price")
+
+
+class PricePerformanceService:
+    """Rank VM sizes by price-performance."""
+
+    def __init__(self, pricing_service: PricingService, spec_table: VMSpecTable | None = None) -> None:
+        self._pricing = pricing_service
+        self._specs = spec_table or VMSpecTable()
+        # (region, currency, os) -> (columns, truncated, built_at)
+        self._tables: dict[tuple[str, str, str], tuple[dict[str, list[Any]], bool, float]] = {}
+
+    async def _get_table(
+        self, region: str, currency_code: str, os_type: str
+    ) -> tuple[dict[str, list[Any]], bool, bool]:
+        """Return the joined price/spec columns for a region, whether the price scan hit
+        the page limit, and whether the columns came from cache."""
+        if self._specs.refresh_if_changed():
+            self._tables.clear()
+
+        key = (region, currency_code, os_type)
+        cached = self._tables.get(key)
+        if cached is not None and time.monotonic() - cached[2] < VM_PRICE_TABLE_TTL:
+            return cached[0], cached[1], True
+
+        items, truncated = await self._pricing.fetch_service_prices(
+            "Virtual Machines", region, currency_code=currency_code, max_pages=VM_PRICE_TABLE_MAX_PAGES
+        )
+
+        # Cheapest matching meter per ARM SKU for the requested OS, excluding Spot / Low Priority
+        best: dict[str, dict[str, Any]] = {}
+        for item in items:
+            sku_name = item.get("skuName", "")
+            if "Spot" in sku_name or "Low Priority" in sku_name:
+                continue
+            is_windows = (item.get("productName") or "").endswith("Windows")
+            if is_windows != (os_type == "windows"):
+                continue
+            price = item.get("retailPrice") or 0
+            arm_sku = (item.get("armSkuName") or "").lower()
+            if price <= 0 or not arm_sku:
+                continue
+            if arm_sku not in best or price < best[arm_sku]["retailPrice"]:
+                best[arm_sku] = item
+
+        columns: dict[str, list[Any]] = {
+            "name": [],
+            "family": [],
+            "category": [],
+            "generation": [],
+            "vcpus": [],
+            "memory_gb": [],
+            "gpus": [],
+            "gpu_model": [],
+            "hourly_price": [],
+            "item": [],
+        }
+        unmatched = 0
+        for arm_sku, item in best.items():
+            spec = self._specs.get(arm_sku)
+            if spec is None:
+                unmatched += 1
+                continue
+            columns["name"].append(spec.name)
+            columns["family"].append(spec.family)
+            columns["category"].append(spec.category)
+            columns["generation"].append(spec.generation)
+            columns["vcpus"].append(spec.vcpus)
+            columns["memory_gb"].append(spec.memory_gb)
+            columns["gpus"].append(spec.gpus)
+            columns["gpu_model"].append(spec.gpu_model)
+            columns["hourly_price"].append(item["retailPrice"])
+            columns["item"].append(item)
+
+        if unmatched:
+            logger.debug(f"{unmatched} VM SKUs in {region} have no entry in the spec table")
+        self._tables[key] = (columns, truncated, time.monotonic())
+        return columns, truncated, False
+
+    async def rank(
+        self,
+        region: str = "eastus",
+        min_vcpus: int | None = None,
+        max_vcpus: int | None = None,
+        min_memory_gb: float | None = None,
+        max_memory_gb: float | None = None,
+        min_gpus: float | None = None,
+        gpu_model: str | None = None,
+        families: list[str] | None = None,
+        categories: list[str] | None = None,
+        os_type: str = "linux",
+        sort_by: str = "price_per_vcpu_hour",
+        top_n: int = 20,
+        currency_code: str = "USD",
+        discount_percentage: float | None = None,
+        use_price_sheet: bool = False,
+    ) -> dict[str, Any]:
+        """Rank VM sizes in a region by price-performance under constraints."""
+        if sort_by not in SORT_KEYS:
+            return {"error": f"Invalid sort_by '{sort_by}'. Use one of: {', '.join(SORT_KEYS)}"}
+        os_type = os_type.lower()
+        if os_type not in ("linux", "windows"):
+            return {"error": f"Invalid os_type '{os_type}'. Use 'linux' or 'windows'"}
+
+        columns, truncated, from_cache = await self._get_table(region.lower(), currency_code, os_type)
+
+        # Constraint mask over the columns
+        family_set = {f.lower() for f in families} if families else None
+        category_set = {c.lower() for c in categories} if categories else None
+        gpu_model_lower = gpu_model.lower() if gpu_model else None
+        mask = [
+            (min_vcpus is None or vcpus >= min_vcpus)
+            and (max_vcpus is None or vcpus <= max_vcpus)
+            and (min_memory_gb is None or memory >= min_memory_gb)
+            and (max_memory_gb is None or memory <= max_memory_gb)
+            and (min_gpus is None or gpus >= min_gpus)
+            and (gpu_model_lower is None or (model or "").lower() == gpu_model_lower)
+            and (family_set is None or family.lower() in family_set)
+            and (category_set is None or category in category_set)
+            for vcpus, memory, gpus, model, family, category in zip(
+                columns["vcpus"],
+                columns["memory_gb"],
+                columns["gpus"],
+                columns["gpu_model"],
+                columns["family"],
+                columns["category"],
+                strict=True,
+            )
+        ]
+        selected = [i for i, keep in enumerate(mask) if keep]
+
+        # Customer pricing applies to the selected rows only
+        prices = [columns["hourly_price"][i] for i in selected]
+        discount_info: dict[str, Any] | None = None
+        price_sheet = self._pricing.price_sheet
+        if use_price_sheet and price_sheet is not None:
+            priced, matched = price_sheet.apply_to_items(
+                [columns["item"][i] for i in selected], currency_code, discount_percentage
+            )
+            prices = [item["retailPrice"] for item in priced]
+            default_pct = price_sheet.default_discount_percentage
+            discount_info = {
+                "percentage": default_pct if default_pct is not None else (discount_percentage or 0.0),
+                "source": "price_sheet",
+                "matched_items": matched,
+                "total_items": len(priced),
+                "note": f"Negotiated price-sheet rates applied to {matched} of {len(priced)} sizes",
+            }
+        elif discount_percentage:
+            prices = [p * (1 - discount_percentage / 100) for p in prices]
+            discount_info = {"percentage": discount_percentage, "note": "Prices shown are after discount"}
+
+        per_vcpu = [p / columns["vcpus"][i] for p, i in zip(prices, selected, strict=True)]
+        per_gb = [p / columns["memory_gb"][i] for p, i in zip(prices, selected, strict=True)]
+        gpus = [columns["gpus"][i] for i in selected]
+        per_gpu = [p / g if g else None for p, g in zip(prices, gpus, strict=True)]
+        metric = {
+            "price_per_vcpu_hour": per_vcpu,
+            "price_per_gb_hour": per_gb,
+            "price_per_gpu_hour": per_gpu,
+            "hourly_price": prices,
+        }[sort_by]
+
+        order = sorted(
+            (pos for pos in range(len(selected)) if metric[pos] is not None),
+            key=lambda pos: (metric[pos], prices[pos]),
+        )
+
+        def _row(pos: int) -> dict[str, Any]:
+            i = selected[pos]
+            gpu_price = per_gpu[pos]
+            return {
+                "sku": columns["name"][i],
+                "family": columns["family"][i],
+                "category": columns["category"][i],
+                "generation": columns["generation"][i],
+                "vcpus": columns["vcpus"][i],
+                "memory_gb": columns["memory_gb"][i],
+                "gpus": columns["gpus"][i],
+                "gpu_model": columns["gpu_model"][i],
+                "hourly_price": round(prices[pos], 6),
+                "monthly_price": round(prices[pos] * 730, 2),
+                "price_per_vcpu_hour": round(per_vcpu[pos], 6),
+                "price_per_gb_hour": round(per_gb[pos], 6),
+                "price_per_gpu_hour": round(gpu_price, 6) if gpu_price is not None else None,
+            }
+
+        result: dict[str, Any] = {
+            "region": region,
+            "currency": currency_code,
+            "os_type": os_type,
+            "sort_by": sort_by,
+            "table_size": len(columns["name"]),
+            "matching": len(order),
+            "from_cache": from_cache,
+            "truncated": truncated,
+            "spec_data_version": self._specs.data_version,
+            "spec_source": DATA_SOURCE_URL,
+            "rankings": [_row(pos) for pos in order[:top_n]],
+        }
+        if selected:
+            result["best_per_vcpu"] = _row(min(range(len(selected)), key=per_vcpu.__getitem__))
+            result["best_per_gb"] = _row(min(range(len(selected)), key=per_gb.__getitem__))
+        if discount_info is not None:
+            result["discount_applied"] = discount_info
+
+        return result
@@ -0,0 +1,347 @@
+"""Customer price sheet for Azure Pricing MCP Server.
+
+Loads per-customer negotiated rates from a CSV or JSON file and applies them
+to Azure Retail Prices API items. Rates can be keyed by meter ID, by
+service + SKU, by SKU alone, or by service, and are indexed into dicts at load
+time so each item is resolved with a handful of O(1) lookups.
+
+Supported formats:
+
+JSON::
+
+    {
+        "customer_id": "contoso",
+        "currency": "USD",
+        "default_discount_percentage": 12.5,
+        "rates": [
+            {"meterId": "0001-...", "unitPrice": 0.081},
+            {"serviceName": "Virtual Machines", "skuName": "D4s v3", "discountPercentage": 22},
+            {"serviceName": "Storage", "discountPercentage": 15}
+        ]
+    }
+
+CSV (one rate per row; a row with no key columns sets the default discount)::
+
+    meterId,serviceName,skuName,unitPrice,discountPercentage,currencyCode,customerId
+
+The file is re-read automatically when its modification time changes.
+"""
+
+import csv
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from ..config import PRICE_SHEET_PATH, PRICE_SHEET_RELOAD_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# Accepted column / field spellings mapped to canonical names
+_FIELD_ALIASES: dict[str, str] = {
+    "meterid": "meterId",
+    "meter_id": "meterId",
+    "servicename": "serviceName",
+    "service_name": "serviceName",
+    "service": "serviceName",
+    "skuname": "skuName",
+    "sku_name": "skuName",
+    "armskuname": "skuName",
+    "arm_sku_name": "skuName",
+    "sku": "skuName",
+    "unitprice": "unitPrice",
+    "unit_price": "unitPrice",
+    "price": "unitPrice",
+    "discountpercentage": "discountPercentage",
+    "discount_percentage": "discountPercentage",
+    "discount": "discountPercentage",
+    "currencycode": "currencyCode",
+    "currency_code": "currencyCode",
+    "currency": "currencyCode",
+    "customerid": "customerId",
+    "customer_id": "customerId",
+}
+
+
+@dataclass(frozen=True)
+class PriceSheetRate:
+    """A negotiated rate: either an absolute unit price or a discount percentage."""
+
+    unit_price: float | None = None
+    discount_percentage: float | None = None
+
+    def price_for(self, retail_price: float) -> float:
+        """Return the negotiated price for a given retail price."""
+        if self.unit_price is not None:
+            return self.unit_price
+        return retail_price * (1 - (self.discount_percentage or 0.0) / 100)
+
+
+def _normalize_row(row: dict[str, Any]) -> dict[str, Any]:
+    """Map row keys to canonical field names, dropping empty values."""
+    normalized: dict[str, Any] = {}
+    for key, value in row.items():
+        if key is None or value is None or value == "":
+            continue
+        canonical = _FIELD_ALIASES.get(str(key).strip().lower(), str(key).strip())
+        normalized[canonical] = value.strip() if isinstance(value, str) else value
+    return normalized
+
+
+def _parse_float(value: Any) -> float | None:
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+class PriceSheet:
+    """Indexed customer price sheet with hot reload."""
+
+    def __init__(self, path: str, reload_interval: float = PRICE_SHEET_RELOAD_INTERVAL) -> None:
+        self._path = path
+        self._reload_interval = reload_interval
+        self._last_check = 0.0
+        self._file_signature: tuple[int, int] | None = None
+        self._loaded_at: datetime | None = None
+
+        self.customer_id: str | None = None
+        self.currency: str | None = None
+        self.default_discount_percentage: float | None = None
+        self._by_meter: dict[str, PriceSheetRate] = {}
+        self._by_service_sku: dict[tuple[str, str], PriceSheetRate] = {}
+        self._by_sku: dict[str, PriceSheetRate] = {}
+        self._by_service: dict[str, PriceSheetRate] = {}
+
+        self.load()
+
+    @classmethod
+    def from_config(cls) -> "PriceSheet | None":
+        """Create a PriceSheet from AZURE_PRICING_PRICE_SHEET, or None if unset or unreadable."""
+        if not PRICE_SHEET_PATH:
+            return None
+        try:
+            return cls(PRICE_SHEET_PATH)
+        except Exception as e:
+            logger.warning(f"Failed to load price sheet {PRICE_SHEET_PATH}: {e}")
+            return None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def version(self) -> tuple[int, int] | None:
+        """Signature (mtime, size) of the rates in use, after reloading the file if it changed."""
+        self._maybe_reload()
+        return self._file_signature
+
+    @property
+    def rate_count(self) -> int:
+        return len(self._by_meter) + len(self._by_service_sku) + len(self._by_sku) + len(self._by_service)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def load(self) -> None:
+        """(Re)load the sheet from disk and rebuild all indexes.
+
+        Raises:
+            OSError / ValueError: If the file cannot be read or parsed.
+        """
+        stat = os.stat(self._path)
+        if self._path.lower().endswith(".json"):
+            header, rows = self._read_json()
+        else:
+            header, rows = self._read_csv()
+
+        by_meter: dict[str, PriceSheetRate] = {}
+        by_service_sku: dict[tuple[str, str], PriceSheetRate] = {}
+        by_sku: dict[str, PriceSheetRate] = {}
+        by_service: dict[str, PriceSheetRate] = {}
+        customer_id = header.get("customerId")
+        currency = header.get("currencyCode")
+        default_discount = _parse_float(header.get("default_discount_percentage"))
+
+        for raw in rows:
+            row = _normalize_row(raw)
+            customer_id = customer_id or row.get("customerId")
+            currency = currency or row.get("currencyCode")
+
+            rate = PriceSheetRate(
+                unit_price=_parse_float(row.get("unitPrice")),
+                discount_percentage=_parse_float(row.get("discountPercentage")),
+            )
+            if rate.unit_price is None and rate.discount_percentage is None:
+                continue
+
+            meter_id = row.get("meterId")
+            service = row.get("serviceName")
+            sku = row.get("skuName")
+
+            if meter_id:
+                by_meter[str(meter_id).lower()] = rate
+            elif service and sku:
+                by_service_sku[(str(service).lower(), str(sku).lower())] = rate
+            elif sku:
+                by_sku[str(sku).lower()] = rate
+            elif service:
+                by_service[str(service).lower()] = rate
+            elif rate.discount_percentage is not None:
+                default_discount = rate.discount_percentage
+
+        self._by_meter = by_meter
+        self._by_service_sku = by_service_sku
+        self._by_sku = by_sku
+        self._by_service = by_service
+        self.customer_id = customer_id
+        self.currency = currency.upper() if currency else None
+        self.default_discount_percentage = default_discount
+        self._file_signature = (stat.st_mtime_ns, stat.st_size)
+        self._loaded_at = datetime.now()
+        self._last_check = time.monotonic()
+        logger.info(f"Loaded price sheet {self._path}: {self.rate_count} rates")
+
+    def _read_json(self) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        with open(self._path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            return {}, data
+        header = _normalize_row({k: v for k, v in data.items() if k != "rates"})
+        return header, list(data.get("rates", []))
+
+    def _read_csv(self) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        with open(self._path, encoding="utf-8-sig", newline="") as f:
+            return {}, list(csv.DictReader(f))
+
+    def _maybe_reload(self) -> None:
+        """Reload the sheet if the file changed since the last check."""
+        now = time.monotonic()
+        if now - self._last_check < self._reload_interval:
+            return
+        self._last_check = now
+        try:
+            stat = os.stat(self._path)
+        except OSError as e:
+            logger.warning(f"Price sheet {self._path} not accessible, keeping previous rates: {e}")
+            return
+        if (stat.st_mtime_ns, stat.st_size) == self._file_signature:
+            return
+        try:
+            self.load()
+        except Exception as e:
+            logger.warning(f"Failed to reload price sheet {self._path}, keeping previous rates: {e}")
+
+    # ------------------------------------------------------------------
+    # Lookup and application
+    # ------------------------------------------------------------------
+
+    def lookup(self, item: dict[str, Any], currency_code: str | None = None) -> tuple[PriceSheetRate, str] | None:
+        """Find the most specific rate for a pricing item.
+
+        Precedence: meterId, service + SKU, SKU, service. Absolute unit prices are
+        hourly pay-as-you-go rates: they are skipped for non-Consumption items
+        (reservation term prices, DevTest) and when the request currency
+        differs from the sheet currency, so those fall through to a percentage
+        rate or the default discount.
+
+        Returns:
+            Tuple of (rate, match_level) or None if no rate applies.
+        """
+        allow_unit_price = (item.get("type") or "Consumption") == "Consumption" and not (
+            self.currency and currency_code and currency_code.upper() != self.currency
+        )
+        service = (item.get("serviceName") or "").lower()
+        skus = [s.lower() for s in (item.get("skuName"), item.get("armSkuName")) if s]
+
+        candidates: list[tuple[PriceSheetRate | None, str]] = [
+            (self._by_meter.get((item.get("meterId") or "").lower()), "meter"),
+        ]
+        candidates.extend((self._by_service_sku.get((service, sku)), "service_sku") for sku in skus)
+        candidates.extend((self._by_sku.get(sku), "sku") for sku in skus)
+        candidates.append((self._by_service.get(service), "service"))
+
+        for rate, level in candidates:
+            if rate is None:
+                continue
+            if rate.unit_price is not None and not allow_unit_price:
+                continue
+            return rate, level
+        return None
+
+    def apply_to_items(
+        self,
+        items: list[dict[str, Any]],
+        currency_code: str = "USD",
+        fallback_discount: float | None = None,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Apply negotiated rates to pricing items in a single pass.
+
+        Items without a matching rate use the sheet's default discount, or
+        ``fallback_discount`` when the sheet defines none. Savings plan prices
+        are scaled by the same ratio as the pay-as-you-go price.
+
+        Returns:
+            Tuple of (priced_items, matched_count).
+        """
+        self._maybe_reload()
+
+        default_pct = (
+            self.default_discount_percentage if self.default_discount_percentage is not None else fallback_discount
+        )
+        default_rate = PriceSheetRate(discount_percentage=default_pct) if default_pct else None
+        lookup = self.lookup
+
+        priced: list[dict[str, Any]] = []
+        matched = 0
+
+        for item in items:
+            found = lookup(item, currency_code)
+            if found is not None:
+                rate, level = found
+                matched += 1
+            elif default_rate is not None:
+                rate, level = default_rate, "default"
+            else:
+                priced.append(item)
+                continue
+
+            priced_item = item.copy()
+            original_price = item.get("retailPrice") or 0.0
+            new_price = rate.price_for(original_price)
+            priced_item["retailPrice"] = round(new_price, 6)
+            priced_item["originalPrice"] = original_price
+            priced_item["priceSheetMatch"] = level
+
+            plans = item.get("savingsPlan")
+            if plans and isinstance(plans, list) and original_price > 0:
+                ratio = new_price / original_price
+                scaled_plans = []
+                for plan in plans:
+                    scaled_plan = plan.copy()
+                    if plan.get("retailPrice"):
+                        scaled_plan["retailPrice"] = round(plan["retailPrice"] * ratio, 6)
+                        scaled_plan["originalPrice"] = plan["retailPrice"]
+                    scaled_plans.append(scaled_plan)
+                priced_item["savingsPlan"] = scaled_plans
+
+            priced.append(priced_item)
+
+        return priced, matched
+
+    def summary(self) -> dict[str, Any]:
+        """Describe the loaded sheet."""
+        self._maybe_reload()
+        return {
+            "path": self._path,
+            "customer_id": self.customer_id,
+            "currency": self.currency,
+            "default_discount_percentage": self.default_discount_percentage,
+            "meter_rates": len(self._by_meter),
+            "service_sku_rates": len(self._by_service_sku),
+            "sku_rates": len(self._by_sku),
+            "service_rates": len(self._by_service),
+            "loaded_at": self._loaded_at.isoformat() if self._loaded_at else None,
+        }
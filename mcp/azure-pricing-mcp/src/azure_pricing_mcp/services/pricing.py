@@ -1,16 +1,34 @@
 """Pricing service for Azure Pricing MCP Server."""
 
+import asyncio
 import json
 import logging
+import re
 from datetime import datetime
 from typing import Any
 
+from ..cache import CacheBackend, approx_size, get_or_fetch, matching_keys
 from ..client import AzurePricingClient
-from ..config import DEFAULT_CUSTOMER_DISCOUNT, REQUEST_DEDUP_TTL, SERVICE_NAME_MAPPINGS
+from ..config import (
+    COST_MATRIX_SKUS_PER_QUERY,
+    DEFAULT_CUSTOMER_DISCOUNT,
+    MAX_PAGES_PER_QUERY,
+    REQUEST_DEDUP_TTL,
+    SERVICE_NAME_MAPPINGS,
+    SWEEP_MAX_GRID_POINTS,
+)
+from ..metrics import record_cache
+from ..progress import ProgressReporter
+from ..tracing import set_attribute, span
+from .price_sheet import PriceSheet
 from .retirement import RetirementService
 
 logger = logging.getLogger(__name__)
 
+# Reservation terms and the hours their (whole-term) price covers
+RI_TERM_HOURS: dict[str, int] = {"1 Year": 8760, "3 Years": 26280}
+SAVINGS_PLAN_TERMS = ("1 Year", "3 Years")
+
 
 def normalize_sku_name(sku_name: str) -> tuple[list[str], str]:
     """Normalize SKU name to handle different formats and generate search variants.
@@ -48,36 +66,195 @@ def normalize_sku_name(sku_name: str) -> tuple[list[str], str]:
     return (search_terms, display_name)
 
 
+def monthly_units(unit_of_measure: str | None, hours_per_month: float = 730) -> float | None:
+    """Return how many billing units of ``unit_of_measure`` one resource consumes per month.
+
+    Hourly and daily meters scale with ``hours_per_month``; monthly meters count
+    once. Returns None for units that are not time-based (e.g. per GB or per
+    10K transactions).
+    """
+    if not unit_of_measure:
+        return None
+    match = re.match(r"\s*([\d.,]*)\s*/?\s*(.*)", unit_of_measure.lower())
+    if match is None:
+        return None
+    count, period = match.groups()
+    per = float(count.replace(",", "")) if count else 1.0
+    if period in ("hour", "hours"):
+        return hours_per_month / per
+    if period in ("day", "days"):
+        return hours_per_month / 24 / per
+    if period in ("month", "months"):
+        return 1 / per
+    return None
+
+
+def unique_currencies(currency_codes: list[str] | None, default: str = "USD") -> list[str]:
+    """Upper-cased currency codes in request order, without duplicates (``[default]`` when empty)."""
+    currencies = list(dict.fromkeys(code.strip().upper() for code in currency_codes or [] if code and code.strip()))
+    return currencies or [default.upper()]
+
+
+def _price_row_key(item: dict[str, Any]) -> tuple[Any, ...]:
+    """Key that lines up the same price across currencies (meter ID, or the identifying fields)."""
+    return (
+        item.get("meterId"),
+        item.get("skuId"),
+        item.get("armRegionName"),
+        item.get("skuName"),
+        item.get("productName"),
+        item.get("meterName"),
+        item.get("type"),
+        item.get("reservationTerm"),
+        item.get("tierMinimumUnits"),
+    )
+
+
+def _sku_match_terms(sku_name: str) -> set[str]:
+    """Exact skuName / armSkuName spellings that identify a requested SKU."""
+    search_terms, display_name = normalize_sku_name(sku_name)
+    original = sku_name.strip()
+    return {term for term in (original, original.replace("_", " "), display_name, *search_terms) if term}
+
+
+def _grid_row(item: dict[str, Any], row_of: dict[str, int]) -> int | None:
+    """Row of the requested SKU a price item fills, matched on skuName, then armSkuName.
+
+    Spot and Low Priority meters share the armSkuName of the regular meter, so
+    they only fill a row requested by their own skuName (e.g. "D4s v3 Spot").
+    """
+    sku_name = item.get("skuName") or ""
+    row = row_of.get(sku_name.lower())
+    if row is not None or "Spot" in sku_name or "Low Priority" in sku_name:
+        return row
+    return row_of.get((item.get("armSkuName") or "").lower())
+
+
+def region_price_entry(item: dict[str, Any]) -> dict[str, Any] | None:
+    """Per-region price entry for a pricing item, as used in region recommendations.
+
+    Returns None for items without a region or a positive price. ``pricing_type``
+    is "On-Demand", "Spot" or "Low Priority".
+    """
+    region = item.get("armRegionName")
+    price = item.get("retailPrice", 0)
+    if not region or not price or price <= 0:
+        return None
+
+    sku_name_item = item.get("skuName", "")
+    meter_name = item.get("meterName", "")
+    if "Spot" in sku_name_item or "Spot" in meter_name:
+        pricing_type = "Spot"
+    elif "Low Priority" in sku_name_item or "Low Priority" in meter_name:
+        pricing_type = "Low Priority"
+    else:
+        pricing_type = "On-Demand"
+
+    entry = {
+        "region": region,
+        "location": item.get("location", region),
+        "retail_price": price,
+        "sku_name": item.get("skuName"),
+        "product_name": item.get("productName"),
+        "unit_of_measure": item.get("unitOfMeasure"),
+        "meter_name": item.get("meterName"),
+        "pricing_type": pricing_type,
+    }
+    if "originalPrice" in item:
+        entry["original_price"] = item["originalPrice"]
+    return entry
+
+
 class PricingService:
     """Service for Azure pricing operations."""
 
-    def __init__(self, client: AzurePricingClient, retirement_service: RetirementService) -> None:
+    def __init__(
+        self,
+        client: AzurePricingClient,
+        retirement_service: RetirementService,
+        price_sheet: PriceSheet | None = None,
+        shared_cache: CacheBackend | None = None,
+    ) -> None:
         self._client = client
         self._retirement_service = retirement_service
+        self._price_sheet = price_sheet
         self._request_cache: dict[str, tuple[dict[str, Any], datetime]] = {}
+        # Second-level cache shared with other worker processes
+        self._shared_cache = shared_cache
+
+    def cache_stats(self, oldest: int = 5) -> dict[str, Any]:
+        """Size, approximate memory and oldest entries of the request deduplication cache."""
+        now = datetime.now()
+        ranked = sorted(self._request_cache.items(), key=lambda item: item[1][1])
+        return {
+            "entries": len(self._request_cache),
+            "bytes": approx_size(self._request_cache),
+            "ttl_seconds": REQUEST_DEDUP_TTL,
+            "oldest": [
+                {"key": key, "age_seconds": round((now - cached_time).total_seconds(), 1)}
+                for key, (_, cached_time) in ranked[:oldest]
+            ],
+        }
+
+    def clear_cache(self, prefix: str | None = None, key: str | None = None) -> int:
+        """Drop request deduplication entries (all, one *key* or a key *prefix*); returns the number removed."""
+        keys = matching_keys(self._request_cache, prefix, key)
+        for k in keys:
+            del self._request_cache[k]
+        return len(keys)
+
+    @property
+    def price_sheet(self) -> PriceSheet | None:
+        """The customer price sheet, if one is configured."""
+        return self._price_sheet
 
     async def _fetch_prices_cached(
         self,
         filter_conditions: list[str] | None = None,
         currency_code: str = "USD",
         limit: int | None = None,
+        all_pages: bool = False,
+        max_pages: int | None = None,
     ) -> dict[str, Any]:
-        """Fetch prices with request-level deduplication cache."""
-        cache_key = json.dumps({"f": filter_conditions, "c": currency_code, "l": limit}, sort_keys=True)
-        if cache_key in self._request_cache:
-            result, cached_time = self._request_cache[cache_key]
-            if (datetime.now() - cached_time).total_seconds() < REQUEST_DEDUP_TTL:
-                return result
-        result = await self._client.fetch_prices(filter_conditions, currency_code, limit)
-        self._request_cache[cache_key] = (result, datetime.now())
-        # Evict old entries
-        if len(self._request_cache) > 100:
-            cutoff = datetime.now()
-            self._request_cache = {
-                k: v for k, v in self._request_cache.items()
-                if (cutoff - v[1]).total_seconds() < REQUEST_DEDUP_TTL
-            }
-        return result
+        """Fetch prices with request-level deduplication cache.
+
+        With ``all_pages`` the query follows NextPageLink via the client, up to
+        ``max_pages`` pages when given. Misses fall through to the shared cache,
+        when configured, before querying the API.
+        """
+        cache_key = json.dumps(
+            {"f": filter_conditions, "c": currency_code, "l": limit, "a": all_pages, "p": max_pages}, sort_keys=True
+        )
+        with span("prices.fetch", filters=len(filter_conditions or []), all_pages=all_pages):
+            if cache_key in self._request_cache:
+                result, cached_time = self._request_cache[cache_key]
+                if (datetime.now() - cached_time).total_seconds() < REQUEST_DEDUP_TTL:
+                    record_cache("request_dedup", hit=True)
+                    set_attribute("cache_hit", True)
+                    return result
+            record_cache("request_dedup", hit=False)
+            set_attribute("cache_hit", False)
+
+            async def fetch() -> dict[str, Any]:
+                if all_pages:
+                    page_kwargs = {"max_pages": max_pages} if max_pages is not None else {}
+                    return await self._client.fetch_all_prices(filter_conditions, currency_code, limit, **page_kwargs)
+                return await self._client.fetch_prices(filter_conditions, currency_code, limit)
+
+            if self._shared_cache is not None:
+                result = await get_or_fetch(self._shared_cache, f"prices:{cache_key}", REQUEST_DEDUP_TTL, fetch)
+            else:
+                result = await fetch()
+            set_attribute("items", len(result.get("Items", [])) if isinstance(result, dict) else 0)
+            self._request_cache[cache_key] = (result, datetime.now())
+            # Evict old entries
+            if len(self._request_cache) > 100:
+                cutoff = datetime.now()
+                self._request_cache = {
+                    k: v for k, v in self._request_cache.items()
+                    if (cutoff - v[1]).total_seconds() < REQUEST_DEDUP_TTL
+                }
+            return result
 
     async def search_prices(
         self,
@@ -90,8 +267,14 @@ class PricingService:
         limit: int = 50,
         discount_percentage: float | None = None,
         validate_sku: bool = True,
+        use_price_sheet: bool = False,
     ) -> dict[str, Any]:
-        """Search Azure retail prices with various filters."""
+        """Search Azure retail prices with various filters.
+
+        When ``use_price_sheet`` is set and a customer price sheet is configured,
+        negotiated rates replace the flat ``discount_percentage`` (which then only
+        applies to items the sheet does not cover).
+        """
         # Resolve user-friendly names to official Azure service names
         if service_name and service_name.lower() in SERVICE_NAME_MAPPINGS:
             service_name = SERVICE_NAME_MAPPINGS[service_name.lower()]
@@ -109,11 +292,7 @@ class PricingService:
         if price_type:
             filter_conditions.append(f"priceType eq '{price_type}'")
 
-        data = await self._client.fetch_prices(
-            filter_conditions=filter_conditions,
-            currency_code=currency_code,
-            limit=limit,
-        )
+        data = await self._fetch_prices_cached(filter_conditions, currency_code, limit)
 
         items = data.get("Items", [])
 
@@ -130,8 +309,13 @@ class PricingService:
                 "suggestions": [item.get("skuName") for item in items[:5] if item and item.get("skuName")],
             }
 
-        # Apply discount
-        if discount_percentage is not None and discount_percentage > 0 and isinstance(items, list):
+        # Apply negotiated price-sheet rates or a flat discount
+        price_sheet_info: dict[str, Any] | None = None
+        if use_price_sheet and self._price_sheet is not None and isinstance(items, list):
+            items, price_sheet_info = self._apply_price_sheet_to_items(
+                self._price_sheet, items, currency_code, discount_percentage
+            )
+        elif discount_percentage is not None and discount_percentage > 0 and isinstance(items, list):
             items = self._apply_discount_to_items(items, discount_percentage)
 
         # Check retirement status for VM SKUs
@@ -150,7 +334,9 @@ class PricingService:
         if retirement_warnings:
             result["retirement_warnings"] = retirement_warnings
 
-        if discount_percentage is not None and discount_percentage > 0:
+        if price_sheet_info is not None:
+            result["discount_applied"] = price_sheet_info
+        elif discount_percentage is not None and discount_percentage > 0:
             result["discount_applied"] = {"percentage": discount_percentage, "note": "Prices shown are after discount"}
 
         if validation_info:
@@ -158,6 +344,70 @@ class PricingService:
 
         return result
 
+    async def search_prices_multi_currency(self, currency_codes: list[str], **search_kwargs: Any) -> dict[str, Any]:
+        """Run one price search in several currencies and line the prices up as columns.
+
+        The same filter is fetched concurrently per currency (through the request
+        cache), so the call takes about as long as a single-currency search.
+        SKU validation, retirement warnings and discount notes come from the
+        first currency.
+        """
+        currencies = unique_currencies(currency_codes)
+        search_kwargs.pop("currency_code", None)
+        primary_kwargs = dict(search_kwargs)
+        other_kwargs = {**search_kwargs, "validate_sku": False}
+
+        outcomes = await asyncio.gather(
+            *(
+                self.search_prices(currency_code=code, **(primary_kwargs if i == 0 else other_kwargs))
+                for i, code in enumerate(currencies)
+            ),
+            return_exceptions=True,
+        )
+
+        results: dict[str, dict[str, Any]] = {}
+        errors: dict[str, str] = {}
+        for code, outcome in zip(currencies, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                logger.warning(f"Price search in {code} failed: {outcome}")
+                errors[code] = str(outcome)
+            else:
+                results[code] = outcome
+        if not results:
+            return {"error": "Price search failed for every currency", "currencies": currencies, "errors": errors}
+
+        rows: dict[tuple[Any, ...], dict[str, Any]] = {}
+        for code, result in results.items():
+            for item in result.get("items", []):
+                row = rows.get(_price_row_key(item))
+                if row is None:
+                    row = rows[_price_row_key(item)] = {
+                        "sku_name": item.get("skuName"),
+                        "product_name": item.get("productName"),
+                        "meter_name": item.get("meterName"),
+                        "region": item.get("armRegionName"),
+                        "location": item.get("location"),
+                        "unit_of_measure": item.get("unitOfMeasure"),
+                        "type": item.get("type"),
+                        "reservation_term": item.get("reservationTerm"),
+                        "prices": dict.fromkeys(currencies),
+                    }
+                row["prices"][code] = item.get("retailPrice")
+
+        primary = results.get(currencies[0]) or next(iter(results.values()))
+        combined: dict[str, Any] = {
+            "currencies": currencies,
+            "rows": list(rows.values()),
+            "count": len(rows),
+            "has_more": any(result.get("has_more") for result in results.values()),
+            "filters_applied": primary.get("filters_applied", []),
+            "errors": errors,
+        }
+        for key in ("retirement_warnings", "discount_applied", "clarification", "suggestions"):
+            if key in primary:
+                combined[key] = primary[key]
+        return combined
+
     async def _validate_and_suggest_skus(
         self, service_name: str | None, sku_name: str, currency_code: str = "USD"
     ) -> dict[str, Any]:
@@ -246,6 +496,39 @@ class PricingService:
 
         return discounted_items
 
+    def _apply_price_sheet_to_items(
+        self, price_sheet: PriceSheet, items: list[dict], currency_code: str, fallback_discount: float | None
+    ) -> tuple[list[dict], dict[str, Any]]:
+        """Apply customer price-sheet rates to pricing items.
+
+        Returns:
+            Tuple of (priced_items, discount_applied_info)
+        """
+        priced, matched = price_sheet.apply_to_items(items, currency_code, fallback_discount)
+        sheet_default = price_sheet.default_discount_percentage
+        default_pct = sheet_default if sheet_default is not None else (fallback_discount or 0.0)
+        return priced, {
+            "percentage": default_pct,
+            "source": "price_sheet",
+            "customer_id": price_sheet.customer_id,
+            "matched_items": matched,
+            "total_items": len(items),
+            "note": (
+                f"Negotiated price-sheet rates applied to {matched} of {len(items)} items; "
+                f"other items at {default_pct}% discount"
+            ),
+        }
+
+    def _price_sheet_search_kwargs(self, use_price_sheet: bool, discount_percentage: float | None) -> dict[str, Any]:
+        """Build search_prices kwargs that delegate discounting to the price sheet.
+
+        Returns an empty dict when no price sheet is in play, so callers keep
+        applying ``discount_percentage`` themselves.
+        """
+        if not use_price_sheet or self._price_sheet is None:
+            return {}
+        return {"use_price_sheet": True, "discount_percentage": discount_percentage}
+
     async def compare_prices(
         self,
         service_name: str,
@@ -253,9 +536,13 @@ class PricingService:
         regions: list[str] | None = None,
         currency_code: str = "USD",
         discount_percentage: float | None = None,
+        use_price_sheet: bool = False,
     ) -> dict[str, Any]:
         """Compare prices across different regions or SKUs."""
         comparisons = []
+        # With a price sheet, rates are applied per item inside search_prices
+        sheet_kwargs = self._price_sheet_search_kwargs(use_price_sheet, discount_percentage)
+        sheet_info: dict[str, Any] | None = None
 
         if regions and isinstance(regions, list):
             for region in regions:
@@ -266,20 +553,23 @@ class PricingService:
                         region=region,
                         currency_code=currency_code,
                         limit=10,
+                        **sheet_kwargs,
                     )
+                    sheet_info = result.get("discount_applied") if sheet_kwargs else None
 
                     if result["items"]:
                         item = result["items"][0]
-                        comparisons.append(
-                            {
-                                "region": region,
-                                "sku_name": item.get("skuName"),
-                                "retail_price": item.get("retailPrice"),
-                                "unit_of_measure": item.get("unitOfMeasure"),
-                                "product_name": item.get("productName"),
-                                "meter_name": item.get("meterName"),
-                            }
-                        )
+                        comparison = {
+                            "region": region,
+                            "sku_name": item.get("skuName"),
+                            "retail_price": item.get("retailPrice"),
+                            "unit_of_measure": item.get("unitOfMeasure"),
+                            "product_name": item.get("productName"),
+                            "meter_name": item.get("meterName"),
+                        }
+                        if "originalPrice" in item:
+                            comparison["original_price"] = item["originalPrice"]
+                        comparisons.append(comparison)
                 except Exception as e:
                     logger.warning(f"Failed to get prices for region {region}: {e}")
         else:
@@ -287,7 +577,9 @@ class PricingService:
                 service_name=service_name,
                 currency_code=currency_code,
                 limit=20,
+                **sheet_kwargs,
             )
+            sheet_info = result.get("discount_applied") if sheet_kwargs else None
 
             sku_prices: dict[str, dict[str, Any]] = {}
             items = result.get("items", [])
@@ -302,10 +594,12 @@ class PricingService:
                         "region": item.get("armRegionName"),
                         "meter_name": item.get("meterName"),
                     }
+                    if "originalPrice" in item:
+                        sku_prices[sku]["original_price"] = item["originalPrice"]
 
             comparisons = list(sku_prices.values())
 
-        if discount_percentage is not None and discount_percentage > 0:
+        if not sheet_kwargs and discount_percentage is not None and discount_percentage > 0:
             for comparison in comparisons:
                 if "retail_price" in comparison and comparison["retail_price"]:
                     original_price = comparison["retail_price"]
@@ -322,7 +616,9 @@ class PricingService:
             "comparison_type": "regions" if regions else "skus",
         }
 
-        if discount_percentage is not None and discount_percentage > 0:
+        if sheet_info:
+            result_data["discount_applied"] = sheet_info
+        elif discount_percentage is not None and discount_percentage > 0:
             result_data["discount_applied"] = {
                 "percentage": discount_percentage,
                 "note": "Prices shown are after discount",
@@ -337,9 +633,11 @@ class PricingService:
         top_n: int = 10,
         currency_code: str = "USD",
         discount_percentage: float | None = None,
+        use_price_sheet: bool = False,
     ) -> dict[str, Any]:
         """Recommend the cheapest Azure regions for a given service and SKU."""
         search_terms, display_sku = normalize_sku_name(sku_name)
+        sheet_kwargs = self._price_sheet_search_kwargs(use_price_sheet, discount_percentage)
 
         discovery_result: dict[str, Any] = {"items": []}
 
@@ -350,6 +648,7 @@ class PricingService:
                 currency_code=currency_code,
                 limit=500,
                 validate_sku=False,
+                **sheet_kwargs,
             )
             if discovery_result.get("items"):
                 break
@@ -368,33 +667,13 @@ class PricingService:
         spot_data: dict[str, dict[str, Any]] = {}
 
         for item in discovery_result["items"]:
-            region = item.get("armRegionName")
-            price = item.get("retailPrice", 0)
-            location = item.get("location", region)
-            sku_name_item = item.get("skuName", "")
-            meter_name = item.get("meterName", "")
-
-            is_spot = "Spot" in sku_name_item or "Spot" in meter_name
-            is_low_priority = "Low Priority" in sku_name_item or "Low Priority" in meter_name
-
-            if region and price and price > 0:
-                item_data = {
-                    "region": region,
-                    "location": location,
-                    "retail_price": price,
-                    "sku_name": item.get("skuName"),
-                    "product_name": item.get("productName"),
-                    "unit_of_measure": item.get("unitOfMeasure"),
-                    "meter_name": item.get("meterName"),
-                }
-
-                if is_spot or is_low_priority:
-                    pricing_type = "Spot" if is_spot else "Low Priority"
-                    if region not in spot_data or price < spot_data[region]["retail_price"]:
-                        spot_data[region] = {**item_data, "pricing_type": pricing_type}
-                else:
-                    if region not in region_data or price < region_data[region]["retail_price"]:
-                        region_data[region] = {**item_data, "pricing_type": "On-Demand"}
+            entry = region_price_entry(item)
+            if entry is None:
+                continue
+            region, price = entry["region"], entry["retail_price"]
+            target = region_data if entry["pricing_type"] == "On-Demand" else spot_data
+            if region not in target or price < target[region]["retail_price"]:
+                target[region] = entry
 
         for region, on_demand in region_data.items():
             if region in spot_data:
@@ -413,7 +692,7 @@ class PricingService:
 
         recommendations = list(region_data.values())
 
-        if discount_percentage is not None and discount_percentage > 0:
+        if not sheet_kwargs and discount_percentage is not None and discount_percentage > 0:
             for rec in recommendations:
                 original_price = rec["retail_price"]
                 discounted_price = original_price * (1 - discount_percentage / 100)
@@ -456,7 +735,9 @@ class PricingService:
                 "max_savings_percentage": recommendations[0].get("savings_vs_most_expensive", 0),
             }
 
-        if discount_percentage is not None and discount_percentage > 0:
+        if sheet_kwargs and discovery_result.get("discount_applied"):
+            result["discount_applied"] = discovery_result["discount_applied"]
+        elif discount_percentage is not None and discount_percentage > 0:
             result["discount_applied"] = {
                 "percentage": discount_percentage,
                 "note": "Prices shown are after discount",
@@ -472,14 +753,17 @@ class PricingService:
         hours_per_month: float = 730,
         currency_code: str = "USD",
         discount_percentage: float | None = None,
+        use_price_sheet: bool = False,
     ) -> dict[str, Any]:
         """Estimate monthly costs based on usage."""
+        sheet_kwargs = self._price_sheet_search_kwargs(use_price_sheet, discount_percentage)
         result = await self.search_prices(
             service_name=service_name,
             sku_name=sku_name,
             region=region or None,
             currency_code=currency_code,
             limit=5,
+            **sheet_kwargs,
         )
 
         if not result["items"]:
@@ -494,8 +778,15 @@ class PricingService:
         hourly_rate = item.get("retailPrice", 0)
         original_hourly_rate = hourly_rate
 
-        if discount_percentage is not None and discount_percentage > 0:
-            hourly_rate = hourly_rate * (1 - discount_percentage / 100)
+        # Flat discount applied here; price sheet rates were already applied per item by search_prices
+        flat_discount = 0.0 if sheet_kwargs else discount_percentage or 0.0
+        if sheet_kwargs:
+            original_hourly_rate = item.get("originalPrice", hourly_rate)
+            is_discounted = "originalPrice" in item
+        else:
+            is_discounted = flat_discount > 0
+            if is_discounted:
+                hourly_rate = hourly_rate * (1 - flat_discount / 100)
 
         monthly_cost = hourly_rate * hours_per_month
         daily_cost = hourly_rate * 24
@@ -506,10 +797,10 @@ class PricingService:
 
         for plan in savings_plans:
             plan_hourly = plan.get("retailPrice", 0)
-            original_plan_hourly = plan_hourly
+            original_plan_hourly = plan.get("originalPrice", plan_hourly)
 
-            if discount_percentage is not None and discount_percentage > 0:
-                plan_hourly = plan_hourly * (1 - discount_percentage / 100)
+            if flat_discount > 0:
+                plan_hourly = plan_hourly * (1 - flat_discount / 100)
 
             plan_monthly = plan_hourly * hours_per_month
             plan_yearly = plan_monthly * 12
@@ -524,7 +815,7 @@ class PricingService:
                 "annual_savings": round((yearly_cost - plan_yearly), 2),
             }
 
-            if discount_percentage is not None and discount_percentage > 0:
+            if is_discounted:
                 plan_data["original_hourly_rate"] = original_plan_hourly
                 plan_data["original_monthly_cost"] = round(original_plan_hourly * hours_per_month, 2)
                 plan_data["original_yearly_cost"] = round(original_plan_hourly * hours_per_month * 12, 2)
@@ -551,11 +842,13 @@ class PricingService:
             "savings_plans": savings_estimates,
         }
 
-        if discount_percentage is not None and discount_percentage > 0:
-            estimate_result["discount_applied"] = {
+        if is_discounted:
+            estimate_result["discount_applied"] = result.get("discount_applied") or {
                 "percentage": discount_percentage,
                 "note": "All prices shown are after discount",
             }
+            if "priceSheetMatch" in item:
+                estimate_result["discount_applied"]["match"] = item["priceSheetMatch"]
             estimate_result["on_demand_pricing"]["original_hourly_rate"] = original_hourly_rate
             estimate_result["on_demand_pricing"]["original_daily_cost"] = round(original_hourly_rate * 24, 2)
             estimate_result["on_demand_pricing"]["original_monthly_cost"] = round(
@@ -567,6 +860,537 @@ class PricingService:
 
         return estimate_result
 
+    async def estimate_costs_multi_currency(self, currency_codes: list[str], **estimate_kwargs: Any) -> dict[str, Any]:
+        """Estimate one resource's cost in several currencies, fetched concurrently.
+
+        Returns the per-currency estimates plus ``rows``: on-demand and savings
+        plan costs as one value per currency.
+        """
+        currencies = unique_currencies(currency_codes)
+        estimate_kwargs.pop("currency_code", None)
+        outcomes = await asyncio.gather(
+            *(self.estimate_costs(currency_code=code, **estimate_kwargs) for code in currencies),
+            return_exceptions=True,
+        )
+
+        estimates: dict[str, dict[str, Any]] = {}
+        errors: dict[str, str] = {}
+        for code, outcome in zip(currencies, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                logger.warning(f"Cost estimate in {code} failed: {outcome}")
+                errors[code] = str(outcome)
+            elif "error" in outcome:
+                errors[code] = outcome["error"]
+            else:
+                estimates[code] = outcome
+        if not estimates:
+            first_error = next(iter(errors.values()), "No pricing found")
+            return {"error": first_error, "currencies": currencies, "errors": errors}
+
+        rows: dict[str, dict[str, Any]] = {}
+
+        def _add(label: str, code: str, value: float | None) -> None:
+            rows.setdefault(label, {"label": label, "values": dict.fromkeys(currencies)})["values"][code] = value
+
+        for code, estimate in estimates.items():
+            on_demand = estimate["on_demand_pricing"]
+            _add("On-Demand hourly", code, on_demand["hourly_rate"])
+            _add("On-Demand daily", code, on_demand["daily_cost"])
+            _add("On-Demand monthly", code, on_demand["monthly_cost"])
+            _add("On-Demand yearly", code, on_demand["yearly_cost"])
+        for code, estimate in estimates.items():
+            for plan in estimate.get("savings_plans", []):
+                _add(f"Savings Plan {plan['term']} monthly", code, plan["monthly_cost"])
+                _add(f"Savings Plan {plan['term']} yearly", code, plan["yearly_cost"])
+
+        primary = estimates.get(currencies[0]) or next(iter(estimates.values()))
+        combined: dict[str, Any] = {
+            "currencies": currencies,
+            "service_name": primary.get("service_name"),
+            "sku_name": primary.get("sku_name"),
+            "region": primary.get("region"),
+            "product_name": primary.get("product_name"),
+            "unit_of_measure": primary.get("unit_of_measure"),
+            "usage_assumptions": primary.get("usage_assumptions"),
+            "rows": list(rows.values()),
+            "estimates": estimates,
+            "errors": errors,
+        }
+        if "discount_applied" in primary:
+            combined["discount_applied"] = primary["discount_applied"]
+        return combined
+
+    async def estimate_cost_sweep(
+        self,
+        service_name: str,
+        sku_name: str,
+        region: str = "",
+        hours_per_month: list[float] | None = None,
+        quantities: list[float] | None = None,
+        discount_percentages: list[float] | None = None,
+        savings_plan_terms: list[str] | None = None,
+        currency_code: str = "USD",
+        discount_percentage: float | None = None,
+        use_price_sheet: bool = False,
+    ) -> dict[str, Any]:
+        """Estimate costs over a grid of usage hours, quantities, discounts and savings plans.
+
+        The price is fetched once; every grid point is derived from it. When
+        ``discount_percentages`` is omitted the single resolved discount (or
+        the customer price sheet) is used.
+
+        Returns:
+            Dict with the swept dimensions, a flat ``grid`` of cost points
+            (pricing option → discount → hours → quantity order) and the
+            cheapest / most expensive points.
+        """
+        hours_values = [float(h) for h in (hours_per_month or [730])]
+        quantity_values = [float(q) for q in (quantities or [1])]
+
+        sheet_kwargs: dict[str, Any] = {}
+        if discount_percentages is None:
+            sheet_kwargs = self._price_sheet_search_kwargs(use_price_sheet, discount_percentage)
+            discount_percentages = [0.0] if sheet_kwargs else [discount_percentage or 0.0]
+        discount_values = [float(d) for d in discount_percentages]
+
+        result = await self.search_prices(
+            service_name=service_name,
+            sku_name=sku_name,
+            region=region or None,
+            currency_code=currency_code,
+            limit=5,
+            **sheet_kwargs,
+        )
+
+        if not result["items"]:
+            return {
+                "error": f"No pricing found for {sku_name} in {region}",
+                "service_name": service_name,
+                "sku_name": sku_name,
+                "region": region,
+            }
+
+        item = result["items"][0]
+
+        # Pricing options: on-demand plus requested (or all available) savings plan terms
+        options: list[tuple[str, float]] = [("On-Demand", item.get("retailPrice", 0))]
+        available_terms = {plan.get("term"): plan.get("retailPrice", 0) for plan in item.get("savingsPlan", [])}
+        requested_terms = savings_plan_terms if savings_plan_terms is not None else list(available_terms)
+        missing_terms = [term for term in requested_terms if term not in available_terms]
+        options.extend(
+            (f"Savings Plan {term}", available_terms[term]) for term in requested_terms if term in available_terms
+        )
+
+        grid_size = len(options) * len(discount_values) * len(hours_values) * len(quantity_values)
+        if grid_size > SWEEP_MAX_GRID_POINTS:
+            return {
+                "error": f"Sweep grid has {grid_size} points, exceeding the limit of {SWEEP_MAX_GRID_POINTS}",
+                "service_name": service_name,
+                "sku_name": sku_name,
+                "region": region,
+            }
+
+        # Usage vector (hours × quantity) and rate vector (option × discount), then their outer product
+        usage = [(h, q, h * q) for h in hours_values for q in quantity_values]
+        rates = [(label, d, rate * (1 - d / 100)) for label, rate in options for d in discount_values]
+
+        grid: list[dict[str, Any]] = [
+            {
+                "pricing": label,
+                "discount_percentage": d,
+                "hours_per_month": h,
+                "quantity": q,
+                "hourly_rate": round(rate, 6),
+                "monthly_cost": round(rate * units, 2),
+                "yearly_cost": round(rate * units * 12, 2),
+            }
+            for label, d, rate in rates
+            for h, q, units in usage
+        ]
+
+        sweep_result: dict[str, Any] = {
+            "service_name": service_name,
+            "sku_name": item.get("skuName"),
+            "region": region,
+            "product_name": item.get("productName"),
+            "unit_of_measure": item.get("unitOfMeasure"),
+            "currency": currency_code,
+            "base_hourly_rate": item.get("retailPrice", 0),
+            "dimensions": {
+                "pricing": [label for label, _ in options],
+                "discount_percentages": discount_values,
+                "hours_per_month": hours_values,
+                "quantities": quantity_values,
+            },
+            "grid_points": len(grid),
+            "grid": grid,
+        }
+
+        if grid:
+            sweep_result["cheapest"] = min(grid, key=lambda point: point["monthly_cost"])
+            sweep_result["most_expensive"] = max(grid, key=lambda point: point["monthly_cost"])
+        if missing_terms:
+            sweep_result["unavailable_savings_plan_terms"] = missing_terms
+        if sheet_kwargs and result.get("discount_applied"):
+            sweep_result["discount_applied"] = result["discount_applied"]
+
+        return sweep_result
+
+    async def cost_matrix(
+        self,
+        service_name: str,
+        sku_names: list[str],
+        regions: list[str],
+        hours_per_month: float = 730,
+        price_type: str = "Consumption",
+        currency_code: str = "USD",
+        discount_percentage: float | None = None,
+        use_price_sheet: bool = False,
+        progress: ProgressReporter | None = None,
+    ) -> dict[str, Any]:
+        """Build a dense SKU × region price matrix from a few batched queries.
+
+        Prices come from :meth:`fetch_price_grid`, so a whole matrix costs one
+        query per ``COST_MATRIX_SKUS_PER_QUERY`` SKUs rather than one per cell.
+
+        Returns:
+            Dict with ``skus`` (rows), ``regions`` (columns), ``unit_prices``
+            and ``monthly_costs`` matrices (None where unavailable), per-row and
+            per-column minimums and the overall cheapest cell.
+        """
+        skus = list(dict.fromkeys(s.strip() for s in sku_names if s and s.strip()))
+        region_list = list(dict.fromkeys(r.strip().lower() for r in regions if r and r.strip()))
+        if not skus or not region_list:
+            return {"error": "At least one SKU and one region are required", "service_name": service_name}
+
+        grid = await self.fetch_price_grid(
+            service_name,
+            skus,
+            region_list,
+            price_type=price_type,
+            currency_code=currency_code,
+            discount_percentage=discount_percentage,
+            use_price_sheet=use_price_sheet,
+            progress=progress,
+        )
+        service_name = grid["service_name"]
+        cells = grid["cells"]
+
+        unit_prices = [[cell["retailPrice"] if cell else None for cell in row] for row in cells]
+        units = [
+            [monthly_units(cell.get("unitOfMeasure"), hours_per_month) if cell else None for cell in row]
+            for row in cells
+        ]
+        monthly_costs = [
+            [round(p * u, 2) if p is not None and u is not None else None for p, u in zip(p_row, u_row, strict=True)]
+            for p_row, u_row in zip(unit_prices, units, strict=True)
+        ]
+        # Rank on monthly cost when every populated cell is time-based, otherwise on unit price
+        comparable = all(
+            (p is None) == (m is None)
+            for p_row, m_row in zip(unit_prices, monthly_costs, strict=True)
+            for p, m in zip(p_row, m_row, strict=True)
+        )
+        ranking = monthly_costs if comparable else unit_prices
+        ranking_field = "monthly_cost" if comparable else "unit_price"
+
+        def _cell_summary(row: int, col: int) -> dict[str, Any]:
+            return {
+                "sku": skus[row],
+                "region": region_list[col],
+                "unit_price": unit_prices[row][col],
+                "monthly_cost": monthly_costs[row][col],
+            }
+
+        def _argmin(values: list[float | None]) -> int | None:
+            present = [(v, i) for i, v in enumerate(values) if v is not None]
+            return min(present)[1] if present else None
+
+        row_minimums: list[dict[str, Any] | None] = []
+        for row, values in enumerate(ranking):
+            min_col = _argmin(values)
+            row_minimums.append(_cell_summary(row, min_col) if min_col is not None else None)
+
+        column_minimums: list[dict[str, Any] | None] = []
+        for col in range(len(region_list)):
+            min_row = _argmin([values[col] for values in ranking])
+            column_minimums.append(_cell_summary(min_row, col) if min_row is not None else None)
+
+        missing = [
+            {"sku": skus[row], "region": region_list[col]}
+            for row, values in enumerate(unit_prices)
+            for col, value in enumerate(values)
+            if value is None
+        ]
+
+        result: dict[str, Any] = {
+            "service_name": service_name,
+            "currency": currency_code,
+            "price_type": price_type,
+            "hours_per_month": hours_per_month,
+            "skus": skus,
+            "regions": region_list,
+            "units_of_measure": [next((cell.get("unitOfMeasure") for cell in row if cell), None) for row in cells],
+            "unit_prices": unit_prices,
+            "monthly_costs": monthly_costs,
+            "ranked_by": ranking_field,
+            "row_minimums": row_minimums,
+            "column_minimums": column_minimums,
+            "missing_cells": missing,
+            "queries": grid["queries"],
+            "truncated": grid["truncated"],
+        }
+
+        populated = [summary for summary in row_minimums if summary is not None]
+        if populated:
+            result["cheapest"] = min(populated, key=lambda summary: summary[ranking_field])
+
+        if grid["discount_applied"] is not None:
+            result["discount_applied"] = grid["discount_applied"]
+
+        return result
+
+    async def fetch_service_prices(
+        self,
+        service_name: str,
+        region: str | None = None,
+        price_type: str = "Consumption",
+        currency_code: str = "USD",
+        max_pages: int | None = None,
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """Fetch every price of a service in one region (or all regions), following all pages.
+
+        ``max_pages`` overrides AZURE_PRICING_MAX_PAGES for service-wide scans.
+
+        Returns:
+            Tuple of the items and whether the scan stopped at the page limit
+            (more prices exist than were returned).
+        """
+        if service_name and service_name.lower() in SERVICE_NAME_MAPPINGS:
+            service_name = SERVICE_NAME_MAPPINGS[service_name.lower()]
+        filter_conditions = [f"serviceName eq '{service_name}'", f"priceType eq '{price_type}'"]
+        if region:
+            filter_conditions.insert(1, f"armRegionName eq '{region}'")
+        data = await self._fetch_prices_cached(filter_conditions, currency_code, all_pages=True, max_pages=max_pages)
+        items: list[dict[str, Any]] = data.get("Items", [])
+        truncated = bool(data.get("NextPageLink"))
+        if truncated:
+            logger.warning(f"{service_name} price scan truncated at {max_pages or MAX_PAGES_PER_QUERY} pages")
+        return items, truncated
+
+    async def fetch_price_grid(
+        self,
+        service_name: str,
+        sku_names: list[str],
+        regions: list[str] | None = None,
+        price_type: str = "Consumption",
+        currency_code: str = "USD",
+        discount_percentage: float | None = None,
+        use_price_sheet: bool = False,
+        reservation_term: str | None = None,
+        progress: ProgressReporter | None = None,
+    ) -> dict[str, Any]:
+        """Fetch the cheapest pricing item for every SKU × region with batched queries.
+
+        All regions go into a single OR'd filter (or no region filter when
+        ``regions`` is empty, covering every region) and SKUs are grouped
+        ``COST_MATRIX_SKUS_PER_QUERY`` at a time; the groups are fetched
+        concurrently with pagination and the request cache. When several meters
+        map to one cell (e.g. Linux and Windows), the cheapest is kept; Spot and
+        Low Priority meters only fill a cell when requested by their skuName.
+        ``reservation_term`` narrows Reservation queries to one term.
+        ``progress`` is advanced as each batched query completes.
+
+        Returns:
+            Dict with ``service_name`` (resolved), ``skus`` (rows), ``regions``
+            (columns, discovered from the results when not given), ``cells``
+            (pricing item or None per SKU × region), ``queries``,
+            ``discount_applied`` (None when no discount was applied) and
+            ``truncated`` (a query stopped at AZURE_PRICING_MAX_PAGES pages, so
+            cells may be missing or not the cheapest).
+        """
+        if service_name and service_name.lower() in SERVICE_NAME_MAPPINGS:
+            service_name = SERVICE_NAME_MAPPINGS[service_name.lower()]
+
+        skus = list(dict.fromkeys(sku_names))
+        sku_terms = [_sku_match_terms(sku) for sku in skus]
+        base_filter = [f"serviceName eq '{service_name}'", f"priceType eq '{price_type}'"]
+        if regions:
+            base_filter.append("(" + " or ".join(f"armRegionName eq '{region}'" for region in regions) + ")")
+        if reservation_term:
+            base_filter.append(f"reservationTerm eq '{reservation_term}'")
+
+        batches = []
+        for start in range(0, len(skus), COST_MATRIX_SKUS_PER_QUERY):
+            terms = sorted(set().union(*sku_terms[start : start + COST_MATRIX_SKUS_PER_QUERY]))
+            sku_clause = " or ".join(f"skuName eq '{t}' or armSkuName eq '{t}'" for t in terms)
+            batches.append([*base_filter, f"({sku_clause})"])
+
+        async def _fetch_batch(index: int, conditions: list[str]) -> dict[str, Any]:
+            response = await self._fetch_prices_cached(conditions, currency_code, all_pages=True)
+            if progress is not None:
+                batch_skus = skus[index * COST_MATRIX_SKUS_PER_QUERY : (index + 1) * COST_MATRIX_SKUS_PER_QUERY]
+                batch_items = response.get("Items", [])
+                await progress.advance(
+                    f"Fetched {service_name} prices for {', '.join(batch_skus)}",
+                    {
+                        "service_name": service_name,
+                        "skus": batch_skus,
+                        "items": len(batch_items),
+                        "regions": sorted({item["armRegionName"] for item in batch_items if item.get("armRegionName")}),
+                    },
+                )
+            return response
+
+        if progress is not None:
+            progress.add_total(len(batches))
+        responses = await asyncio.gather(*(_fetch_batch(i, conditions) for i, conditions in enumerate(batches)))
+        items = [item for response in responses for item in response.get("Items", [])]
+        truncated = any(response.get("NextPageLink") for response in responses)
+        if truncated:
+            logger.warning(f"{service_name} price grid truncated at {MAX_PAGES_PER_QUERY} pages per query")
+
+        discount_info: dict[str, Any] | None = None
+        if use_price_sheet and self._price_sheet is not None:
+            items, discount_info = self._apply_price_sheet_to_items(
+                self._price_sheet, items, currency_code, discount_percentage
+            )
+        elif discount_percentage is not None and discount_percentage > 0:
+            items = self._apply_discount_to_items(items, discount_percentage)
+            discount_info = {"percentage": discount_percentage, "note": "Prices shown are after discount"}
+
+        if regions:
+            region_list = list(regions)
+        else:
+            region_list = sorted({item["armRegionName"].lower() for item in items if item.get("armRegionName")})
+
+        # Index: lowercased sku term -> row, region -> column
+        row_of = {term.lower(): row for row, terms in enumerate(sku_terms) for term in terms}
+        col_of = {region: col for col, region in enumerate(region_list)}
+
+        cells: list[list[dict[str, Any] | None]] = [[None] * len(region_list) for _ in skus]
+        for item in items:
+            price = item.get("retailPrice")
+            col = col_of.get((item.get("armRegionName") or "").lower())
+            if col is None or not price or price <= 0:
+                continue
+            row = _grid_row(item, row_of)
+            if row is None:
+                continue
+            current = cells[row][col]
+            if current is None or price < current["retailPrice"]:
+                cells[row][col] = item
+
+        return {
+            "service_name": service_name,
+            "skus": skus,
+            "regions": region_list,
+            "cells": cells,
+            "queries": len(batches),
+            "discount_applied": discount_info,
+            "truncated": truncated,
+        }
+
+    async def fetch_commitment_rates(
+        self,
+        service_name: str,
+        region: str,
+        sku_names: list[str],
+        currency_code: str = "USD",
+        discount_percentage: float | None = None,
+        use_price_sheet: bool = False,
+    ) -> tuple[dict[str, dict[str, Any]], dict[str, Any] | None]:
+        """Fetch on-demand, savings plan and reservation rates for SKUs in one region.
+
+        Issues one Consumption and one Reservation price grid per term
+        concurrently. Reservation prices (quoted per term) are converted to
+        hourly rates after discounts; a price sheet's absolute unit prices are
+        hourly, so ``PriceSheet`` only applies them to the Consumption grid
+        and reservations get its percentage or default discount.
+
+        Returns:
+            Tuple of ``{sku: {"on_demand", "savings_plan": {term: hourly},
+            "reservation": {term: hourly}, "sku_name", "unit_of_measure"}}``
+            for SKUs with an on-demand price, and the discount metadata (None
+            when no discount was applied).
+        """
+        grid_kwargs: dict[str, Any] = {
+            "currency_code": currency_code,
+            "discount_percentage": discount_percentage,
+            "use_price_sheet": use_price_sheet,
+        }
+        consumption, *reservations = await asyncio.gather(
+            self.fetch_price_grid(service_name, sku_names, [region], **grid_kwargs),
+            *(
+                self.fetch_price_grid(
+                    service_name, sku_names, [region], price_type="Reservation", reservation_term=term, **grid_kwargs
+                )
+                for term in RI_TERM_HOURS
+            ),
+        )
+
+        rates: dict[str, dict[str, Any]] = {}
+        for row, sku in enumerate(consumption["skus"]):
+            item = consumption["cells"][row][0]
+            if item is None:
+                continue
+            plans = {plan.get("term"): plan.get("retailPrice", 0) for plan in item.get("savingsPlan") or []}
+            rates[sku] = {
+                "on_demand": item["retailPrice"],
+                "savings_plan": {term: plans[term] for term in SAVINGS_PLAN_TERMS if plans.get(term)},
+                "reservation": {},
+                "sku_name": item.get("skuName"),
+                "unit_of_measure": item.get("unitOfMeasure"),
+            }
+        for term, grid in zip(RI_TERM_HOURS, reservations, strict=True):
+            for row, sku in enumerate(grid["skus"]):
+                item = grid["cells"][row][0]
+                if item is not None and sku in rates:
+                    rates[sku]["reservation"][term] = item["retailPrice"] / RI_TERM_HOURS[term]
+        return rates, consumption["discount_applied"]
+
+    async def fetch_row_commitment_rates(
+        self,
+        rows: list[dict[str, Any]],
+        currency_code: str = "USD",
+        discount_percentage: float | None = None,
+        use_price_sheet: bool = False,
+    ) -> tuple[list[dict[str, Any] | None], dict[str, Any] | None]:
+        """Fetch commitment rates for rows with ``service_name``, ``region`` and ``sku_name``.
+
+        Rows are grouped by (service, region) so each group costs one
+        fetch_commitment_rates call; the groups are fetched concurrently.
+
+        Returns:
+            Tuple of the rates of each row (None when the SKU has no on-demand
+            price in its region) and the discount metadata of the first group
+            that applied one.
+        """
+        groups: dict[tuple[str, str], list[str]] = {}
+        for row in rows:
+            groups.setdefault((row["service_name"], row["region"]), []).append(row["sku_name"])
+        keys = list(groups)
+        fetched = await asyncio.gather(
+            *(
+                self.fetch_commitment_rates(
+                    service_name,
+                    region,
+                    groups[(service_name, region)],
+                    currency_code=currency_code,
+                    discount_percentage=discount_percentage,
+                    use_price_sheet=use_price_sheet,
+                )
+                for service_name, region in keys
+            )
+        )
+        discount_applied = None
+        by_group: dict[tuple[str, str], dict[str, dict[str, Any]]] = {}
+        for key, (rates, discount) in zip(keys, fetched, strict=True):
+            discount_applied = discount_applied or discount
+            by_group[key] = rates
+        row_rates = [by_group[(row["service_name"], row["region"])].get(row["sku_name"]) for row in rows]
+        return row_rates, discount_applied
+
     async def get_ri_pricing(
         self,
         service_name: str | None = None,
@@ -577,20 +1401,38 @@ class PricingService:
         compare_on_demand: bool = True,
         limit: int = 50,
     ) -> dict[str, Any]:
-        """Get Reserved Instance pricing and optionally compare with On-Demand."""
-        ri_filter = ["priceType eq 'Reservation'"]
+        """Get Reserved Instance pricing and optionally compare with On-Demand.
+
+        The Reservation and Consumption queries are issued concurrently and
+        both follow NextPageLink, so service-wide comparisons need a single
+        round-trip per page rather than one query after the other.
+        """
+        common_filter = []
         if service_name:
-            ri_filter.append(f"serviceName eq '{service_name}'")
+            common_filter.append(f"serviceName eq '{service_name}'")
         if region:
-            ri_filter.append(f"armRegionName eq '{region}'")
+            common_filter.append(f"armRegionName eq '{region}'")
         if sku_name:
-            ri_filter.append(f"contains(skuName, '{sku_name}')")
+            common_filter.append(f"contains(skuName, '{sku_name}')")
 
-        ri_data = await self._client.fetch_prices(
+        ri_filter = ["priceType eq 'Reservation'", *common_filter]
+        if reservation_term:
+            ri_filter.append(f"reservationTerm eq '{reservation_term}'")
+
+        ri_fetch = self._client.fetch_all_prices(
             filter_conditions=ri_filter,
             currency_code=currency_code,
             limit=limit,
         )
+        if compare_on_demand:
+            od_fetch = self._client.fetch_all_prices(
+                filter_conditions=["priceType eq 'Consumption'", *common_filter],
+                currency_code=currency_code,
+            )
+            ri_data, od_data = await asyncio.gather(ri_fetch, od_fetch)
+        else:
+            ri_data, od_data = await ri_fetch, None
+
         ri_items = ri_data.get("Items", [])
 
         if reservation_term:
@@ -602,80 +1444,100 @@ class PricingService:
             "count": len(ri_items),
         }
 
-        if compare_on_demand and ri_items:
-            od_filter = ["priceType eq 'Consumption'"]
-            if service_name:
-                od_filter.append(f"serviceName eq '{service_name}'")
-            if region:
-                od_filter.append(f"armRegionName eq '{region}'")
-            if sku_name:
-                od_filter.append(f"contains(skuName, '{sku_name}')")
-
-            od_data = await self._client.fetch_prices(
-                filter_conditions=od_filter,
-                currency_code=currency_code,
-                limit=limit * 2,
-            )
-            od_items = od_data.get("Items", [])
-
-            comparison = self._calculate_ri_savings(ri_items, od_items)
-            result["comparison"] = comparison
+        if od_data is not None and ri_items:
+            result["comparison"] = self._calculate_ri_savings(ri_items, od_data.get("Items", []))
 
         return result
 
     def _calculate_ri_savings(self, ri_items: list[dict], od_items: list[dict]) -> list[dict]:
-        """Calculate savings and break-even for RI vs On-Demand."""
-        comparison_results = []
-
-        od_map = {}
-        for item in od_items:
-            key = (item.get("skuName"), item.get("armRegionName"))
-            od_map[key] = item
+        """Calculate savings and break-even for RI vs On-Demand.
+
+        Reservations are hash-joined to On-Demand meters on (SKU, region,
+        product), then (SKU, region, meter name), then (SKU, region). The last
+        key can match several meters (e.g. Linux and Windows); the cheapest
+        one is used so savings are never overstated. The arithmetic runs over
+        the matched pairs as parallel columns.
+        """
+        by_product: dict[tuple[Any, Any, Any], dict] = {}
+        by_meter: dict[tuple[Any, Any, Any], dict] = {}
+        by_sku_region: dict[tuple[Any, Any], dict] = {}
+
+        for od in od_items:
+            if not od.get("retailPrice"):
+                continue
+            sku_region = (od.get("skuName"), od.get("armRegionName"))
+            if od.get("productName"):
+                by_product.setdefault((*sku_region, od["productName"]), od)
+            if od.get("meterName"):
+                by_meter.setdefault((*sku_region, od["meterName"]), od)
+            cheapest = by_sku_region.get(sku_region)
+            if cheapest is None or od["retailPrice"] < cheapest["retailPrice"]:
+                by_sku_region[sku_region] = od
+
+        # Join: collect matched pairs as columns
+        matched_ri: list[dict] = []
+        ri_prices: list[float] = []
+        od_prices: list[float] = []
+        term_hours: list[int] = []
 
         for ri in ri_items:
-            key = (ri.get("skuName"), ri.get("armRegionName"))
-            od = od_map.get(key)
-
-            if od:
-                ri_price = ri.get("retailPrice", 0)
-                od_price = od.get("retailPrice", 0)
-                term = ri.get("reservationTerm", "")
-
-                if od_price > 0:
-                    hours_in_term = 8760 if "1 Year" in term else (26280 if "3 Year" in term else 0)
-
-                    if hours_in_term > 0 and ri_price > od_price:
-                        ri_hourly = ri_price / hours_in_term
-                        total_ri_cost = ri_price
-                    else:
-                        ri_hourly = ri_price / hours_in_term if hours_in_term > 0 else ri_price
-                        total_ri_cost = ri_price
-
-                    savings_percent = ((od_price - ri_hourly) / od_price) * 100
-
-                    break_even_months = 0.0
-                    if total_ri_cost > 0:
-                        monthly_od_cost = od_price * 730
-                        if monthly_od_cost > 0:
-                            break_even_months = total_ri_cost / monthly_od_cost
-
-                    comparison_results.append(
-                        {
-                            "sku": ri.get("skuName"),
-                            "region": ri.get("armRegionName"),
-                            "term": term,
-                            "ri_hourly": round(ri_hourly, 5),
-                            "od_hourly": od_price,
-                            "savings_percentage": round(savings_percent, 2),
-                            "break_even_months": round(break_even_months, 1) if break_even_months else None,
-                            "annual_savings": round((od_price - ri_hourly) * 8760, 2),
-                        }
-                    )
-
-        return comparison_results
+            sku_region = (ri.get("skuName"), ri.get("armRegionName"))
+            match = (
+                by_product.get((*sku_region, ri.get("productName")))
+                or by_meter.get((*sku_region, ri.get("meterName")))
+                or by_sku_region.get(sku_region)
+            )
+            if match is None:
+                continue
+            term = ri.get("reservationTerm", "")
+            matched_ri.append(ri)
+            ri_prices.append(ri.get("retailPrice", 0))
+            od_prices.append(match["retailPrice"])
+            term_hours.append(8760 if "1 Year" in term else (26280 if "3 Year" in term else 0))
+
+        # Column arithmetic over the joined pairs
+        ri_hourly = [p / h if h > 0 else p for p, h in zip(ri_prices, term_hours, strict=True)]
+        savings_pct = [(od - ri) / od * 100 for od, ri in zip(od_prices, ri_hourly, strict=True)]
+        break_even = [p / (od * 730) if p > 0 else 0.0 for p, od in zip(ri_prices, od_prices, strict=True)]
+        annual_savings = [(od - ri) * 8760 for od, ri in zip(od_prices, ri_hourly, strict=True)]
+
+        return [
+            {
+                "sku": ri.get("skuName"),
+                "region": ri.get("armRegionName"),
+                "product_name": ri.get("productName"),
+                "term": ri.get("reservationTerm", ""),
+                "ri_hourly": round(ri_hourly[i], 5),
+                "od_hourly": od_prices[i],
+                "savings_percentage": round(savings_pct[i], 2),
+                "break_even_months": round(break_even[i], 1) if break_even[i] else None,
+                "annual_savings": round(annual_savings[i], 2),
+            }
+            for i, ri in enumerate(matched_ri)
+        ]
 
     async def get_customer_discount(self, customer_id: str | None = None) -> dict[str, Any]:
-        """Get customer discount information."""
+        """Get customer discount information.
+
+        When a price sheet is configured, describes the negotiated rates it holds
+        instead of the static default discount.
+        """
+        if self._price_sheet is not None:
+            sheet = self._price_sheet.summary()
+            default_pct = sheet["default_discount_percentage"]
+            return {
+                "customer_id": customer_id or sheet["customer_id"] or "default",
+                "discount_percentage": default_pct if default_pct is not None else DEFAULT_CUSTOMER_DISCOUNT,
+                "discount_type": "negotiated",
+                "description": "Negotiated rates from customer price sheet",
+                "valid_until": None,
+                "applicable_services": "all",
+                "price_sheet": sheet,
+                "note": (
+                    "Per-meter, per-SKU and per-service rates from the price sheet take precedence; "
+                    "other items use the default discount percentage."
+                ),
+            }
         return {
             "customer_id": customer_id or "default",
             "discount_percentage": DEFAULT_CUSTOMER_DISCOUNT,
@@ -3,9 +3,11 @@
 import asyncio
 import logging
 import re
+from dataclasses import asdict
 from datetime import datetime
 from typing import Any
 
+from ..cache import CacheBackend, approx_size, get_or_fetch, matching_keys
 from ..client import AzurePricingClient
 from ..config import (
     PREVIOUS_GEN_URL,
@@ -13,10 +15,15 @@ from ..config import (
     RETIREMENT_CACHE_TTL,
     VM_SERIES_REPLACEMENTS,
 )
+from ..metrics import record_cache
 from ..models import RetirementStatus, VMSeriesRetirementInfo
+from ..tracing import set_attribute, span
 
 logger = logging.getLogger(__name__)
 
+# Key of the retirement data in the shared cache and the cache admin tool
+RETIREMENT_CACHE_KEY = "retirement"
+
 # Fallback retirement data when GitHub fetch fails
 # Based on Microsoft docs as of January 2026
 FALLBACK_RETIREMENT_DATA: dict[str, VMSeriesRetirementInfo] = {
@@ -151,23 +158,67 @@ FALLBACK_RETIREMENT_DATA: dict[str, VMSeriesRetirementInfo] = {
 class RetirementService:
     """Service for managing VM retirement status information."""
 
-    def __init__(self, client: AzurePricingClient) -> None:
+    def __init__(self, client: AzurePricingClient, shared_cache: CacheBackend | None = None) -> None:
         self._client = client
         self._cache: dict[str, VMSeriesRetirementInfo] | None = None
         self._cache_time: datetime | None = None
+        # Second-level cache shared with other worker processes
+        self._shared_cache = shared_cache
+
+    def cache_stats(self, oldest: int = 5) -> dict[str, Any]:
+        """Size, approximate memory and age of the cached retirement data (one entry)."""
+        if self._cache is None or self._cache_time is None:
+            return {"entries": 0, "bytes": 0, "ttl_seconds": RETIREMENT_CACHE_TTL.total_seconds(), "oldest": []}
+        age = round((datetime.now() - self._cache_time).total_seconds(), 1)
+        return {
+            "entries": 1,
+            "series": len(self._cache),
+            "bytes": approx_size(self._cache),
+            "ttl_seconds": RETIREMENT_CACHE_TTL.total_seconds(),
+            "oldest": [{"key": RETIREMENT_CACHE_KEY, "age_seconds": age}][:oldest],
+        }
+
+    def clear_cache(self, prefix: str | None = None, key: str | None = None) -> int:
+        """Drop the cached retirement data if its key (``retirement``) matches; returns the number removed."""
+        if self._cache is None or not matching_keys([RETIREMENT_CACHE_KEY], prefix, key):
+            return 0
+        self._cache = None
+        self._cache_time = None
+        return 1
 
     async def get_retirement_data(self) -> dict[str, VMSeriesRetirementInfo]:
         """Get retirement data, using cache if valid or fetching fresh data."""
         now = datetime.now()
 
-        # Check if cache is valid
-        if self._cache is not None and self._cache_time is not None and (now - self._cache_time) < RETIREMENT_CACHE_TTL:
+        with span("retirement.fetch"):
+            # Check if cache is valid
+            cache_valid = self._cache_time is not None and (now - self._cache_time) < RETIREMENT_CACHE_TTL
+            set_attribute("cache_hit", self._cache is not None and cache_valid)
+            record_cache("retirement", hit=self._cache is not None and cache_valid)
+            if self._cache is not None and cache_valid:
+                return self._cache
+
+            # Fetch fresh data (or another worker's copy from the shared cache)
+            if self._shared_cache is not None:
+                shared = await get_or_fetch(
+                    self._shared_cache,
+                    RETIREMENT_CACHE_KEY,
+                    RETIREMENT_CACHE_TTL.total_seconds(),
+                    self._fetch_retirement_rows,
+                )
+                self._cache = {
+                    key: VMSeriesRetirementInfo(**{**row, "status": RetirementStatus(row["status"])})
+                    for key, row in shared.items()
+                }
+            else:
+                self._cache = await self._fetch_retirement_data()
+            self._cache_time = now
             return self._cache
 
-        # Fetch fresh data
-        self._cache = await self._fetch_retirement_data()
-        self._cache_time = now
-        return self._cache
+    async def _fetch_retirement_rows(self) -> dict[str, dict[str, Any]]:
+        """Fetch retirement data as JSON-serializable rows for the shared cache."""
+        data = await self._fetch_retirement_data()
+        return {key: {**asdict(info), "status": info.status.value} for key, info in data.items()}
 
     async def _fetch_retirement_data(self) -> dict[str, VMSeriesRetirementInfo]:
         """Fetch VM retirement status data from Microsoft docs on GitHub."""
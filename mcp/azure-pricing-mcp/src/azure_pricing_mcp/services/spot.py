@@ -16,12 +16,14 @@ from typing import Any
 import aiohttp
 
 from ..auth import AzureCredentialManager, get_credential_manager
+from ..cache import CacheBackend, approx_size, get_or_fetch, matching_keys
 from ..config import (
     AZURE_COMPUTE_API_VERSION,
     AZURE_RESOURCE_GRAPH_API_VERSION,
     AZURE_RESOURCE_GRAPH_URL,
     SPOT_CACHE_TTL,
 )
+from ..metrics import record_cache
 
 logger = logging.getLogger(__name__)
 
@@ -32,19 +34,44 @@ class SpotService:
     def __init__(
         self,
         credential_manager: AzureCredentialManager | None = None,
+        shared_cache: CacheBackend | None = None,
     ) -> None:
         """Initialize the Spot service.
 
         Args:
             credential_manager: Optional credential manager. If not provided,
                               uses the singleton instance.
+            shared_cache: Optional cache shared with other worker processes.
         """
         self._credential_manager = credential_manager or get_credential_manager()
+        self._shared_cache = shared_cache
         self._eviction_cache: dict[str, Any] | None = None
         self._eviction_cache_time: datetime | None = None
         self._price_cache: dict[str, Any] | None = None
         self._price_cache_time: datetime | None = None
 
+    def cache_stats(self, oldest: int = 5) -> dict[str, Any]:
+        """Size, approximate memory and age of the eviction rate cache (entries share one timestamp)."""
+        entries = self._eviction_cache or {}
+        age = None
+        if self._eviction_cache_time is not None:
+            age = round((datetime.now() - self._eviction_cache_time).total_seconds(), 1)
+        return {
+            "entries": len(entries),
+            "bytes": approx_size(entries),
+            "ttl_seconds": SPOT_CACHE_TTL.total_seconds(),
+            "oldest": [{"key": key, "age_seconds": age} for key in list(entries)[:oldest]],
+        }
+
+    def clear_cache(self, prefix: str | None = None, key: str | None = None) -> int:
+        """Drop eviction rate entries (all, one *key* or a key *prefix*); returns the number removed."""
+        if not self._eviction_cache:
+            return 0
+        keys = matching_keys(self._eviction_cache, prefix, key)
+        for k in keys:
+            del self._eviction_cache[k]
+        return len(keys)
+
     def _check_authentication(self) -> dict[str, Any] | None:
         """Check if user is authenticated.
 
@@ -155,8 +182,34 @@ class SpotService:
             if (datetime.now() - self._eviction_cache_time) < SPOT_CACHE_TTL:
                 cached = self._eviction_cache.get(cache_key)
                 if cached is not None:
+                    record_cache("spot", hit=True)
                     return cached
+        record_cache("spot", hit=False)
+
+        response: dict[str, Any]
+        if self._shared_cache is not None:
+            response = await get_or_fetch(
+                self._shared_cache,
+                f"spot:{cache_key}",
+                SPOT_CACHE_TTL.total_seconds(),
+                lambda: self._query_eviction_rates(skus, locations),
+            )
+        else:
+            response = await self._query_eviction_rates(skus, locations)
+
+        if "error" in response:
+            return response
 
+        # Cache the result
+        if self._eviction_cache is None:
+            self._eviction_cache = {}
+        self._eviction_cache[cache_key] = response
+        self._eviction_cache_time = datetime.now()
+
+        return response
+
+    async def _query_eviction_rates(self, skus: list[str], locations: list[str]) -> dict[str, Any]:
+        """Query Resource Graph for eviction rates and format the response."""
         # Build the query
         sku_filter = ", ".join(f"'{sku.lower()}'" for sku in skus)
         location_filter = ", ".join(f"'{loc.lower()}'" for loc in locations)
@@ -180,7 +233,7 @@ SpotResources
 
         # Format the response
         data = result.get("data", [])
-        response = {
+        return {
             "eviction_rates": data,
             "count": len(data),
             "skus_queried": skus,
@@ -188,14 +241,6 @@ SpotResources
             "note": "Eviction rates are categorized as: 0-5%, 5-10%, 10-15%, 15-20%, 20%+",
         }
 
-        # Cache the result
-        if self._eviction_cache is None:
-            self._eviction_cache = {}
-        self._eviction_cache[cache_key] = response
-        self._eviction_cache_time = datetime.now()
-
-        return response
-
     async def get_price_history(
         self,
         sku: str,
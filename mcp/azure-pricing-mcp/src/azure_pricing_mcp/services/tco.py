@@ -0,0 +1,274 @@
+"""Multi-year TCO projection for Azure Pricing MCP Server.
+
+Projects 1–5 years of month-by-month cash flows for a set of resources:
+
+- Usage grows at an annual rate (compounded monthly), per resource or globally
+- Pricing per resource: on-demand, 1/3-year reservations or 1/3-year savings
+  plans. Commitments cover the starting quantity for the full month (renewed
+  at the end of each term); growth above it is billed on-demand
+- Commitments can be paid monthly or upfront at the start of each term
+- A discount schedule applies a per-year discount to the projected spend
+- Optional NPV at a given cost of capital
+
+A sensitivity sweep recomputes the total over a grid of growth rates and
+flat discounts. Rates for all resources come from batched price grids
+(PricingService.fetch_row_commitment_rates), so one projection needs a handful
+of API calls regardless of horizon or sweep size.
+"""
+
+import logging
+from typing import Any
+
+from ..config import SWEEP_MAX_GRID_POINTS
+from .bulk import _resolve_service_alias
+from .pricing import RI_TERM_HOURS, PricingService, monthly_units
+
+logger = logging.getLogger(__name__)
+
+HOURS_PER_MONTH = 730
+
+# Pricing option -> (rate kind, term); on-demand has no commitment
+PRICING_OPTIONS: dict[str, tuple[str, str] | None] = {
+    "on_demand": None,
+    "ri_1y": ("reservation", "1 Year"),
+    "ri_3y": ("reservation", "3 Years"),
+    "sp_1y": ("savings_plan", "1 Year"),
+    "sp_3y": ("savings_plan", "3 Years"),
+}
+PAYMENT_OPTIONS = ("monthly", "upfront")
+MAX_YEARS = 5
+
+
+def _discount_factors(discount_schedule: list[float], months: int) -> list[float]:
+    """Per-month price factor from a per-year discount schedule (last value carries forward)."""
+    if not discount_schedule:
+        return [1.0] * months
+    return [1 - discount_schedule[min(m // 12, len(discount_schedule) - 1)] / 100 for m in range(months)]
+
+
+class TCOService:
+    """Project multi-year total cost of ownership."""
+
+    def __init__(self, pricing_service: PricingService) -> None:
+        self._pricing = pricing_service
+
+    @staticmethod
+    def _cash_flow(
+        row: dict[str, Any], option: str, growth_rate_percent: float, months: int, payment: str
+    ) -> list[float]:
+        """Monthly cash flow of one resource under a pricing option, before the discount schedule."""
+        od_monthly = row["on_demand_monthly"]
+        growth = (1 + growth_rate_percent / 100) ** (1 / 12)
+        quantities = [row["quantity"] * growth**m for m in range(months)]
+
+        commitment = PRICING_OPTIONS[option]
+        rate = row["rates"][commitment[0]].get(commitment[1]) if commitment and row["hourly"] else None
+        if commitment is None or rate is None:
+            return [q * od_monthly for q in quantities]
+
+        # Commitment is billed for every hour of the month, whatever the usage
+        committed = row["quantity"]
+        overage = [(q - committed) * od_monthly if q > committed else 0.0 for q in quantities]
+        if payment == "monthly":
+            fixed = committed * rate * HOURS_PER_MONTH
+            return [fixed + extra for extra in overage]
+
+        term_months = (RI_TERM_HOURS[commitment[1]] // 8760) * 12
+        upfront = committed * rate * HOURS_PER_MONTH * term_months
+        return [(upfront if m % term_months == 0 else 0.0) + extra for m, extra in enumerate(overage)]
+
+    async def project(
+        self,
+        resources: list[dict[str, Any]],
+        years: int = 3,
+        pricing: str = "on_demand",
+        growth_rate_percent: float = 0.0,
+        discount_schedule: list[float] | None = None,
+        payment: str = "monthly",
+        cost_of_capital_percent: float | None = None,
+        sensitivity_growth_rates: list[float] | None = None,
+        sensitivity_discount_percentages: list[float] | None = None,
+        region: str = "eastus",
+        currency_code: str = "USD",
+        discount_percentage: float | None = None,
+        use_price_sheet: bool = False,
+    ) -> dict[str, Any]:
+        """Project the TCO of *resources* over 1–5 years.
+
+        Each entry in *resources* must contain ``service_name`` and
+        ``sku_name``. Optional keys: region, quantity (default 1; instances,
+        or billing units such as GB for non-hourly meters), hours_per_month
+        (default 730), growth_rate_percent and pricing (override the global
+        values for that resource).
+
+        ``discount_percentage`` (or the customer price sheet) is applied to
+        unit rates; ``discount_schedule`` is a per-year discount on the
+        projected spend on top of that, e.g. ``[0, 5, 10]`` for a ramp.
+        """
+        if not 1 <= years <= MAX_YEARS:
+            return {"error": f"years must be between 1 and {MAX_YEARS}"}
+        if pricing not in PRICING_OPTIONS:
+            return {"error": f"Invalid pricing '{pricing}'. Use one of: {', '.join(PRICING_OPTIONS)}"}
+        if payment not in PAYMENT_OPTIONS:
+            return {"error": f"Invalid payment '{payment}'. Use one of: {', '.join(PAYMENT_OPTIONS)}"}
+
+        growth_values = [float(g) for g in sensitivity_growth_rates or []]
+        discount_values = [float(d) for d in sensitivity_discount_percentages or []]
+        grid_size = max(len(growth_values), 1) * max(len(discount_values), 1)
+        if grid_size > SWEEP_MAX_GRID_POINTS:
+            return {"error": f"Sensitivity grid has {grid_size} points, exceeding the limit of {SWEEP_MAX_GRID_POINTS}"}
+
+        months = years * 12
+        schedule = [float(d) for d in discount_schedule or []]
+
+        rows: list[dict[str, Any]] = []
+        errors: list[dict[str, Any]] = []
+        warnings: list[dict[str, Any]] = []
+        for idx, res in enumerate(resources):
+            if not res.get("service_name") or not res.get("sku_name"):
+                errors.append({"index": idx, "error": "Missing required field(s): service_name, sku_name"})
+                continue
+            row_pricing = res.get("pricing") or pricing
+            if row_pricing not in PRICING_OPTIONS:
+                errors.append({"index": idx, "error": f"Invalid pricing '{row_pricing}'"})
+                continue
+            rows.append(
+                {
+                    "index": idx,
+                    "service_name": _resolve_service_alias(res["service_name"]),
+                    "sku_name": res["sku_name"].strip(),
+                    "region": (res.get("region") or region).strip().lower(),
+                    "quantity": float(res.get("quantity", 1)),
+                    "hours_per_month": float(res.get("hours_per_month", HOURS_PER_MONTH)),
+                    "growth_override": res.get("growth_rate_percent"),
+                    "pricing": row_pricing,
+                }
+            )
+
+        if not rows:
+            return {"error": "No valid resources to project", "errors": errors}
+
+        row_rates, discount_applied = await self._pricing.fetch_row_commitment_rates(
+            rows, currency_code=currency_code, discount_percentage=discount_percentage, use_price_sheet=use_price_sheet
+        )
+
+        priced: list[dict[str, Any]] = []
+        for row, sku_rates in zip(rows, row_rates, strict=True):
+            if sku_rates is None:
+                errors.append({"index": row["index"], "error": f"No pricing for {row['sku_name']} in {row['region']}"})
+                continue
+            unit = (sku_rates.get("unit_of_measure") or "").lower()
+            units = monthly_units(unit, row["hours_per_month"])
+            row["rates"] = sku_rates
+            row["hourly"] = "hour" in unit
+            row["on_demand_monthly"] = sku_rates["on_demand"] * (units if units is not None else 1)
+            commitment = PRICING_OPTIONS[row["pricing"]]
+            if commitment and not (row["hourly"] and commitment[1] in sku_rates[commitment[0]]):
+                warnings.append(
+                    {
+                        "index": row["index"],
+                        "warning": f"{row['pricing']} not offered for {row['sku_name']}; projected on-demand",
+                    }
+                )
+            priced.append(row)
+
+        if not priced:
+            return {"error": "No pricing found for any resource", "errors": errors}
+
+        def _growth(row: dict[str, Any], default: float) -> float:
+            return float(row["growth_override"]) if row["growth_override"] is not None else default
+
+        def _flows(growth_default: float, option: str | None = None, pay: str = payment) -> list[list[float]]:
+            return [
+                self._cash_flow(row, option or row["pricing"], _growth(row, growth_default), months, pay)
+                for row in priced
+            ]
+
+        factors = _discount_factors(schedule, months)
+        resource_flows = [[cf * f for cf, f in zip(flow, factors, strict=True)] for flow in _flows(growth_rate_percent)]
+        cash_flow = [sum(month) for month in zip(*resource_flows, strict=True)]
+
+        cumulative = 0.0
+        yearly = []
+        for year in range(years):
+            cost = sum(cash_flow[year * 12 : (year + 1) * 12])
+            cumulative += cost
+            yearly.append({"year": year + 1, "cost": round(cost, 2), "cumulative": round(cumulative, 2)})
+        total = sum(cash_flow)
+
+        # Same projection with every resource on each pricing option
+        comparison: list[dict[str, Any]] = []
+        for option in PRICING_OPTIONS:
+            option_flows = _flows(growth_rate_percent, option)
+            option_total = sum(sum(cf * f for cf, f in zip(flow, factors, strict=True)) for flow in option_flows)
+            comparison.append({"pricing": option, "total_cost": round(option_total, 2)})
+        on_demand_total = comparison[0]["total_cost"]
+        for entry in comparison:
+            savings = on_demand_total - entry["total_cost"]
+            entry["savings_vs_on_demand"] = round(savings, 2)
+            entry["savings_percentage"] = round(savings / on_demand_total * 100, 2) if on_demand_total else 0.0
+        comparison.sort(key=lambda entry: entry["total_cost"])
+
+        result: dict[str, Any] = {
+            "currency": currency_code,
+            "years": years,
+            "months": months,
+            "pricing": pricing,
+            "payment": payment,
+            "growth_rate_percent": growth_rate_percent,
+            "discount_schedule": schedule,
+            "total_cost": round(total, 2),
+            "average_monthly_cost": round(total / months, 2),
+            "yearly": yearly,
+            "monthly_cash_flow": [round(cf, 2) for cf in cash_flow],
+            "resources": [
+                {
+                    "index": row["index"],
+                    "service_name": row["service_name"],
+                    "sku_name": row["sku_name"],
+                    "region": row["region"],
+                    "quantity": row["quantity"],
+                    "pricing": row["pricing"],
+                    "growth_rate_percent": _growth(row, growth_rate_percent),
+                    "on_demand_unit_price": row["rates"]["on_demand"],
+                    "unit_of_measure": row["rates"].get("unit_of_measure"),
+                    "total_cost": round(sum(flow), 2),
+                    "first_month_cost": round(flow[0], 2),
+                    "last_month_cost": round(flow[-1], 2),
+                }
+                for row, flow in zip(priced, resource_flows, strict=True)
+            ],
+            "comparison": comparison,
+            "errors": errors,
+            "warnings": warnings,
+        }
+
+        if cost_of_capital_percent is not None:
+            monthly_rate = (1 + cost_of_capital_percent / 100) ** (1 / 12) - 1
+            npv = sum(cf / (1 + monthly_rate) ** m for m, cf in enumerate(cash_flow))
+            result["cost_of_capital_percent"] = cost_of_capital_percent
+            result["npv"] = round(npv, 2)
+
+        if growth_values or discount_values:
+            # Undiscounted monthly totals per growth rate; flat discounts scale them
+            growth_axis = growth_values or [growth_rate_percent]
+            grid = []
+            for growth in growth_axis:
+                monthly = [sum(month) for month in zip(*_flows(growth), strict=True)]
+                if discount_values:
+                    base = sum(monthly)
+                    grid.append([round(base * (1 - d / 100), 2) for d in discount_values])
+                else:
+                    grid.append([round(sum(m * f for m, f in zip(monthly, factors, strict=True)), 2)])
+            result["sensitivity"] = {
+                "growth_rates": growth_axis,
+                "discount_percentages": discount_values or None,
+                "total_cost": grid,
+                "min_total": min(min(row) for row in grid),
+                "max_total": max(max(row) for row in grid),
+            }
+
+        if discount_applied is not None:
+            result["discount_applied"] = discount_applied
+
+        return result
@@ -0,0 +1,230 @@
+"""VM capability table for price-performance ranking.
+
+Embedded vCPU / memory / GPU specs for common Azure VM series, sourced from
+the official Microsoft size documentation:
+https://learn.microsoft.com/en-us/azure/virtual-machines/sizes/overview
+
+Most series have a fixed memory-per-vCPU ratio, so rows are generated from a
+compact series table; sizes that break the ratio are listed as overrides.
+
+The table can be refreshed without a release by pointing
+``AZURE_PRICING_VM_SPECS_PATH`` at a JSON file, either a list of rows
+(``{"name": "Standard_D4s_v5", "vcpus": 4, "memory_gb": 16, ...}``) or the
+output of ``az vm list-skus --resource-type virtualMachines -o json``.
+Entries from the file override the embedded ones.
+"""
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from ..config import VM_SPECS_PATH
+
+logger = logging.getLogger(__name__)
+
+# Version of this embedded data table — bump when updating from docs.
+DATA_VERSION = "2026-03-01"
+
+DATA_SOURCE_URL = "https://learn.microsoft.com/en-us/azure/virtual-machines/sizes/overview"
+
+
+@dataclass(frozen=True)
+class VMSpec:
+    """Capabilities of a single VM size."""
+
+    name: str  # ARM SKU name, e.g. Standard_D4s_v5
+    vcpus: int
+    memory_gb: float
+    family: str
+    category: str
+    generation: str
+    gpus: float = 0.0
+    gpu_model: str | None = None
+
+
+# (family, category, generation, name template, vCPU sizes, GiB per vCPU, memory overrides by vCPU)
+_SERIES: list[tuple[str, str, str, str, tuple[int, ...], float, dict[int, float]]] = [
+    # General purpose
+    ("Dv3", "general", "v3", "Standard_D{n}_v3", (2, 4, 8, 16, 32, 48, 64), 4, {}),
+    ("Dsv3", "general", "v3", "Standard_D{n}s_v3", (2, 4, 8, 16, 32, 48, 64), 4, {}),
+    ("Dv4", "general", "v4", "Standard_D{n}_v4", (2, 4, 8, 16, 32, 48, 64), 4, {}),
+    ("Dsv4", "general", "v4", "Standard_D{n}s_v4", (2, 4, 8, 16, 32, 48, 64), 4, {}),
+    ("Ddsv4", "general", "v4", "Standard_D{n}ds_v4", (2, 4, 8, 16, 32, 48, 64), 4, {}),
+    ("Dasv4", "general", "v4", "Standard_D{n}as_v4", (2, 4, 8, 16, 32, 48, 64, 96), 4, {}),
+    ("Dv5", "general", "v5", "Standard_D{n}_v5", (2, 4, 8, 16, 32, 48, 64, 96), 4, {}),
+    ("Dsv5", "general", "v5", "Standard_D{n}s_v5", (2, 4, 8, 16, 32, 48, 64, 96), 4, {}),
+    ("Ddsv5", "general", "v5", "Standard_D{n}ds_v5", (2, 4, 8, 16, 32, 48, 64, 96), 4, {}),
+    ("Dasv5", "general", "v5", "Standard_D{n}as_v5", (2, 4, 8, 16, 32, 48, 64, 96), 4, {}),
+    ("Dadsv5", "general", "v5", "Standard_D{n}ads_v5", (2, 4, 8, 16, 32, 48, 64, 96), 4, {}),
+    ("Dlsv5", "general", "v5", "Standard_D{n}ls_v5", (2, 4, 8, 16, 32, 48, 64, 96), 2, {}),
+    ("Dpsv5", "general", "v5", "Standard_D{n}ps_v5", (2, 4, 8, 16, 32, 48, 64), 4, {}),
+    ("Dplsv5", "general", "v5", "Standard_D{n}pls_v5", (2, 4, 8, 16, 32, 48, 64), 2, {}),
+    ("Dsv6", "general", "v6", "Standard_D{n}s_v6", (2, 4, 8, 16, 32, 48, 64, 96, 128), 4, {}),
+    ("Dasv6", "general", "v6", "Standard_D{n}as_v6", (2, 4, 8, 16, 32, 48, 64, 96), 4, {}),
+    ("Dlsv6", "general", "v6", "Standard_D{n}ls_v6", (2, 4, 8, 16, 32, 48, 64, 96, 128), 2, {}),
+    # Compute optimized
+    ("Fsv2", "compute", "v2", "Standard_F{n}s_v2", (2, 4, 8, 16, 32, 48, 64, 72), 2, {72: 144}),
+    ("Fasv6", "compute", "v6", "Standard_F{n}as_v6", (2, 4, 8, 16, 32, 48, 64), 4, {}),
+    # Memory optimized
+    ("Ev3", "memory", "v3", "Standard_E{n}_v3", (2, 4, 8, 16, 20, 32, 48, 64), 8, {20: 160, 64: 432}),
+    ("Esv3", "memory", "v3", "Standard_E{n}s_v3", (2, 4, 8, 16, 20, 32, 48, 64), 8, {20: 160, 64: 432}),
+    ("Esv4", "memory", "v4", "Standard_E{n}s_v4", (2, 4, 8, 16, 20, 32, 48, 64), 8, {64: 504}),
+    ("Edsv4", "memory", "v4", "Standard_E{n}ds_v4", (2, 4, 8, 16, 20, 32, 48, 64), 8, {64: 504}),
+    ("Ev5", "memory", "v5", "Standard_E{n}_v5", (2, 4, 8, 16, 20, 32, 48, 64, 96), 8, {64: 512, 96: 672}),
+    ("Esv5", "memory", "v5", "Standard_E{n}s_v5", (2, 4, 8, 16, 20, 32, 48, 64, 96), 8, {64: 512, 96: 672}),
+    ("Edsv5", "memory", "v5", "Standard_E{n}ds_v5", (2, 4, 8, 16, 20, 32, 48, 64, 96), 8, {64: 512, 96: 672}),
+    ("Easv5", "memory", "v5", "Standard_E{n}as_v5", (2, 4, 8, 16, 20, 32, 48, 64, 96), 8, {64: 512, 96: 672}),
+    ("Esv6", "memory", "v6", "Standard_E{n}s_v6", (2, 4, 8, 16, 20, 32, 48, 64, 96, 128), 8, {}),
+    # Storage optimized
+    ("Lsv3", "storage", "v3", "Standard_L{n}s_v3", (8, 16, 32, 48, 64, 80), 8, {}),
+]
+
+# Burstable and GPU sizes do not follow a single ratio; listed explicitly.
+# (name, vCPUs, memory GiB, family, category, generation, GPUs, GPU model)
+_EXPLICIT: list[tuple[str, int, float, str, str, str, float, str | None]] = [
+    ("Standard_B1s", 1, 1, "B", "burstable", "v1", 0, None),
+    ("Standard_B1ms", 1, 2, "B", "burstable", "v1", 0, None),
+    ("Standard_B2s", 2, 4, "B", "burstable", "v1", 0, None),
+    ("Standard_B2ms", 2, 8, "B", "burstable", "v1", 0, None),
+    ("Standard_B4ms", 4, 16, "B", "burstable", "v1", 0, None),
+    ("Standard_B8ms", 8, 32, "B", "burstable", "v1", 0, None),
+    ("Standard_B12ms", 12, 48, "B", "burstable", "v1", 0, None),
+    ("Standard_B16ms", 16, 64, "B", "burstable", "v1", 0, None),
+    ("Standard_B20ms", 20, 80, "B", "burstable", "v1", 0, None),
+    ("Standard_B2ts_v2", 2, 1, "Bsv2", "burstable", "v2", 0, None),
+    ("Standard_B2ls_v2", 2, 4, "Bsv2", "burstable", "v2", 0, None),
+    ("Standard_B2s_v2", 2, 8, "Bsv2", "burstable", "v2", 0, None),
+    ("Standard_B4ls_v2", 4, 8, "Bsv2", "burstable", "v2", 0, None),
+    ("Standard_B4s_v2", 4, 16, "Bsv2", "burstable", "v2", 0, None),
+    ("Standard_B8ls_v2", 8, 16, "Bsv2", "burstable", "v2", 0, None),
+    ("Standard_B8s_v2", 8, 32, "Bsv2", "burstable", "v2", 0, None),
+    ("Standard_B16ls_v2", 16, 32, "Bsv2", "burstable", "v2", 0, None),
+    ("Standard_B16s_v2", 16, 64, "Bsv2", "burstable", "v2", 0, None),
+    ("Standard_B32ls_v2", 32, 64, "Bsv2", "burstable", "v2", 0, None),
+    ("Standard_B32s_v2", 32, 128, "Bsv2", "burstable", "v2", 0, None),
+    ("Standard_NC4as_T4_v3", 4, 28, "NCasT4_v3", "gpu", "v3", 1, "T4"),
+    ("Standard_NC8as_T4_v3", 8, 56, "NCasT4_v3", "gpu", "v3", 1, "T4"),
+    ("Standard_NC16as_T4_v3", 16, 110, "NCasT4_v3", "gpu", "v3", 1, "T4"),
+    ("Standard_NC64as_T4_v3", 64, 440, "NCasT4_v3", "gpu", "v3", 4, "T4"),
+    ("Standard_NC6s_v3", 6, 112, "NCv3", "gpu", "v3", 1, "V100"),
+    ("Standard_NC12s_v3", 12, 224, "NCv3", "gpu", "v3", 2, "V100"),
+    ("Standard_NC24s_v3", 24, 448, "NCv3", "gpu", "v3", 4, "V100"),
+    ("Standard_NC24ads_A100_v4", 24, 220, "NCA100v4", "gpu", "v4", 1, "A100"),
+    ("Standard_NC48ads_A100_v4", 48, 440, "NCA100v4", "gpu", "v4", 2, "A100"),
+    ("Standard_NC96ads_A100_v4", 96, 880, "NCA100v4", "gpu", "v4", 4, "A100"),
+    ("Standard_NV6ads_A10_v5", 6, 55, "NVadsA10_v5", "gpu", "v5", 1 / 6, "A10"),
+    ("Standard_NV12ads_A10_v5", 12, 110, "NVadsA10_v5", "gpu", "v5", 1 / 3, "A10"),
+    ("Standard_NV18ads_A10_v5", 18, 220, "NVadsA10_v5", "gpu", "v5", 1 / 2, "A10"),
+    ("Standard_NV36ads_A10_v5", 36, 440, "NVadsA10_v5", "gpu", "v5", 1, "A10"),
+    ("Standard_NV72ads_A10_v5", 72, 880, "NVadsA10_v5", "gpu", "v5", 2, "A10"),
+    ("Standard_ND96asr_v4", 96, 900, "NDasrA100_v4", "gpu", "v4", 8, "A100"),
+    ("Standard_ND96isr_H100_v5", 96, 1900, "NDH100v5", "gpu", "v5", 8, "H100"),
+]
+
+
+def _build_embedded_specs() -> dict[str, VMSpec]:
+    specs: dict[str, VMSpec] = {}
+    for family, category, generation, template, sizes, ratio, overrides in _SERIES:
+        for vcpus in sizes:
+            name = template.format(n=vcpus)
+            memory = overrides.get(vcpus, vcpus * ratio)
+            specs[name.lower()] = VMSpec(name, vcpus, float(memory), family, category, generation)
+    for name, vcpus, memory, family, category, generation, gpus, gpu_model in _EXPLICIT:
+        specs[name.lower()] = VMSpec(name, vcpus, float(memory), family, category, generation, gpus, gpu_model)
+    return specs
+
+
+def _spec_from_list_skus(entry: dict[str, Any]) -> VMSpec | None:
+    """Convert an ``az vm list-skus`` entry to a VMSpec."""
+    caps = {cap.get("name"): cap.get("value") for cap in entry.get("capabilities") or []}
+    if "vCPUs" not in caps or "MemoryGB" not in caps:
+        return None
+    name = entry.get("name", "")
+    return VMSpec(
+        name=name,
+        vcpus=int(caps["vCPUs"]),
+        memory_gb=float(caps["MemoryGB"]),
+        family=entry.get("family") or "",
+        category=entry.get("tier", "").lower() or "unknown",
+        generation=name.rsplit("_", 1)[-1] if name.count("_") > 1 else "v1",
+        gpus=float(caps.get("GPUs") or 0),
+    )
+
+
+def _spec_from_row(row: dict[str, Any]) -> VMSpec:
+    return VMSpec(
+        name=row["name"],
+        vcpus=int(row["vcpus"]),
+        memory_gb=float(row["memory_gb"]),
+        family=row.get("family", ""),
+        category=row.get("category", "unknown"),
+        generation=row.get("generation", ""),
+        gpus=float(row.get("gpus", 0)),
+        gpu_model=row.get("gpu_model"),
+    )
+
+
+class VMSpecTable:
+    """VM capability lookup keyed by ARM SKU name (case-insensitive)."""
+
+    def __init__(self, path: str | None = VM_SPECS_PATH) -> None:
+        self._path = path or None
+        self._file_mtime: float | None = None
+        self._specs: dict[str, VMSpec] = {}
+        self.refresh()
+
+    @property
+    def data_version(self) -> str:
+        if self._file_mtime is not None:
+            return f"{DATA_VERSION}+file"
+        return DATA_VERSION
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def get(self, arm_sku_name: str | None) -> VMSpec | None:
+        if not arm_sku_name:
+            return None
+        return self._specs.get(arm_sku_name.lower())
+
+    def refresh(self) -> None:
+        """Rebuild the table from embedded data plus the override file, if any."""
+        specs = _build_embedded_specs()
+        self._file_mtime = None
+        if self._path:
+            try:
+                specs.update(self._load_file(self._path))
+                self._file_mtime = os.path.getmtime(self._path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Failed to load VM specs from {self._path}, using embedded table: {e}")
+        self._specs = specs
+
+    def refresh_if_changed(self) -> bool:
+        """Reload when the override file was modified. Returns True if reloaded."""
+        if not self._path:
+            return False
+        try:
+            mtime = os.path.getmtime(self._path)
+        except OSError:
+            return False
+        if mtime == self._file_mtime:
+            return False
+        self.refresh()
+        return True
+
+    @staticmethod
+    def _load_file(path: str) -> dict[str, VMSpec]:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        rows = (data.get("specs") or data.get("value") or []) if isinstance(data, dict) else data
+        specs: dict[str, VMSpec] = {}
+        for row in rows:
+            spec = _spec_from_list_skus(row) if "capabilities" in row else _spec_from_row(row)
+            if spec is not None:
+                specs[spec.name.lower()] = spec
+        return specs
+
+    def to_dicts(self) -> list[dict[str, Any]]:
+        return [asdict(spec) for spec in self._specs.values()]
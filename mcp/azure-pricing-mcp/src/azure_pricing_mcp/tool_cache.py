@@ -0,0 +1,252 @@
+"""Tool-level result cache for Azure Pricing MCP Server.
+
+Sits in front of tool dispatch and stores the final ``TextContent`` list of
+a tool call, keyed on the tool name and its normalized arguments:
+
+- Schema defaults are filled in, so ``{}`` and ``{"currency_code": "USD"}`` share an entry
+- ``None`` values and a false ``show_with_discount`` are dropped (they change nothing)
+- Numbers compare by value (``10`` == ``10.0``) and strings are stripped
+
+Entries expire after ``AZURE_PRICING_TOOL_CACHE_TTL`` seconds and the least
+recently used entry is evicted beyond ``AZURE_PRICING_TOOL_CACHE_MAX_ENTRIES``.
+Tools with side effects or per-subscription results, and error responses
+(which may be transient), are never cached.
+"""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from mcp.types import TextContent
+
+from .cache import approx_size, matching_keys
+from .config import TOOL_CACHE_MAX_ENTRIES, TOOL_CACHE_TTL
+from .metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+# Tools whose results must not be reused: actions, data read from the caller's subscription,
+# and batches (each call in a batch is cached on its own)
+UNCACHEABLE_TOOLS = frozenset({"simulate_eviction", "find_orphaned_resources", "batch"})
+# Tools that always report price sheet rates (others only with show_with_discount)
+PRICE_SHEET_TOOLS = frozenset({"get_customer_discount"})
+
+
+def _normalize_value(value: Any) -> Any:
+    """Canonical form of an argument value for cache keys."""
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, int | float):
+        return float(value)
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize_value(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list | tuple):
+        return [_normalize_value(v) for v in value]
+    return value
+
+
+def normalize_arguments(arguments: dict[str, Any] | None, defaults: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Normalize tool arguments so equivalent invocations compare equal."""
+    merged = dict(defaults or {})
+    merged.update({k: v for k, v in (arguments or {}).items() if v is not None})
+    # show_with_discount=false is the same as leaving it out
+    if not merged.get("show_with_discount"):
+        merged.pop("show_with_discount", None)
+    normalized: dict[str, Any] = _normalize_value(merged)
+    return normalized
+
+
+# Plain-text responses starting with these report an error
+_ERROR_PREFIXES = ("Error", "❌", "Unknown tool:")
+
+
+class ErrorTextContent(TextContent):
+    """Text part of a response that reports an error (sent to clients as plain text)."""
+
+
+def text_response(text: str, result: Any = None) -> list[TextContent]:
+    """Wrap formatted *text* as a response, flagged as an error when the service *result* has an ``error``."""
+    if isinstance(result, dict) and result.get("error"):
+        return [ErrorTextContent(type="text", text=text)]
+    return [TextContent(type="text", text=text)]
+
+
+def error_response(text: str) -> list[TextContent]:
+    """A response reporting an error."""
+    return [ErrorTextContent(type="text", text=text)]
+
+
+def is_error_response(content: Any) -> bool:
+    """Whether a response reports an error: flagged by its handler, or plain text with an error prefix."""
+    if not isinstance(content, list):
+        return False
+    return any(
+        isinstance(part, ErrorTextContent)
+        or (isinstance(part, TextContent) and part.text.lstrip().startswith(_ERROR_PREFIXES))
+        for part in content
+    )
+
+
+def _schema_defaults() -> dict[str, dict[str, Any]]:
+    """Per-tool argument defaults from the tool input schemas."""
+    from .tools import get_tool_definitions
+
+    defaults: dict[str, dict[str, Any]] = {}
+    for tool in get_tool_definitions():
+        properties = (tool.inputSchema or {}).get("properties", {})
+        defaults[tool.name] = {name: spec["default"] for name, spec in properties.items() if "default" in spec}
+    return defaults
+
+
+class ToolResultCache:
+    """TTL + LRU cache of formatted tool responses with per-tool hit counters."""
+
+    def __init__(
+        self,
+        ttl: float = TOOL_CACHE_TTL,
+        max_entries: int = TOOL_CACHE_MAX_ENTRIES,
+        tool_defaults: dict[str, dict[str, Any]] | None = None,
+        uncacheable: frozenset[str] = UNCACHEABLE_TOOLS,
+        clock: Callable[[], float] = time.monotonic,
+        price_sheet_version: Callable[[], Any] | None = None,
+    ) -> None:
+        """
+        Args:
+            price_sheet_version: Returns the loaded price sheet's version; calls
+                priced with the sheet are keyed on it, so a reload is never
+                answered with responses priced on the previous rates.
+        """
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._tool_defaults = tool_defaults
+        self._uncacheable = uncacheable
+        self._clock = clock
+        self._price_sheet_version = price_sheet_version
+        self._entries: OrderedDict[str, tuple[str, float, list[TextContent]]] = OrderedDict()
+        self._hits: dict[str, int] = {}
+        self._misses: dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl > 0 and self._max_entries > 0
+
+    def _defaults(self, name: str) -> dict[str, Any] | None:
+        """Argument defaults of a known tool (None for unknown tools)."""
+        if self._tool_defaults is None:
+            self._tool_defaults = _schema_defaults()
+        return self._tool_defaults.get(name)
+
+    def key(self, name: str, arguments: dict[str, Any] | None) -> str | None:
+        """Cache key for a tool call, or None when the call must not be cached."""
+        if not self.enabled or name in self._uncacheable:
+            return None
+        defaults = self._defaults(name)
+        if defaults is None:
+            return None
+        try:
+            normalized = normalize_arguments(arguments, defaults)
+            parts: list[Any] = [name, normalized]
+            if self._price_sheet_version is not None and (
+                normalized.get("show_with_discount") or name in PRICE_SHEET_TOOLS
+            ):
+                parts.append(self._price_sheet_version())
+            return json.dumps(parts, sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, name: str, key: str | None) -> list[TextContent] | None:
+        """Return the cached response for *key*, counting a hit or miss for *name*."""
+        if key is None:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None and self._clock() < entry[1]:
+            self._entries.move_to_end(key)
+            self._hits[name] = self._hits.get(name, 0) + 1
+            record_cache("tool", hit=True)
+            return list(entry[2])
+        if entry is not None:
+            del self._entries[key]
+        self._misses[name] = self._misses.get(name, 0) + 1
+        record_cache("tool", hit=False)
+        return None
+
+    def expires_in(self, key: str) -> float | None:
+        """Seconds until *key* expires, or None when it is not cached (does not count as a lookup)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        remaining = entry[1] - self._clock()
+        return remaining if remaining > 0 else None
+
+    def put(self, name: str, key: str | None, content: list[TextContent]) -> None:
+        """Store a tool response under *key* (error responses are not stored)."""
+        if key is None or is_error_response(content):
+            return
+        self._entries[key] = (name, self._clock() + self._ttl, list(content))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self, name: str | None = None, prefix: str | None = None, key: str | None = None) -> int:
+        """Drop all entries, or those of one tool, of tools whose name starts with *prefix*, or one *key*.
+
+        Returns the number removed.
+        """
+        if name is None and prefix is None and key is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+        if key is not None:
+            keys = matching_keys(self._entries, key=key)
+        elif prefix is not None:
+            keys = [k for k, entry in self._entries.items() if entry[0].startswith(prefix)]
+        else:
+            keys = [k for k, entry in self._entries.items() if entry[0] == name]
+        for k in keys:
+            del self._entries[k]
+        return len(keys)
+
+    def inspect(self, oldest: int = 5) -> dict[str, Any]:
+        """Live entries, their approximate memory and the *oldest* entries (admin tool)."""
+        now = self._clock()
+        live = sorted((entry[1], key) for key, entry in self._entries.items() if entry[1] > now)
+        return {
+            "entries": len(live),
+            "bytes": approx_size([self._entries[key][2] for _, key in live]),
+            "ttl_seconds": self._ttl,
+            "oldest": [
+                {"key": key, "age_seconds": round(self._ttl - (expires - now), 1)} for expires, key in live[:oldest]
+            ],
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """Entry count and hit/miss counters, overall and per tool."""
+        per_tool: dict[str, dict[str, Any]] = {}
+        for name in sorted(set(self._hits) | set(self._misses)):
+            hits = self._hits.get(name, 0)
+            misses = self._misses.get(name, 0)
+            per_tool[name] = {
+                "entries": 0,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            }
+        for entry in self._entries.values():
+            per_tool.setdefault(entry[0], {"entries": 0, "hits": 0, "misses": 0, "hit_rate": 0.0})["entries"] += 1
+        hits = sum(self._hits.values())
+        misses = sum(self._misses.values())
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self._ttl,
+            "max_entries": self._max_entries,
+            "entries": len(self._entries),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "tools": per_tool,
+        }
@@ -41,6 +41,11 @@ def get_tool_definitions() -> list[Tool]:
                             "description": "Currency code (default: USD)",
                             "default": "USD",
                         },
+                        "currency_codes": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Several currency codes (e.g., ['USD', 'EUR', 'GBP']) to return prices side by side; fetched concurrently, overrides currency_code",
+                        },
                         "limit": {
                             "type": "integer",
                             "description": "Maximum number of results (default: 50)",
@@ -52,7 +57,7 @@ def get_tool_definitions() -> list[Tool]:
                         },
                         "show_with_discount": {
                             "type": "boolean",
-                            "description": "Set to true to apply a discount; uses default 10% unless discount_percentage is explicitly specified.",
+                            "description": "Set to true to apply a discount; uses the customer price sheet (AZURE_PRICING_PRICE_SHEET) when configured, otherwise default 10% unless discount_percentage is explicitly specified.",
                             "default": False,
                         },
                         "validate_sku": {
@@ -93,7 +98,7 @@ def get_tool_definitions() -> list[Tool]:
                         },
                         "show_with_discount": {
                             "type": "boolean",
-                            "description": "Set to true to apply a discount; uses default 10% unless discount_percentage is explicitly specified.",
+                            "description": "Set to true to apply a discount; uses the customer price sheet (AZURE_PRICING_PRICE_SHEET) when configured, otherwise default 10% unless discount_percentage is explicitly specified.",
                             "default": False,
                         },
                     },
@@ -102,7 +107,10 @@ def get_tool_definitions() -> list[Tool]:
             ),
             Tool(
                 name="azure_cost_estimate",
-                description="Estimate Azure costs based on usage patterns",
+                description=(
+                    "Estimate Azure costs based on usage patterns. Pass any sweep_* list to get a what-if "
+                    "cost grid over usage hours, quantities, discounts and savings plan terms from a single price lookup."
+                ),
                 inputSchema={
                     "type": "object",
                     "properties": {
@@ -128,15 +136,40 @@ def get_tool_definitions() -> list[Tool]:
                             "description": "Currency code (default: USD)",
                             "default": "USD",
                         },
+                        "currency_codes": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Several currency codes (e.g., ['USD', 'EUR', 'GBP']) to return the estimate side by side; fetched concurrently, overrides currency_code",
+                        },
                         "discount_percentage": {
                             "type": "number",
                             "description": "Discount percentage to apply to prices (e.g., 10 for 10% discount). If not specified and show_with_discount is false, no discount is applied. If show_with_discount is true, defaults to 10%.",
                         },
                         "show_with_discount": {
                             "type": "boolean",
-                            "description": "Set to true to apply a discount; uses default 10% unless discount_percentage is explicitly specified.",
+                            "description": "Set to true to apply a discount; uses the customer price sheet (AZURE_PRICING_PRICE_SHEET) when configured, otherwise default 10% unless discount_percentage is explicitly specified.",
                             "default": False,
                         },
+                        "sweep_hours_per_month": {
+                            "type": "array",
+                            "items": {"type": "number"},
+                            "description": "What-if sweep: list of monthly usage hours to evaluate (e.g., [200, 400, 730])",
+                        },
+                        "sweep_quantities": {
+                            "type": "array",
+                            "items": {"type": "number"},
+                            "description": "What-if sweep: list of instance counts to evaluate",
+                        },
+                        "sweep_discount_percentages": {
+                            "type": "array",
+                            "items": {"type": "number"},
+                            "description": "What-if sweep: list of discount percentages to evaluate",
+                        },
+                        "sweep_savings_plan_terms": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "What-if sweep: savings plan terms to include (e.g., ['1 Year', '3 Years']). Defaults to all offered terms.",
+                        },
                     },
                     "required": ["service_name", "sku_name", "region"],
                 },
@@ -227,7 +260,7 @@ def get_tool_definitions() -> list[Tool]:
                         },
                         "show_with_discount": {
                             "type": "boolean",
-                            "description": "Set to true to apply a discount; uses default 10% unless discount_percentage is explicitly specified.",
+                            "description": "Set to true to apply a discount; uses the customer price sheet (AZURE_PRICING_PRICE_SHEET) when configured, otherwise default 10% unless discount_percentage is explicitly specified.",
                             "default": False,
                         },
                     },
@@ -278,7 +311,7 @@ def get_tool_definitions() -> list[Tool]:
             ),
             Tool(
                 name="get_customer_discount",
-                description="Get customer discount information. Returns default 10% discount for all customers.",
+                description="Get customer discount information. Returns negotiated price-sheet rates when AZURE_PRICING_PRICE_SHEET is configured, otherwise the default 10% discount.",
                 inputSchema={
                     "type": "object",
                     "properties": {
@@ -431,6 +464,361 @@ def get_tool_definitions() -> list[Tool]:
                     "required": ["model", "deployment_type", "rpm", "avg_input_tokens", "avg_output_tokens"],
                 },
             ),
+            # SKU × region cost matrix
+            Tool(
+                name="azure_cost_matrix",
+                description=(
+                    "Build a price matrix for several candidate SKUs across several regions in one call. "
+                    "Returns unit prices and monthly costs per SKU/region with the cheapest region per SKU "
+                    "and cheapest SKU per region. Uses a few batched queries instead of one lookup per combination."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "service_name": {
+                            "type": "string",
+                            "description": "Azure service name (e.g., 'Virtual Machines')",
+                        },
+                        "sku_names": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Candidate SKU names (e.g., ['D4s v3', 'D4as v5', 'Standard_E4s_v5'])",
+                        },
+                        "regions": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Candidate regions (e.g., ['eastus', 'westeurope'])",
+                        },
+                        "hours_per_month": {
+                            "type": "number",
+                            "description": "Usage hours per month for monthly costs (default: 730)",
+                            "default": 730,
+                        },
+                        "price_type": {
+                            "type": "string",
+                            "description": "Price type (default: Consumption)",
+                            "default": "Consumption",
+                        },
+                        "currency_code": {
+                            "type": "string",
+                            "description": "Currency code (default: USD)",
+                            "default": "USD",
+                        },
+                        "discount_percentage": {
+                            "type": "number",
+                            "description": "Discount percentage to apply to prices (e.g., 10 for 10% discount). If not specified and show_with_discount is false, no discount is applied. If show_with_discount is true, defaults to 10%.",
+                        },
+                        "show_with_discount": {
+                            "type": "boolean",
+                            "description": "Set to true to apply a discount; uses the customer price sheet (AZURE_PRICING_PRICE_SHEET) when configured, otherwise default 10% unless discount_percentage is explicitly specified.",
+                            "default": False,
+                        },
+                    },
+                    "required": ["service_name", "sku_names", "regions"],
+                },
+            ),
+            # Bill-of-materials region optimizer
+            Tool(
+                name="azure_bom_region_optimizer",
+                description=(
+                    "Find the cheapest Azure region for a whole bill of materials. Prices every resource in every "
+                    "candidate region with batched queries, excludes regions where any resource is unavailable, "
+                    "and ranks the rest by total monthly cost. Resources with a region are pinned there."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "resources": {
+                            "type": "array",
+                            "description": (
+                                "Resources in the bill of materials. Each must have service_name and sku_name. "
+                                "Optional: quantity (default 1; instances, or billing units such as GB for "
+                                "non-hourly meters), hours_per_month (default 730), region (pins the resource)."
+                            ),
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "service_name": {"type": "string", "description": "Azure service name"},
+                                    "sku_name": {"type": "string", "description": "SKU name"},
+                                    "quantity": {"type": "number", "description": "Quantity (default: 1)"},
+                                    "hours_per_month": {
+                                        "type": "number",
+                                        "description": "Usage hours per month (default: 730)",
+                                    },
+                                    "region": {
+                                        "type": "string",
+                                        "description": "Pin this resource to a region (optional)",
+                                    },
+                                },
+                                "required": ["service_name", "sku_name"],
+                            },
+                        },
+                        "regions": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Candidate regions (default: every region with pricing)",
+                        },
+                        "top_n": {
+                            "type": "integer",
+                            "description": "Number of regions to return (default: 10)",
+                            "default": 10,
+                        },
+                        "currency_code": {
+                            "type": "string",
+                            "description": "Currency code (default: USD)",
+                            "default": "USD",
+                        },
+                        "discount_percentage": {
+                            "type": "number",
+                            "description": "Discount percentage to apply to all resources",
+                        },
+                        "show_with_discount": {
+                            "type": "boolean",
+                            "description": "Set to true to apply customer pricing; uses the customer price sheet (AZURE_PRICING_PRICE_SHEET) when configured, otherwise default 10% unless discount_percentage is explicitly specified.",
+                            "default": False,
+                        },
+                    },
+                    "required": ["resources"],
+                },
+            ),
+            # VM price-performance ranking
+            Tool(
+                name="azure_vm_price_performance",
+                description=(
+                    "Rank Azure VM sizes in a region by $/vCPU-hour, $/GB-hour, $/GPU-hour or hourly price, "
+                    "filtered by vCPU, memory, GPU, family and category constraints. Joins VM prices with a "
+                    "bundled VM spec table; repeated queries are answered from a cached table. "
+                    "Example: cheapest VM with at least 8 vCPU and 32 GB RAM."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "region": {
+                            "type": "string",
+                            "description": "Azure region (default: eastus)",
+                            "default": "eastus",
+                        },
+                        "min_vcpus": {"type": "integer", "description": "Minimum vCPUs"},
+                        "max_vcpus": {"type": "integer", "description": "Maximum vCPUs"},
+                        "min_memory_gb": {"type": "number", "description": "Minimum memory in GB"},
+                        "max_memory_gb": {"type": "number", "description": "Maximum memory in GB"},
+                        "min_gpus": {"type": "number", "description": "Minimum GPUs (fractional GPUs allowed)"},
+                        "gpu_model": {"type": "string", "description": "GPU model (e.g., T4, A10, A100, H100)"},
+                        "families": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Restrict to VM families (e.g., ['Dsv5', 'Dasv5'])",
+                        },
+                        "categories": {
+                            "type": "array",
+                            "items": {
+                                "type": "string",
+                                "enum": ["general", "compute", "memory", "storage", "burstable", "gpu"],
+                            },
+                            "description": "Restrict to size categories",
+                        },
+                        "os_type": {
+                            "type": "string",
+                            "enum": ["linux", "windows"],
+                            "description": "Operating system pricing (default: linux)",
+                            "default": "linux",
+                        },
+                        "sort_by": {
+                            "type": "string",
+                            "enum": ["price_per_vcpu_hour", "price_per_gb_hour", "price_per_gpu_hour", "hourly_price"],
+                            "description": "Ranking metric (default: price_per_vcpu_hour)",
+                            "default": "price_per_vcpu_hour",
+                        },
+                        "top_n": {
+                            "type": "integer",
+                            "description": "Number of sizes to return (default: 20)",
+                            "default": 20,
+                        },
+                        "currency_code": {
+                            "type": "string",
+                            "description": "Currency code (default: USD)",
+                            "default": "USD",
+                        },
+                        "discount_percentage": {
+                            "type": "number",
+                            "description": "Discount percentage to apply to prices (e.g., 10 for 10% discount). If not specified and show_with_discount is false, no discount is applied. If show_with_discount is true, defaults to 10%.",
+                        },
+                        "show_with_discount": {
+                            "type": "boolean",
+                            "description": "Set to true to apply a discount; uses the customer price sheet (AZURE_PRICING_PRICE_SHEET) when configured, otherwise default 10% unless discount_percentage is explicitly specified.",
+                            "default": False,
+                        },
+                    },
+                },
+            ),
+            # Reservation / savings plan coverage optimizer
+            Tool(
+                name="azure_coverage_optimizer",
+                description=(
+                    "Find the cheapest mix of on-demand, 1/3-year reservations and a savings plan commitment for "
+                    "a fleet, from hourly usage profiles (8760 hourly instance counts per SKU, or a histogram of "
+                    "instance count to hours). Returns every strategy ranked by annual cost with reserved instance "
+                    "counts, the hourly savings plan commitment, coverage and savings."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "fleet": {
+                            "type": "array",
+                            "description": (
+                                "SKUs in the fleet. Each needs sku_name and either hourly_usage or usage_histogram. "
+                                "All profiles must cover the same number of hours (at most 26280). "
+                                "Optional: service_name (default 'Virtual Machines'), region."
+                            ),
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "sku_name": {"type": "string", "description": "SKU name (e.g., 'D4s v5')"},
+                                    "service_name": {"type": "string", "description": "Azure service name"},
+                                    "region": {"type": "string", "description": "Region for this SKU"},
+                                    "hourly_usage": {
+                                        "type": "array",
+                                        "items": {"type": "number"},
+                                        "description": "Instances running in each hour (e.g., 8760 values)",
+                                    },
+                                    "usage_histogram": {
+                                        "type": "object",
+                                        "additionalProperties": {"type": "number"},
+                                        "description": "Hours spent at each instance count (e.g., {'2': 6000, '6': 2760})",
+                                    },
+                                },
+                                "required": ["sku_name"],
+                            },
+                        },
+                        "region": {
+                            "type": "string",
+                            "description": "Default region for fleet entries (default: eastus)",
+                            "default": "eastus",
+                        },
+                        "currency_code": {
+                            "type": "string",
+                            "description": "Currency code (default: USD)",
+                            "default": "USD",
+                        },
+                        "discount_percentage": {
+                            "type": "number",
+                            "description": "Discount percentage to apply to all rates",
+                        },
+                        "show_with_discount": {
+                            "type": "boolean",
+                            "description": "Set to true to apply customer pricing; uses the customer price sheet (AZURE_PRICING_PRICE_SHEET) when configured, otherwise default 10% unless discount_percentage is explicitly specified.",
+                            "default": False,
+                        },
+                    },
+                    "required": ["fleet"],
+                },
+            ),
+            # Multi-year TCO projection
+            Tool(
+                name="azure_tco_projection",
+                description=(
+                    "Project 1-5 year total cost of ownership for a set of Azure resources with month-by-month cash "
+                    "flows. Supports usage growth rates, reservations and savings plans (monthly or upfront), "
+                    "per-year discount schedules, NPV, a comparison of all pricing options and a sensitivity sweep "
+                    "over growth and discount."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "resources": {
+                            "type": "array",
+                            "description": (
+                                "Resources to project. Each must have service_name and sku_name. Optional: region, "
+                                "quantity (default 1), hours_per_month (default 730), growth_rate_percent, pricing."
+                            ),
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "service_name": {"type": "string", "description": "Azure service name"},
+                                    "sku_name": {"type": "string", "description": "SKU name"},
+                                    "region": {"type": "string", "description": "Azure region"},
+                                    "quantity": {"type": "number", "description": "Starting quantity (default: 1)"},
+                                    "hours_per_month": {
+                                        "type": "number",
+                                        "description": "Usage hours per month (default: 730)",
+                                    },
+                                    "growth_rate_percent": {
+                                        "type": "number",
+                                        "description": "Annual usage growth for this resource",
+                                    },
+                                    "pricing": {
+                                        "type": "string",
+                                        "enum": ["on_demand", "ri_1y", "ri_3y", "sp_1y", "sp_3y"],
+                                        "description": "Pricing option for this resource",
+                                    },
+                                },
+                                "required": ["service_name", "sku_name"],
+                            },
+                        },
+                        "years": {
+                            "type": "integer",
+                            "description": "Projection horizon in years, 1-5 (default: 3)",
+                            "default": 3,
+                        },
+                        "pricing": {
+                            "type": "string",
+                            "enum": ["on_demand", "ri_1y", "ri_3y", "sp_1y", "sp_3y"],
+                            "description": "Default pricing option (default: on_demand)",
+                            "default": "on_demand",
+                        },
+                        "growth_rate_percent": {
+                            "type": "number",
+                            "description": "Annual usage growth, compounded monthly (default: 0)",
+                            "default": 0,
+                        },
+                        "discount_schedule": {
+                            "type": "array",
+                            "items": {"type": "number"},
+                            "description": "Discount percentage per year on projected spend, e.g. [0, 5, 10]",
+                        },
+                        "payment": {
+                            "type": "string",
+                            "enum": ["monthly", "upfront"],
+                            "description": "Commitment payment: monthly, or upfront at the start of each term",
+                            "default": "monthly",
+                        },
+                        "cost_of_capital_percent": {
+                            "type": "number",
+                            "description": "Annual cost of capital for NPV of the cash flow (optional)",
+                        },
+                        "sensitivity_growth_rates": {
+                            "type": "array",
+                            "items": {"type": "number"},
+                            "description": "Sensitivity sweep: annual growth rates to evaluate",
+                        },
+                        "sensitivity_discount_percentages": {
+                            "type": "array",
+                            "items": {"type": "number"},
+                            "description": "Sensitivity sweep: flat discounts to evaluate (replace discount_schedule)",
+                        },
+                        "region": {
+                            "type": "string",
+                            "description": "Default region for resources (default: eastus)",
+                            "default": "eastus",
+                        },
+                        "currency_code": {
+                            "type": "string",
+                            "description": "Currency code (default: USD)",
+                            "default": "USD",
+                        },
+                        "discount_percentage": {
+                            "type": "number",
+                            "description": "Discount percentage to apply to unit rates",
+                        },
+                        "show_with_discount": {
+                            "type": "boolean",
+                            "description": "Set to true to apply customer pricing; uses the customer price sheet (AZURE_PRICING_PRICE_SHEET) when configured, otherwise default 10% unless discount_percentage is explicitly specified.",
+                            "default": False,
+                        },
+                    },
+                    "required": ["resources"],
+                },
+            ),
             # Bulk cost estimation
             Tool(
                 name="azure_bulk_estimate",
@@ -474,14 +862,161 @@ def get_tool_definitions() -> list[Tool]:
                             "description": "Currency code (default: USD)",
                             "default": "USD",
                         },
+                        "currency_codes": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Several currency codes (e.g., ['USD', 'EUR', 'GBP']) to return costs and totals side by side; fetched concurrently, overrides currency_code",
+                        },
                         "discount_percentage": {
                             "type": "number",
                             "description": "Discount percentage to apply to all resources",
                         },
+                        "show_with_discount": {
+                            "type": "boolean",
+                            "description": "Set to true to apply customer pricing; uses the customer price sheet (AZURE_PRICING_PRICE_SHEET) when configured, otherwise default 10% unless discount_percentage is explicitly specified.",
+                            "default": False,
+                        },
                     },
                     "required": ["resources"],
                 },
             ),
+            # Batch meta-tool
+            Tool(
+                name="batch",
+                description=(
+                    "Run several tool calls in one request. Calls run concurrently and results are returned "
+                    "in order, with per-call errors. Use it instead of many sequential calls, e.g. one "
+                    "azure_cost_estimate per resource."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "calls": {
+                            "type": "array",
+                            "description": "Tool calls to run (batches cannot be nested)",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "tool": {
+                                        "type": "string",
+                                        "description": "Tool name (e.g., 'azure_cost_estimate')",
+                                    },
+                                    "arguments": {
+                                        "type": "object",
+                                        "description": "Arguments for the tool",
+                                    },
+                                },
+                                "required": ["tool"],
+                            },
+                        },
+                    },
+                    "required": ["calls"],
+                },
+            ),
+            # Admin tool
+            Tool(
+                name="server_metrics",
+                description=(
+                    "Server metrics for operators: per-tool call counts, errors and latency, upstream API "
+                    "latency, retries and 429 responses, cache hit ratios and dispatcher load."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "format": {
+                            "type": "string",
+                            "enum": ["summary", "prometheus"],
+                            "description": "summary (readable tables) or prometheus (text exposition format)",
+                            "default": "summary",
+                        },
+                    },
+                },
+            ),
+            # Admin tool
+            Tool(
+                name="server_profiling",
+                description=(
+                    "Profile tool calls with cProfile to find CPU hot spots. Sets the fraction of calls profiled, "
+                    "or one tool to profile, and lists saved profiles with the hot spots of the newest one. "
+                    "Call without arguments to see the current settings."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "sample_rate": {
+                            "type": "number",
+                            "minimum": 0,
+                            "maximum": 1,
+                            "description": "Fraction of tool calls to profile (0 turns sampling off)",
+                        },
+                        "tool": {
+                            "type": "string",
+                            "description": (
+                                "Profile only this tool (every call unless sample_rate is set); empty clears it"
+                            ),
+                        },
+                        "top": {
+                            "type": "integer",
+                            "description": "Functions listed from the newest profile, by cumulative time (0 hides)",
+                            "default": 15,
+                        },
+                    },
+                },
+            ),
+            # Admin tool
+            Tool(
+                name="server_cache",
+                description=(
+                    "Inspect and control the server's caches: entries, memory, hit rates and oldest entries of the "
+                    "tool result, price request, retirement, Spot and shared caches. Flush entries by cache, key "
+                    "prefix or key (e.g. after a price update) and prewarm a list of queries."
+                ),
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "action": {
+                            "type": "string",
+                            "enum": ["stats", "flush", "prewarm"],
+                            "description": "stats (report only), flush (drop entries) or prewarm (run queries now)",
+                            "default": "stats",
+                        },
+                        "cache": {
+                            "type": "string",
+                            "enum": ["all", "tool", "prices", "retirement", "spot", "shared"],
+                            "description": "Cache to flush",
+                            "default": "all",
+                        },
+                        "prefix": {
+                            "type": "string",
+                            "description": (
+                                "Flush keys starting with this prefix (tool names for the tool cache, "
+                                "e.g. 'prices:' for the shared cache)"
+                            ),
+                        },
+                        "key": {"type": "string", "description": "Flush this exact key"},
+                        "queries": {
+                            "type": "array",
+                            "description": (
+                                "Tool calls to prewarm; without queries, connections, retirement data and the "
+                                "most frequent logged queries are prewarmed"
+                            ),
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "tool": {"type": "string", "description": "Tool name"},
+                                    "arguments": {"type": "object", "description": "Arguments for the tool"},
+                                },
+                                "required": ["tool"],
+                            },
+                        },
+                        "oldest": {
+                            "type": "integer",
+                            "description": "Oldest entries listed per cache",
+                            "default": 5,
+                        },
+                    },
+                },
+            ),
         ]
         + get_databricks_tool_definitions()
         + get_github_pricing_tool_definitions()
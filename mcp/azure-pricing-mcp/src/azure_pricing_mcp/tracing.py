@@ -0,0 +1,194 @@
+"""Lightweight tracing for Azure Pricing MCP Server.
+
+A trace covers one tool call. ``start_trace`` opens its root span in the
+server's call handler; code below it (dispatcher, handlers, services, the
+HTTP client) opens child spans with ``span``, so a slow call shows where
+its time went:
+
+- ``dispatch.queue`` — waiting for a tool or priority class slot
+- ``handler`` and ``format`` — the tool handler and its response formatting
+- ``prices.fetch``, ``retirement.fetch``, ``shared_cache`` — service lookups
+  with their ``cache_hit`` attribute
+- ``http.request`` — one upstream request with ``attempts``, ``status`` and ``bytes``
+
+The current span is kept in a context variable, so it follows the call into
+sub-tasks. Spans are collected per trace and handed to the exporter when the
+root span ends; ``JsonLinesExporter`` appends one JSON object per span to a
+local file for offline analysis. Without an exporter (``AZURE_PRICING_TRACE_FILE``
+unset) every helper is a no-op.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Protocol
+
+from .config import TRACE_FILE, TRACE_MAX_SPANS, TRACE_SLOW_MS
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "duration_ms", "status", "attributes", "_trace")
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start: float
+    duration_ms: float | None
+    status: str
+    attributes: dict[str, Any]
+    # Spans of the whole trace, shared by all its spans; the root exports them
+    _trace: "list[Span]"
+
+    def __init__(self, name: str, parent: "Span | None" = None, attributes: dict[str, Any] | None = None) -> None:
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self.duration_ms = None
+        self.status = "ok"
+        self.attributes = dict(attributes or {})
+        self._trace = parent._trace if parent else []
+
+    def set(self, key: str, value: Any) -> None:
+        """Set an attribute on this span."""
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class SpanExporter(Protocol):
+    """Receives the spans of each finished trace."""
+
+    def export(self, spans: list[Span]) -> None: ...
+
+
+class JsonLinesExporter:
+    """Append spans to a local file, one JSON object per line."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        lines = "".join(json.dumps(span.to_dict(), default=str) + "\n" for span in spans)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            logger.warning(f"Could not write trace to {self.path}: {e}")
+
+
+_current_span: ContextVar[Span | None] = ContextVar("azure_pricing_span", default=None)
+_exporter: SpanExporter | None = JsonLinesExporter(os.path.expanduser(TRACE_FILE)) if TRACE_FILE else None
+_slow_ms = TRACE_SLOW_MS
+
+
+def configure(exporter: SpanExporter | None, slow_ms: float = TRACE_SLOW_MS) -> None:
+    """Set the exporter (None disables tracing) and the minimum root duration of exported traces."""
+    global _exporter, _slow_ms
+    _exporter = exporter
+    _slow_ms = slow_ms
+
+
+def enabled() -> bool:
+    """Whether spans are being recorded."""
+    return _exporter is not None
+
+
+def current_span() -> Span | None:
+    """Innermost open span of the current trace, if any."""
+    return _current_span.get()
+
+
+def set_attribute(key: str, value: Any) -> None:
+    """Set an attribute on the current span (no-op outside a trace)."""
+    active = _current_span.get()
+    if active is not None:
+        active.set(key, value)
+
+
+@contextmanager
+def _open(name: str, parent: Span | None, attributes: dict[str, Any]) -> Iterator[Span]:
+    opened = Span(name, parent, attributes)
+    started = time.perf_counter()
+    token = _current_span.set(opened)
+    try:
+        yield opened
+    except BaseException as e:
+        opened.status = "cancelled" if isinstance(e, asyncio.CancelledError) else "error"
+        opened.attributes.setdefault("error", type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        opened.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        # The root is always kept; a runaway fan-out only loses its excess child spans
+        if len(opened._trace) < TRACE_MAX_SPANS or parent is None:
+            opened._trace.append(opened)
+
+
+@contextmanager
+def start_trace(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Open the root span of a new trace and export the trace when it ends.
+
+    Inside an existing trace (e.g. a call run by the ``batch`` tool) this
+    opens a child span instead. Yields None when tracing is disabled.
+    """
+    exporter = _exporter
+    if exporter is None:
+        yield None
+        return
+    parent = _current_span.get()
+    if parent is not None:
+        with _open(name, parent, attributes) as child:
+            yield child
+        return
+    root: Span | None = None
+    try:
+        with _open(name, None, attributes) as root:
+            yield root
+    finally:
+        if root is not None:
+            _export(exporter, root)
+
+
+def _export(exporter: SpanExporter, root: Span) -> None:
+    if root.duration_ms is not None and root.duration_ms < _slow_ms:
+        return
+    try:
+        exporter.export(root._trace)
+    except Exception as e:
+        logger.warning(f"Trace export failed: {e}")
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Open a child span of the current trace; yields None (and records nothing) outside a trace."""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    with _open(name, parent, attributes) as child:
+        yield child
@@ -0,0 +1,283 @@
+"""Predictive cache warm-up for Azure Pricing MCP Server.
+
+Tool-call traffic is repetitive (the same services, popular regions and
+landing zone SKUs), so the server keeps a query log and re-runs the hottest
+queries before users ask for them:
+
+- ``QueryLog`` counts cacheable tool calls by their normalized cache key
+  (tool name + normalized arguments). Nothing about the caller is kept:
+  calls naming a customer or an Azure resource are not logged at all.
+  Counts are merged into a private JSON file per user on the host, so all
+  workers and restarts contribute to one ranking
+- ``CacheWarmer`` re-runs the top-K queries at startup and every
+  ``AZURE_PRICING_WARMUP_INTERVAL`` seconds, refreshing tool result cache
+  entries that are missing or would expire before the next run. Calls go
+  through the dispatcher and the shared batch limiter, so warm-up never
+  exceeds the limits user traffic gets
+- Hit-rate counters (``CacheWarmer.stats``) show how many user calls were
+  answered from entries the warmer prefetched
+"""
+
+import asyncio
+import contextlib
+import copy
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from mcp.types import TextContent
+
+from .config import WARMUP_INTERVAL, WARMUP_LOG_PATH, WARMUP_MAX_QUERIES, WARMUP_TOP_K
+from .dispatch import TOOL_ROUTES
+from .tool_cache import UNCACHEABLE_TOOLS, ToolResultCache
+
+logger = logging.getLogger(__name__)
+
+# Arguments that identify a customer or one of their resources; calls carrying them are not logged
+IDENTIFYING_ARGUMENTS = frozenset({"customer_id", "vm_resource_id"})
+
+
+def _loggable(name: Any, arguments: Any) -> bool:
+    """Whether a query may be kept in the log: a known, cacheable tool called without identifying arguments."""
+    return (
+        name in TOOL_ROUTES
+        and name not in UNCACHEABLE_TOOLS
+        and isinstance(arguments, dict)
+        and not IDENTIFYING_ARGUMENTS & arguments.keys()
+    )
+
+
+class QueryLog:
+    """Frequency counts of normalized tool queries, persisted to a JSON file."""
+
+    def __init__(self, path: str | None = WARMUP_LOG_PATH, max_queries: int = WARMUP_MAX_QUERIES) -> None:
+        """
+        Args:
+            path: JSON file shared by the workers on this host (None keeps the log in memory).
+            max_queries: Queries kept; the least frequent are dropped beyond it.
+        """
+        self.path = path
+        self._max_queries = max_queries
+        # Cache key -> {"tool", "arguments", "count"}
+        self._queries: dict[str, dict[str, Any]] = {}
+        # Counts not yet merged into the file
+        self._pending: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def record(self, key: str, name: str, arguments: dict[str, Any] | None) -> None:
+        """Count one call of a cacheable query (calls that are not ``_loggable`` are ignored)."""
+        if not _loggable(name, arguments or {}):
+            return
+        entry = self._queries.get(key)
+        if entry is None:
+            entry = self._queries[key] = {"tool": name, "arguments": copy.deepcopy(arguments or {}), "count": 0}
+        entry["count"] += 1
+        self._pending[key] = self._pending.get(key, 0) + 1
+        if len(self._queries) > self._max_queries * 2:
+            self._prune()
+
+    def top(self, k: int) -> list[tuple[str, str, dict[str, Any]]]:
+        """The *k* most frequent queries as (cache key, tool name, arguments)."""
+        ranked = sorted(self._queries.items(), key=lambda item: item[1]["count"], reverse=True)[:k]
+        return [(key, entry["tool"], dict(entry["arguments"])) for key, entry in ranked]
+
+    def _prune(self) -> None:
+        ranked = sorted(self._queries.items(), key=lambda item: item[1]["count"], reverse=True)
+        self._queries = dict(ranked[: self._max_queries])
+        self._pending = {key: count for key, count in self._pending.items() if key in self._queries}
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return {
+                key: entry
+                for key, entry in data.get("queries", {}).items()
+                if isinstance(entry, dict)
+                and {"tool", "arguments", "count"} <= entry.keys()
+                and isinstance(entry["count"], int)
+                and _loggable(entry["tool"], entry["arguments"])
+            }
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable query log {self.path}: {e}")
+            return {}
+
+    def load(self) -> int:
+        """Merge the file's counts (other workers, earlier runs) into this log; returns the queries known."""
+        for key, entry in self._read().items():
+            self._queries[key] = {**entry, "count": entry["count"] + self._pending.get(key, 0)}
+        if len(self._queries) > self._max_queries:
+            self._prune()
+        return len(self._queries)
+
+    def save(self) -> None:
+        """Add counts recorded since the last save to the file (atomically replaced)."""
+        if not self.path or not self._pending:
+            return
+        merged = self._read()
+        for key, count in self._pending.items():
+            entry = merged.get(key) or {**self._queries[key], "count": 0}
+            merged[key] = {**entry, "count": entry["count"] + count}
+        ranked = dict(sorted(merged.items(), key=lambda item: item[1]["count"], reverse=True)[: self._max_queries])
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            # Readable by this user only (mkstemp files are 0600 and keep that mode when renamed)
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"queries": ranked}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save query log {self.path}: {e}")
+            return
+        self._pending.clear()
+        self._queries = ranked
+
+
+class CacheWarmer:
+    """Re-run the most frequent queries into the tool result cache."""
+
+    def __init__(
+        self,
+        cache: ToolResultCache,
+        call: Callable[[str, dict[str, Any]], Awaitable[Any]],
+        limiter: asyncio.Semaphore,
+        log: QueryLog | None = None,
+        top_k: int = WARMUP_TOP_K,
+        interval: float = WARMUP_INTERVAL,
+    ) -> None:
+        """
+        Args:
+            cache: The tool result cache to fill.
+            call: Runs one tool call (through the dispatcher) and returns its content.
+            limiter: Limiter shared with batched user calls.
+            log: Query log to rank (default: the per-host file).
+            top_k: Queries prefetched per run.
+            interval: Seconds between runs; entries expiring sooner are refreshed.
+        """
+        self._cache = cache
+        self._call = call
+        self._limiter = limiter
+        self.log = log if log is not None else QueryLog()
+        self._top_k = top_k
+        self._interval = interval
+        self._task: asyncio.Task[None] | None = None
+        self._prefetched: set[str] = set()
+        self._runs = 0
+        self._warmed = 0
+        self._failed = 0
+        self._hits = 0
+        self._misses = 0
+        self._warm_hits = 0
+
+    def record(self, name: str, key: str | None, arguments: dict[str, Any] | None, hit: bool) -> None:
+        """Log a user tool call (before handlers modify *arguments*) and count cache hits."""
+        if key is None:
+            return
+        self.log.record(key, name, arguments)
+        if hit:
+            self._hits += 1
+            if key in self._prefetched:
+                self._warm_hits += 1
+        else:
+            self._misses += 1
+
+    async def warm_once(self) -> int:
+        """Prefetch the top-K queries that are missing or expire before the next run; returns the count."""
+        due = [
+            (key, name, arguments)
+            for key, name, arguments in self.log.top(self._top_k)
+            if (self._cache.expires_in(key) or 0) < self._interval
+        ]
+        results = await asyncio.gather(*(self._warm(*query) for query in due))
+        self._runs += 1
+        warmed = sum(results)
+        if due:
+            logger.info(f"Cache warm-up prefetched {warmed}/{len(due)} hot queries")
+        return warmed
+
+    async def warm(self, queries: list[tuple[str, dict[str, Any]]]) -> dict[str, int]:
+        """Run the given (tool name, arguments) queries into the cache now, e.g. after a price update.
+
+        Returns counts of queries ``warmed``, ``failed`` and ``uncacheable`` (never cached, so not run).
+        """
+        due = []
+        for name, arguments in queries:
+            key = self._cache.key(name, arguments)
+            if key is not None:
+                due.append((key, name, arguments))
+        results = await asyncio.gather(*(self._warm(*query) for query in due))
+        warmed = sum(results)
+        logger.info(f"Cache warm-up of {len(due)} requested queries cached {warmed}")
+        return {"warmed": warmed, "failed": len(due) - warmed, "uncacheable": len(queries) - len(due)}
+
+    async def _warm(self, key: str, name: str, arguments: dict[str, Any]) -> bool:
+        async with self._limiter:
+            try:
+                result = await self._call(name, dict(arguments))
+            except Exception as e:
+                logger.warning(f"Warm-up of {name} failed: {e}")
+                result = None
+        if not isinstance(result, list) or not result or not isinstance(result[0], TextContent):
+            self._failed += 1
+            return False
+        self._cache.put(name, key, result)
+        if self._cache.expires_in(key) is None:
+            # Error responses are not cached
+            self._failed += 1
+            return False
+        self._prefetched.add(key)
+        self._warmed += 1
+        return True
+
+    def start(self) -> "asyncio.Task[None]":
+        """Start the periodic warm-up loop in the background (idempotent)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.log.load()
+                await self.warm_once()
+                self.log.save()
+            except Exception as e:
+                logger.warning(f"Cache warm-up run failed: {e}")
+            await asyncio.sleep(self._interval)
+
+    async def stop(self) -> None:
+        """Stop the loop and save counts recorded since the last run."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        self.log.save()
+
+    def stats(self) -> dict[str, Any]:
+        """Warm-up runs and the hit rate of logged user calls, overall and on prefetched entries."""
+        calls = self._hits + self._misses
+        return {
+            "running": self._task is not None,
+            "log_path": self.log.path,
+            "tracked_queries": len(self.log),
+            "top_k": self._top_k,
+            "interval_seconds": self._interval,
+            "runs": self._runs,
+            "prefetched": self._warmed,
+            "failed": self._failed,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / calls, 4) if calls else 0.0,
+            "warm_hits": self._warm_hits,
+            "warm_hit_rate": round(self._warm_hits / calls, 4) if calls else 0.0,
+        }
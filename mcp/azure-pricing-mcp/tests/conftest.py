@@ -0,0 +1,25 @@
+"""Shared fixtures for the Azure Pricing MCP Server tests."""
+
+import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams
+
+from azure_pricing_mcp.metrics import METRICS
+
+
+@pytest.fixture
+def reset_metrics():
+    """Clear the process-wide metrics registry before and after a test."""
+    METRICS.reset()
+    yield
+    METRICS.reset()
+
+
+@pytest.fixture
+def call_tool():
+    """Return a helper that sends a tool call through a server's CallToolRequest handler."""
+
+    def call(server, name: str, arguments: dict | None = None):
+        request = CallToolRequest(params=CallToolRequestParams(name=name, arguments=arguments or {}))
+        return server.request_handlers[CallToolRequest](request)
+
+    return call
@@ -0,0 +1,112 @@
+"""Tests for the batch meta-tool."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams, TextContent
+
+from azure_pricing_mcp.batch import run_batch
+from azure_pricing_mcp.formatters import format_batch_response
+from azure_pricing_mcp.server import create_server
+from azure_pricing_mcp.tool_cache import text_response
+
+
+def _text(value: str) -> list[TextContent]:
+    return [TextContent(type="text", text=value)]
+
+
+@pytest.mark.asyncio
+async def test_results_in_order_with_bounded_concurrency():
+    in_flight = {"now": 0, "max": 0}
+
+    async def call_tool(name, arguments):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        # Later calls finish first
+        await asyncio.sleep(0.01 * (10 - arguments["n"]))
+        in_flight["now"] -= 1
+        return _text(f"{name} {arguments['n']}")
+
+    calls = [{"tool": "azure_cost_estimate", "arguments": {"n": n}} for n in range(10)]
+    result = await run_batch(calls, call_tool, asyncio.Semaphore(4))
+
+    assert [r["text"] for r in result["results"]] == [f"azure_cost_estimate {n}" for n in range(10)]
+    assert result["succeeded"] == 10
+    assert in_flight["max"] == 4
+
+
+@pytest.mark.asyncio
+async def test_per_entry_errors():
+    async def call_tool(name, arguments):
+        if name == "boom":
+            raise RuntimeError("API unavailable")
+        if name == "missing":
+            return _text(f"Unknown tool: {name}")
+        if name == "spot_price_history":
+            return text_response("### ❌ Authentication Required", {"error": "authentication_required"})
+        arguments["mutated"] = True
+        return _text("ok")
+
+    original = {"service_name": "Storage"}
+    calls = [
+        {"tool": "azure_price_search", "arguments": original},
+        {"tool": "boom"},
+        {"tool": "missing"},
+        {"tool": "spot_price_history"},
+        {"tool": "batch", "arguments": {"calls": []}},
+        {"arguments": {}},
+    ]
+    result = await run_batch(calls, call_tool, asyncio.Semaphore(2))
+
+    errors = [r.get("error") for r in result["results"]]
+    assert errors[0] is None
+    assert errors[1] == "API unavailable"
+    assert errors[2] == "Unknown tool: missing"
+    assert errors[3] == "### ❌ Authentication Required"
+    assert "nested" in errors[4]
+    assert "Missing tool" in errors[5]
+    assert result["failed"] == 5
+    assert original == {"service_name": "Storage"}
+
+
+@pytest.mark.asyncio
+async def test_batch_validation():
+    async def call_tool(name, arguments):
+        return _text("ok")
+
+    assert "non-empty" in (await run_batch([], call_tool, asyncio.Semaphore(1)))["error"]
+    too_many = [{"tool": "x"}] * 3
+    assert "limit of 2" in (await run_batch(too_many, call_tool, asyncio.Semaphore(1), max_calls=2))["error"]
+
+
+@pytest.mark.asyncio
+async def test_server_batch_goes_through_cache():
+    server, pricing_server = create_server()
+    pricing_server._session_active = True
+    handler = AsyncMock(side_effect=lambda arguments: _text(f"Estimate for {arguments['sku_name']}"))
+    pricing_server.tool_handlers.handle_cost_estimate = handler
+    call = server.request_handlers[CallToolRequest]
+
+    calls = [
+        {"tool": "azure_cost_estimate", "arguments": {"service_name": "vm", "sku_name": sku}}
+        for sku in ("D2s v5", "D4s v5")
+    ]
+    request = CallToolRequest(
+        params=CallToolRequestParams(name="batch", arguments={"calls": calls + [{"tool": "nope"}]})
+    )
+
+    text = (await call(request)).root.content[0].text
+    assert "**Calls**: 3 (2 succeeded, 1 failed)" in text
+    assert text.index("Estimate for D2s v5") < text.index("Estimate for D4s v5")
+    assert "## 3. nope ❌" in text
+    assert handler.await_count == 2
+
+    # Repeating the batch is served from the per-call result cache
+    await call(request)
+    assert handler.await_count == 2
+    assert pricing_server.tool_cache.stats()["tools"]["azure_cost_estimate"]["hits"] == 2
+
+
+def test_formatter_error():
+    assert format_batch_response({"error": "calls must be a non-empty list"}).startswith("❌")
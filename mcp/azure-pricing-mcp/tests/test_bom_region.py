@@ -0,0 +1,131 @@
+"""Tests for the bill-of-materials cheapest-region solver."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from azure_pricing_mcp.formatters import format_bom_region_response
+from azure_pricing_mcp.services import BillOfMaterialsService, PricingService
+
+
+def _price(service, sku, region, price, unit="1 Hour"):
+    return {
+        "serviceName": service,
+        "skuName": sku,
+        "armRegionName": region,
+        "retailPrice": price,
+        "unitOfMeasure": unit,
+    }
+
+
+CATALOG = [
+    _price("Virtual Machines", "D2s v3", "eastus", 0.10),
+    _price("Virtual Machines", "D2s v3", "westeurope", 0.12),
+    _price("Virtual Machines", "D2s v3", "swedencentral", 0.09),
+    _price("Azure Firewall", "Basic", "eastus", 0.40),
+    _price("Azure Firewall", "Basic", "westeurope", 0.45),
+    _price("Storage", "Standard LRS", "eastus", 0.02, unit="1 GB/Month"),
+    _price("Storage", "Standard LRS", "westeurope", 0.021, unit="1 GB/Month"),
+    _price("Storage", "Standard LRS", "swedencentral", 0.019, unit="1 GB/Month"),
+]
+
+
+async def _fetch(filter_conditions, currency_code="USD", limit=None):
+    service_clause = filter_conditions[0]
+    return {"Items": [item for item in CATALOG if f"serviceName eq '{item['serviceName']}'" == service_clause]}
+
+
+@pytest.fixture
+def bom_service():
+    client = MagicMock()
+    client.fetch_all_prices = AsyncMock(side_effect=_fetch)
+    return BillOfMaterialsService(PricingService(client, MagicMock()))
+
+
+RESOURCES = [
+    {"service_name": "vm", "sku_name": "D2s v3", "quantity": 2},
+    {"service_name": "Azure Firewall", "sku_name": "Basic"},
+    {"service_name": "Storage", "sku_name": "Standard LRS", "quantity": 100},
+]
+
+
+@pytest.mark.asyncio
+async def test_ranks_regions_by_total_cost(bom_service):
+    result = await bom_service.cheapest_region(RESOURCES)
+
+    # eastus: 2*0.10*730 + 0.40*730 + 100*0.02 = 146 + 292 + 2 = 440
+    assert result["cheapest_region"] == "eastus"
+    assert [r["region"] for r in result["rankings"]] == ["eastus", "westeurope"]
+    assert result["rankings"][0]["monthly_cost"] == 440.0
+    assert result["rankings"][1]["monthly_cost"] == 505.8
+    # One batched query per service
+    assert result["queries"] == 3
+
+
+@pytest.mark.asyncio
+async def test_masks_regions_missing_a_resource(bom_service):
+    result = await bom_service.cheapest_region(RESOURCES)
+
+    assert result["unavailable_regions"] == [{"region": "swedencentral", "missing_resources": ["Basic"]}]
+    assert result["regions_evaluated"] == 3
+    assert result["regions_available"] == 2
+
+
+@pytest.mark.asyncio
+async def test_pinned_resource_costed_in_its_region(bom_service):
+    resources = [
+        {"service_name": "Virtual Machines", "sku_name": "D2s v3"},
+        {"service_name": "Azure Firewall", "sku_name": "Basic", "region": "westeurope"},
+    ]
+
+    result = await bom_service.cheapest_region(resources, regions=["eastus", "swedencentral"])
+
+    # Firewall is pinned, so swedencentral is no longer masked
+    assert result["cheapest_region"] == "swedencentral"
+    assert result["pinned_monthly_cost"] == 328.5
+    assert result["rankings"][0]["monthly_cost"] == round(0.09 * 730 + 328.5, 2)
+    assert {item["region"] for item in result["breakdown"]} == {"swedencentral", "westeurope"}
+
+
+@pytest.mark.asyncio
+async def test_unpriced_resource_reported(bom_service):
+    resources = [*RESOURCES, {"service_name": "Virtual Machines", "sku_name": "Z99 v9"}, {"service_name": "Storage"}]
+
+    result = await bom_service.cheapest_region(resources)
+
+    assert result["cheapest_region"] == "eastus"
+    errors = {err["index"]: err["error"] for err in result["errors"]}
+    assert "Z99 v9" in errors[3]
+    assert "Missing required field" in errors[4]
+
+
+@pytest.mark.asyncio
+async def test_discount_applied(bom_service):
+    result = await bom_service.cheapest_region(RESOURCES[:1], regions=["eastus"], discount_percentage=50)
+
+    assert result["rankings"][0]["monthly_cost"] == 73.0
+    assert result["discount_applied"]["percentage"] == 50
+
+
+@pytest.mark.asyncio
+async def test_formatter(bom_service):
+    result = await bom_service.cheapest_region(RESOURCES)
+
+    text = format_bom_region_response(result)
+
+    assert "| 1 | eastus | $440.00" in text
+    assert "swedencentral: missing Basic" in text
+
+
+@pytest.mark.asyncio
+async def test_truncated_price_scan_is_flagged(bom_service):
+    async def truncated(filter_conditions, currency_code="USD", limit=None):
+        return {**(await _fetch(filter_conditions)), "NextPageLink": "https://prices.azure.com/next"}
+
+    complete = await bom_service.cheapest_region(RESOURCES, regions=["eastus"])
+    bom_service._pricing._client.fetch_all_prices = AsyncMock(side_effect=truncated)
+    result = await bom_service.cheapest_region(RESOURCES)
+
+    assert complete["truncated"] is False and result["truncated"] is True
+    assert "truncated at the page limit" in format_bom_region_response(result)
+    assert "truncated" not in format_bom_region_response(complete)
@@ -0,0 +1,173 @@
+"""Tests for cache inspection, flushing and prewarming through the server_cache tool."""
+
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+from mcp.types import ListToolsRequest, TextContent
+
+from azure_pricing_mcp.cache import approx_size, matching_keys
+from azure_pricing_mcp.config import CACHE_PREWARM_MAX_QUERIES
+from azure_pricing_mcp.models import RetirementStatus, VMSeriesRetirementInfo
+from azure_pricing_mcp.server import _cache_tool, create_server
+
+pytestmark = pytest.mark.usefixtures("reset_metrics")
+
+
+@pytest.fixture
+def servers(monkeypatch):
+    monkeypatch.setattr("azure_pricing_mcp.server.CACHE_ADMIN", "full")
+    server, pricing_server = create_server()
+    pricing_server._session_active = True
+    pricing_server.cache_warmer.log.path = None
+    return server, pricing_server
+
+
+@pytest.fixture
+def cache_tool(call_tool):
+    async def text(server, arguments: dict | None = None) -> str:
+        return (await call_tool(server, "server_cache", arguments)).root.content[0].text
+
+    return text
+
+
+def _fill_caches(pricing_server) -> None:
+    pricing = pricing_server._pricing_service
+    pricing._request_cache['{"f": ["a"]}'] = ({"Items": [{"retailPrice": 1.0}]}, datetime.now())
+    pricing._request_cache['{"f": ["b"]}'] = ({"Items": []}, datetime.now())
+    retirement = pricing_server._retirement_service
+    retirement._cache = {
+        "Av1": VMSeriesRetirementInfo("Av1-series", RetirementStatus.RETIRED, retirement_date="2024-08-31")
+    }
+    retirement._cache_time = datetime.now()
+
+
+def test_matching_keys_and_approx_size():
+    keys = ["prices:a", "prices:b", "spot:x"]
+
+    assert matching_keys(keys, prefix="prices:") == ["prices:a", "prices:b"]
+    assert matching_keys(keys, key="spot:x") == ["spot:x"]
+    assert matching_keys(keys) == keys
+    assert approx_size({"a": ["x" * 1000]}) > 1000
+
+
+@pytest.mark.asyncio
+async def test_stats_reports_sizes_hit_rates_and_oldest_entries(servers, cache_tool):
+    server, pricing_server = servers
+    _fill_caches(pricing_server)
+    await pricing_server._shared_cache.set("prices:q", {"Items": []}, 60)
+    await pricing_server._retirement_service.get_retirement_data()
+
+    caches = await pricing_server.cache_stats(oldest=1)
+    text = await cache_tool(server)
+
+    assert caches["prices"]["entries"] == 2 and caches["prices"]["bytes"] > 0
+    assert caches["prices"]["oldest"][0]["key"] == '{"f": ["a"]}'
+    assert caches["retirement"]["series"] == 1
+    assert (caches["retirement"]["hits"], caches["retirement"]["hit_rate"]) == (1, 1.0)
+    assert caches["shared"]["backend"] == "memory" and caches["shared"]["entries"] == 1
+    assert caches["spot"]["entries"] == 0
+    assert text.startswith("# 🗄️ Server Caches")
+    assert "| prices | 2 |" in text
+    assert "| shared (memory) | 1 |" in text
+    assert "`retirement`" in text
+
+
+@pytest.mark.asyncio
+async def test_flush_by_prefix_key_and_cache(servers, cache_tool):
+    server, pricing_server = servers
+    _fill_caches(pricing_server)
+    await pricing_server._shared_cache.set("prices:q", {"Items": []}, 60)
+    await pricing_server._shared_cache.set("spot:eviction:x", {}, 60)
+
+    text = await cache_tool(server, {"action": "flush", "cache": "prices", "key": '{"f": ["a"]}'})
+    assert "**Flushed** 1 entries (prices: 1)" in text
+    assert list(pricing_server._pricing_service._request_cache) == ['{"f": ["b"]}']
+
+    removed = await pricing_server.flush_caches("shared", prefix="prices:")
+    assert removed == {"shared": 1}
+    assert await pricing_server._shared_cache.get("spot:eviction:x") is not None
+
+    removed = await pricing_server.flush_caches()
+    assert removed == {"tool": 0, "prices": 1, "retirement": 1, "spot": 0, "shared": 1}
+    assert pricing_server._retirement_service.cache_stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_tool_cache_by_tool_name_prefix(servers, cache_tool, call_tool):
+    server, pricing_server = servers
+
+    async def discount(arguments):
+        return [TextContent(type="text", text="10% discount")]
+
+    pricing_server.tool_handlers.handle_customer_discount = discount
+    await call_tool(server, "get_customer_discount")
+    assert pricing_server.tool_cache.stats()["entries"] == 1
+
+    await cache_tool(server, {"action": "flush", "cache": "tool", "prefix": "get_customer"})
+
+    assert pricing_server.tool_cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_prewarm_queries_fill_the_tool_cache(servers, cache_tool, call_tool):
+    server, pricing_server = servers
+    calls = []
+
+    async def discount(arguments):
+        calls.append(arguments)
+        return [TextContent(type="text", text="10% discount")]
+
+    pricing_server.tool_handlers.handle_customer_discount = discount
+    queries = [{"tool": "get_customer_discount"}, {"tool": "simulate_eviction", "arguments": {}}]
+
+    text = await cache_tool(server, {"action": "prewarm", "queries": queries})
+    await call_tool(server, "get_customer_discount")
+
+    assert "**Prewarmed** 1 queries (0 failed, 1 not cacheable)" in text
+    assert len(calls) == 1  # the user call was served from the prewarmed entry
+
+
+@pytest.mark.asyncio
+async def test_prewarm_without_queries_runs_startup_prewarm(servers, cache_tool):
+    server, pricing_server = servers
+    pricing_server._client.prewarm = AsyncMock(return_value=2)
+    pricing_server._retirement_service.get_retirement_data = AsyncMock(return_value={})
+
+    text = await cache_tool(server, {"action": "prewarm"})
+
+    pricing_server._client.prewarm.assert_awaited_once()
+    assert "connections and retirement data, and 0 frequent queries" in text
+
+
+@pytest.mark.asyncio
+async def test_invalid_requests(servers, cache_tool):
+    server, pricing_server = servers
+
+    invalid = await cache_tool(server, {"action": "flush", "cache": "nope"})
+    direct = (await _cache_tool(pricing_server, {"action": "flush", "cache": "nope"}))[0].text
+    assert invalid.startswith("Input validation error")
+    assert direct.startswith("Error: Unknown cache 'nope'")
+    unknown = await cache_tool(server, {"action": "prewarm", "queries": [{"tool": "not_a_tool"}]})
+    assert unknown == "Error: Unknown tool(s): not_a_tool"
+    not_objects = (await _cache_tool(pricing_server, {"action": "prewarm", "queries": ["azure_price_search"]}))[0].text
+    assert not_objects == "Error: queries must be a list of {tool, arguments} objects"
+    too_many = [{"tool": "get_customer_discount"}] * (CACHE_PREWARM_MAX_QUERIES + 1)
+    over_limit = await cache_tool(server, {"action": "prewarm", "queries": too_many})
+    assert over_limit.endswith(f"exceed the prewarm limit of {CACHE_PREWARM_MAX_QUERIES}")
+
+
+@pytest.mark.asyncio
+async def test_read_only_and_disabled_modes(servers, monkeypatch, cache_tool):
+    server, pricing_server = servers
+    _fill_caches(pricing_server)
+    monkeypatch.setattr("azure_pricing_mcp.server.CACHE_ADMIN", "read")
+
+    assert (await cache_tool(server)).startswith("# 🗄️ Server Caches")
+    denied = await cache_tool(server, {"action": "flush"})
+    assert denied == "Error: flush is disabled (AZURE_PRICING_CACHE_ADMIN=read)"
+    assert pricing_server._pricing_service.cache_stats()["entries"] == 2
+
+    monkeypatch.setattr("azure_pricing_mcp.server.CACHE_ADMIN", "off")
+    tools = (await server.request_handlers[ListToolsRequest](ListToolsRequest())).root.tools
+    assert "server_cache" not in {tool.name for tool in tools}
@@ -0,0 +1,156 @@
+"""Tests for cooperative cancellation of in-flight tool calls."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams
+
+from azure_pricing_mcp.cancellation import gather_cancelling
+from azure_pricing_mcp.server import create_server
+from azure_pricing_mcp.services import BulkEstimateService
+from azure_pricing_mcp.services.orphaned_resources import OrphanedResourceScanner
+
+
+class _Hang:
+    """Blocks forever and records how many waits started and were cancelled."""
+
+    def __init__(self) -> None:
+        self.started = 0
+        self.cancelled = 0
+
+    async def wait(self, *args, **kwargs):
+        self.started += 1
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+
+async def _settle() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_siblings():
+    hang = _Hang()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("API unavailable")
+
+    with pytest.raises(RuntimeError):
+        await gather_cancelling(hang.wait(), hang.wait(), fail())
+
+    assert hang.cancelled == 2
+
+
+@pytest.mark.asyncio
+async def test_caller_cancellation_reaches_sub_tasks():
+    hang = _Hang()
+    task = asyncio.create_task(gather_cancelling(hang.wait(), hang.wait(), return_exceptions=True))
+    await _settle()
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert hang.cancelled == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_sub_task_is_not_returned_as_result():
+    async def cancelled():
+        raise asyncio.CancelledError
+
+    async def ok():
+        return 1
+
+    with pytest.raises(asyncio.CancelledError):
+        await gather_cancelling(ok(), cancelled(), return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_bulk_estimate_cancellation_stops_all_line_items():
+    hang = _Hang()
+    pricing = MagicMock()
+    pricing.estimate_costs = AsyncMock(side_effect=hang.wait)
+    resources = [{"service_name": "Virtual Machines", "sku_name": f"D{n}s v5", "region": "eastus"} for n in (2, 4, 8)]
+
+    task = asyncio.create_task(BulkEstimateService(pricing).bulk_estimate(resources, currency_codes=["USD", "EUR"]))
+    await _settle()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # Every per-currency request was cancelled, and none was retried
+    assert hang.started == 6
+    assert hang.cancelled == 6
+    assert pricing.estimate_costs.await_count == 6
+
+
+@pytest.mark.asyncio
+async def test_bulk_currency_failure_cancels_other_currencies():
+    hang = _Hang()
+
+    async def estimate(currency_code, **kwargs):
+        if currency_code == "EUR":
+            raise RuntimeError("throttled")
+        return await hang.wait()
+
+    pricing = MagicMock()
+    pricing.estimate_costs = AsyncMock(side_effect=estimate)
+    resources = [{"service_name": "Virtual Machines", "sku_name": "D4s v5", "region": "eastus"}]
+
+    task = asyncio.create_task(BulkEstimateService(pricing).bulk_estimate(resources, currency_codes=["USD", "EUR"]))
+    await _settle()
+    # The failed attempt's USD request is cancelled before the retry starts
+    assert hang.cancelled == 1
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_orphaned_scan_cancellation_stops_graph_queries():
+    credential_manager = MagicMock()
+    credential_manager.get_initialization_error.return_value = None
+    credential_manager.is_authenticated.return_value = True
+    scanner = OrphanedResourceScanner(credential_manager=credential_manager)
+    scanner._get_subscriptions = AsyncMock(return_value=[{"id": "sub-1", "name": "Dev"}])
+    hang = _Hang()
+    scanner._execute_resource_graph_query = AsyncMock(side_effect=hang.wait)
+
+    task = asyncio.create_task(scanner.scan())
+    await _settle()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert hang.started == 11
+    assert hang.cancelled == 11
+
+
+@pytest.mark.asyncio
+async def test_cancelled_tool_call_is_not_cached():
+    server, pricing_server = create_server()
+    pricing_server._session_active = True
+    hang = _Hang()
+    pricing_server.tool_handlers.handle_cost_estimate = AsyncMock(side_effect=hang.wait)
+    call = server.request_handlers[CallToolRequest]
+    request = CallToolRequest(
+        params=CallToolRequestParams(
+            name="azure_cost_estimate", arguments={"service_name": "vm", "sku_name": "D4s v5", "region": "eastus"}
+        )
+    )
+
+    task = asyncio.create_task(call(request))
+    await _settle()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert hang.cancelled == 1
+    assert pricing_server.tool_cache.stats()["entries"] == 0
@@ -0,0 +1,157 @@
+"""Tests for the SKU × region cost matrix."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from azure_pricing_mcp.formatters import format_cost_matrix_response
+from azure_pricing_mcp.services import PricingService
+from azure_pricing_mcp.services.pricing import monthly_units
+
+
+def _vm(sku, region, price, product="Virtual Machines DSv3 Series"):
+    return {
+        "serviceName": "Virtual Machines",
+        "skuName": sku,
+        "armSkuName": "Standard_" + sku.replace(" ", "_"),
+        "armRegionName": region,
+        "productName": product,
+        "unitOfMeasure": "1 Hour",
+        "retailPrice": price,
+    }
+
+
+ITEMS = [
+    _vm("D4s v3", "eastus", 0.192),
+    _vm("D4s v3", "eastus", 0.376, product="Virtual Machines DSv3 Series Windows"),
+    _vm("D4s v3", "westeurope", 0.23),
+    _vm("D4s v3 Spot", "eastus", 0.02),
+    _vm("D4as v5", "eastus", 0.172),
+    _vm("D4as v5", "westeurope", 0.25),
+    _vm("E4s v5", "eastus", 0.252),
+]
+
+
+@pytest.fixture
+def pricing_service():
+    client = MagicMock()
+    client.fetch_all_prices = AsyncMock(return_value={"Items": ITEMS})
+    return PricingService(client, MagicMock())
+
+
+@pytest.mark.asyncio
+async def test_cost_matrix_dense_values(pricing_service):
+    result = await pricing_service.cost_matrix(
+        service_name="Virtual Machines",
+        sku_names=["D4s v3", "Standard_D4as_v5", "E4s v5"],
+        regions=["eastus", "westeurope"],
+    )
+
+    assert result["unit_prices"] == [[0.192, 0.23], [0.172, 0.25], [0.252, None]]
+    assert result["monthly_costs"][0] == [140.16, 167.9]
+    assert result["ranked_by"] == "monthly_cost"
+    assert result["missing_cells"] == [{"sku": "E4s v5", "region": "westeurope"}]
+
+
+@pytest.mark.asyncio
+async def test_cost_matrix_minimums(pricing_service):
+    result = await pricing_service.cost_matrix(
+        service_name="Virtual Machines",
+        sku_names=["D4s v3", "D4as v5", "E4s v5"],
+        regions=["eastus", "westeurope"],
+    )
+
+    assert [m["region"] for m in result["row_minimums"]] == ["eastus", "eastus", "eastus"]
+    assert [m["sku"] for m in result["column_minimums"]] == ["D4as v5", "D4s v3"]
+    assert result["cheapest"]["sku"] == "D4as v5"
+    assert result["cheapest"]["region"] == "eastus"
+
+
+@pytest.mark.asyncio
+async def test_cost_matrix_batches_queries(pricing_service, monkeypatch):
+    monkeypatch.setattr("azure_pricing_mcp.services.pricing.COST_MATRIX_SKUS_PER_QUERY", 2)
+
+    result = await pricing_service.cost_matrix(
+        service_name="vm",
+        sku_names=["D4s v3", "D4as v5", "E4s v5"],
+        regions=["eastus", "westeurope", "westus2"],
+    )
+
+    assert result["queries"] == 2
+    assert pricing_service._client.fetch_all_prices.await_count == 2
+    conditions = pricing_service._client.fetch_all_prices.call_args_list[0].args[0]
+    assert "serviceName eq 'Virtual Machines'" in conditions
+    assert "(armRegionName eq 'eastus' or armRegionName eq 'westeurope' or armRegionName eq 'westus2')" in conditions
+
+
+@pytest.mark.asyncio
+async def test_cost_matrix_applies_discount(pricing_service):
+    result = await pricing_service.cost_matrix(
+        service_name="Virtual Machines",
+        sku_names=["D4s v3"],
+        regions=["eastus"],
+        discount_percentage=50,
+    )
+
+    assert result["unit_prices"] == [[0.096]]
+    assert result["discount_applied"]["percentage"] == 50
+
+
+@pytest.mark.asyncio
+async def test_cost_matrix_requires_inputs(pricing_service):
+    result = await pricing_service.cost_matrix(service_name="Virtual Machines", sku_names=[], regions=["eastus"])
+
+    assert "error" in result
+
+
+@pytest.mark.asyncio
+async def test_cost_matrix_formatter(pricing_service):
+    result = await pricing_service.cost_matrix(
+        service_name="Virtual Machines",
+        sku_names=["D4s v3", "E4s v5"],
+        regions=["eastus", "westeurope"],
+    )
+
+    text = format_cost_matrix_response(result)
+
+    assert "| D4s v3 | $140.16 | $167.90 | eastus |" in text
+    assert "N/A" in text
+
+
+@pytest.mark.parametrize(
+    "unit,expected",
+    [("1 Hour", 730), ("100 Hours", 7.3), ("1/Month", 1), ("1/Day", 730 / 24), ("1 GB/Month", None), ("10K", None)],
+)
+def test_monthly_units(unit, expected):
+    assert monthly_units(unit, 730) == (pytest.approx(expected) if expected is not None else None)
+
+
+@pytest.mark.asyncio
+async def test_price_grid_skips_spot_meters_matched_by_arm_sku():
+    spot = {**_vm("D4s v3 Spot", "eastus", 0.02), "armSkuName": "Standard_D4s_v3"}
+    client = MagicMock()
+    client.fetch_all_prices = AsyncMock(return_value={"Items": [spot, _vm("D4s v3", "eastus", 0.192)]})
+    service = PricingService(client, MagicMock())
+
+    grid = await service.fetch_price_grid("Virtual Machines", ["Standard_D4s_v3"], ["eastus"])
+
+    assert grid["cells"][0][0]["retailPrice"] == 0.192
+
+
+@pytest.mark.asyncio
+async def test_cost_matrix_by_arm_sku_name_ignores_spot_and_low_priority_meters():
+    spot = {**_vm("D4s v3 Spot", "eastus", 0.02), "armSkuName": "Standard_D4s_v3"}
+    low_priority = {**_vm("D4s v3 Low Priority", "westeurope", 0.04), "armSkuName": "Standard_D4s_v3"}
+    client = MagicMock()
+    client.fetch_all_prices = AsyncMock(return_value={"Items": [spot, low_priority, _vm("D4s v3", "eastus", 0.192)]})
+    service = PricingService(client, MagicMock())
+
+    result = await service.cost_matrix(
+        service_name="Virtual Machines",
+        sku_names=["Standard_D4s_v3", "D4s v3 Spot"],
+        regions=["eastus", "westeurope"],
+    )
+
+    assert result["unit_prices"] == [[0.192, None], [0.02, None]]
+    assert result["cheapest"]["sku"] == "D4s v3 Spot"
+    assert result["row_minimums"][0]["unit_price"] == 0.192
@@ -0,0 +1,130 @@
+"""Tests for the what-if cost sweep mode of azure_cost_estimate."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from azure_pricing_mcp.handlers import ToolHandlers
+from azure_pricing_mcp.services import PricingService, SKUService
+
+VM_ITEM = {
+    "serviceName": "Virtual Machines",
+    "skuName": "D4s v3",
+    "armRegionName": "eastus",
+    "productName": "Virtual Machines DSv3 Series",
+    "unitOfMeasure": "1 Hour",
+    "retailPrice": 0.2,
+    "savingsPlan": [
+        {"term": "1 Year", "retailPrice": 0.15},
+        {"term": "3 Years", "retailPrice": 0.1},
+    ],
+}
+
+
+@pytest.fixture
+def pricing_service():
+    client = MagicMock()
+    client.fetch_prices = AsyncMock(return_value={"Items": [VM_ITEM]})
+    retirement = MagicMock()
+    retirement.check_skus_retirement_status = AsyncMock(return_value=[])
+    return PricingService(client, retirement)
+
+
+@pytest.mark.asyncio
+async def test_sweep_fetches_price_once(pricing_service):
+    result = await pricing_service.estimate_cost_sweep(
+        service_name="Virtual Machines",
+        sku_name="D4s v3",
+        region="eastus",
+        hours_per_month=[100, 730],
+        quantities=[1, 3],
+        discount_percentages=[0, 10],
+    )
+
+    assert pricing_service._client.fetch_prices.await_count == 1
+    # 3 pricing options × 2 discounts × 2 hours × 2 quantities
+    assert result["grid_points"] == 24
+    assert result["dimensions"]["pricing"] == ["On-Demand", "Savings Plan 1 Year", "Savings Plan 3 Years"]
+
+
+@pytest.mark.asyncio
+async def test_sweep_grid_values(pricing_service):
+    result = await pricing_service.estimate_cost_sweep(
+        service_name="Virtual Machines",
+        sku_name="D4s v3",
+        hours_per_month=[730],
+        quantities=[2],
+        discount_percentages=[10],
+        savings_plan_terms=["3 Years", "5 Years"],
+    )
+
+    on_demand, three_year = result["grid"]
+    assert on_demand["pricing"] == "On-Demand"
+    assert on_demand["hourly_rate"] == 0.18
+    assert on_demand["monthly_cost"] == 262.8
+    assert on_demand["yearly_cost"] == 3153.6
+    assert three_year["monthly_cost"] == 131.4
+    assert result["cheapest"] == three_year
+    assert result["unavailable_savings_plan_terms"] == ["5 Years"]
+
+
+@pytest.mark.asyncio
+async def test_sweep_uses_resolved_discount_by_default(pricing_service):
+    result = await pricing_service.estimate_cost_sweep(
+        service_name="Virtual Machines",
+        sku_name="D4s v3",
+        hours_per_month=[730],
+        savings_plan_terms=[],
+        discount_percentage=50,
+    )
+
+    assert result["dimensions"]["discount_percentages"] == [50.0]
+    assert result["grid"][0]["hourly_rate"] == 0.1
+
+
+@pytest.mark.asyncio
+async def test_sweep_grid_limit(pricing_service, monkeypatch):
+    monkeypatch.setattr("azure_pricing_mcp.services.pricing.SWEEP_MAX_GRID_POINTS", 10)
+
+    result = await pricing_service.estimate_cost_sweep(
+        service_name="Virtual Machines",
+        sku_name="D4s v3",
+        hours_per_month=list(range(1, 11)),
+        quantities=[1, 2],
+    )
+
+    assert "error" in result
+
+
+@pytest.mark.asyncio
+async def test_sweep_no_pricing(pricing_service):
+    pricing_service._client.fetch_prices.return_value = {"Items": []}
+
+    result = await pricing_service.estimate_cost_sweep(
+        service_name="Virtual Machines", sku_name="Nope", hours_per_month=[730]
+    )
+
+    assert "error" in result
+
+
+@pytest.mark.asyncio
+async def test_handler_routes_sweep_arguments():
+    mock_pricing = AsyncMock(spec=PricingService)
+    mock_pricing.estimate_cost_sweep.return_value = {"error": "No pricing found"}
+    handlers = ToolHandlers(mock_pricing, AsyncMock(spec=SKUService))
+
+    await handlers.handle_cost_estimate(
+        {
+            "service_name": "Virtual Machines",
+            "sku_name": "D4s v3",
+            "region": "eastus",
+            "hours_per_month": 400,
+            "sweep_quantities": [1, 2],
+        }
+    )
+
+    mock_pricing.estimate_costs.assert_not_called()
+    kwargs = mock_pricing.estimate_cost_sweep.call_args.kwargs
+    assert kwargs["hours_per_month"] == [400]
+    assert kwargs["quantities"] == [1, 2]
+    assert kwargs["discount_percentage"] == 0.0
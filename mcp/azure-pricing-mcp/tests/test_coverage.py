@@ -0,0 +1,267 @@
+"""Tests for the reservation and savings plan coverage optimizer."""
+
+import json
+import random
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from azure_pricing_mcp.formatters import format_coverage_optimizer_response
+from azure_pricing_mcp.services import CoverageOptimizerService, PriceSheet, PricingService
+
+
+def _od(sku, price, sp_1y=None, sp_3y=None, region="eastus"):
+    plans = []
+    if sp_1y is not None:
+        plans.append({"term": "1 Year", "retailPrice": sp_1y})
+    if sp_3y is not None:
+        plans.append({"term": "3 Years", "retailPrice": sp_3y})
+    return {
+        "serviceName": "Virtual Machines",
+        "skuName": sku,
+        "armRegionName": region,
+        "type": "Consumption",
+        "retailPrice": price,
+        "unitOfMeasure": "1 Hour",
+        "savingsPlan": plans,
+    }
+
+
+def _ri(sku, term, total, region="eastus"):
+    return {
+        "serviceName": "Virtual Machines",
+        "skuName": sku,
+        "armRegionName": region,
+        "type": "Reservation",
+        "reservationTerm": term,
+        "retailPrice": total,
+        "unitOfMeasure": "1 Hour",
+    }
+
+
+CATALOG = [
+    # D4s v5: RI 1y at 60% of on-demand, 3y at 40%; SP 1y 80%, 3y 65%
+    _od("D4s v5", 1.0, sp_1y=0.8, sp_3y=0.65),
+    _ri("D4s v5", "1 Year", 0.6 * 8760),
+    _ri("D4s v5", "3 Years", 0.4 * 26280),
+    # E4s v5: no reservations, savings plan only
+    _od("E4s v5", 2.0, sp_1y=1.6, sp_3y=1.3),
+    _od("D4s v5 Spot", 0.1),
+]
+
+
+def _fetcher(catalog):
+    async def fetch(filter_conditions, currency_code="USD", limit=None):
+        conditions = " ".join(filter_conditions)
+        items = []
+        for item in catalog:
+            if f"priceType eq '{item['type']}'" not in conditions:
+                continue
+            if item["type"] == "Reservation" and f"reservationTerm eq '{item['reservationTerm']}'" not in conditions:
+                continue
+            if f"skuName eq '{item['skuName']}'" not in conditions:
+                continue
+            items.append(item)
+        return {"Items": items}
+
+    return fetch
+
+
+_fetch = _fetcher(CATALOG)
+
+
+@pytest.fixture
+def service():
+    client = MagicMock()
+    client.fetch_all_prices = AsyncMock(side_effect=_fetch)
+    return CoverageOptimizerService(PricingService(client, MagicMock()))
+
+
+@pytest.mark.asyncio
+async def test_steady_usage_prefers_three_year_reservations(service):
+    result = await service.optimize([{"sku_name": "D4s v5", "usage_histogram": {"4": 8760}}])
+
+    optimal = result["optimal"]
+    assert optimal["strategy"] == "Reservations 3 Years"
+    assert optimal["reserved_instances"] == 4
+    assert optimal["reservation_coverage"] == 100.0
+    assert result["annual_on_demand_cost"] == 35040.0
+    assert optimal["annual_cost"] == 14016.0
+    assert optimal["savings_percentage"] == 60.0
+
+
+@pytest.mark.asyncio
+async def test_reserves_only_instances_above_break_even(service):
+    # 2 instances always on, a third for 30% of the year: 3y break-even is 40% utilization
+    histogram = [{"instances": 3, "hours": 2628}, {"instances": 2, "hours": 6132}]
+
+    result = await service.optimize([{"sku_name": "D4s v5", "usage_histogram": histogram}])
+
+    three_year = next(s for s in result["strategies"] if s["strategy"] == "Reservations 3 Years")
+    assert three_year["reserved_instances"] == 2
+    # A commitment used 30% of the time at 65% of on-demand does not pay off either
+    assert result["optimal"]["strategy"] == "Reservations 3 Years"
+    assert result["optimal"]["reservation_coverage"] == round(2 * 8760 / (2 * 8760 + 2628) * 100, 2)
+    assert result["optimal"]["annual_on_demand_cost"] == 2628.0
+
+
+@pytest.mark.asyncio
+async def test_savings_plan_commitment_for_fleet(service):
+    # E4s v5 has no reservations; usage alternates between 1 and 3 instances
+    hourly = [1.0, 3.0] * 12
+
+    result = await service.optimize([{"sku_name": "E4s v5", "hourly_usage": hourly}])
+
+    optimal = result["optimal"]
+    assert result["profile_hours"] == 24
+    assert optimal["strategy"] == "Savings Plan 3 Years"
+    assert optimal["reserved_instances"] == 0
+    # Commit to the always-on instance: covering the second and third only pays in half the hours
+    assert optimal["savings_plan_commitment_hourly"] == 1.3
+    assert optimal["savings_plan_utilization"] == 100.0
+    assert {s["strategy"] for s in result["strategies"]} == {"On-Demand", "Savings Plan 1 Year", "Savings Plan 3 Years"}
+
+
+@pytest.mark.asyncio
+async def test_reservations_sized_against_savings_plan_rate(service):
+    # Every hour the 11 entries run 0..10 instances between them, so fleet-wide usage is flat
+    fleet = [
+        {"sku_name": "D4s v5", "hourly_usage": [float((hour + shift) % 11) for hour in range(11)]}
+        for shift in range(11)
+    ]
+
+    result = await service.optimize(fleet)
+
+    # The 5th and 6th RI beat on-demand (6/11 and 5/11 use at 0.4) but not the 3y plan at 0.65
+    optimal = result["optimal"]
+    assert optimal["strategy"] == "Reservations 3 Years + Savings Plan 3 Years"
+    assert [sku["reserved_instances"] for sku in result["per_sku"]] == [4] * 11
+    assert optimal["savings_plan_commitment_hourly"] == 13.65
+    assert optimal["savings_plan_utilization"] == 100.0
+    assert optimal["annual_cost"] == 273750.0
+    assert all(s["annual_cost"] > optimal["annual_cost"] for s in result["strategies"][1:])
+
+
+@pytest.mark.asyncio
+async def test_strategies_ranked_by_cost(service):
+    fleet = [
+        {"sku_name": "D4s v5", "hourly_usage": [2.0] * 20 + [0.0] * 4},
+        {"sku_name": "E4s v5", "hourly_usage": [1.0] * 24},
+    ]
+
+    result = await service.optimize(fleet)
+
+    costs = [s["annual_cost"] for s in result["strategies"]]
+    assert costs == sorted(costs)
+    assert result["strategies"][-1]["strategy"] == "On-Demand"
+    assert result["strategies"][-1]["annual_cost"] == result["annual_on_demand_cost"]
+    assert [sku["on_demand_hourly"] for sku in result["per_sku"]] == [1.0, 2.0]
+
+
+@pytest.mark.asyncio
+async def test_invalid_entries_reported(service):
+    fleet = [
+        {"sku_name": "D4s v5", "usage_histogram": {"1": 100}},
+        {"sku_name": "E4s v5"},
+        {"usage_histogram": {"1": 100}},
+        {"sku_name": "Z9 v9", "usage_histogram": {"1": 100}},
+    ]
+
+    result = await service.optimize(fleet)
+
+    errors = {err["index"]: err["error"] for err in result["errors"]}
+    assert "Missing usage profile" in errors[1]
+    assert "sku_name" in errors[2]
+    assert "No pricing" in errors[3]
+    assert result["priced_skus"] == 1
+
+
+@pytest.mark.asyncio
+async def test_mismatched_hourly_lengths(service):
+    fleet = [
+        {"sku_name": "D4s v5", "hourly_usage": [1.0] * 24},
+        {"sku_name": "E4s v5", "hourly_usage": [1.0] * 48},
+    ]
+
+    result = await service.optimize(fleet)
+
+    assert "differ in length" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_histogram_must_cover_the_hourly_profile(service):
+    fleet = [
+        {"sku_name": "D4s v5", "hourly_usage": [1.0] * 24},
+        {"sku_name": "E4s v5", "usage_histogram": {"1": 12}},
+    ]
+
+    result = await service.optimize(fleet)
+
+    assert result["error"] == "Usage profiles differ in length: [12, 24] hours"
+
+
+@pytest.mark.asyncio
+async def test_oversized_histogram_rejected(service):
+    result = await service.optimize([{"sku_name": "D4s v5", "usage_histogram": {"1": 1e12}}])
+
+    assert "covers more than 26280 hours" in result["errors"][0]["error"]
+
+
+@pytest.mark.asyncio
+async def test_discount_applied_to_all_rates(service):
+    result = await service.optimize([{"sku_name": "D4s v5", "usage_histogram": {"4": 8760}}], discount_percentage=50)
+
+    assert result["annual_on_demand_cost"] == 17520.0
+    assert result["optimal"]["annual_cost"] == 7008.0
+    assert result["discount_applied"]["percentage"] == 50
+
+
+@pytest.mark.asyncio
+async def test_price_sheet_unit_price_does_not_reprice_reservation_terms(tmp_path):
+    path = tmp_path / "sheet.json"
+    path.write_text(json.dumps([{"skuName": "D4s v5", "unitPrice": 0.5}]), encoding="utf-8")
+    client = MagicMock()
+    client.fetch_all_prices = AsyncMock(side_effect=_fetch)
+    service = CoverageOptimizerService(PricingService(client, MagicMock(), PriceSheet(str(path))))
+
+    result = await service.optimize([{"sku_name": "D4s v5", "usage_histogram": {"4": 8760}}], use_price_sheet=True)
+
+    strategies = {s["strategy"]: s for s in result["strategies"]}
+    assert result["annual_on_demand_cost"] == 17520.0
+    # Reservations keep their list term price (0.4/h over 3 years), not the hourly 0.5 spread over the term
+    assert strategies["Reservations 3 Years"]["annual_cost"] == 14016.0
+    # The savings plan is scaled with the negotiated pay-as-you-go price
+    assert result["optimal"]["strategy"] == "Savings Plan 3 Years"
+    assert result["optimal"]["annual_cost"] == 11388.0
+
+
+@pytest.mark.asyncio
+async def test_hundred_skus_with_distinct_rates_over_a_year_in_under_a_second():
+    catalog = []
+    for i in range(100):
+        catalog.append(_od(f"D{i} v5", 1.0 + i * 0.01, sp_3y=0.65 + i * 0.0065))
+        catalog.append(_ri(f"D{i} v5", "1 Year", (0.5 + i * 0.005) * 8760))
+    client = MagicMock()
+    client.fetch_all_prices = AsyncMock(side_effect=_fetcher(catalog))
+    service = CoverageOptimizerService(PricingService(client, MagicMock()))
+    rng = random.Random(0)
+    fleet = [{"sku_name": f"D{i} v5", "hourly_usage": rng.choices(range(11), k=8760)} for i in range(100)]
+
+    started = time.perf_counter()
+    result = await service.optimize(fleet)
+    elapsed = time.perf_counter() - started
+
+    assert result["priced_skus"] == 100
+    assert result["optimal"]["strategy"] == "Reservations 1 Year + Savings Plan 3 Years"
+    assert elapsed < 1.0
+
+
+@pytest.mark.asyncio
+async def test_formatter(service):
+    result = await service.optimize([{"sku_name": "D4s v5", "usage_histogram": {"4": 8760}}])
+
+    text = format_coverage_optimizer_response(result)
+
+    assert "## 🏆 Optimal: Reservations 3 Years" in text
+    assert "| D4s v5 | eastus | 4 | 4 | $1.0000 | 4 |" in text
@@ -0,0 +1,145 @@
+"""Tests for the tool dispatch table and per-tool admission control."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams, TextContent
+
+from azure_pricing_mcp.dispatch import PRIORITY_HEAVY, TOOL_ROUTES, ToolDispatcher, ToolPolicy
+from azure_pricing_mcp.handlers import ToolHandlers
+from azure_pricing_mcp.server import create_server
+from azure_pricing_mcp.tools import get_tool_definitions
+
+
+class _Handlers:
+    """Stand-in for ToolHandlers that tracks how many calls run at once."""
+
+    def __init__(self, delay: float = 0.01) -> None:
+        self.delay = delay
+        self.running = 0
+        self.max_running = 0
+        self.release = asyncio.Event()
+
+    async def _work(self, label: str) -> list[TextContent]:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            else:
+                await self.release.wait()
+        finally:
+            self.running -= 1
+        return [TextContent(type="text", text=label)]
+
+    async def handle_bulk_estimate(self, arguments):
+        return await self._work("bulk")
+
+    async def handle_cost_matrix(self, arguments):
+        return await self._work("matrix")
+
+    async def handle_price_search(self, arguments):
+        return [TextContent(type="text", text="search")]
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_dispatch_table_covers_every_tool():
+    # batch and the admin tools are answered by the server itself
+    server_tools = {"batch", "server_metrics", "server_profiling", "server_cache"}
+    names = {tool.name for tool in get_tool_definitions()} - server_tools
+
+    assert names == set(TOOL_ROUTES)
+    for method, _ in TOOL_ROUTES.values():
+        assert callable(getattr(ToolHandlers, method))
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap():
+    handlers = _Handlers()
+    dispatcher = ToolDispatcher({"azure_bulk_estimate": ToolPolicy(PRIORITY_HEAVY, 2, 10, None)}, class_limits={})
+
+    results = await asyncio.gather(*(dispatcher.dispatch(handlers, "azure_bulk_estimate", {}) for _ in range(6)))
+
+    assert [r[0].text for r in results] == ["bulk"] * 6
+    assert handlers.max_running == 2
+    assert dispatcher.stats()["azure_bulk_estimate"]["completed"] == 6
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_fast():
+    handlers = _Handlers(delay=0)
+    dispatcher = ToolDispatcher({"azure_bulk_estimate": ToolPolicy(PRIORITY_HEAVY, 1, 1, None)}, class_limits={})
+
+    running = asyncio.create_task(dispatcher.dispatch(handlers, "azure_bulk_estimate", {}))
+    queued = asyncio.create_task(dispatcher.dispatch(handlers, "azure_bulk_estimate", {}))
+    await _settle()
+    rejected = await dispatcher.dispatch(handlers, "azure_bulk_estimate", {})
+
+    assert rejected[0].text.startswith("Error: azure_bulk_estimate is at capacity (1 running, 1 queued)")
+    handlers.release.set()
+    assert [(await running)[0].text, (await queued)[0].text] == ["bulk", "bulk"]
+    stats = dispatcher.stats()["azure_bulk_estimate"]
+    assert (stats["rejected"], stats["completed"], stats["queued"]) == (1, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_call():
+    handlers = _Handlers(delay=0)
+    dispatcher = ToolDispatcher({"azure_cost_matrix": ToolPolicy(PRIORITY_HEAVY, 1, 1, 0.01)}, class_limits={})
+
+    result = await dispatcher.dispatch(handlers, "azure_cost_matrix", {})
+
+    assert "did not finish within 0.01s" in result[0].text
+    assert handlers.running == 0
+    stats = dispatcher.stats()["azure_cost_matrix"]
+    assert (stats["timed_out"], stats["running"]) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_heavy_class_cap_leaves_room_for_lookups():
+    handlers = _Handlers(delay=0)
+    dispatcher = ToolDispatcher(class_limits={PRIORITY_HEAVY: 1})
+
+    heavy = [
+        asyncio.create_task(dispatcher.dispatch(handlers, name, {}))
+        for name in ("azure_bulk_estimate", "azure_cost_matrix")
+    ]
+    await _settle()
+
+    # Only one heavy call runs; an interactive lookup is not held up by either
+    assert handlers.running == 1
+    assert (await dispatcher.dispatch(handlers, "azure_price_search", {}))[0].text == "search"
+    assert dispatcher.stats()["azure_cost_matrix"]["queued"] == 1
+
+    handlers.release.set()
+    assert sorted([(await task)[0].text for task in heavy]) == ["bulk", "matrix"]
+    assert handlers.max_running == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_tool():
+    result = await ToolDispatcher().dispatch(SimpleNamespace(), "nope", {})
+
+    assert result[0].text == "Unknown tool: nope"
+
+
+@pytest.mark.asyncio
+async def test_server_routes_through_dispatcher():
+    server, pricing_server = create_server()
+    pricing_server._session_active = True
+    call = server.request_handlers[CallToolRequest]
+
+    async def discount(arguments):
+        return [TextContent(type="text", text="10% discount")]
+
+    pricing_server.tool_handlers.handle_customer_discount = discount
+    request = CallToolRequest(params=CallToolRequestParams(name="get_customer_discount", arguments={}))
+
+    assert (await call(request)).root.content[0].text == "10% discount"
+    stats = pricing_server.dispatcher.stats()["get_customer_discount"]
+    assert (stats["priority"], stats["completed"]) == ("interactive", 1)
@@ -0,0 +1,138 @@
+"""Tests for the metrics layer, the /metrics route and the server_metrics tool."""
+
+import pytest
+from mcp.types import TextContent
+from starlette.testclient import TestClient
+
+from azure_pricing_mcp.cache import MemoryCacheBackend, get_or_fetch
+from azure_pricing_mcp.metrics import (
+    CACHE_REQUESTS,
+    TOOL_CALLS,
+    UPSTREAM_REQUESTS,
+    UPSTREAM_RETRIES,
+    Counter,
+    Histogram,
+    MetricsRegistry,
+    snapshot,
+)
+from azure_pricing_mcp.server import create_server, create_streamable_http_app
+
+pytestmark = pytest.mark.usefixtures("reset_metrics")
+
+
+def test_histogram_buckets_and_quantile():
+    histogram = Histogram("latency_seconds", "Latency", ("tool",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.05, 0.5, 5.0):
+        histogram.observe("a", value=value)
+
+    assert histogram.count("a") == 4
+    assert histogram.total("a") == pytest.approx(5.6)
+    assert histogram.quantile(0.5, "a") == 0.1
+    assert histogram.quantile(0.75, "a") == 1.0
+    assert histogram.quantile(0.95, "b") is None
+    assert histogram.render() == [
+        'latency_seconds_bucket{tool="a",le="0.1"} 2',
+        'latency_seconds_bucket{tool="a",le="1"} 3',
+        'latency_seconds_bucket{tool="a",le="+Inf"} 4',
+        'latency_seconds_sum{tool="a"} 5.6',
+        'latency_seconds_count{tool="a"} 4',
+    ]
+
+
+def test_registry_renders_exposition_format():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ("host",))
+    counter.inc('a"b')
+    counter.inc('a"b', amount=2)
+
+    text = registry.render([("queued", "gauge", "Queued calls", ("tool",), [(("x",), 3)])])
+
+    assert text.splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{host="a\\"b"} 3',
+        "# HELP queued Queued calls",
+        "# TYPE queued gauge",
+        'queued{tool="x"} 3',
+    ]
+    assert registry.counter("requests_total", "Requests", ("host",)) is counter
+    assert isinstance(counter, Counter)
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_are_counted_by_outcome(call_tool):
+    server, pricing_server = create_server()
+    pricing_server._session_active = True
+    pricing_server.cache_warmer.log.path = None
+
+    async def discount(arguments):
+        return [TextContent(type="text", text="10% discount")]
+
+    async def broken(arguments):
+        return [TextContent(type="text", text="Error: upstream unavailable")]
+
+    pricing_server.tool_handlers.handle_customer_discount = discount
+    pricing_server.tool_handlers.handle_ri_pricing = broken
+    await call_tool(server, "get_customer_discount")
+    await call_tool(server, "get_customer_discount")
+    await call_tool(server, "azure_ri_pricing", {"service_name": "Virtual Machines"})
+    await call_tool(server, "not_a_tool")
+
+    assert TOOL_CALLS.value("get_customer_discount", "ok") == 1
+    assert TOOL_CALLS.value("get_customer_discount", "cached") == 1
+    assert TOOL_CALLS.value("azure_ri_pricing", "error") == 1
+    assert TOOL_CALLS.value("unknown", "error") == 1
+    assert CACHE_REQUESTS.value("tool", "hit") == 1
+    summary = snapshot()["tools"]["get_customer_discount"]
+    assert summary["calls"] == 2 and summary["p95_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_lookups_are_counted():
+    cache = MemoryCacheBackend()
+
+    async def fetch():
+        return {"Items": []}
+
+    await get_or_fetch(cache, "prices:q", 60, fetch)
+    await get_or_fetch(cache, "prices:q", 60, fetch)
+
+    assert snapshot()["caches"]["shared_memory"] == {"hit": 1, "miss": 1, "error": 0, "hit_rate": 0.5}
+
+
+def test_upstream_summary():
+    UPSTREAM_REQUESTS.inc("prices.azure.com", "200", amount=3)
+    UPSTREAM_REQUESTS.inc("prices.azure.com", "429")
+    UPSTREAM_RETRIES.inc("prices.azure.com", "429")
+
+    host = snapshot()["upstream"]["prices.azure.com"]
+
+    assert (host["requests"], host["rate_limited"], host["retries"]) == (4, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_server_metrics_tool(call_tool):
+    server, pricing_server = create_server()
+    pricing_server._session_active = True
+    TOOL_CALLS.inc("azure_price_search", "ok")
+
+    summary = (await call_tool(server, "server_metrics")).root.content[0].text
+    prometheus = (await call_tool(server, "server_metrics", {"format": "prometheus"})).root.content[0].text
+
+    assert summary.startswith("# 📈 Server Metrics")
+    assert "| azure_price_search | 1 |" in summary
+    assert 'azure_pricing_tool_calls_total{tool="azure_price_search",outcome="ok"} 1' in prometheus
+    assert "# TYPE azure_pricing_dispatch_queued gauge" in prometheus
+
+
+def test_metrics_route(monkeypatch):
+    monkeypatch.setattr("azure_pricing_mcp.server.PREWARM_ENABLED", False)
+    monkeypatch.setattr("azure_pricing_mcp.server.WARMUP_ENABLED", False)
+    UPSTREAM_REQUESTS.inc("prices.azure.com", "200")
+
+    with TestClient(create_streamable_http_app(stateless=True)) as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'azure_pricing_upstream_requests_total{host="prices.azure.com",status="200"} 1' in response.text
@@ -0,0 +1,173 @@
+"""Tests for multi-currency fan-out on search, estimate and bulk estimate."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from azure_pricing_mcp.formatters import (
+    format_bulk_estimate_response,
+    format_multi_currency_estimate_response,
+    format_multi_currency_search_response,
+)
+from azure_pricing_mcp.services import BulkEstimateService, PricingService
+
+RATES = {"USD": 1.0, "EUR": 0.9, "GBP": 0.8}
+
+ITEMS = [
+    {
+        "meterId": "m-d4",
+        "serviceName": "Virtual Machines",
+        "productName": "Virtual Machines Dsv5 Series",
+        "skuName": "D4s v5",
+        "meterName": "D4s v5",
+        "armRegionName": "eastus",
+        "location": "US East",
+        "type": "Consumption",
+        "retailPrice": 0.2,
+        "unitOfMeasure": "1 Hour",
+        "savingsPlan": [{"term": "1 Year", "retailPrice": 0.15}],
+    },
+    {
+        "meterId": "m-d8",
+        "serviceName": "Virtual Machines",
+        "productName": "Virtual Machines Dsv5 Series",
+        "skuName": "D8s v5",
+        "meterName": "D8s v5",
+        "armRegionName": "eastus",
+        "location": "US East",
+        "type": "Consumption",
+        "retailPrice": 0.4,
+        "unitOfMeasure": "1 Hour",
+    },
+]
+
+
+@pytest.fixture
+def pricing_service():
+    in_flight = {"now": 0, "max": 0}
+
+    async def _fetch(filter_conditions, currency_code="USD", limit=None):
+        if currency_code not in RATES:
+            raise ValueError(f"Unsupported currency {currency_code}")
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        conditions = " ".join(filter_conditions)
+        rate = RATES[currency_code]
+        items = [
+            {
+                **item,
+                "retailPrice": round(item["retailPrice"] * rate, 6),
+                "savingsPlan": [
+                    {**plan, "retailPrice": round(plan["retailPrice"] * rate, 6)}
+                    for plan in item.get("savingsPlan", [])
+                ],
+            }
+            for item in ITEMS
+            if "skuName" not in conditions or f"'{item['skuName']}'" in conditions
+        ]
+        return {"Items": items}
+
+    client = MagicMock()
+    client.fetch_prices = AsyncMock(side_effect=_fetch)
+    retirement = MagicMock()
+    retirement.check_skus_retirement_status = AsyncMock(return_value=[])
+    service = PricingService(client, retirement)
+    service.in_flight = in_flight
+    return service
+
+
+@pytest.mark.asyncio
+async def test_search_aligns_prices_by_meter(pricing_service):
+    result = await pricing_service.search_prices_multi_currency(
+        ["usd", "EUR", "GBP", "EUR"], service_name="Virtual Machines", region="eastus"
+    )
+
+    assert result["currencies"] == ["USD", "EUR", "GBP"]
+    assert result["count"] == 2
+    assert result["rows"][0]["prices"] == {"USD": 0.2, "EUR": 0.18, "GBP": 0.16}
+    assert result["rows"][1]["sku_name"] == "D8s v5"
+    # One request per currency, all in flight together
+    assert pricing_service._client.fetch_prices.await_count == 3
+    assert pricing_service.in_flight["max"] == 3
+
+
+@pytest.mark.asyncio
+async def test_search_repeat_is_served_from_cache(pricing_service):
+    kwargs = {"service_name": "Virtual Machines", "region": "eastus"}
+    await pricing_service.search_prices_multi_currency(["USD", "EUR"], **kwargs)
+    await pricing_service.search_prices(currency_code="EUR", **kwargs)
+
+    assert pricing_service._client.fetch_prices.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_search_reports_failed_currency(pricing_service):
+    result = await pricing_service.search_prices_multi_currency(["USD", "XXX"], service_name="Virtual Machines")
+
+    assert result["rows"][0]["prices"] == {"USD": 0.2, "XXX": None}
+    assert "Unsupported currency" in result["errors"]["XXX"]
+
+    failed = await pricing_service.search_prices_multi_currency(["XXX"], service_name="Virtual Machines")
+    assert "every currency" in failed["error"]
+
+
+@pytest.mark.asyncio
+async def test_estimate_rows_per_currency(pricing_service):
+    result = await pricing_service.estimate_costs_multi_currency(
+        ["USD", "EUR"], service_name="Virtual Machines", sku_name="D4s v5", region="eastus"
+    )
+
+    rows = {row["label"]: row["values"] for row in result["rows"]}
+    assert rows["On-Demand monthly"] == {"USD": 146.0, "EUR": 131.4}
+    assert rows["Savings Plan 1 Year monthly"] == {"USD": 109.5, "EUR": 98.55}
+    assert set(result["estimates"]) == {"USD", "EUR"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_totals_per_currency(pricing_service):
+    resources = [
+        {"service_name": "vm", "sku_name": "D4s v5", "region": "eastus", "quantity": 2},
+        {"service_name": "vm", "sku_name": "D8s v5", "region": "eastus"},
+    ]
+
+    result = await BulkEstimateService(pricing_service).bulk_estimate(resources, currency_codes=["EUR", "GBP"])
+
+    assert result["currency"] == "EUR"
+    assert result["currencies"] == ["EUR", "GBP"]
+    assert result["totals"]["monthly"] == result["totals_by_currency"]["EUR"]["monthly"] == 525.6
+    assert result["totals_by_currency"]["GBP"]["monthly"] == 467.2
+    assert result["line_items"][0]["costs_by_currency"]["GBP"]["monthly_cost"] == pytest.approx(233.6)
+
+
+@pytest.mark.asyncio
+async def test_bulk_single_currency_unchanged(pricing_service):
+    resources = [{"service_name": "vm", "sku_name": "D4s v5", "region": "eastus"}]
+
+    result = await BulkEstimateService(pricing_service).bulk_estimate(resources, currency_code="EUR")
+
+    assert "currencies" not in result
+    assert "costs_by_currency" not in result["line_items"][0]
+    assert result["totals"]["monthly"] == 131.4
+
+
+@pytest.mark.asyncio
+async def test_formatters(pricing_service):
+    search = await pricing_service.search_prices_multi_currency(["USD", "EUR"], service_name="Virtual Machines")
+    text = format_multi_currency_search_response(search)
+    assert "| SKU | Product | Region | Type | Unit | USD | EUR |" in text
+    assert "| 0.200000 | 0.180000 |" in text
+
+    estimate = await pricing_service.estimate_costs_multi_currency(
+        ["USD", "EUR"], service_name="Virtual Machines", sku_name="D4s v5", region="eastus"
+    )
+    assert "| On-Demand monthly | 146.00 | 131.40 |" in format_multi_currency_estimate_response(estimate)
+
+    bulk = await BulkEstimateService(pricing_service).bulk_estimate(
+        [{"service_name": "vm", "sku_name": "D4s v5", "region": "eastus"}], currency_codes=["USD", "GBP"]
+    )
+    text = format_bulk_estimate_response(bulk)
+    assert "| Virtual Machines | D4s v5 | eastus | 1 | 146.00 | 116.80 |" in text
+    assert "| GBP | 116.80 | 1,401.60 |" in text
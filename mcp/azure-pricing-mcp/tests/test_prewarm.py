@@ -0,0 +1,90 @@
+"""Tests for connection pre-warming at server start."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from azure_pricing_mcp.client import AzurePricingClient
+from azure_pricing_mcp.config import HTTP_POOL_PER_HOST
+from azure_pricing_mcp.server import AzurePricingServer
+
+
+@pytest.mark.asyncio
+async def test_client_prewarm_opens_pooled_connections():
+    async with AzurePricingClient() as client:
+        client.make_request = AsyncMock(side_effect=[{"Items": []}, ConnectionError("dns"), {"Items": []}])
+
+        assert await client.prewarm(3) == 2
+
+    assert client.make_request.await_count == 3
+    params = client.make_request.await_args.kwargs["params"]
+    assert params["$top"] == "1"
+    assert client.make_request.await_args.kwargs["max_retries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_client_prewarm_capped_by_pool():
+    async with AzurePricingClient() as client:
+        client.make_request = AsyncMock(return_value={"Items": []})
+
+        assert await client.prewarm(HTTP_POOL_PER_HOST + 10) == HTTP_POOL_PER_HOST
+        assert await client.prewarm(0) == 0
+
+
+@pytest.mark.asyncio
+async def test_client_prewarm_without_session():
+    assert await AzurePricingClient().prewarm(2) == 0
+
+
+@pytest.mark.asyncio
+async def test_initialize_does_not_wait_for_prewarm():
+    pricing_server = AzurePricingServer()
+    release = asyncio.Event()
+
+    async def slow_prewarm(connections):
+        await release.wait()
+        return connections
+
+    pricing_server._client.prewarm = slow_prewarm
+    pricing_server._retirement_service.get_retirement_data = AsyncMock(return_value={"Av1": object()})
+
+    await pricing_server.initialize(prewarm=True)
+    task = pricing_server._prewarm_task
+
+    assert pricing_server.is_active
+    assert task is not None and not task.done()
+    assert pricing_server.start_prewarm() is task
+
+    release.set()
+    await task
+    pricing_server._retirement_service.get_retirement_data.assert_awaited_once()
+    await pricing_server.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_running_prewarm():
+    pricing_server = AzurePricingServer()
+    hang = asyncio.Event()
+    pricing_server._client.prewarm = AsyncMock(side_effect=hang.wait)
+    pricing_server._retirement_service.get_retirement_data = AsyncMock(side_effect=hang.wait)
+
+    async with pricing_server:
+        task = pricing_server.start_prewarm()
+        await asyncio.sleep(0)
+
+    assert task.cancelled()
+    assert pricing_server._prewarm_task is None
+
+
+@pytest.mark.asyncio
+async def test_prewarm_failures_are_logged_not_raised():
+    pricing_server = AzurePricingServer()
+    pricing_server._client.prewarm = AsyncMock(side_effect=RuntimeError("offline"))
+    pricing_server._retirement_service.get_retirement_data = AsyncMock(side_effect=RuntimeError("offline"))
+
+    await pricing_server.prewarm()
+
+
+def test_start_prewarm_needs_active_session():
+    assert AzurePricingServer().start_prewarm() is None
@@ -0,0 +1,162 @@
+"""Tests for cross-region price anomaly detection."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from azure_pricing_mcp.formatters import format_price_anomaly_report
+from azure_pricing_mcp.services import PriceAnomalyService, PricingService
+from azure_pricing_mcp.services.anomaly import find_price_anomalies
+
+
+def _item(region, price, sku="D4s v5", service="Virtual Machines", **extra):
+    return {
+        "serviceName": service,
+        "productName": f"{service} Dsv5 Series",
+        "skuName": sku,
+        "meterName": sku,
+        "armRegionName": region,
+        "location": region.upper(),
+        "type": "Consumption",
+        "retailPrice": price,
+        "unitOfMeasure": "1 Hour",
+        **extra,
+    }
+
+
+REGIONS = ["eastus", "westus", "northeurope", "westeurope", "japaneast"]
+
+ITEMS = [
+    # On-demand: japaneast is 1.5x the median, eastus is cheap
+    _item("eastus", 0.6),
+    _item("westus", 1.0),
+    _item("northeurope", 1.0),
+    _item("westeurope", 1.05),
+    _item("japaneast", 1.5),
+    # Spot: ~80% discount except westus (50%) and westeurope (not cheaper)
+    _item("eastus", 0.12, sku="D4s v5 Spot"),
+    _item("westus", 0.5, sku="D4s v5 Spot"),
+    _item("northeurope", 0.2, sku="D4s v5 Spot"),
+    _item("westeurope", 1.2, sku="D4s v5 Spot"),
+    _item("japaneast", 0.3, sku="D4s v5 Spot"),
+    # Only priced in two regions: skipped
+    _item("eastus", 5.0, sku="M8ms"),
+    _item("westus", 9.0, sku="M8ms"),
+    # Ignored: tiered, reservation and non-primary meters
+    _item("westus", 50.0, tierMinimumUnits=100),
+    {**_item("westus", 5000.0), "type": "Reservation"},
+    _item("westus", 70.0, isPrimaryMeterRegion=False),
+]
+
+
+def test_regional_outliers():
+    result = find_price_anomalies(ITEMS)
+
+    assert result["skus_analyzed"] == 1
+    assert result["skus_skipped"] == 1
+    assert result["items_scanned"] == 12
+    by_region = {o["region"]: o for o in result["outliers"]}
+    assert set(by_region) == {"japaneast", "eastus"}
+    assert by_region["japaneast"]["direction"] == "expensive"
+    assert by_region["japaneast"]["ratio"] == 1.5
+    assert by_region["eastus"]["direction"] == "cheap"
+    assert by_region["eastus"]["sku_name"] == "D4s v5"
+    assert by_region["eastus"]["regions_compared"] == 5
+    # Largest deviation first (|log 0.6| > |log 1.5|)
+    assert result["outliers"][0]["region"] == "eastus"
+
+
+def test_spot_anomalies():
+    result = find_price_anomalies(ITEMS)
+
+    reasons = {a["region"]: a["reason"] for a in result["spot_anomalies"]}
+    assert reasons == {"westeurope": "spot_not_cheaper", "westus": "unusually_low_discount"}
+    assert result["spot_anomalies"][0]["reason"] == "spot_not_cheaper"
+    assert result["spot_anomalies"][1]["median_spot_discount_percentage"] == 80.0
+
+
+def test_spot_discount_needs_min_regions():
+    items = [item for item in ITEMS if item["armRegionName"] in ("eastus", "westus", "northeurope")]
+
+    result = find_price_anomalies(items, min_regions=3, spot_deviation=20)
+    assert {a["reason"] for a in result["spot_anomalies"]} == {"unusually_low_discount"}
+
+    result = find_price_anomalies(items, min_regions=4)
+    assert result["skus_analyzed"] == 0
+    assert result["spot_anomalies"] == []
+
+
+def test_region_and_service_filters():
+    storage = [_item(region, 0.02, sku="Hot LRS", service="Storage") for region in REGIONS]
+
+    result = find_price_anomalies(ITEMS + storage, service_names=["storage"])
+    assert result["services"] == ["Storage"]
+    assert result["outliers"] == []
+
+    result = find_price_anomalies(ITEMS, regions=["westus", "northeurope", "westeurope", "japaneast"])
+    assert "eastus" not in {r["region"] for r in result["region_summary"]}
+
+
+def test_region_summary_sorted_by_median_ratio():
+    result = find_price_anomalies(ITEMS)
+
+    summary = result["region_summary"]
+    assert [r["region"] for r in summary][0] == "eastus"
+    assert [r["region"] for r in summary][-1] == "japaneast"
+    assert summary[-1]["expensive_outliers"] == 1
+    assert summary[0]["cheap_outliers"] == 1
+
+
+def test_low_priority_not_treated_as_spot():
+    # Cheaper than Spot everywhere, so it would win the Spot bucket and become the reported discount
+    low_priority = [_item(region, 0.01, sku="D4s v5 Low Priority") for region in REGIONS]
+
+    result = find_price_anomalies(ITEMS + low_priority)
+
+    assert result["items_scanned"] == 12
+    reasons = {a["region"]: a["reason"] for a in result["spot_anomalies"]}
+    assert reasons == {"westeurope": "spot_not_cheaper", "westus": "unusually_low_discount"}
+    assert result["spot_anomalies"][1]["spot_price"] == 0.5
+
+
+def test_invalid_ratio():
+    assert "greater than 1" in find_price_anomalies(ITEMS, outlier_ratio=1.0)["error"]
+
+
+@pytest.mark.asyncio
+async def test_scan_fetches_each_service_across_regions():
+    client = MagicMock()
+    client.fetch_all_prices = AsyncMock(return_value={"Items": ITEMS})
+    service = PriceAnomalyService(PricingService(client, MagicMock()))
+
+    result = await service.scan(["Virtual Machines"], max_pages=5)
+
+    assert result["outlier_count"] == 2
+    conditions = client.fetch_all_prices.call_args.args[0]
+    assert "serviceName eq 'Virtual Machines'" in conditions
+    assert not any("armRegionName" in condition for condition in conditions)
+    assert client.fetch_all_prices.call_args.kwargs["max_pages"] == 5
+
+
+@pytest.mark.asyncio
+async def test_scan_reports_services_truncated_at_the_page_limit():
+    client = MagicMock()
+    client.fetch_all_prices = AsyncMock(return_value={"Items": ITEMS, "NextPageLink": "https://next"})
+    service = PriceAnomalyService(PricingService(client, MagicMock()))
+
+    result = await service.scan(["Virtual Machines"], max_pages=1)
+    text = format_price_anomaly_report(result)
+
+    assert result["truncated_services"] == ["Virtual Machines"]
+    assert "⚠️ **Incomplete scan**: Virtual Machines stopped at the page limit" in text
+    assert find_price_anomalies(ITEMS)["truncated_services"] == []
+
+
+def test_formatter():
+    text = format_price_anomaly_report(find_price_anomalies(ITEMS))
+
+    assert "# 🔎 Cross-Region Price Anomaly Report" in text
+    assert "## Regional Price Outliers (2)" in text
+    assert "| japaneast | $1.500000 | $1.000000 | 🔺 1.50× |" in text
+    assert "| spot not cheaper |" in text
+    assert "| eastus | 1 | 0.600 | 0 | 1 |" in text
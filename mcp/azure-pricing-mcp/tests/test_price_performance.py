@@ -0,0 +1,173 @@
+"""Tests for VM price-performance ranking and the VM spec table."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from azure_pricing_mcp.config import VM_PRICE_TABLE_MAX_PAGES
+from azure_pricing_mcp.formatters import format_vm_price_performance_response
+from azure_pricing_mcp.services import PricePerformanceService, PricingService
+from azure_pricing_mcp.services.vm_specs import DATA_VERSION, VMSpecTable
+
+
+def _vm(arm_sku, price, windows=False, spot=False):
+    sku = arm_sku.replace("Standard_", "").replace("_", " ")
+    return {
+        "serviceName": "Virtual Machines",
+        "armSkuName": arm_sku,
+        "skuName": f"{sku} Spot" if spot else sku,
+        "productName": "Virtual Machines Series Windows" if windows else "Virtual Machines Series",
+        "armRegionName": "eastus",
+        "unitOfMeasure": "1 Hour",
+        "retailPrice": price,
+    }
+
+
+VM_PRICES = [
+    _vm("Standard_D4s_v5", 0.192),
+    _vm("Standard_D8s_v5", 0.384),
+    _vm("Standard_D8s_v5", 0.752, windows=True),
+    _vm("Standard_D8s_v5", 0.05, spot=True),
+    _vm("Standard_D8as_v5", 0.344),
+    _vm("Standard_E4s_v5", 0.252),
+    _vm("Standard_F8s_v2", 0.338),
+    _vm("Standard_NC4as_T4_v3", 0.526),
+    _vm("Standard_Unknown_v9", 0.01),
+]
+
+
+@pytest.fixture
+def service():
+    client = MagicMock()
+    client.fetch_all_prices = AsyncMock(return_value={"Items": VM_PRICES})
+    return PricePerformanceService(PricingService(client, MagicMock()), VMSpecTable(path=""))
+
+
+class TestVMSpecTable:
+    def test_embedded_specs(self):
+        table = VMSpecTable(path="")
+
+        spec = table.get("standard_d8s_v5")
+        assert (spec.vcpus, spec.memory_gb, spec.family, spec.generation) == (8, 32.0, "Dsv5", "v5")
+        assert table.get("Standard_E64s_v5").memory_gb == 512
+        assert table.get("Standard_NC4as_T4_v3").gpu_model == "T4"
+        assert table.data_version == DATA_VERSION
+
+    def test_override_file_rows(self, tmp_path):
+        path = tmp_path / "specs.json"
+        path.write_text(json.dumps([{"name": "Standard_D8s_v5", "vcpus": 8, "memory_gb": 40}]), encoding="utf-8")
+
+        table = VMSpecTable(path=str(path))
+
+        assert table.get("Standard_D8s_v5").memory_gb == 40
+        assert table.data_version.endswith("+file")
+
+    def test_override_file_list_skus_format(self, tmp_path):
+        path = tmp_path / "skus.json"
+        path.write_text(
+            json.dumps(
+                [
+                    {
+                        "name": "Standard_D2pls_v6",
+                        "family": "standardDplsv6Family",
+                        "tier": "Standard",
+                        "capabilities": [{"name": "vCPUs", "value": "2"}, {"name": "MemoryGB", "value": "4"}],
+                    }
+                ]
+            ),
+            encoding="utf-8",
+        )
+
+        table = VMSpecTable(path=str(path))
+
+        spec = table.get("Standard_D2pls_v6")
+        assert (spec.vcpus, spec.memory_gb, spec.generation) == (2, 4.0, "v6")
+
+    def test_bad_override_file_falls_back(self, tmp_path):
+        path = tmp_path / "broken.json"
+        path.write_text("{", encoding="utf-8")
+
+        table = VMSpecTable(path=str(path))
+
+        assert table.get("Standard_D8s_v5") is not None
+
+
+class TestPricePerformanceService:
+    @pytest.mark.asyncio
+    async def test_constraint_filter_and_ranking(self, service):
+        result = await service.rank(min_vcpus=8, min_memory_gb=32)
+
+        skus = [row["sku"] for row in result["rankings"]]
+        assert skus == ["Standard_D8as_v5", "Standard_D8s_v5"]
+        assert result["rankings"][0]["price_per_vcpu_hour"] == 0.043
+        assert result["rankings"][0]["price_per_gb_hour"] == 0.01075
+
+    @pytest.mark.asyncio
+    async def test_excludes_spot_windows_and_unknown(self, service):
+        result = await service.rank(sort_by="hourly_price")
+
+        assert result["table_size"] == 6
+        d8 = next(row for row in result["rankings"] if row["sku"] == "Standard_D8s_v5")
+        assert d8["hourly_price"] == 0.384
+
+    @pytest.mark.asyncio
+    async def test_windows_prices(self, service):
+        result = await service.rank(os_type="windows")
+
+        assert [row["sku"] for row in result["rankings"]] == ["Standard_D8s_v5"]
+        assert result["rankings"][0]["hourly_price"] == 0.752
+
+    @pytest.mark.asyncio
+    async def test_sort_by_gb_and_best_picks(self, service):
+        result = await service.rank(sort_by="price_per_gb_hour", categories=["general", "memory"])
+
+        assert result["rankings"][0]["sku"] == "Standard_E4s_v5"
+        assert result["best_per_gb"]["sku"] == "Standard_E4s_v5"
+        assert result["best_per_vcpu"]["sku"] == "Standard_D8as_v5"
+
+    @pytest.mark.asyncio
+    async def test_gpu_ranking(self, service):
+        result = await service.rank(min_gpus=1, sort_by="price_per_gpu_hour")
+
+        assert [row["sku"] for row in result["rankings"]] == ["Standard_NC4as_T4_v3"]
+        assert result["rankings"][0]["price_per_gpu_hour"] == 0.526
+
+    @pytest.mark.asyncio
+    async def test_table_cached_between_calls(self, service):
+        first = await service.rank(min_vcpus=8)
+        second = await service.rank(max_vcpus=4, discount_percentage=50)
+
+        assert first["from_cache"] is False
+        assert second["from_cache"] is True
+        assert service._pricing._client.fetch_all_prices.await_count == 1
+        assert second["rankings"][0]["hourly_price"] == 0.096
+
+    @pytest.mark.asyncio
+    async def test_truncated_price_scan_is_reported(self):
+        client = MagicMock()
+        client.fetch_all_prices = AsyncMock(return_value={"Items": VM_PRICES, "NextPageLink": "https://next"})
+        service = PricePerformanceService(PricingService(client, MagicMock()), VMSpecTable(path=""))
+
+        first = await service.rank()
+        second = await service.rank(min_vcpus=8)
+
+        assert client.fetch_all_prices.await_args.kwargs["max_pages"] == VM_PRICE_TABLE_MAX_PAGES
+        assert first["truncated"] is True
+        assert second["from_cache"] is True and second["truncated"] is True
+        assert "stopped at the page limit" in format_vm_price_performance_response(first)
+
+    @pytest.mark.asyncio
+    async def test_invalid_sort_key(self, service):
+        result = await service.rank(sort_by="speed")
+
+        assert "error" in result
+
+    @pytest.mark.asyncio
+    async def test_formatter(self, service):
+        result = await service.rank(min_vcpus=8, min_memory_gb=32)
+
+        text = format_vm_price_performance_response(result)
+
+        assert "| 1 | Standard_D8as_v5 | 8 | 32 |" in text
+        assert "Best $/vCPU-hour: Standard_D8as_v5" in text
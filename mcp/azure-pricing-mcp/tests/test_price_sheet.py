@@ -0,0 +1,223 @@
+"""Tests for customer price sheet support."""
+
+import json
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from azure_pricing_mcp.config import DEFAULT_CUSTOMER_DISCOUNT
+from azure_pricing_mcp.services import PriceSheet, PricingService
+
+
+def _write_json(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+def _item(**overrides):
+    item = {
+        "meterId": "meter-1",
+        "serviceName": "Storage",
+        "skuName": "Standard LRS",
+        "armSkuName": "Standard_LRS",
+        "armRegionName": "eastus",
+        "retailPrice": 1.0,
+        "unitOfMeasure": "1 GB/Month",
+    }
+    item.update(overrides)
+    return item
+
+
+@pytest.fixture
+def sheet_path(tmp_path):
+    return _write_json(
+        tmp_path / "sheet.json",
+        {
+            "customer_id": "contoso",
+            "currency": "USD",
+            "default_discount_percentage": 5,
+            "rates": [
+                {"meterId": "meter-1", "unitPrice": 0.5},
+                {"serviceName": "Storage", "skuName": "Premium LRS", "discountPercentage": 30},
+                {"skuName": "D4s v3", "discountPercentage": 20},
+                {"serviceName": "Storage", "discountPercentage": 10},
+            ],
+        },
+    )
+
+
+def _pricing_service(sheet, items):
+    client = MagicMock()
+    client.fetch_prices = AsyncMock(return_value={"Items": items})
+    return PricingService(client, MagicMock(), sheet)
+
+
+class TestPriceSheetLoading:
+    def test_load_json(self, sheet_path):
+        sheet = PriceSheet(sheet_path)
+
+        assert sheet.customer_id == "contoso"
+        assert sheet.currency == "USD"
+        assert sheet.default_discount_percentage == 5
+        assert sheet.rate_count == 4
+
+    def test_load_csv(self, tmp_path):
+        path = tmp_path / "sheet.csv"
+        path.write_text(
+            "meter_id,service_name,sku_name,unit_price,discount_percentage,currency_code\n"
+            "meter-1,,,0.5,,EUR\n"
+            ",Virtual Machines,D4s v3,,25,\n"
+            ",,,,7,\n",
+            encoding="utf-8",
+        )
+
+        sheet = PriceSheet(str(path))
+
+        assert sheet.currency == "EUR"
+        assert sheet.default_discount_percentage == 7
+        assert sheet.summary()["meter_rates"] == 1
+        assert sheet.summary()["service_sku_rates"] == 1
+
+    def test_from_config_unset(self, monkeypatch):
+        monkeypatch.setattr("azure_pricing_mcp.services.price_sheet.PRICE_SHEET_PATH", "")
+        assert PriceSheet.from_config() is None
+
+    def test_from_config_missing_file(self, monkeypatch, tmp_path):
+        monkeypatch.setattr("azure_pricing_mcp.services.price_sheet.PRICE_SHEET_PATH", str(tmp_path / "missing.json"))
+        assert PriceSheet.from_config() is None
+
+
+class TestPriceSheetLookup:
+    def test_precedence(self, sheet_path):
+        sheet = PriceSheet(sheet_path)
+
+        assert sheet.lookup(_item())[1] == "meter"
+        assert sheet.lookup(_item(meterId="other", skuName="Premium LRS"))[1] == "service_sku"
+        assert sheet.lookup(_item(meterId="other", serviceName="Virtual Machines", skuName="D4s v3"))[1] == "sku"
+        assert sheet.lookup(_item(meterId="other"))[1] == "service"
+        assert sheet.lookup(_item(meterId="other", serviceName="Functions")) is None
+
+    def test_unit_price_skipped_on_currency_mismatch(self, sheet_path):
+        sheet = PriceSheet(sheet_path)
+
+        rate, level = sheet.lookup(_item(), currency_code="EUR")
+
+        assert level == "service"
+        assert rate.discount_percentage == 10
+
+    def test_apply_to_items(self, sheet_path):
+        sheet = PriceSheet(sheet_path)
+        items = [
+            _item(savingsPlan=[{"term": "1 Year", "retailPrice": 0.8}]),
+            _item(meterId="other", serviceName="Functions", retailPrice=2.0),
+        ]
+
+        priced, matched = sheet.apply_to_items(items)
+
+        assert matched == 1
+        assert priced[0]["retailPrice"] == 0.5
+        assert priced[0]["originalPrice"] == 1.0
+        assert priced[0]["savingsPlan"][0]["retailPrice"] == pytest.approx(0.4)
+        # Unmatched item falls back to the sheet default discount
+        assert priced[1]["retailPrice"] == pytest.approx(1.9)
+        assert priced[1]["priceSheetMatch"] == "default"
+        # Input items are not mutated
+        assert items[0]["retailPrice"] == 1.0
+
+    def test_unit_price_applies_to_consumption_items_only(self, tmp_path):
+        path = _write_json(tmp_path / "sheet.json", [{"skuName": "D4s v5", "unitPrice": 0.15}])
+        sheet = PriceSheet(path)
+        vm = {"meterId": "vm", "serviceName": "Virtual Machines", "skuName": "D4s v5"}
+        items = [
+            {**vm, "type": "Consumption", "retailPrice": 0.192},
+            {**vm, "type": "Reservation", "reservationTerm": "1 Year", "retailPrice": 1050.0},
+            {**vm, "type": "DevTestConsumption", "retailPrice": 0.1},
+        ]
+
+        priced, matched = sheet.apply_to_items(items, fallback_discount=10)
+
+        assert matched == 1
+        assert priced[0]["retailPrice"] == 0.15
+        # Term and DevTest prices fall through to the default discount instead of the hourly rate
+        assert priced[1]["retailPrice"] == pytest.approx(945.0)
+        assert priced[1]["priceSheetMatch"] == "default"
+        assert priced[2]["retailPrice"] == pytest.approx(0.09)
+
+    def test_hot_reload(self, tmp_path):
+        path = tmp_path / "sheet.json"
+        _write_json(path, [{"serviceName": "Storage", "discountPercentage": 10}])
+        sheet = PriceSheet(str(path), reload_interval=0)
+
+        _write_json(path, [{"serviceName": "Storage", "discountPercentage": 40}, {"skuName": "x", "unitPrice": 1}])
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000_000))
+
+        priced, _ = sheet.apply_to_items([_item(meterId="other")])
+
+        assert priced[0]["retailPrice"] == pytest.approx(0.6)
+        assert sheet.rate_count == 2
+
+    def test_failed_reload_keeps_previous_rates(self, tmp_path):
+        path = tmp_path / "sheet.json"
+        _write_json(path, [{"serviceName": "Storage", "discountPercentage": 10}])
+        sheet = PriceSheet(str(path), reload_interval=0)
+
+        path.write_text("{not json", encoding="utf-8")
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000_000))
+
+        priced, _ = sheet.apply_to_items([_item(meterId="other")])
+
+        assert priced[0]["retailPrice"] == pytest.approx(0.9)
+
+
+class TestPricingServiceIntegration:
+    @pytest.mark.asyncio
+    async def test_search_prices_uses_price_sheet(self, sheet_path):
+        service = _pricing_service(PriceSheet(sheet_path), [_item()])
+
+        result = await service.search_prices(service_name="Storage", use_price_sheet=True, discount_percentage=10)
+
+        assert result["items"][0]["retailPrice"] == 0.5
+        assert result["discount_applied"]["source"] == "price_sheet"
+        assert result["discount_applied"]["matched_items"] == 1
+
+    @pytest.mark.asyncio
+    async def test_search_prices_without_flag_uses_flat_discount(self, sheet_path):
+        service = _pricing_service(PriceSheet(sheet_path), [_item()])
+
+        result = await service.search_prices(service_name="Storage", discount_percentage=10)
+
+        assert result["items"][0]["retailPrice"] == pytest.approx(0.9)
+        assert "source" not in result["discount_applied"]
+
+    @pytest.mark.asyncio
+    async def test_estimate_costs_uses_price_sheet(self, sheet_path):
+        service = _pricing_service(PriceSheet(sheet_path), [_item()])
+
+        result = await service.estimate_costs(
+            service_name="Storage", sku_name="Standard LRS", hours_per_month=100, use_price_sheet=True
+        )
+
+        assert result["on_demand_pricing"]["hourly_rate"] == 0.5
+        assert result["on_demand_pricing"]["original_hourly_rate"] == 1.0
+        assert result["discount_applied"]["match"] == "meter"
+
+    @pytest.mark.asyncio
+    async def test_get_customer_discount_reports_sheet(self, sheet_path):
+        service = _pricing_service(PriceSheet(sheet_path), [])
+
+        result = await service.get_customer_discount()
+
+        assert result["customer_id"] == "contoso"
+        assert result["discount_type"] == "negotiated"
+        assert result["discount_percentage"] == 5
+        assert result["price_sheet"]["meter_rates"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_customer_discount_without_sheet(self):
+        service = _pricing_service(None, [])
+
+        result = await service.get_customer_discount()
+
+        assert result["discount_type"] == "standard"
+        assert result["discount_percentage"] == DEFAULT_CUSTOMER_DISCOUNT
@@ -0,0 +1,173 @@
+"""Tests for sampled tool call profiling and the server_profiling tool."""
+
+import asyncio
+import os
+import pstats
+from unittest.mock import AsyncMock
+
+import pytest
+from mcp.types import ListToolsRequest, TextContent
+
+from azure_pricing_mcp.profiling import ToolProfiler, arguments_hash
+from azure_pricing_mcp.server import _profiling_tool, create_server
+
+
+def _busy() -> int:
+    return sum(i * i for i in range(20_000))
+
+
+def test_selection_by_sample_rate_and_tool():
+    draws = iter([0.05, 0.5])
+    sampled = ToolProfiler(sample_rate=0.1, rng=lambda: next(draws))
+    named = ToolProfiler(tool="azure_bulk_estimate")
+
+    assert not ToolProfiler().enabled
+    assert [sampled.should_profile("azure_price_search") for _ in range(2)] == [True, False]
+    assert named.should_profile("azure_bulk_estimate")
+    assert not named.should_profile("azure_price_search")
+
+    named.configure(tool="")
+    assert not named.enabled
+
+
+def test_arguments_hash_is_order_independent():
+    assert arguments_hash({"a": 1, "b": [2]}) == arguments_hash({"b": [2], "a": 1})
+    assert arguments_hash({"a": 1}) != arguments_hash({"a": 2})
+    assert arguments_hash(None) == arguments_hash({})
+
+
+@pytest.mark.asyncio
+async def test_profile_saved_with_tool_name_and_arguments_hash(tmp_path):
+    profiler = ToolProfiler(tool="azure_bulk_estimate", directory=str(tmp_path))
+    arguments = {"resources": [{"sku_name": "D2s v5"}]}
+    expected_hash = arguments_hash(arguments)
+
+    async def call():
+        arguments.pop("resources")  # handlers consume arguments in place
+        return _busy()
+
+    assert await profiler.run("azure_bulk_estimate", arguments, call) == _busy()
+
+    (path,) = profiler.profiles()
+    assert os.path.basename(path).startswith(f"azure_bulk_estimate-{expected_hash}-")
+    functions = {name for _, _, name in pstats.Stats(path).stats}
+    assert "_busy" in functions
+    assert "_busy" in profiler.top_functions(path)
+    assert profiler.stats()["profiled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unselected_calls_are_not_profiled(tmp_path):
+    profiler = ToolProfiler(tool="azure_bulk_estimate", directory=str(tmp_path))
+
+    async def call():
+        return "ok"
+
+    assert await profiler.run("azure_price_search", {}, call) == "ok"
+    assert profiler.profiles() == []
+
+
+@pytest.mark.asyncio
+async def test_overlapping_calls_are_not_profiled_twice(tmp_path):
+    profiler = ToolProfiler(sample_rate=1.0, directory=str(tmp_path))
+
+    async def call():
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    await asyncio.gather(*(profiler.run("azure_price_search", {"n": n}, call) for n in range(3)))
+
+    assert len(profiler.profiles()) == 1
+    assert profiler.stats()["skipped_busy"] == 2
+
+
+@pytest.mark.asyncio
+async def test_keeps_newest_profiles(tmp_path):
+    profiler = ToolProfiler(sample_rate=1.0, directory=str(tmp_path), max_files=2)
+
+    async def call():
+        return None
+
+    for n in range(4):
+        await profiler.run("azure_price_search", {"n": n}, call)
+
+    kept = [os.path.basename(path).split("-")[1] for path in profiler.profiles()]
+    assert sorted(kept) == sorted(arguments_hash({"n": n}) for n in (2, 3))
+
+
+@pytest.mark.asyncio
+async def test_server_profiles_dispatched_calls_not_cache_hits(tmp_path, monkeypatch, call_tool):
+    monkeypatch.setattr("azure_pricing_mcp.server.PROFILING_ADMIN", "full")
+    server, pricing_server = create_server()
+    pricing_server._session_active = True
+    pricing_server.cache_warmer.log.path = None
+    pricing_server.profiler.directory = str(tmp_path)
+
+    async def discount(arguments):
+        return [TextContent(type="text", text=f"{_busy()} discount")]
+
+    pricing_server.tool_handlers.handle_customer_discount = discount
+    await call_tool(server, "server_profiling", {"tool": "get_customer_discount"})
+    await call_tool(server, "get_customer_discount")
+    await call_tool(server, "get_customer_discount")
+
+    assert len(pricing_server.profiler.profiles()) == 1
+    report = (await call_tool(server, "server_profiling", {"tool": "", "sample_rate": 0})).root.content[0].text
+    assert report.startswith("# 🔬 Tool Profiling")
+    assert "**Profiling**: Off" in report
+    assert "get_customer_discount-" in report and "_busy" in report
+    assert not pricing_server.profiler.enabled
+
+
+@pytest.mark.asyncio
+async def test_server_profiling_rejects_bad_arguments(monkeypatch, call_tool):
+    monkeypatch.setattr("azure_pricing_mcp.server.PROFILING_ADMIN", "full")
+    server, pricing_server = create_server()
+
+    unknown = (await call_tool(server, "server_profiling", {"tool": "not_a_tool"})).root.content[0].text
+    bad_rate = _profiling_tool(pricing_server, {"sample_rate": "all"})[0].text
+
+    assert unknown == "Error: Unknown tool: not_a_tool"
+    assert bad_rate == "Error: sample_rate must be a number between 0 and 1"
+    assert not pricing_server.profiler.enabled
+
+
+@pytest.mark.asyncio
+async def test_profiling_changes_need_full_admin(monkeypatch, call_tool):
+    server, pricing_server = create_server()
+
+    report = (await call_tool(server, "server_profiling")).root.content[0].text
+    denied = (await call_tool(server, "server_profiling", {"sample_rate": 1})).root.content[0].text
+    assert report.startswith("# 🔬 Tool Profiling")
+    assert denied == "Error: changing profiling is disabled (AZURE_PRICING_PROFILING_ADMIN=read)"
+    assert not pricing_server.profiler.enabled
+
+    monkeypatch.setattr("azure_pricing_mcp.server.PROFILING_ADMIN", "off")
+    tools = (await server.request_handlers[ListToolsRequest](ListToolsRequest())).root.tools
+    assert "server_profiling" not in {tool.name for tool in tools}
+
+
+@pytest.mark.asyncio
+async def test_unknown_tool_names_are_never_saved_outside_the_directory(tmp_path):
+    profiler = ToolProfiler(sample_rate=1.0, directory=str(tmp_path / "profiles"))
+
+    async def call():
+        return None
+
+    await profiler.run("../outside", {}, call)
+
+    assert profiler.profiles() == []
+    assert [path.name for path in tmp_path.iterdir()] == []
+
+
+@pytest.mark.asyncio
+async def test_server_does_not_profile_unknown_tools(call_tool):
+    server, pricing_server = create_server()
+    pricing_server._session_active = True
+    pricing_server.cache_warmer.log.path = None
+    pricing_server.profiler.run = AsyncMock()
+
+    result = await call_tool(server, "../not_a_tool")
+
+    assert result.root.content[0].text == "Unknown tool: ../not_a_tool"
+    pricing_server.profiler.run.assert_not_awaited()
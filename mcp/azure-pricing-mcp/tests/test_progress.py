@@ -0,0 +1,150 @@
+"""Tests for MCP progress notifications and partial results."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from mcp.server.lowlevel.server import request_ctx
+from mcp.shared.context import RequestContext
+from mcp.types import CallToolRequest, CallToolRequestParams, RequestParams, TextContent
+
+from azure_pricing_mcp.progress import PARTIAL_RESULT_LOGGER, ProgressReporter, current_progress
+from azure_pricing_mcp.server import create_server
+from azure_pricing_mcp.services import BulkEstimateService, PricingService
+from azure_pricing_mcp.services.orphaned_resources import OrphanedResourceScanner
+
+
+def _session():
+    session = MagicMock()
+    session.send_progress_notification = AsyncMock()
+    session.send_log_message = AsyncMock()
+    return session
+
+
+VM_ITEM = {
+    "serviceName": "Virtual Machines",
+    "productName": "Virtual Machines Dsv5 Series",
+    "skuName": "D4s v5",
+    "armRegionName": "eastus",
+    "type": "Consumption",
+    "retailPrice": 0.2,
+    "unitOfMeasure": "1 Hour",
+}
+
+
+@pytest.mark.asyncio
+async def test_reporter_sends_progress_and_partial_results():
+    session = _session()
+    reporter = ProgressReporter(session, "tok", 7)
+    reporter.add_total(2)
+
+    await reporter.advance("first", {"line_item": {"sku_name": "D4s v5"}})
+    await reporter.advance("second")
+
+    assert session.send_progress_notification.await_args_list[0].args == ("tok", 1)
+    assert session.send_progress_notification.await_args_list[1].kwargs["total"] == 2
+    log = session.send_log_message.await_args
+    assert session.send_log_message.await_count == 1
+    assert log.kwargs["logger"] == PARTIAL_RESULT_LOGGER
+    assert log.kwargs["related_request_id"] == 7
+    assert log.kwargs["data"] == {
+        "type": "partial_result",
+        "progress": 1,
+        "total": 2,
+        "line_item": {"sku_name": "D4s v5"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_inactive_reporter_and_send_failures():
+    session = _session()
+    silent = ProgressReporter(session)
+    await silent.advance("no token")
+    assert silent.completed == 1
+    session.send_progress_notification.assert_not_awaited()
+
+    session.send_progress_notification.side_effect = RuntimeError("closed")
+    await ProgressReporter(session, "tok").advance("still fine")
+
+    assert ProgressReporter.from_request_context(create_server()[0]).active is False
+
+
+@pytest.mark.asyncio
+async def test_bulk_estimate_reports_each_resource():
+    client = MagicMock()
+    client.fetch_prices = AsyncMock(return_value={"Items": [VM_ITEM]})
+    retirement = MagicMock()
+    retirement.check_skus_retirement_status = AsyncMock(return_value=[])
+    session = _session()
+    reporter = ProgressReporter(session, "tok")
+
+    resources = [
+        {"service_name": "vm", "sku_name": "D4s v5", "region": "eastus"},
+        {"service_name": "vm", "sku_name": "D4s v5", "region": "westus"},
+        {"service_name": "vm"},
+    ]
+    await BulkEstimateService(PricingService(client, retirement)).bulk_estimate(resources, progress=reporter)
+
+    assert reporter.total == 3
+    assert session.send_progress_notification.await_count == 3
+    chunks = [call.kwargs["data"] for call in session.send_log_message.await_args_list]
+    assert sum("line_item" in chunk for chunk in chunks) == 2
+    assert sum("error" in chunk for chunk in chunks) == 1
+
+
+@pytest.mark.asyncio
+async def test_cost_matrix_reports_each_batched_query():
+    client = MagicMock()
+    client.fetch_all_prices = AsyncMock(return_value={"Items": [VM_ITEM]})
+    reporter = ProgressReporter(_session(), "tok")
+    skus = [f"D{n}s v5" for n in (2, 4, 8, 16, 32, 48, 64)]
+
+    await PricingService(client, MagicMock()).cost_matrix("Virtual Machines", skus, ["eastus"], progress=reporter)
+
+    assert reporter.total == reporter.completed == client.fetch_all_prices.await_count
+
+
+@pytest.mark.asyncio
+async def test_orphaned_scan_reports_queries_and_resources():
+    manager = MagicMock()
+    manager.get_initialization_error.return_value = None
+    manager.is_authenticated.return_value = True
+    scanner = OrphanedResourceScanner(credential_manager=manager)
+    scanner._get_subscriptions = AsyncMock(return_value=[{"id": "sub-1", "name": "One"}])
+    disk = {"id": "/disks/d1", "name": "d1", "subscriptionId": "sub-1"}
+    scanner._execute_resource_graph_query = AsyncMock(side_effect=[{"data": [dict(disk)]}] + [{"data": []}] * 10)
+    scanner._get_resource_cost = AsyncMock(return_value=4.5)
+    session = _session()
+    reporter = ProgressReporter(session, "tok")
+
+    await scanner.scan(progress=reporter)
+
+    assert reporter.total == reporter.completed == 12
+    resource = session.send_log_message.await_args.kwargs["data"]["resource"]
+    assert resource["name"] == "d1"
+    assert resource["estimated_cost_usd"] == 4.5
+
+
+@pytest.mark.asyncio
+async def test_server_publishes_reporter_to_handlers():
+    server, pricing_server = create_server()
+    pricing_server._session_active = True
+    seen = {}
+
+    async def handle_bulk(arguments):
+        seen["progress"] = current_progress()
+        return [TextContent(type="text", text="done")]
+
+    pricing_server.tool_handlers.handle_bulk_estimate = handle_bulk
+    session = _session()
+    context = RequestContext(
+        request_id=3, meta=RequestParams.Meta(progressToken="tok"), session=session, lifespan_context=None
+    )
+    token = request_ctx.set(context)
+    try:
+        request = CallToolRequest(params=CallToolRequestParams(name="azure_bulk_estimate", arguments={"resources": []}))
+        await server.request_handlers[CallToolRequest](request)
+    finally:
+        request_ctx.reset(token)
+
+    assert seen["progress"].active
+    assert current_progress() is None
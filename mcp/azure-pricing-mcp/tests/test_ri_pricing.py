@@ -1,5 +1,6 @@
 """Tests for Reserved Instance pricing functionality."""
 
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -59,3 +60,103 @@ async def test_get_ri_pricing(services):
         assert "comparison" in result
         comp = result["comparison"][0]
         assert comp["sku"] == "D4s v3"
+
+
+@pytest.mark.asyncio
+async def test_get_ri_pricing_fetches_concurrently(services):
+    """RI and On-Demand queries should be in flight at the same time."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def fake_fetch(filter_conditions, currency_code, limit):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if "priceType eq 'Reservation'" in filter_conditions:
+            return {
+                "Items": [
+                    {"skuName": "D4s v3", "armRegionName": "eastus", "retailPrice": 3504.0, "reservationTerm": "1 Year"}
+                ]
+            }
+        return {"Items": [{"skuName": "D4s v3", "armRegionName": "eastus", "retailPrice": 0.8}]}
+
+    with patch.object(services["client"], "fetch_prices", side_effect=fake_fetch):
+        result = await services["pricing"].get_ri_pricing(sku_name="D4s v3", region="eastus")
+
+    assert max_in_flight == 2
+    assert len(result["comparison"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_ri_pricing_follows_next_page_link(services):
+    """On-Demand matches on later pages should still be joined."""
+    ri_page = {
+        "Items": [{"skuName": "D4s v3", "armRegionName": "westus", "retailPrice": 3504.0, "reservationTerm": "1 Year"}]
+    }
+    od_first_page = {
+        "Items": [{"skuName": "D4s v3", "armRegionName": "eastus", "retailPrice": 0.8}],
+        "NextPageLink": "https://prices.azure.com/api/retail/prices?$skip=1000",
+    }
+    od_second_page = {"Items": [{"skuName": "D4s v3", "armRegionName": "westus", "retailPrice": 0.9}]}
+
+    with (
+        patch.object(services["client"], "fetch_prices", new_callable=AsyncMock) as mock_fetch,
+        patch.object(services["client"], "make_request", new_callable=AsyncMock) as mock_request,
+    ):
+        mock_fetch.side_effect = [ri_page, od_first_page]
+        mock_request.return_value = od_second_page
+
+        result = await services["pricing"].get_ri_pricing(sku_name="D4s v3")
+
+    mock_request.assert_awaited_once_with(url=od_first_page["NextPageLink"])
+    assert result["comparison"][0]["region"] == "westus"
+    assert result["comparison"][0]["od_hourly"] == 0.9
+
+
+def test_calculate_ri_savings_joins_on_product(services):
+    """Multiple meters for the same SKU/region must not overwrite each other."""
+    ri_items = [
+        {
+            "skuName": "D4s v3",
+            "armRegionName": "eastus",
+            "productName": "Virtual Machines DSv3 Series",
+            "retailPrice": 3504.0,
+            "reservationTerm": "1 Year",
+        }
+    ]
+    od_items = [
+        {
+            "skuName": "D4s v3",
+            "armRegionName": "eastus",
+            "productName": "Virtual Machines DSv3 Series",
+            "retailPrice": 0.8,
+        },
+        {
+            "skuName": "D4s v3",
+            "armRegionName": "eastus",
+            "productName": "Virtual Machines DSv3 Series Windows",
+            "retailPrice": 1.2,
+        },
+    ]
+
+    comparison = services["pricing"]._calculate_ri_savings(ri_items, od_items)
+
+    assert len(comparison) == 1
+    assert comparison[0]["od_hourly"] == 0.8
+    assert comparison[0]["ri_hourly"] == 0.4
+    assert comparison[0]["savings_percentage"] == 50.0
+
+
+def test_calculate_ri_savings_falls_back_to_cheapest_meter(services):
+    """Without a product match the cheapest On-Demand meter is used."""
+    ri_items = [{"skuName": "D4s v3", "armRegionName": "eastus", "retailPrice": 3504.0, "reservationTerm": "1 Year"}]
+    od_items = [
+        {"skuName": "D4s v3", "armRegionName": "eastus", "productName": "Windows", "retailPrice": 1.2},
+        {"skuName": "D4s v3", "armRegionName": "eastus", "productName": "Linux", "retailPrice": 0.8},
+    ]
+
+    comparison = services["pricing"]._calculate_ri_savings(ri_items, od_items)
+
+    assert comparison[0]["od_hourly"] == 0.8
@@ -0,0 +1,260 @@
+"""Tests for the shared cross-process cache backends."""
+
+import asyncio
+import fnmatch
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from azure_pricing_mcp.cache import (
+    MemoryCacheBackend,
+    RedisCacheBackend,
+    SQLiteCacheBackend,
+    create_cache_backend,
+    get_or_fetch,
+)
+from azure_pricing_mcp.models import RetirementStatus, VMSeriesRetirementInfo
+from azure_pricing_mcp.services import PricingService, RetirementService
+
+
+class _FakeRedis:
+    """Local stand-in for a redis.asyncio client (get/set/delete/scan_iter)."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, tuple[bytes, float]] = {}
+
+    def _live(self, key: str) -> bytes | None:
+        entry = self.data.get(key)
+        if entry is not None and entry[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry[0] if entry else None
+
+    async def get(self, key):
+        return self._live(key)
+
+    async def set(self, key, value, px=None, nx=False):
+        if nx and self._live(key) is not None:
+            return None
+        self.data[key] = (value.encode(), time.monotonic() + px / 1000)
+        return True
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def scan_iter(self, match="*"):
+        for key in list(self.data):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCacheBackend()
+    if request.param == "sqlite":
+        return SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"))
+    return RedisCacheBackend(_FakeRedis())
+
+
+@pytest.mark.asyncio
+async def test_backend_roundtrip_and_ttl(backend):
+    await backend.set("prices:a", {"Items": [{"retailPrice": 0.1}]}, ttl=60)
+    await backend.set("prices:b", [1, 2], ttl=0.01)
+
+    assert await backend.get("prices:a") == {"Items": [{"retailPrice": 0.1}]}
+    assert await backend.get("missing") is None
+    await asyncio.sleep(0.02)
+    assert await backend.get("prices:b") is None
+
+    assert await backend.add("lease:a", True, 60) is True
+    assert await backend.add("lease:a", True, 60) is False
+    await backend.delete("lease:a")
+    assert await backend.add("lease:a", True, 60) is True
+
+    await backend.clear()
+    assert await backend.get("prices:a") is None
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_backend_clear_by_prefix_and_stats(backend):
+    for key in ("prices:a", "prices:b", "prices_x", "Prices:c", "spot:eviction:d2s:eastus"):
+        await backend.set(key, {"key": key}, ttl=60)
+
+    assert await backend.clear("prices:") == 2
+    stats = await backend.stats(oldest=2)
+
+    assert stats["backend"] == backend.name
+    assert stats["entries"] == 3
+    assert await backend.get("prices_x") is not None and await backend.get("Prices:c") is not None
+    if backend.name != "redis":
+        assert stats["bytes"] > 0
+        assert len(stats["oldest"]) == 2 and 0 < stats["oldest"][0]["expires_in_seconds"] <= 60
+    assert await backend.clear() == 3
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_is_shared_between_processes(tmp_path):
+    # Two connections to one file stand in for two worker processes
+    path = str(tmp_path / "cache.sqlite3")
+    worker_a, worker_b = SQLiteCacheBackend(path), SQLiteCacheBackend(path)
+
+    await worker_a.set("retirement", {"Av1": {"status": "retired"}}, ttl=60)
+
+    assert await worker_b.get("retirement") == {"Av1": {"status": "retired"}}
+    assert await worker_a.add("lease:x", True, 60) is True
+    assert await worker_b.add("lease:x", True, 60) is False
+
+    # Reopens after close, e.g. when the server is entered again
+    await worker_b.close()
+    assert await worker_b.get("retirement") is not None
+    await worker_a.close()
+    await worker_b.close()
+
+
+@pytest.mark.asyncio
+async def test_get_or_fetch_fetches_once_across_workers():
+    cache = MemoryCacheBackend()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"Items": [], "Count": 0}
+
+    results = await asyncio.gather(*(get_or_fetch(cache, "prices:q", 60, fetch) for _ in range(4)))
+
+    assert calls == 1
+    assert all(result == {"Items": [], "Count": 0} for result in results)
+    assert await cache.get("lease:prices:q") is None
+
+
+@pytest.mark.asyncio
+async def test_get_or_fetch_does_not_share_errors():
+    cache = MemoryCacheBackend()
+
+    result = await get_or_fetch(cache, "spot:x", 60, AsyncMock(return_value={"error": "auth"}))
+
+    assert result == {"error": "auth"}
+    assert await cache.get("spot:x") is None
+
+
+@pytest.mark.asyncio
+async def test_release_only_removes_the_owners_lease(backend):
+    await backend.add("lease:a", "mine", 60)
+
+    await backend.release("lease:a", "theirs")
+    assert await backend.get("lease:a") == "mine"
+    await backend.release("lease:a", "mine")
+    assert await backend.get("lease:a") is None
+
+
+@pytest.mark.asyncio
+async def test_waiters_stop_when_the_holder_fails():
+    cache = MemoryCacheBackend()
+    started = asyncio.Event()
+
+    async def failing_fetch():
+        started.set()
+        await asyncio.sleep(0.05)
+        return {"error": "throttled"}
+
+    holder = asyncio.create_task(get_or_fetch(cache, "spot:x", 60, failing_fetch, lease_seconds=30))
+    await started.wait()
+    begin = time.monotonic()
+    result = await get_or_fetch(cache, "spot:x", 60, AsyncMock(return_value={"rate": 1}), lease_seconds=30)
+
+    assert result == {"rate": 1}
+    assert time.monotonic() - begin < 1
+    assert await holder == {"error": "throttled"}
+
+
+@pytest.mark.asyncio
+async def test_timed_out_waiter_keeps_the_other_workers_lease():
+    cache = MemoryCacheBackend()
+    await cache.add("lease:prices:q", "other-worker", 60)
+
+    result = await get_or_fetch(cache, "prices:q", 60, AsyncMock(return_value={"Items": []}), lease_seconds=0.1)
+
+    assert result == {"Items": []}
+    assert await cache.get("lease:prices:q") == "other-worker"
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_is_bounded_and_purges_expired_entries():
+    cache = MemoryCacheBackend(max_entries=2)
+    for key in ("a", "b", "c"):
+        await cache.set(key, key, 60)
+    assert (await cache.get("a"), await cache.get("c")) == (None, "c")
+
+    await cache.set("d", "d", 0.01)
+    await asyncio.sleep(0.02)
+    assert await cache.purge_expired() == 1
+    assert len(cache._entries) == 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_purges_expired_rows(tmp_path):
+    cache = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"))
+    await cache.set("old", 1, 0.01)
+    await cache.set("new", 2, 60)
+    await asyncio.sleep(0.02)
+
+    assert await cache.purge_expired() == 1
+    assert await cache.get("new") == 2
+
+
+@pytest.mark.asyncio
+async def test_get_or_fetch_survives_backend_failure():
+    cache = MemoryCacheBackend()
+    cache.get = AsyncMock(side_effect=ConnectionError("down"))
+
+    assert await get_or_fetch(cache, "prices:q", 60, AsyncMock(return_value={"Items": []})) == {"Items": []}
+
+
+@pytest.mark.asyncio
+async def test_pricing_workers_share_results(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    workers = []
+    for _ in range(2):
+        client = MagicMock()
+        client.fetch_prices = AsyncMock(return_value={"Items": [{"skuName": "D2s v5"}]})
+        workers.append(PricingService(client, MagicMock(), shared_cache=SQLiteCacheBackend(path)))
+
+    first = await workers[0]._fetch_prices_cached(["serviceName eq 'Virtual Machines'"])
+    second = await workers[1]._fetch_prices_cached(["serviceName eq 'Virtual Machines'"])
+
+    assert first == second == {"Items": [{"skuName": "D2s v5"}]}
+    workers[0]._client.fetch_prices.assert_awaited_once()
+    workers[1]._client.fetch_prices.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_retirement_data_shared_through_redis():
+    cache = RedisCacheBackend(_FakeRedis())
+    data = {
+        "Av1": VMSeriesRetirementInfo("Av1-series", RetirementStatus.RETIRED, "August 31, 2024", "Av2-series"),
+    }
+    worker_a, worker_b = RetirementService(MagicMock(), cache), RetirementService(MagicMock(), cache)
+    worker_a._fetch_retirement_data = AsyncMock(return_value=data)
+    worker_b._fetch_retirement_data = AsyncMock(return_value={})
+
+    assert await worker_a.get_retirement_data() == data
+    assert await worker_b.get_retirement_data() == data
+    worker_b._fetch_retirement_data.assert_not_awaited()
+
+
+def test_create_cache_backend(tmp_path):
+    assert isinstance(create_cache_backend("memory"), MemoryCacheBackend)
+    sqlite = create_cache_backend("sqlite", str(tmp_path / "c.sqlite3"))
+    assert isinstance(sqlite, SQLiteCacheBackend)
+    assert isinstance(create_cache_backend("nope"), MemoryCacheBackend)
+    asyncio.run(sqlite.close())
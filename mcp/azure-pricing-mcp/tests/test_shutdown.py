@@ -0,0 +1,150 @@
+"""Tests for graceful shutdown: refusing new tool calls and draining in-flight ones."""
+
+import asyncio
+import json
+import signal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from mcp.types import TextContent
+
+from azure_pricing_mcp.metrics import snapshot
+from azure_pricing_mcp.server import (
+    SHUTTING_DOWN_ERROR,
+    _drain_on_shutdown_signal,
+    _uvicorn_server,
+    create_server,
+)
+
+pytestmark = pytest.mark.usefixtures("reset_metrics")
+
+
+@pytest.fixture
+async def servers():
+    server, pricing_server = create_server()
+    pricing_server.cache_warmer.log.path = None
+    await pricing_server.initialize()
+    yield server, pricing_server
+    await pricing_server.shutdown()
+
+
+def _blocking_handler(pricing_server, release: asyncio.Event) -> asyncio.Event:
+    started = asyncio.Event()
+
+    async def discount(arguments):
+        started.set()
+        await release.wait()
+        return [TextContent(type="text", text="10% discount")]
+
+    pricing_server.tool_handlers.handle_customer_discount = discount
+    return started
+
+
+@pytest.mark.asyncio
+async def test_in_flight_calls_finish_while_new_calls_are_refused(servers, call_tool):
+    server, pricing_server = servers
+    release = asyncio.Event()
+    started = _blocking_handler(pricing_server, release)
+    in_flight = asyncio.create_task(call_tool(server, "get_customer_discount"))
+    await started.wait()
+
+    shutdown = asyncio.create_task(pricing_server.shutdown())
+    await asyncio.sleep(0)
+    refused = await call_tool(server, "azure_price_search", {"service_name": "Virtual Machines"})
+
+    assert pricing_server.is_draining and pricing_server.is_active
+    assert refused.root.content[0].text == SHUTTING_DOWN_ERROR
+    assert snapshot()["tools"]["azure_price_search"]["outcomes"] == {"refused": 1}
+
+    release.set()
+    result = await in_flight
+    await shutdown
+
+    assert result.root.content[0].text == "10% discount"
+    assert not pricing_server.is_active
+
+
+@pytest.mark.asyncio
+async def test_calls_past_the_deadline_are_cancelled(servers, call_tool):
+    server, pricing_server = servers
+    started = _blocking_handler(pricing_server, asyncio.Event())
+    in_flight = asyncio.create_task(call_tool(server, "get_customer_discount"))
+    await started.wait()
+
+    assert await pricing_server.drain(timeout=0.01) == 1
+    assert in_flight.cancelled()
+    assert await pricing_server.drain(timeout=0.01) == 0
+
+
+@pytest.mark.asyncio
+async def test_drain_cancels_background_work_and_saves_the_query_log(servers, tmp_path, call_tool):
+    server, pricing_server = servers
+    log_path = tmp_path / "queries.json"
+    pricing_server.cache_warmer.log.path = str(log_path)
+
+    async def hanging_prewarm(connections):
+        await asyncio.Event().wait()
+
+    pricing_server._client.prewarm = hanging_prewarm
+    pricing_server._retirement_service.get_retirement_data = AsyncMock(return_value={})
+    prewarm = pricing_server.start_prewarm()
+    pricing_server.start_warmup()
+    _blocking_handler(pricing_server, release := asyncio.Event())
+    release.set()
+
+    await call_tool(server, "get_customer_discount")
+    await pricing_server.drain()
+
+    assert prewarm is not None and prewarm.cancelled()
+    assert not pricing_server.cache_warmer.stats()["running"]
+    assert [q["tool"] for q in json.loads(log_path.read_text())["queries"].values()] == ["get_customer_discount"]
+
+
+@pytest.mark.asyncio
+async def test_initialize_after_shutdown_accepts_calls_again(servers, call_tool):
+    server, pricing_server = servers
+    _blocking_handler(pricing_server, release := asyncio.Event())
+    release.set()
+
+    await pricing_server.shutdown()
+    await pricing_server.initialize()
+    result = await call_tool(server, "get_customer_discount")
+
+    assert not pricing_server.is_draining
+    assert result.root.content[0].text == "10% discount"
+
+
+@pytest.mark.asyncio
+async def test_uvicorn_server_drains_before_closing_connections():
+    _, pricing_server = create_server()
+    order = []
+    pricing_server.drain = AsyncMock(side_effect=lambda: order.append("drain"))
+    uvicorn_server = _uvicorn_server(object(), pricing_server, "127.0.0.1", 0)
+
+    with patch("uvicorn.Server.shutdown", new=AsyncMock(side_effect=lambda sockets: order.append("close"))):
+        await uvicorn_server.shutdown()
+
+    assert order == ["drain", "close"]
+    assert uvicorn_server.config.timeout_graceful_shutdown is not None
+
+
+@pytest.mark.asyncio
+async def test_shutdown_signal_starts_draining_and_chains_to_the_server_handler():
+    _, pricing_server = create_server()
+    received = []
+
+    def server_handler(sig, frame):
+        received.append(sig)
+
+    original = signal.signal(signal.SIGTERM, server_handler)
+    try:
+        restore = _drain_on_shutdown_signal(pricing_server)
+        signal.raise_signal(signal.SIGTERM)
+        await asyncio.sleep(0.01)
+
+        assert pricing_server.is_draining
+        assert received == [signal.SIGTERM]
+        restore()
+        assert signal.getsignal(signal.SIGTERM) is server_handler
+    finally:
+        signal.signal(signal.SIGTERM, original)
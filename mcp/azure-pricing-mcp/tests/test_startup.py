@@ -0,0 +1,91 @@
+"""Startup benchmark: import cost of the server entry point.
+
+Stdio clients start a fresh server process per session, so import time is
+user-visible latency. Imports run in a fresh interpreter; budgets can be
+raised on slow machines with ``AZURE_PRICING_STARTUP_BUDGET_MS`` (whole
+import, including the MCP SDK) and ``AZURE_PRICING_STARTUP_OWN_BUDGET_MS``
+(this package's own modules).
+"""
+
+import importlib
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import azure_pricing_mcp
+
+SRC_DIR = str(Path(azure_pricing_mcp.__file__).resolve().parents[1])
+STARTUP_BUDGET_MS = float(os.environ.get("AZURE_PRICING_STARTUP_BUDGET_MS", "3000"))
+OWN_MODULES_BUDGET_MS = float(os.environ.get("AZURE_PRICING_STARTUP_OWN_BUDGET_MS", "150"))
+
+# Only needed once a tool is called (or never, for the stdio transport)
+DEFERRED_MODULES = [
+    "azure_pricing_mcp.handlers",
+    "azure_pricing_mcp.formatters",
+    "azure_pricing_mcp.databricks.handlers",
+    "azure_pricing_mcp.github_pricing.handlers",
+    "azure_pricing_mcp.services.bom",
+    "azure_pricing_mcp.services.bulk",
+    "azure_pricing_mcp.services.orphaned",
+    "azure_pricing_mcp.services.spot",
+    "azure_pricing_mcp.services.price_performance",
+    "azure.identity",
+]
+
+
+def _python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [SRC_DIR, os.environ.get("PYTHONPATH")]))}
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code], capture_output=True, text=True, env=env, timeout=60, check=True
+    )
+
+
+def _import_times() -> dict[str, tuple[int, int]]:
+    """Module -> (self, cumulative) import time in microseconds for ``import azure_pricing_mcp.server``."""
+    stderr = _python("import azure_pricing_mcp.server", "-X", "importtime").stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def test_entry_point_defers_handlers_and_services():
+    code = "import json, sys, azure_pricing_mcp.server; print(json.dumps(list(sys.modules)))"
+    loaded = set(json.loads(_python(code).stdout))
+
+    assert not loaded & set(DEFERRED_MODULES)
+
+
+def test_entry_point_import_time_within_budget():
+    times = _import_times()
+    total_ms = times["azure_pricing_mcp.server"][1] / 1000
+    own_ms = sum(self_us for name, (self_us, _) in times.items() if name.startswith("azure_pricing_mcp")) / 1000
+
+    assert total_ms < STARTUP_BUDGET_MS, f"import azure_pricing_mcp.server took {total_ms:.0f}ms"
+    assert own_ms < OWN_MODULES_BUDGET_MS, f"azure_pricing_mcp modules took {own_ms:.0f}ms to import"
+
+
+@pytest.mark.parametrize(
+    "package",
+    [
+        "azure_pricing_mcp",
+        "azure_pricing_mcp.services",
+        "azure_pricing_mcp.databricks",
+        "azure_pricing_mcp.github_pricing",
+    ],
+)
+def test_lazy_exports_resolve(package):
+    module = importlib.import_module(package)
+
+    for name in module.__all__:
+        assert getattr(module, name) is not None
+        assert name in dir(module)
+    with pytest.raises(AttributeError):
+        module.NotAnExport  # noqa: B018
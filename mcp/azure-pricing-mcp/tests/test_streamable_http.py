@@ -0,0 +1,88 @@
+"""Tests for the stateless streamable HTTP transport."""
+
+from unittest.mock import patch
+
+from starlette.testclient import TestClient
+
+from azure_pricing_mcp import server as server_module
+from azure_pricing_mcp.server import _parse_args, create_streamable_http_app
+
+HEADERS = {"Accept": "application/json, text/event-stream", "Content-Type": "application/json"}
+
+
+def _rpc(method: str, params: dict | None = None, request_id: int = 1) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}}
+
+
+INITIALIZE = _rpc(
+    "initialize",
+    {"protocolVersion": "2025-03-26", "capabilities": {}, "clientInfo": {"name": "test", "version": "1.0"}},
+)
+
+
+def test_stateless_requests_can_hit_any_worker():
+    # Two apps stand in for two worker processes behind a load balancer
+    with (
+        TestClient(create_streamable_http_app(stateless=True, json_response=True)) as worker_a,
+        TestClient(create_streamable_http_app(stateless=True, json_response=True)) as worker_b,
+    ):
+        init = worker_a.post("/mcp", json=INITIALIZE, headers=HEADERS)
+        assert init.status_code == 200
+        assert init.json()["result"]["serverInfo"]["name"] == "azure-pricing"
+        assert "mcp-session-id" not in init.headers
+
+        tools = worker_b.post("/mcp", json=_rpc("tools/list", request_id=2), headers=HEADERS)
+        assert tools.status_code == 200
+        names = {tool["name"] for tool in tools.json()["result"]["tools"]}
+        assert {"azure_price_search", "batch"} <= names
+
+
+def test_health_endpoint():
+    with TestClient(create_streamable_http_app(stateless=True)) as client:
+        response = client.get("/health")
+
+    assert response.json() == {"status": "ok", "stateless": True}
+
+
+def test_health_endpoint_reports_draining():
+    app = create_streamable_http_app(stateless=True)
+    with TestClient(app) as client:
+        app.state.pricing_server._draining = True
+        response = client.get("/health")
+
+    assert response.status_code == 503
+    assert response.json() == {"status": "draining", "stateless": True}
+
+
+def test_stateful_mode_issues_session_ids():
+    with TestClient(create_streamable_http_app(stateless=False, json_response=True)) as client:
+        init = client.post("/mcp", json=INITIALIZE, headers=HEADERS)
+
+    assert init.headers.get("mcp-session-id")
+
+
+def test_parse_args():
+    args = _parse_args(["--transport", "streamable-http", "--no-stateless", "--json-response", "--workers", "4"])
+
+    assert args.transport == "streamable-http"
+    assert (args.stateless, args.json_response, args.workers) == (False, True, 4)
+    assert _parse_args([]).stateless is True
+
+
+def test_run_starts_workers_with_shared_settings(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["azure-pricing-mcp", "--transport", "streamable-http", "--workers", "3"])
+    monkeypatch.setenv("AZURE_PRICING_HTTP_STATELESS", "")
+    monkeypatch.setenv("AZURE_PRICING_HTTP_JSON_RESPONSE", "")
+    monkeypatch.delenv("AZURE_PRICING_CACHE_BACKEND", raising=False)
+
+    with patch("uvicorn.run") as uvicorn_run, patch.object(server_module.asyncio, "run") as asyncio_run:
+        server_module.run()
+
+    asyncio_run.assert_not_called()
+    target = uvicorn_run.call_args
+    assert target.args == ("azure_pricing_mcp.server:create_streamable_http_app",)
+    assert target.kwargs["factory"] is True
+    assert target.kwargs["workers"] == 3
+    assert server_module.os.environ["AZURE_PRICING_HTTP_STATELESS"] == "true"
+    assert server_module.os.environ["AZURE_PRICING_HTTP_JSON_RESPONSE"] == "false"
+    assert server_module.os.environ["AZURE_PRICING_CACHE_BACKEND"] == "sqlite"
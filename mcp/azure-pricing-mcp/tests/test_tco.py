@@ -0,0 +1,166 @@
+"""Tests for the multi-year TCO projection engine."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from azure_pricing_mcp.formatters import format_tco_projection_response
+from azure_pricing_mcp.services import PricingService, TCOService
+
+
+def _item(service, sku, price, price_type="Consumption", unit="1 Hour", **extra):
+    return {
+        "serviceName": service,
+        "skuName": sku,
+        "armRegionName": "eastus",
+        "type": price_type,
+        "retailPrice": price,
+        "unitOfMeasure": unit,
+        **extra,
+    }
+
+
+CATALOG = [
+    _item(
+        "Virtual Machines",
+        "D4s v5",
+        1.0,
+        savingsPlan=[{"term": "1 Year", "retailPrice": 0.8}, {"term": "3 Years", "retailPrice": 0.65}],
+    ),
+    _item("Virtual Machines", "D4s v5", 0.6 * 8760, price_type="Reservation", reservationTerm="1 Year"),
+    _item("Virtual Machines", "D4s v5", 0.4 * 26280, price_type="Reservation", reservationTerm="3 Years"),
+    _item("Storage", "Standard LRS", 0.02, unit="1 GB/Month"),
+]
+
+
+async def _fetch(filter_conditions, currency_code="USD", limit=None):
+    conditions = " ".join(filter_conditions)
+    items = []
+    for item in CATALOG:
+        if f"serviceName eq '{item['serviceName']}'" not in conditions:
+            continue
+        if f"priceType eq '{item['type']}'" not in conditions or f"skuName eq '{item['skuName']}'" not in conditions:
+            continue
+        if "reservationTerm" in item and f"reservationTerm eq '{item['reservationTerm']}'" not in conditions:
+            continue
+        items.append(item)
+    return {"Items": items}
+
+
+@pytest.fixture
+def service():
+    client = MagicMock()
+    client.fetch_all_prices = AsyncMock(side_effect=_fetch)
+    return TCOService(PricingService(client, MagicMock()))
+
+
+VM = {"service_name": "vm", "sku_name": "D4s v5"}
+
+
+@pytest.mark.asyncio
+async def test_flat_on_demand_projection(service):
+    result = await service.project([VM], years=3)
+
+    assert result["months"] == 36
+    assert result["total_cost"] == 26280.0
+    assert [year["cost"] for year in result["yearly"]] == [8760.0, 8760.0, 8760.0]
+    assert result["yearly"][-1]["cumulative"] == 26280.0
+    assert result["monthly_cash_flow"] == [730.0] * 36
+
+
+@pytest.mark.asyncio
+async def test_growth_compounds_monthly(service):
+    result = await service.project([VM], years=2, growth_rate_percent=12)
+
+    year1, year2 = (year["cost"] for year in result["yearly"])
+    assert result["monthly_cash_flow"][0] == 730.0
+    assert year2 == pytest.approx(year1 * 1.12, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_reservation_with_growth_bills_overage_on_demand(service):
+    result = await service.project([{**VM, "quantity": 2}], years=1, pricing="ri_3y", growth_rate_percent=50)
+
+    flow = result["monthly_cash_flow"]
+    # Two reserved instances at 0.4/hour; growth above two billed at 1.0/hour
+    assert flow[0] == 584.0
+    assert flow[-1] == round(584.0 + 2 * (1.5 ** (11 / 12) - 1) * 730, 2)
+
+
+@pytest.mark.asyncio
+async def test_upfront_payment_at_term_start(service):
+    result = await service.project([VM], years=2, pricing="ri_1y", payment="upfront")
+
+    flow = result["monthly_cash_flow"]
+    assert flow[0] == flow[12] == 5256.0
+    assert sum(flow) == 10512.0
+    assert flow.count(0.0) == 22
+
+
+@pytest.mark.asyncio
+async def test_comparison_ranks_pricing_options(service):
+    result = await service.project([VM], years=3)
+
+    totals = {entry["pricing"]: entry["total_cost"] for entry in result["comparison"]}
+    assert totals == {
+        "on_demand": 26280.0,
+        "ri_1y": 15768.0,
+        "ri_3y": 10512.0,
+        "sp_1y": 21024.0,
+        "sp_3y": 17082.0,
+    }
+    assert result["comparison"][0]["pricing"] == "ri_3y"
+    assert result["comparison"][0]["savings_percentage"] == 60.0
+
+
+@pytest.mark.asyncio
+async def test_discount_schedule_and_npv(service):
+    result = await service.project([VM], years=3, discount_schedule=[0, 10], cost_of_capital_percent=8)
+
+    assert [year["cost"] for year in result["yearly"]] == [8760.0, 7884.0, 7884.0]
+    assert result["npv"] < result["total_cost"]
+
+
+@pytest.mark.asyncio
+async def test_sensitivity_grid(service):
+    result = await service.project(
+        [VM], years=1, sensitivity_growth_rates=[0, 10], sensitivity_discount_percentages=[0, 50]
+    )
+
+    sensitivity = result["sensitivity"]
+    assert sensitivity["total_cost"][0] == [8760.0, 4380.0]
+    assert sensitivity["total_cost"][1][0] > 8760.0
+    assert sensitivity["min_total"] == 4380.0
+
+
+@pytest.mark.asyncio
+async def test_non_hourly_meter_falls_back_to_on_demand(service):
+    storage = {"service_name": "Storage", "sku_name": "Standard LRS", "quantity": 100}
+
+    result = await service.project([storage], years=1, pricing="ri_3y")
+
+    assert result["total_cost"] == 24.0
+    assert "projected on-demand" in result["warnings"][0]["warning"]
+
+
+@pytest.mark.asyncio
+async def test_validation_errors(service):
+    assert "between 1 and 5" in (await service.project([VM], years=6))["error"]
+    assert "Invalid pricing" in (await service.project([VM], pricing="spot"))["error"]
+
+    result = await service.project([VM, {"service_name": "vm", "sku_name": "Z9 v9"}, {"sku_name": "x"}], years=1)
+    errors = {err["index"]: err["error"] for err in result["errors"]}
+    assert "No pricing" in errors[1]
+    assert "Missing required" in errors[2]
+
+
+@pytest.mark.asyncio
+async def test_formatter(service):
+    result = await service.project([VM], years=3, sensitivity_growth_rates=[0, 10])
+
+    text = format_tco_projection_response(result)
+
+    assert "# 📈 3-Year TCO Projection" in text
+    assert "| 3 | $8,760.00 | $26,280.00 |" in text
+    assert "| ri_3y | $10,512.00 | $15,768.00 (60.0%) |" in text
+    assert "| 0% | $26,280.00 |" in text
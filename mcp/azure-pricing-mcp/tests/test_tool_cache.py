@@ -0,0 +1,171 @@
+"""Tests for the tool-level result cache."""
+
+import json
+import os
+from unittest.mock import AsyncMock
+
+import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams, TextContent
+
+from azure_pricing_mcp.server import create_server
+from azure_pricing_mcp.services import PriceSheet
+from azure_pricing_mcp.tool_cache import ToolResultCache, is_error_response, normalize_arguments, text_response
+
+DEFAULTS = {"azure_price_search": {"currency_code": "USD", "limit": 50, "show_with_discount": False}}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _text(value: str) -> list[TextContent]:
+    return [TextContent(type="text", text=value)]
+
+
+def test_normalize_fills_defaults_and_drops_noise():
+    defaults = DEFAULTS["azure_price_search"]
+
+    plain = normalize_arguments({"service_name": "Virtual Machines"}, defaults)
+    explicit = normalize_arguments(
+        {"service_name": " Virtual Machines ", "currency_code": "USD", "limit": 50.0, "region": None}, defaults
+    )
+
+    assert plain == explicit
+    assert "show_with_discount" not in plain
+    assert normalize_arguments({"show_with_discount": True}, defaults)["show_with_discount"] is True
+
+
+def test_equivalent_calls_share_a_key():
+    cache = ToolResultCache(tool_defaults=DEFAULTS)
+
+    key = cache.key("azure_price_search", {"service_name": "Storage", "discount_percentage": 10})
+    assert key == cache.key("azure_price_search", {"discount_percentage": 10.0, "service_name": "Storage"})
+    assert key != cache.key("azure_price_search", {"service_name": "Storage", "discount_percentage": 15})
+    assert key != cache.key("azure_price_search", {"service_name": "Storage", "show_with_discount": True})
+
+
+def test_hit_miss_and_ttl():
+    clock = FakeClock()
+    cache = ToolResultCache(ttl=60, tool_defaults=DEFAULTS, clock=clock)
+    key = cache.key("azure_price_search", {"service_name": "Storage"})
+
+    assert cache.get("azure_price_search", key) is None
+    cache.put("azure_price_search", key, _text("prices"))
+    assert cache.get("azure_price_search", key)[0].text == "prices"
+
+    clock.now = 61
+    assert cache.get("azure_price_search", key) is None
+
+    stats = cache.stats()
+    assert stats["entries"] == 0
+    assert stats["tools"]["azure_price_search"] == {"entries": 0, "hits": 1, "misses": 2, "hit_rate": 0.3333}
+
+
+def test_lru_eviction_and_clear():
+    cache = ToolResultCache(max_entries=2, tool_defaults=DEFAULTS)
+    keys = [cache.key("azure_price_search", {"service_name": name}) for name in ("a", "b", "c")]
+
+    cache.put("azure_price_search", keys[0], _text("a"))
+    cache.put("azure_price_search", keys[1], _text("b"))
+    cache.get("azure_price_search", keys[0])
+    cache.put("azure_price_search", keys[2], _text("c"))
+
+    assert cache.get("azure_price_search", keys[1]) is None
+    assert cache.get("azure_price_search", keys[0]) is not None
+    assert cache.clear("azure_price_search") == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_clear_by_tool_prefix_or_key_and_inspect():
+    clock = FakeClock()
+    defaults = {**DEFAULTS, "azure_price_compare": {}, "azure_cost_estimate": {}}
+    cache = ToolResultCache(ttl=60, tool_defaults=defaults, clock=clock)
+    search = cache.key("azure_price_search", {"service_name": "Storage"})
+    compare = cache.key("azure_price_compare", {"service_name": "Storage"})
+    estimate = cache.key("azure_cost_estimate", {"sku_name": "D2s v5"})
+    cache.put("azure_price_search", search, _text("a"))
+    clock.now = 10
+    cache.put("azure_price_compare", compare, _text("b"))
+    cache.put("azure_cost_estimate", estimate, _text("c"))
+
+    info = cache.inspect(oldest=1)
+    assert (info["entries"], info["oldest"]) == (3, [{"key": search, "age_seconds": 10.0}])
+    assert info["bytes"] > 0
+
+    assert cache.clear(key=estimate) == 1
+    assert cache.clear(prefix="azure_price_") == 2
+    assert cache.inspect()["entries"] == 0
+
+
+def test_price_sheet_reload_changes_discounted_keys(tmp_path):
+    path = tmp_path / "sheet.json"
+    path.write_text(json.dumps([{"serviceName": "Storage", "discountPercentage": 10}]), encoding="utf-8")
+    sheet = PriceSheet(str(path), reload_interval=0)
+    cache = ToolResultCache(tool_defaults={**DEFAULTS, "get_customer_discount": {}}, price_sheet_version=sheet.version)
+    discounted = {"service_name": "Storage", "show_with_discount": True}
+    before = (cache.key("azure_price_search", discounted), cache.key("get_customer_discount", {}))
+    list_price = cache.key("azure_price_search", {"service_name": "Storage"})
+
+    path.write_text(json.dumps([{"serviceName": "Storage", "discountPercentage": 40}]), encoding="utf-8")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000_000))
+
+    assert cache.key("azure_price_search", discounted) != before[0]
+    assert cache.key("get_customer_discount", {}) != before[1]
+    assert cache.key("azure_price_search", {"service_name": "Storage"}) == list_price
+
+
+def test_uncacheable_unknown_errors_and_disabled():
+    cache = ToolResultCache(tool_defaults={**DEFAULTS, "simulate_eviction": {}})
+
+    assert cache.key("simulate_eviction", {"vm_resource_id": "x"}) is None
+    assert cache.key("no_such_tool", {}) is None
+
+    key = cache.key("azure_price_search", {})
+    cache.put("azure_price_search", key, _text("Error: API unavailable"))
+    cache.put("azure_price_search", key, _text("❌ **Error**: boom"))
+    assert cache.stats()["entries"] == 0
+
+    assert ToolResultCache(ttl=0, tool_defaults=DEFAULTS).key("azure_price_search", {}) is None
+
+
+@pytest.mark.asyncio
+async def test_server_serves_repeated_calls_from_cache():
+    server, pricing_server = create_server()
+    pricing_server._session_active = True
+    handler = AsyncMock(return_value=_text("Found 1 Azure pricing results"))
+    pricing_server.tool_handlers.handle_price_search = handler
+    call = server.request_handlers[CallToolRequest]
+
+    def _request(arguments):
+        return CallToolRequest(params=CallToolRequestParams(name="azure_price_search", arguments=arguments))
+
+    first = await call(_request({"service_name": "Storage"}))
+    second = await call(_request({"service_name": "Storage", "currency_code": "USD", "show_with_discount": False}))
+
+    assert handler.await_count == 1
+    assert first.root.content[0].text == second.root.content[0].text == "Found 1 Azure pricing results"
+    assert pricing_server.tool_cache.stats()["tools"]["azure_price_search"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_service_errors_are_flagged_and_not_cached():
+    server, pricing_server = create_server()
+    pricing_server._session_active = True
+    spot = pricing_server.tool_handlers._get_spot_service()
+    spot.get_price_history = AsyncMock(return_value={"error": "authentication_required", "message": "Sign in"})
+    request = CallToolRequest(
+        params=CallToolRequestParams(name="spot_price_history", arguments={"sku": "D4s_v5", "location": "eastus"})
+    )
+
+    first = await server.request_handlers[CallToolRequest](request)
+    await server.request_handlers[CallToolRequest](request)
+
+    assert first.root.content[0].text.startswith("### ❌ Authentication Required")
+    assert spot.get_price_history.await_count == 2
+    assert pricing_server.tool_cache.stats()["entries"] == 0
+    assert is_error_response(text_response("### ❌ Failed", {"error": "x"}))
+    assert not is_error_response(text_response("### Spot prices", {"price_history": []}))
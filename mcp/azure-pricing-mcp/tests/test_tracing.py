@@ -0,0 +1,185 @@
+"""Tests for tool call tracing and the JSON lines exporter."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams, TextContent
+
+from azure_pricing_mcp import tracing
+from azure_pricing_mcp.cache import MemoryCacheBackend, get_or_fetch
+from azure_pricing_mcp.client import AzurePricingClient
+from azure_pricing_mcp.server import create_server
+from azure_pricing_mcp.tracing import JsonLinesExporter, set_attribute, span, start_trace
+
+
+class _Collect:
+    def __init__(self) -> None:
+        self.traces: list[list[dict]] = []
+
+    def export(self, spans):
+        self.traces.append([s.to_dict() for s in spans])
+
+    def names(self, trace: int = -1) -> list[str]:
+        return [s["name"] for s in self.traces[trace]]
+
+    def find(self, name: str, trace: int = -1) -> dict:
+        return next(s for s in self.traces[trace] if s["name"] == name)
+
+
+@pytest.fixture
+def exporter():
+    collected = _Collect()
+    tracing.configure(collected, slow_ms=0)
+    yield collected
+    tracing.configure(None)
+
+
+def test_disabled_tracing_records_nothing():
+    tracing.configure(None)
+
+    with start_trace("tool_call") as root, span("child") as child:
+        set_attribute("ignored", True)
+
+    assert root is None and child is None
+    assert tracing.current_span() is None
+
+
+def test_span_outside_trace_is_a_noop(exporter):
+    with span("orphan") as orphan:
+        set_attribute("ignored", True)
+
+    assert orphan is None
+    assert exporter.traces == []
+
+
+def test_nested_spans_share_trace_and_parent(exporter):
+    with start_trace("tool_call", tool="azure_price_search"):
+        with span("prices.fetch", filters=2):
+            set_attribute("cache_hit", False)
+            with span("http.request"):
+                pass
+
+    root, fetch, request = (exporter.find(name) for name in ("tool_call", "prices.fetch", "http.request"))
+    assert exporter.names() == ["http.request", "prices.fetch", "tool_call"]
+    assert {s["trace_id"] for s in exporter.traces[0]} == {root["trace_id"]}
+    assert (root["parent_id"], fetch["parent_id"], request["parent_id"]) == (
+        None,
+        root["span_id"],
+        fetch["span_id"],
+    )
+    assert fetch["attributes"] == {"filters": 2, "cache_hit": False}
+    assert root["duration_ms"] >= fetch["duration_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_spans_follow_the_call_into_sub_tasks(exporter):
+    async def item(n: int) -> None:
+        with span("bulk.item", n=n):
+            await asyncio.sleep(0)
+
+    with start_trace("tool_call") as root:
+        await asyncio.gather(item(1), item(2))
+
+    items = [s for s in exporter.traces[0] if s["name"] == "bulk.item"]
+    assert len(items) == 2
+    assert all(s["parent_id"] == root.span_id for s in items)
+
+
+def test_errors_are_recorded_and_reraised(exporter):
+    with pytest.raises(ValueError), start_trace("tool_call"), span("handler"):
+        raise ValueError("boom")
+
+    handler = exporter.find("handler")
+    assert (handler["status"], handler["attributes"]["error"]) == ("error", "ValueError")
+    assert exporter.find("tool_call")["status"] == "error"
+
+
+def test_fast_traces_are_skipped(exporter):
+    tracing.configure(exporter, slow_ms=60_000)
+
+    with start_trace("tool_call"):
+        pass
+
+    assert exporter.traces == []
+
+
+def test_json_lines_exporter_appends_one_span_per_line(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracing.configure(JsonLinesExporter(str(path)))
+    try:
+        for _ in range(2):
+            with start_trace("tool_call", tool="azure_cost_estimate"), span("format"):
+                pass
+    finally:
+        tracing.configure(None)
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["name"] for r in records] == ["format", "tool_call"] * 2
+    assert records[1]["attributes"] == {"tool": "azure_cost_estimate"}
+    assert records[0]["trace_id"] != records[2]["trace_id"]
+
+
+@pytest.mark.asyncio
+async def test_tool_call_trace_covers_dispatch_and_cache(exporter):
+    server, pricing_server = create_server()
+    pricing_server._session_active = True
+    pricing_server.cache_warmer.log.path = None
+
+    async def discount(arguments):
+        with span("service"):
+            return [TextContent(type="text", text="10% discount")]
+
+    pricing_server.tool_handlers.handle_customer_discount = discount
+    request = CallToolRequest(params=CallToolRequestParams(name="get_customer_discount", arguments={}))
+    await server.request_handlers[CallToolRequest](request)
+    await server.request_handlers[CallToolRequest](request)
+
+    assert exporter.names(0) == ["dispatch.queue", "service", "handler", "tool_call"]
+    assert exporter.find("dispatch.queue", 0)["attributes"]["priority"] == "interactive"
+    assert exporter.find("tool_call", 0)["attributes"] == {
+        "tool": "get_customer_discount",
+        "cache_hit": False,
+        "outcome": "ok",
+    }
+    assert exporter.names(1) == ["tool_call"]
+    assert exporter.find("tool_call", 1)["attributes"]["cache_hit"] is True
+
+
+@pytest.mark.asyncio
+async def test_http_request_span_counts_attempts_and_bytes(exporter):
+    rate_limited = AsyncMock(status=429, headers={})
+    ok = AsyncMock(status=200, headers={}, content_length=1234)
+    ok.json = AsyncMock(return_value={"Items": []})
+    ok.raise_for_status = MagicMock()
+    client = AzurePricingClient()
+    client.session = MagicMock()
+    client.session.get.return_value.__aenter__.side_effect = [rate_limited, ok]
+
+    with patch("asyncio.sleep", new_callable=AsyncMock), start_trace("tool_call"):
+        await client.make_request("https://prices.azure.com/api/retail/prices")
+
+    request = exporter.find("http.request")
+    assert request["attributes"] == {
+        "host": "prices.azure.com",
+        "method": "GET",
+        "attempts": 2,
+        "status": "200",
+        "bytes": 1234,
+    }
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_span_records_hits(exporter):
+    cache = MemoryCacheBackend()
+
+    async def fetch():
+        return {"Items": []}
+
+    with start_trace("tool_call"):
+        await get_or_fetch(cache, "prices:q", 60, fetch)
+        await get_or_fetch(cache, "prices:q", 60, fetch)
+
+    hits = [s["attributes"]["cache_hit"] for s in exporter.traces[0] if s["name"] == "shared_cache"]
+    assert hits == [False, True]
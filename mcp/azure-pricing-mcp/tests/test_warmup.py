@@ -0,0 +1,195 @@
+"""Tests for the query log and predictive cache warm-up."""
+
+import asyncio
+import json
+
+import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams, TextContent
+
+from azure_pricing_mcp.server import create_server
+from azure_pricing_mcp.tool_cache import ToolResultCache
+from azure_pricing_mcp.warmup import CacheWarmer, QueryLog
+
+DEFAULTS = {"azure_price_search": {"currency_code": "USD", "limit": 50}}
+
+
+def _cache() -> ToolResultCache:
+    return ToolResultCache(ttl=300, tool_defaults=DEFAULTS)
+
+
+def _record(warmer: CacheWarmer, cache: ToolResultCache, arguments: dict, times: int = 1) -> str:
+    key = cache.key("azure_price_search", arguments)
+    for _ in range(times):
+        warmer.record("azure_price_search", key, arguments, hit=cache.get("azure_price_search", key) is not None)
+    return key
+
+
+class _Calls:
+    def __init__(self, fail: bool = False) -> None:
+        self.calls: list[tuple[str, dict]] = []
+        self.fail = fail
+
+    async def __call__(self, name, arguments):
+        self.calls.append((name, arguments))
+        text = "Error: upstream" if self.fail else f"{arguments['sku_name']} prices"
+        return [TextContent(type="text", text=text)]
+
+
+def test_query_log_ranks_by_frequency():
+    log = QueryLog(path=None)
+    for key, count in (("a", 1), ("b", 3), ("c", 2)):
+        for _ in range(count):
+            log.record(key, "azure_price_search", {"sku_name": key})
+
+    assert [key for key, _, _ in log.top(2)] == ["b", "c"]
+    assert log.top(1)[0][2] == {"sku_name": "b"}
+
+
+def test_query_log_merges_workers_through_file(tmp_path):
+    path = str(tmp_path / "queries.json")
+    worker_a, worker_b = QueryLog(path), QueryLog(path)
+    worker_a.record("k", "azure_price_search", {"sku_name": "D2s v5"})
+    worker_b.record("k", "azure_price_search", {"sku_name": "D2s v5"})
+    worker_b.record("k2", "azure_price_search", {"sku_name": "E4s v5"})
+
+    worker_a.save()
+    worker_b.save()
+    restarted = QueryLog(path)
+
+    assert restarted.load() == 2
+    assert restarted.top(1)[0][0] == "k"
+    stored = json.loads((tmp_path / "queries.json").read_text())["queries"]
+    assert stored["k"]["count"] == 2
+    # The file holds only the normalized query and its count
+    assert set(stored["k"]) == {"tool", "arguments", "count"}
+
+
+def test_query_log_keeps_most_frequent(tmp_path):
+    log = QueryLog(str(tmp_path / "queries.json"), max_queries=2)
+    for key, count in (("a", 3), ("b", 1), ("c", 2)):
+        for _ in range(count):
+            log.record(key, "azure_price_search", {})
+    log.save()
+
+    assert QueryLog(log.path).load() == 2
+    assert [key for key, _, _ in log.top(5)] == ["a", "c"]
+
+
+def test_unreadable_log_is_ignored(tmp_path):
+    path = tmp_path / "queries.json"
+    path.write_text("not json")
+
+    assert QueryLog(str(path)).load() == 0
+
+
+def test_identifying_and_unknown_queries_are_not_logged(tmp_path):
+    path = tmp_path / "cache" / "queries.json"
+    log = QueryLog(str(path))
+    log.record("d", "get_customer_discount", {"customer_id": "contoso"})
+    log.record("u", "not_a_tool", {})
+    log.record("s", "simulate_eviction", {})
+    log.record("k", "azure_price_search", {"sku_name": "D2s v5"})
+    log.save()
+
+    assert [key for key, _, _ in log.top(5)] == ["k"]
+    assert path.stat().st_mode & 0o077 == 0
+
+
+def test_unknown_tools_in_the_file_are_dropped(tmp_path):
+    path = tmp_path / "queries.json"
+    entry = {"arguments": {}, "count": 5}
+    path.write_text(
+        json.dumps({"queries": {"a": {**entry, "tool": "rm_rf"}, "b": {**entry, "tool": "github_pricing"}}})
+    )
+
+    log = QueryLog(str(path))
+
+    assert log.load() == 1
+    assert log.top(5)[0][1] == "github_pricing"
+
+
+@pytest.mark.asyncio
+async def test_warm_once_prefetches_hot_queries_and_counts_warm_hits():
+    cache = _cache()
+    call = _Calls()
+    warmer = CacheWarmer(cache, call, asyncio.Semaphore(2), QueryLog(path=None), top_k=1, interval=60)
+    hot = _record(warmer, cache, {"sku_name": "D2s v5"}, times=3)
+    _record(warmer, cache, {"sku_name": "E4s v5"})
+
+    assert await warmer.warm_once() == 1
+    assert call.calls == [("azure_price_search", {"sku_name": "D2s v5"})]
+    assert cache.expires_in(hot) is not None
+
+    # Fresh entries are not fetched again on the next run
+    assert await warmer.warm_once() == 0
+
+    _record(warmer, cache, {"sku_name": "D2s v5"})
+    stats = warmer.stats()
+    assert (stats["prefetched"], stats["hits"], stats["misses"], stats["warm_hits"]) == (1, 1, 4, 1)
+    assert stats["warm_hit_rate"] == 0.2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached():
+    cache = _cache()
+    warmer = CacheWarmer(cache, _Calls(fail=True), asyncio.Semaphore(1), QueryLog(path=None))
+    key = _record(warmer, cache, {"sku_name": "D2s v5"})
+
+    assert await warmer.warm_once() == 0
+    assert cache.expires_in(key) is None
+    assert warmer.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_up_respects_shared_limiter():
+    running = peak = 0
+
+    async def call(name, arguments):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return [TextContent(type="text", text="ok")]
+
+    cache = _cache()
+    warmer = CacheWarmer(cache, call, asyncio.Semaphore(2), QueryLog(path=None), top_k=6)
+    for sku in range(6):
+        _record(warmer, cache, {"sku_name": f"sku{sku}"})
+
+    assert await warmer.warm_once() == 6
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_stop_saves_log(tmp_path):
+    cache = _cache()
+    warmer = CacheWarmer(cache, _Calls(), asyncio.Semaphore(1), QueryLog(str(tmp_path / "q.json")), interval=3600)
+    warmer.start()
+    await asyncio.sleep(0)
+    _record(warmer, cache, {"sku_name": "D2s v5"})
+
+    await warmer.stop()
+
+    assert QueryLog(str(tmp_path / "q.json")).load() == 1
+    assert warmer.stats()["running"] is False
+
+
+@pytest.mark.asyncio
+async def test_server_logs_cacheable_calls():
+    server, pricing_server = create_server()
+    pricing_server._session_active = True
+    pricing_server.cache_warmer.log.path = None
+    call = server.request_handlers[CallToolRequest]
+
+    async def discount(arguments):
+        return [TextContent(type="text", text="10% discount")]
+
+    pricing_server.tool_handlers.handle_customer_discount = discount
+    request = CallToolRequest(params=CallToolRequestParams(name="get_customer_discount", arguments={}))
+    await call(request)
+    await call(request)
+
+    stats = pricing_server.cache_warmer.stats()
+    assert (stats["tracked_queries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+    assert pricing_server.cache_warmer.log.top(1)[0][1] == "get_customer_discount"